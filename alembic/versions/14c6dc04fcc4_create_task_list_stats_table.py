@@ -0,0 +1,244 @@
+"""create task_list_stats table
+
+Revision ID: 14c6dc04fcc4
+Revises: 95ac63a86a2c
+Create Date: 2026-10-19 10:03:27.604415
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "14c6dc04fcc4"
+down_revision = "95ac63a86a2c"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.create_table(
+        "task_list_stats",
+        sa.Column("task_list_id", sa.UUID(), nullable=False),
+        sa.Column("total_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("pending_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("in_process_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("completed_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("low_priority_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("medium_priority_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("high_priority_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "completed_percentage_sum", sa.BigInteger(), server_default="0", nullable=False
+        ),
+        sa.ForeignKeyConstraint(["task_list_id"], ["task_list.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_list_id"),
+    )
+
+    # Every task list owns exactly one counters row, created together with the list.
+    op.execute(
+        """
+        CREATE FUNCTION task_list_stats_create() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_list_stats (task_list_id) VALUES (NEW.id);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_list_stats_create AFTER INSERT ON task_list
+        FOR EACH ROW EXECUTE FUNCTION task_list_stats_create()
+        """
+    )
+
+    # Apply a +1/-1 delta for one task row. A plain UPDATE (instead of an upsert) is a
+    # no-op while a task list is being deleted, when its counters row is already gone.
+    op.execute(
+        """
+        CREATE FUNCTION task_list_stats_apply(
+            list_id uuid,
+            row_status task_status,
+            row_priority task_priority,
+            percentage integer,
+            delta integer
+        ) RETURNS void AS $$
+            UPDATE task_list_stats SET
+                total_count = total_count + delta,
+                pending_count = pending_count
+                    + CASE WHEN row_status = 'pending' THEN delta ELSE 0 END,
+                in_process_count = in_process_count
+                    + CASE WHEN row_status = 'in_process' THEN delta ELSE 0 END,
+                completed_count = completed_count
+                    + CASE WHEN row_status = 'completed' THEN delta ELSE 0 END,
+                low_priority_count = low_priority_count
+                    + CASE WHEN row_priority = 'low' THEN delta ELSE 0 END,
+                medium_priority_count = medium_priority_count
+                    + CASE WHEN row_priority = 'medium' THEN delta ELSE 0 END,
+                high_priority_count = high_priority_count
+                    + CASE WHEN row_priority = 'high' THEN delta ELSE 0 END,
+                completed_percentage_sum = completed_percentage_sum
+                    + coalesce(percentage, 0) * delta
+            WHERE task_list_id = list_id
+        $$ LANGUAGE sql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION task_list_stats_track() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+                AND NEW.task_list_id = OLD.task_list_id
+                AND NEW.status = OLD.status
+                AND NEW.priority = OLD.priority
+                AND NEW.completed_percentage IS NOT DISTINCT FROM OLD.completed_percentage
+            THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM task_list_stats_apply(
+                    OLD.task_list_id, OLD.status, OLD.priority, OLD.completed_percentage, -1
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM task_list_stats_apply(
+                    NEW.task_list_id, NEW.status, NEW.priority, NEW.completed_percentage, 1
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_list_stats_track AFTER INSERT OR UPDATE OR DELETE ON task
+        FOR EACH ROW EXECUTE FUNCTION task_list_stats_track()
+        """
+    )
+
+    # Recompute the counters from the task table. Returns how many task lists had
+    # drifted; with dry_run the drift is only reported, not repaired.
+    op.execute(
+        """
+        CREATE FUNCTION rebuild_task_list_stats(
+            list_id uuid DEFAULT NULL,
+            dry_run boolean DEFAULT false
+        ) RETURNS integer AS $$
+        DECLARE
+            drifted integer;
+        BEGIN
+            CREATE TEMP TABLE task_list_stats_actual ON COMMIT DROP AS
+            SELECT
+                tl.id AS task_list_id,
+                count(t.id)::integer AS total_count,
+                count(t.id) FILTER (WHERE t.status = 'pending')::integer AS pending_count,
+                count(t.id) FILTER (WHERE t.status = 'in_process')::integer
+                    AS in_process_count,
+                count(t.id) FILTER (WHERE t.status = 'completed')::integer AS completed_count,
+                count(t.id) FILTER (WHERE t.priority = 'low')::integer AS low_priority_count,
+                count(t.id) FILTER (WHERE t.priority = 'medium')::integer
+                    AS medium_priority_count,
+                count(t.id) FILTER (WHERE t.priority = 'high')::integer
+                    AS high_priority_count,
+                coalesce(sum(t.completed_percentage), 0)::bigint AS completed_percentage_sum
+            FROM task_list tl
+            LEFT JOIN task t ON t.task_list_id = tl.id
+            WHERE list_id IS NULL OR tl.id = list_id
+            GROUP BY tl.id;
+
+            SELECT count(*) INTO drifted
+            FROM task_list_stats_actual a
+            LEFT JOIN task_list_stats s ON s.task_list_id = a.task_list_id
+            WHERE s.task_list_id IS NULL
+                OR (a.total_count, a.pending_count, a.in_process_count, a.completed_count,
+                    a.low_priority_count, a.medium_priority_count, a.high_priority_count,
+                    a.completed_percentage_sum)
+                IS DISTINCT FROM
+                   (s.total_count, s.pending_count, s.in_process_count, s.completed_count,
+                    s.low_priority_count, s.medium_priority_count, s.high_priority_count,
+                    s.completed_percentage_sum);
+
+            IF NOT dry_run AND drifted > 0 THEN
+                INSERT INTO task_list_stats AS s
+                SELECT * FROM task_list_stats_actual
+                ON CONFLICT (task_list_id) DO UPDATE SET
+                    total_count = EXCLUDED.total_count,
+                    pending_count = EXCLUDED.pending_count,
+                    in_process_count = EXCLUDED.in_process_count,
+                    completed_count = EXCLUDED.completed_count,
+                    low_priority_count = EXCLUDED.low_priority_count,
+                    medium_priority_count = EXCLUDED.medium_priority_count,
+                    high_priority_count = EXCLUDED.high_priority_count,
+                    completed_percentage_sum = EXCLUDED.completed_percentage_sum
+                WHERE (s.total_count, s.pending_count, s.in_process_count, s.completed_count,
+                       s.low_priority_count, s.medium_priority_count, s.high_priority_count,
+                       s.completed_percentage_sum)
+                    IS DISTINCT FROM
+                      (EXCLUDED.total_count, EXCLUDED.pending_count, EXCLUDED.in_process_count,
+                       EXCLUDED.completed_count, EXCLUDED.low_priority_count,
+                       EXCLUDED.medium_priority_count, EXCLUDED.high_priority_count,
+                       EXCLUDED.completed_percentage_sum);
+            END IF;
+
+            DROP TABLE task_list_stats_actual;
+            RETURN drifted;
+        END
+        $$ LANGUAGE plpgsql VOLATILE
+        """
+    )
+    op.execute("SELECT rebuild_task_list_stats()")
+
+    # The summary computed column now reads the counters row instead of scanning tasks.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_list_summary(task_list task_list)
+        RETURNS task_list_summary AS $$
+            SELECT
+                s.total_count,
+                s.pending_count,
+                s.in_process_count,
+                s.completed_count,
+                s.low_priority_count,
+                s.medium_priority_count,
+                s.high_priority_count,
+                CASE WHEN s.total_count > 0
+                    THEN s.completed_percentage_sum::double precision / s.total_count
+                    ELSE 0
+                END
+            FROM task_list_stats s
+            WHERE s.task_list_id = task_list.id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+
+def downgrade():
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_list_summary(task_list task_list)
+        RETURNS task_list_summary AS $$
+            SELECT
+                count(*)::integer,
+                count(*) FILTER (WHERE t.status = 'pending')::integer,
+                count(*) FILTER (WHERE t.status = 'in_process')::integer,
+                count(*) FILTER (WHERE t.status = 'completed')::integer,
+                count(*) FILTER (WHERE t.priority = 'low')::integer,
+                count(*) FILTER (WHERE t.priority = 'medium')::integer,
+                count(*) FILTER (WHERE t.priority = 'high')::integer,
+                coalesce(avg(coalesce(t.completed_percentage, 0)), 0)::double precision
+            FROM task t
+            WHERE t.task_list_id = task_list.id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+    op.execute("DROP FUNCTION IF EXISTS rebuild_task_list_stats(uuid, boolean)")
+    op.execute("DROP TRIGGER IF EXISTS task_list_stats_track ON task")
+    op.execute("DROP FUNCTION IF EXISTS task_list_stats_track()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "task_list_stats_apply(uuid, task_status, task_priority, integer, integer)"
+    )
+    op.execute("DROP TRIGGER IF EXISTS task_list_stats_create ON task_list")
+    op.execute("DROP FUNCTION IF EXISTS task_list_stats_create()")
+    op.drop_table("task_list_stats")
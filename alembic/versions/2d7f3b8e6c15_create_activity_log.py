@@ -0,0 +1,93 @@
+"""create activity log
+
+Revision ID: 2d7f3b8e6c15
+Revises: 9c4e2a7f1b36
+Create Date: 2026-10-19 20:03:27.552194
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "2d7f3b8e6c15"
+down_revision = "9c4e2a7f1b36"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+def upgrade():
+    # No foreign keys: the history outlives the tasks, and inserts skip the key checks.
+    op.create_table(
+        "activity_log",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("task_list_id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column(
+            "details",
+            postgresql.JSONB(),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_activity_log_task_id_id",
+        "activity_log",
+        ["task_id", "id"],
+        postgresql_where=sa.text("task_id IS NOT NULL"),
+    )
+
+    # One multi-row INSERT per batch of the activity log writer.
+    op.execute(
+        """
+        CREATE FUNCTION record_activity(entries jsonb) RETURNS integer AS $$
+            WITH inserted AS (
+                INSERT INTO activity_log (
+                    task_list_id, task_id, user_id, action, details, created_at
+                )
+                SELECT e."taskListId", e."taskId", e."userId", e.action,
+                    coalesce(e.details, '{}'::jsonb), coalesce(e."occurredAt", now())
+                FROM jsonb_to_recordset(entries) AS e(
+                    "taskListId" uuid,
+                    "taskId" uuid,
+                    "userId" uuid,
+                    action text,
+                    details jsonb,
+                    "occurredAt" timestamp
+                )
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM inserted
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+    # Newest entries first; a page continues strictly before the ID of the last entry of the
+    # previous page.
+    op.execute(
+        """
+        CREATE FUNCTION task_activity(
+            target_task_id uuid,
+            before_id bigint DEFAULT NULL,
+            page_size integer DEFAULT 20
+        ) RETURNS SETOF activity_log AS $$
+            SELECT a.*
+            FROM activity_log a
+            WHERE a.task_id = target_task_id AND (before_id IS NULL OR a.id < before_id)
+            ORDER BY a.id DESC
+            LIMIT page_size
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS task_activity(uuid, bigint, integer)")
+    op.execute("DROP FUNCTION IF EXISTS record_activity(jsonb)")
+    op.drop_index("ix_activity_log_task_id_id", table_name="activity_log")
+    op.drop_table("activity_log")
@@ -0,0 +1,41 @@
+"""add task filter indexes
+
+Revision ID: 3e2f49e8b0d3
+Revises: e566880d5789
+Create Date: 2026-10-19 16:48:05.127634
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "3e2f49e8b0d3"
+down_revision = "e566880d5789"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    # Filtered task reads always restrict the task list first. Status and priority filters
+    # are IN lists over (task_list_id, status, priority); each sortable column gets an index
+    # ending in the id tie-breaker, so ORDER BY <column>, id is read straight from the index
+    # (backwards for descending orders) and range filters on the column use the same index.
+    op.create_index(
+        "ix_task_task_list_id_status_priority", "task", ["task_list_id", "status", "priority"]
+    )
+    op.create_index("ix_task_task_list_id_priority_id", "task", ["task_list_id", "priority", "id"])
+    op.create_index(
+        "ix_task_task_list_id_created_at_id", "task", ["task_list_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_task_task_list_id_completed_percentage_id",
+        "task",
+        ["task_list_id", "completed_percentage", "id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_task_task_list_id_completed_percentage_id", table_name="task")
+    op.drop_index("ix_task_task_list_id_created_at_id", table_name="task")
+    op.drop_index("ix_task_task_list_id_priority_id", table_name="task")
+    op.drop_index("ix_task_task_list_id_status_priority", table_name="task")
@@ -0,0 +1,122 @@
+"""add updated_at and task tombstones
+
+Revision ID: 49e71f33e01f
+Revises: 4d8db7332f96
+Create Date: 2026-10-19 12:41:52.306117
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "49e71f33e01f"
+down_revision = "4d8db7332f96"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    for table in ("task_list", "task"):
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False
+            ),
+        )
+        op.execute(f"UPDATE {table} SET updated_at = coalesce(created_at, updated_at)")
+
+    op.execute(
+        """
+        CREATE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ("task_list", "task"):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_set_updated_at BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+            """
+        )
+    op.create_index(
+        "ix_task_task_list_id_updated_at", "task", ["task_list_id", "updated_at"]
+    )
+
+    op.create_table(
+        "task_tombstone",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("task_list_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "deleted_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index(
+        "ix_task_tombstone_task_list_id_deleted_at",
+        "task_tombstone",
+        ["task_list_id", "deleted_at"],
+    )
+
+    # Tasks removed together with their task list need no tombstone: the list itself is gone.
+    op.execute(
+        """
+        CREATE FUNCTION task_tombstone_record() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM task_list WHERE id = OLD.task_list_id) THEN
+                INSERT INTO task_tombstone (task_id, task_list_id)
+                VALUES (OLD.id, OLD.task_list_id)
+                ON CONFLICT (task_id) DO UPDATE SET deleted_at = now();
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_tombstone_record AFTER DELETE ON task
+        FOR EACH ROW EXECUTE FUNCTION task_tombstone_record()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION tasks_updated_since(list_id uuid, since timestamp)
+        RETURNS SETOF task AS $$
+            SELECT t.*
+            FROM task t
+            WHERE t.task_list_id = list_id AND t.updated_at > since
+            ORDER BY t.updated_at, t.id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION task_tombstones_since(list_id uuid, since timestamp)
+        RETURNS SETOF task_tombstone AS $$
+            SELECT tt.*
+            FROM task_tombstone tt
+            WHERE tt.task_list_id = list_id AND tt.deleted_at > since
+            ORDER BY tt.deleted_at, tt.task_id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS task_tombstones_since(uuid, timestamp)")
+    op.execute("DROP FUNCTION IF EXISTS tasks_updated_since(uuid, timestamp)")
+    op.execute("DROP TRIGGER IF EXISTS task_tombstone_record ON task")
+    op.execute("DROP FUNCTION IF EXISTS task_tombstone_record()")
+    op.drop_index("ix_task_tombstone_task_list_id_deleted_at", table_name="task_tombstone")
+    op.drop_table("task_tombstone")
+    op.drop_index("ix_task_task_list_id_updated_at", table_name="task")
+    for table in ("task_list", "task"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_set_updated_at ON {table}")
+        op.drop_column(table, "updated_at")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,48 @@
+"""create task title search
+
+Revision ID: 4d8db7332f96
+Revises: 14c6dc04fcc4
+Create Date: 2026-10-19 11:20:05.731902
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "4d8db7332f96"
+down_revision = "14c6dc04fcc4"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_task_title_trgm ON task USING gin (title gin_trgm_ops)")
+
+    # Both the substring match and the word-similarity operator (<%) are answered by the
+    # trigram index; results are ranked by how well the search term matches a title word.
+    op.execute(
+        r"""
+        CREATE FUNCTION search_tasks(
+            search text,
+            list_id uuid DEFAULT NULL,
+            max_results integer DEFAULT 20
+        ) RETURNS SETOF task AS $$
+            SELECT t.*
+            FROM task t
+            WHERE (
+                t.title ILIKE '%' || replace(replace(replace(
+                    search, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+                OR search <% t.title
+            )
+            AND (list_id IS NULL OR t.task_list_id = list_id)
+            ORDER BY word_similarity(search, t.title) DESC, t.created_at DESC, t.id
+            LIMIT max_results
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS search_tasks(text, uuid, integer)")
+    op.execute("DROP INDEX IF EXISTS ix_task_title_trgm")
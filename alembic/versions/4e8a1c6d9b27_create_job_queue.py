@@ -0,0 +1,131 @@
+"""create job queue
+
+Revision ID: 4e8a1c6d9b27
+Revises: 2d7f3b8e6c15
+Create Date: 2026-10-19 21:26:10.904113
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "4e8a1c6d9b27"
+down_revision = "2d7f3b8e6c15"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+def upgrade():
+    op.create_table(
+        "job",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column(
+            "payload",
+            postgresql.JSONB(),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_attempts", sa.Integer(), server_default="5", nullable=False),
+        sa.Column("run_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("locked_until", sa.TIMESTAMP(), nullable=True),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("failed_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column(
+            "created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Failed jobs are kept for inspection but never claimed again.
+    op.create_index(
+        "ix_job_run_at",
+        "job",
+        ["run_at", "id"],
+        postgresql_where=sa.text("failed_at IS NULL"),
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION enqueue_job(
+            job_kind text,
+            job_payload jsonb,
+            attempt_limit integer DEFAULT 5
+        ) RETURNS job AS $$
+            INSERT INTO job (kind, payload, max_attempts)
+            VALUES (job_kind, coalesce(job_payload, '{}'::jsonb), attempt_limit)
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+    # Lease up to `batch_size` due jobs to the calling worker. Jobs claimed by concurrent
+    # workers are skipped rather than waited for; a job whose lease ran out, e.g. because its
+    # worker died, is claimed again.
+    op.execute(
+        """
+        CREATE FUNCTION claim_jobs(
+            batch_size integer DEFAULT 10,
+            lease_seconds integer DEFAULT 300
+        ) RETURNS SETOF job AS $$
+            UPDATE job j
+            SET attempts = j.attempts + 1,
+                locked_until = now() + make_interval(secs => lease_seconds)
+            FROM (
+                SELECT id
+                FROM job
+                WHERE failed_at IS NULL
+                    AND run_at <= now()
+                    AND (locked_until IS NULL OR locked_until <= now())
+                ORDER BY run_at, id
+                LIMIT batch_size
+                FOR UPDATE SKIP LOCKED
+            ) claimed
+            WHERE j.id = claimed.id
+            RETURNING j.*
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION complete_jobs(job_ids bigint[]) RETURNS integer AS $$
+            WITH completed AS (
+                DELETE FROM job WHERE id = ANY(job_ids) RETURNING 1
+            )
+            SELECT count(*)::integer FROM completed
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    # Release a failed job: it runs again after `retry_in_seconds`, or is marked as failed for
+    # good when no delay is given.
+    op.execute(
+        """
+        CREATE FUNCTION retry_job(
+            job_id bigint,
+            error text,
+            retry_in_seconds integer DEFAULT NULL
+        ) RETURNS job AS $$
+            UPDATE job
+            SET last_error = error,
+                locked_until = NULL,
+                run_at = CASE
+                    WHEN retry_in_seconds IS NULL THEN run_at
+                    ELSE now() + make_interval(secs => retry_in_seconds)
+                END,
+                failed_at = CASE WHEN retry_in_seconds IS NULL THEN now() END
+            WHERE id = job_id
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS retry_job(bigint, text, integer)")
+    op.execute("DROP FUNCTION IF EXISTS complete_jobs(bigint[])")
+    op.execute("DROP FUNCTION IF EXISTS claim_jobs(integer, integer)")
+    op.execute("DROP FUNCTION IF EXISTS enqueue_job(text, jsonb, integer)")
+    op.drop_index("ix_job_run_at", table_name="job")
+    op.drop_table("job")
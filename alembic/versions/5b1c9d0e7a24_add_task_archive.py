@@ -0,0 +1,168 @@
+"""add task archive
+
+Revision ID: 5b1c9d0e7a24
+Revises: 73927c87d52b
+Create Date: 2026-10-19 18:05:12.640281
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "5b1c9d0e7a24"
+down_revision = "73927c87d52b"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+TASK_COLUMNS = (
+    "id, title, priority, status, completed_percentage, task_list_id, created_at, updated_at, "
+    "version"
+)
+
+
+def upgrade():
+    op.create_table(
+        "task_archive",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column(
+            "priority", postgresql.ENUM(name="task_priority", create_type=False), nullable=False
+        ),
+        sa.Column(
+            "status", postgresql.ENUM(name="task_status", create_type=False), nullable=False
+        ),
+        sa.Column("completed_percentage", sa.Integer(), nullable=True),
+        sa.Column("task_list_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("updated_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "archived_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["task_list_id"], ["task_list.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_task_archive_task_list_id", "task_archive", ["task_list_id"])
+
+    op.create_table(
+        "assigned_task_archive",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["task_archive.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_assigned_task_archive_task_id", "assigned_task_archive", ["task_id"])
+
+    # The archiver looks for completed tasks by age without scanning the active ones.
+    op.create_index(
+        "ix_task_completed_updated_at",
+        "task",
+        ["updated_at"],
+        postgresql_where=sa.text("status = 'completed'"),
+    )
+
+    # Reads with include_archived go through this view; the smart tags give PostGraphile its
+    # primary key and its relation to task_list, and keep it read-only.
+    op.execute(
+        f"""
+        CREATE VIEW task_including_archived AS
+            SELECT {TASK_COLUMNS}, NULL::timestamp AS archived_at FROM task
+            UNION ALL
+            SELECT {TASK_COLUMNS}, archived_at FROM task_archive
+        """
+    )
+    smart_tags = (
+        "@primaryKey id",
+        "@foreignKey (task_list_id) references task_list (id)",
+        "@omit create,update,delete",
+    )
+    op.execute(
+        "COMMENT ON VIEW task_including_archived IS E'" + "\\n".join(smart_tags) + "'"
+    )
+
+    # Move one batch of tasks completed longer than `older_than_days` ago, with their
+    # assignments. Tasks locked by a concurrent writer are left for the next batch.
+    op.execute(
+        f"""
+        CREATE FUNCTION archive_completed_tasks(
+            older_than_days integer,
+            batch_size integer DEFAULT 1000
+        ) RETURNS integer AS $$
+            WITH batch AS (
+                SELECT id
+                FROM task
+                WHERE status = 'completed'
+                    AND updated_at < now() - make_interval(days => older_than_days)
+                ORDER BY updated_at
+                LIMIT batch_size
+                FOR UPDATE SKIP LOCKED
+            ),
+            archived AS (
+                DELETE FROM task t USING batch b
+                WHERE t.id = b.id
+                RETURNING t.id, t.title, t.priority, t.status, t.completed_percentage,
+                    t.task_list_id, t.created_at, t.updated_at, t.version
+            ),
+            inserted AS (
+                INSERT INTO task_archive ({TASK_COLUMNS})
+                SELECT * FROM archived
+                RETURNING 1
+            ),
+            archived_assignments AS (
+                INSERT INTO assigned_task_archive (id, task_id, user_id, created_at)
+                SELECT a.id, a.task_id, a.user_id, a.created_at
+                FROM assigned_task a
+                JOIN batch b ON a.task_id = b.id
+            )
+            SELECT count(*)::integer FROM inserted
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+    # Move archived tasks of a task list back, with their assignments. Restored tasks count
+    # as updated for the changes feed, so their tombstones are removed.
+    op.execute(
+        f"""
+        CREATE FUNCTION restore_archived_tasks(list_id uuid, task_ids uuid[])
+        RETURNS integer AS $$
+            WITH restored AS (
+                DELETE FROM task_archive
+                WHERE task_list_id = list_id AND id = ANY (task_ids)
+                RETURNING {TASK_COLUMNS}
+            ),
+            inserted AS (
+                INSERT INTO task ({TASK_COLUMNS})
+                SELECT id, title, priority, status, completed_percentage, task_list_id,
+                    created_at, now(), version
+                FROM restored
+                RETURNING 1
+            ),
+            reassigned AS (
+                INSERT INTO assigned_task (id, task_id, user_id, created_at)
+                SELECT a.id, a.task_id, a.user_id, a.created_at
+                FROM assigned_task_archive a
+                JOIN restored r ON a.task_id = r.id
+            ),
+            forgotten AS (
+                DELETE FROM task_tombstone tt USING restored r WHERE tt.task_id = r.id
+            )
+            SELECT count(*)::integer FROM inserted
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS restore_archived_tasks(uuid, uuid[])")
+    op.execute("DROP FUNCTION IF EXISTS archive_completed_tasks(integer, integer)")
+    op.execute("DROP VIEW IF EXISTS task_including_archived")
+    op.drop_index("ix_task_completed_updated_at", table_name="task")
+    op.drop_index("ix_assigned_task_archive_task_id", table_name="assigned_task_archive")
+    op.drop_table("assigned_task_archive")
+    op.drop_index("ix_task_archive_task_list_id", table_name="task_archive")
+    op.drop_table("task_archive")
@@ -0,0 +1,93 @@
+"""add row versions
+
+Revision ID: 73927c87d52b
+Revises: 3e2f49e8b0d3
+Create Date: 2026-10-19 17:32:41.905318
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "73927c87d52b"
+down_revision = "3e2f49e8b0d3"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    for table in ("task_list", "task"):
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), server_default=sa.text("1"), nullable=False),
+        )
+
+    # Every UPDATE bumps the version, whichever mutation or function issues it, so a client
+    # holding an older version can never overwrite a newer row.
+    op.execute(
+        """
+        CREATE FUNCTION bump_row_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version = OLD.version + 1;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ("task_list", "task"):
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_bump_row_version BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION bump_row_version()
+            """
+        )
+
+    # Compare-and-set updates: a NULL expected version updates unconditionally and a NULL
+    # field keeps its current value. No row is returned when the task does not exist or its
+    # version differs.
+    op.execute(
+        """
+        CREATE FUNCTION update_task_if_version(
+            task_id uuid,
+            expected_version integer DEFAULT NULL,
+            new_title text DEFAULT NULL,
+            new_priority task_priority DEFAULT NULL,
+            new_status task_status DEFAULT NULL,
+            new_completed_percentage integer DEFAULT NULL
+        ) RETURNS task AS $$
+            UPDATE task SET
+                title = coalesce(new_title, title),
+                priority = coalesce(new_priority, priority),
+                status = coalesce(new_status, status),
+                completed_percentage = coalesce(new_completed_percentage, completed_percentage)
+            WHERE id = task_id AND (expected_version IS NULL OR version = expected_version)
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION update_task_list_if_version(
+            list_id uuid,
+            expected_version integer DEFAULT NULL,
+            new_name text DEFAULT NULL
+        ) RETURNS task_list AS $$
+            UPDATE task_list SET name = coalesce(new_name, name)
+            WHERE id = list_id AND (expected_version IS NULL OR version = expected_version)
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS update_task_list_if_version(uuid, integer, text)")
+    op.execute(
+        "DROP FUNCTION IF EXISTS update_task_if_version("
+        "uuid, integer, text, task_priority, task_status, integer)"
+    )
+    for table in ("task_list", "task"):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_row_version ON {table}")
+        op.drop_column(table, "version")
+    op.execute("DROP FUNCTION IF EXISTS bump_row_version()")
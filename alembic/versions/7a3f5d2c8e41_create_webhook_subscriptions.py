@@ -0,0 +1,148 @@
+"""create webhook subscriptions
+
+Revision ID: 7a3f5d2c8e41
+Revises: 4e8a1c6d9b27
+Create Date: 2026-10-19 22:41:37.215864
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "7a3f5d2c8e41"
+down_revision = "4e8a1c6d9b27"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+# A task row `t` in the shape of the API.
+TASK_JSON = (
+    "jsonb_build_object("
+    "'id', t.id, 'title', t.title, 'priority', t.priority, 'status', t.status, "
+    "'completedPercentage', t.completed_percentage, 'taskListId', t.task_list_id, "
+    "'createdAt', t.created_at, 'updatedAt', t.updated_at, 'version', t.version)"
+)
+
+
+def upgrade():
+    op.create_table(
+        "webhook_subscription",
+        sa.Column(
+            "id", sa.UUID(), server_default=sa.text("gen_random_uuid()"), nullable=False
+        ),
+        sa.Column("task_list_id", sa.UUID(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("secret", sa.String(), nullable=False),
+        sa.Column(
+            "created_at", sa.TIMESTAMP(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["task_list_id"], ["task_list.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_webhook_subscription_task_list_id", "webhook_subscription", ["task_list_id"]
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION remove_webhook_subscription(list_id uuid, subscription_id uuid)
+        RETURNS webhook_subscription AS $$
+            DELETE FROM webhook_subscription
+            WHERE id = subscription_id AND task_list_id = list_id
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+    # Every statement changing tasks or assignments queues one 'webhook' job per changed row
+    # and subscription of its task list, in the same transaction as the change, so no change
+    # can commit without its deliveries; the job workers deliver them. Tasks of soft-deleted
+    # task lists, e.g. removed by the purge, are left out.
+    op.execute(
+        f"""
+        CREATE FUNCTION task_webhooks() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO job (kind, payload)
+            SELECT 'webhook', jsonb_build_object(
+                'subscriptionId', s.id,
+                'url', s.url,
+                'secret', s.secret,
+                'event', jsonb_build_object(
+                    'id', gen_random_uuid(),
+                    'action', CASE TG_OP
+                        WHEN 'INSERT' THEN 'task.created'
+                        WHEN 'UPDATE' THEN 'task.updated'
+                        ELSE 'task.deleted'
+                    END,
+                    'taskListId', t.task_list_id,
+                    'taskId', t.id,
+                    'task', {TASK_JSON},
+                    'occurredAt', now()::timestamp
+                )
+            )
+            FROM changed_tasks t
+            JOIN task_list tl ON tl.id = t.task_list_id AND tl.deleted_at IS NULL
+            JOIN webhook_subscription s ON s.task_list_id = t.task_list_id
+            ORDER BY t.id, s.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for event, transition in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+        op.execute(
+            f"""
+            CREATE TRIGGER task_{event.lower()}_webhooks
+            AFTER {event} ON task
+            REFERENCING {transition} TABLE AS changed_tasks
+            FOR EACH STATEMENT EXECUTE FUNCTION task_webhooks()
+            """
+        )
+
+    op.execute(
+        """
+        CREATE FUNCTION assigned_task_webhooks() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO job (kind, payload)
+            SELECT 'webhook', jsonb_build_object(
+                'subscriptionId', s.id,
+                'url', s.url,
+                'secret', s.secret,
+                'event', jsonb_build_object(
+                    'id', gen_random_uuid(),
+                    'action', 'task.assigned',
+                    'taskListId', t.task_list_id,
+                    'taskId', t.id,
+                    'userId', a.user_id,
+                    'occurredAt', now()::timestamp
+                )
+            )
+            FROM new_assignments a
+            JOIN task t ON t.id = a.task_id
+            JOIN task_list tl ON tl.id = t.task_list_id AND tl.deleted_at IS NULL
+            JOIN webhook_subscription s ON s.task_list_id = t.task_list_id
+            ORDER BY a.id, s.id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER assigned_task_webhooks
+        AFTER INSERT ON assigned_task
+        REFERENCING NEW TABLE AS new_assignments
+        FOR EACH STATEMENT EXECUTE FUNCTION assigned_task_webhooks()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS assigned_task_webhooks ON assigned_task")
+    op.execute("DROP FUNCTION IF EXISTS assigned_task_webhooks()")
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER IF EXISTS task_{event}_webhooks ON task")
+    op.execute("DROP FUNCTION IF EXISTS task_webhooks()")
+    op.execute("DROP FUNCTION IF EXISTS remove_webhook_subscription(uuid, uuid)")
+    op.drop_index("ix_webhook_subscription_task_list_id", table_name="webhook_subscription")
+    op.drop_table("webhook_subscription")
@@ -0,0 +1,59 @@
+"""create task_list summary function
+
+Revision ID: 95ac63a86a2c
+Revises: 7b4b7e47cadc
+Create Date: 2026-10-19 09:12:40.118253
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "95ac63a86a2c"
+down_revision = "7b4b7e47cadc"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    # PostGraphile exposes a function whose first argument is a table row as a
+    # computed column, so this becomes `TaskList.summary` in the GraphQL schema.
+    op.execute(
+        """
+        CREATE TYPE task_list_summary AS (
+            total_count integer,
+            pending_count integer,
+            in_process_count integer,
+            completed_count integer,
+            low_priority_count integer,
+            medium_priority_count integer,
+            high_priority_count integer,
+            average_completed_percentage double precision
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION task_list_summary(task_list task_list)
+        RETURNS task_list_summary AS $$
+            SELECT
+                count(*)::integer,
+                count(*) FILTER (WHERE t.status = 'pending')::integer,
+                count(*) FILTER (WHERE t.status = 'in_process')::integer,
+                count(*) FILTER (WHERE t.status = 'completed')::integer,
+                count(*) FILTER (WHERE t.priority = 'low')::integer,
+                count(*) FILTER (WHERE t.priority = 'medium')::integer,
+                count(*) FILTER (WHERE t.priority = 'high')::integer,
+                coalesce(avg(coalesce(t.completed_percentage, 0)), 0)::double precision
+            FROM task t
+            WHERE t.task_list_id = task_list.id
+        $$ LANGUAGE sql STABLE
+        """
+    )
+    op.execute("CREATE INDEX ix_task_task_list_id ON task (task_list_id)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_task_task_list_id")
+    op.execute("DROP FUNCTION IF EXISTS task_list_summary(task_list)")
+    op.execute("DROP TYPE IF EXISTS task_list_summary")
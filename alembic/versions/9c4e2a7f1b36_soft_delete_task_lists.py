@@ -0,0 +1,312 @@
+"""soft delete task lists
+
+Revision ID: 9c4e2a7f1b36
+Revises: 5b1c9d0e7a24
+Create Date: 2026-10-19 19:12:44.318506
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "9c4e2a7f1b36"
+down_revision = "5b1c9d0e7a24"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+TASK_COLUMNS = (
+    "id, title, priority, status, completed_percentage, task_list_id, created_at, updated_at, "
+    "version"
+)
+
+# Condition on a task `t` hiding the tasks of soft-deleted task lists.
+VISIBLE_TASK = (
+    "EXISTS (SELECT 1 FROM task_list tl WHERE tl.id = t.task_list_id AND tl.deleted_at IS NULL)"
+)
+
+# Condition on the `list_id` argument of the bulk task functions.
+VISIBLE_LIST = (
+    "EXISTS (SELECT 1 FROM task_list tl WHERE tl.id = list_id AND tl.deleted_at IS NULL)"
+)
+
+
+def _search_tasks(visible: str) -> str:
+    return rf"""
+        CREATE OR REPLACE FUNCTION search_tasks(
+            search text,
+            list_id uuid DEFAULT NULL,
+            max_results integer DEFAULT 20
+        ) RETURNS SETOF task AS $$
+            SELECT t.*
+            FROM task t
+            WHERE (
+                t.title ILIKE '%' || replace(replace(replace(
+                    search, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+                OR search <% t.title
+            )
+            AND (list_id IS NULL OR t.task_list_id = list_id)
+            AND {visible}
+            ORDER BY word_similarity(search, t.title) DESC, t.created_at DESC, t.id
+            LIMIT max_results
+        $$ LANGUAGE sql STABLE
+    """
+
+
+def _user_assigned_tasks(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION user_assigned_tasks(
+            assignee_id uuid,
+            status_filter task_status DEFAULT NULL,
+            priority_filter task_priority DEFAULT NULL,
+            after_created_at timestamp DEFAULT NULL,
+            after_id uuid DEFAULT NULL,
+            page_size integer DEFAULT 20
+        ) RETURNS SETOF assigned_task AS $$
+            SELECT a.*
+            FROM assigned_task a
+            JOIN task t ON t.id = a.task_id
+            WHERE a.user_id = assignee_id
+                AND (status_filter IS NULL OR t.status = status_filter)
+                AND (priority_filter IS NULL OR t.priority = priority_filter)
+                AND (
+                    after_created_at IS NULL
+                    OR (a.created_at, a.id) < (after_created_at, after_id)
+                )
+                AND {visible}
+            ORDER BY a.created_at DESC, a.id DESC
+            LIMIT page_size
+        $$ LANGUAGE sql STABLE
+    """
+
+
+def _task_including_archived(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE VIEW task_including_archived AS
+            SELECT {TASK_COLUMNS}, NULL::timestamp AS archived_at FROM task t WHERE {visible}
+            UNION ALL
+            SELECT {TASK_COLUMNS}, archived_at FROM task_archive t WHERE {visible}
+    """
+
+
+def _update_task_list_if_version(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION update_task_list_if_version(
+            list_id uuid,
+            expected_version integer DEFAULT NULL,
+            new_name text DEFAULT NULL
+        ) RETURNS task_list AS $$
+            UPDATE task_list SET name = coalesce(new_name, name)
+            WHERE id = list_id
+                AND (expected_version IS NULL OR version = expected_version)
+                AND {visible}
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def _update_task_if_version(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION update_task_if_version(
+            task_id uuid,
+            expected_version integer DEFAULT NULL,
+            new_title text DEFAULT NULL,
+            new_priority task_priority DEFAULT NULL,
+            new_status task_status DEFAULT NULL,
+            new_completed_percentage integer DEFAULT NULL
+        ) RETURNS task AS $$
+            UPDATE task t SET
+                title = coalesce(new_title, title),
+                priority = coalesce(new_priority, priority),
+                status = coalesce(new_status, status),
+                completed_percentage = coalesce(new_completed_percentage, completed_percentage)
+            WHERE id = task_id
+                AND (expected_version IS NULL OR version = expected_version)
+                AND {visible}
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def _task_tombstone_record(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION task_tombstone_record() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM task_list WHERE id = OLD.task_list_id AND {visible}) THEN
+                INSERT INTO task_tombstone (task_id, task_list_id)
+                VALUES (OLD.id, OLD.task_list_id)
+                ON CONFLICT (task_id) DO UPDATE SET deleted_at = now();
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """
+
+
+def _bulk_update_tasks(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION bulk_update_tasks(
+            list_id uuid,
+            task_ids uuid[] DEFAULT NULL,
+            statuses task_status[] DEFAULT NULL,
+            priorities task_priority[] DEFAULT NULL,
+            new_status task_status DEFAULT NULL,
+            new_priority task_priority DEFAULT NULL,
+            new_completed_percentage integer DEFAULT NULL
+        ) RETURNS integer AS $$
+            WITH updated AS (
+                UPDATE task SET
+                    status = coalesce(new_status, status),
+                    priority = coalesce(new_priority, priority),
+                    completed_percentage = coalesce(new_completed_percentage, completed_percentage)
+                WHERE task_list_id = list_id
+                    AND (task_ids IS NULL OR id = ANY (task_ids))
+                    AND (statuses IS NULL OR status = ANY (statuses))
+                    AND (priorities IS NULL OR priority = ANY (priorities))
+                    AND (coalesce(new_status, status), coalesce(new_priority, priority),
+                         coalesce(new_completed_percentage, completed_percentage))
+                        IS DISTINCT FROM (status, priority, completed_percentage)
+                    AND {visible}
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM updated
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def _bulk_delete_tasks(visible: str) -> str:
+    return f"""
+        CREATE OR REPLACE FUNCTION bulk_delete_tasks(
+            list_id uuid,
+            task_ids uuid[] DEFAULT NULL,
+            statuses task_status[] DEFAULT NULL,
+            priorities task_priority[] DEFAULT NULL
+        ) RETURNS integer AS $$
+            WITH deleted AS (
+                DELETE FROM task
+                WHERE task_list_id = list_id
+                    AND (task_ids IS NULL OR id = ANY (task_ids))
+                    AND (statuses IS NULL OR status = ANY (statuses))
+                    AND (priorities IS NULL OR priority = ANY (priorities))
+                    AND {visible}
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM deleted
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def upgrade():
+    op.add_column("task_list", sa.Column("deleted_at", sa.TIMESTAMP(), nullable=True))
+    op.create_index(
+        "ix_task_list_deleted_at",
+        "task_list",
+        ["deleted_at"],
+        postgresql_where=sa.text("deleted_at IS NOT NULL"),
+    )
+
+    # Deleting a task list only marks it; its tasks are removed later by
+    # purge_deleted_task_lists. Until then every read leaves them out and no update changes
+    # them.
+    op.execute(
+        """
+        CREATE FUNCTION soft_delete_task_list(list_id uuid) RETURNS task_list AS $$
+            UPDATE task_list SET deleted_at = now()
+            WHERE id = list_id AND deleted_at IS NULL
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION visible_task_list(list_id uuid) RETURNS task_list AS $$
+            SELECT * FROM task_list WHERE id = list_id AND deleted_at IS NULL
+        $$ LANGUAGE sql STABLE
+        """
+    )
+    op.execute(
+        f"""
+        CREATE FUNCTION visible_task(task_id uuid) RETURNS task AS $$
+            SELECT t.* FROM task t WHERE t.id = task_id AND {VISIBLE_TASK}
+        $$ LANGUAGE sql STABLE
+        """
+    )
+    op.execute(_search_tasks(VISIBLE_TASK))
+    op.execute(_user_assigned_tasks(VISIBLE_TASK))
+    op.execute(_task_including_archived(VISIBLE_TASK))
+    op.execute(_update_task_list_if_version("deleted_at IS NULL"))
+    op.execute(_update_task_if_version(VISIBLE_TASK))
+    op.execute(_bulk_update_tasks(VISIBLE_LIST))
+    op.execute(_bulk_delete_tasks(VISIBLE_LIST))
+    # Purged tasks need no tombstones: their task list is gone for the clients already.
+    op.execute(_task_tombstone_record("deleted_at IS NULL"))
+
+    # Remove up to `batch_size` tasks and archived tasks of soft-deleted task lists, then the
+    # task lists left empty with their tombstones. Rows locked by a concurrent writer are left
+    # for the next batch. Returns the number of tasks removed.
+    op.execute(
+        """
+        CREATE FUNCTION purge_deleted_task_lists(batch_size integer DEFAULT 1000)
+        RETURNS integer AS $$
+        DECLARE
+            purged integer;
+            purged_archived integer;
+        BEGIN
+            WITH batch AS (
+                SELECT t.id
+                FROM task_list tl
+                JOIN task t ON t.task_list_id = tl.id
+                WHERE tl.deleted_at IS NOT NULL
+                LIMIT batch_size
+                FOR UPDATE OF t SKIP LOCKED
+            )
+            DELETE FROM task t USING batch b WHERE t.id = b.id;
+            GET DIAGNOSTICS purged = ROW_COUNT;
+
+            WITH batch AS (
+                SELECT ta.id
+                FROM task_list tl
+                JOIN task_archive ta ON ta.task_list_id = tl.id
+                WHERE tl.deleted_at IS NOT NULL
+                LIMIT batch_size - purged
+                FOR UPDATE OF ta SKIP LOCKED
+            )
+            DELETE FROM task_archive ta USING batch b WHERE ta.id = b.id;
+            GET DIAGNOSTICS purged_archived = ROW_COUNT;
+            purged := purged + purged_archived;
+
+            IF purged < batch_size THEN
+                WITH emptied AS (
+                    DELETE FROM task_list tl
+                    WHERE tl.deleted_at IS NOT NULL
+                        AND NOT EXISTS (SELECT 1 FROM task t WHERE t.task_list_id = tl.id)
+                        AND NOT EXISTS (
+                            SELECT 1 FROM task_archive ta WHERE ta.task_list_id = tl.id
+                        )
+                    RETURNING tl.id
+                )
+                DELETE FROM task_tombstone tt USING emptied e WHERE tt.task_list_id = e.id;
+            END IF;
+            RETURN purged;
+        END
+        $$ LANGUAGE plpgsql VOLATILE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS purge_deleted_task_lists(integer)")
+    op.execute("DELETE FROM task_list WHERE deleted_at IS NOT NULL")
+    op.execute(_task_tombstone_record("true"))
+    op.execute(_bulk_delete_tasks("true"))
+    op.execute(_bulk_update_tasks("true"))
+    op.execute(_update_task_if_version("true"))
+    op.execute(_update_task_list_if_version("true"))
+    op.execute(_task_including_archived("true"))
+    op.execute(_user_assigned_tasks("true"))
+    op.execute(_search_tasks("true"))
+    op.execute("DROP FUNCTION IF EXISTS visible_task(uuid)")
+    op.execute("DROP FUNCTION IF EXISTS visible_task_list(uuid)")
+    op.execute("DROP FUNCTION IF EXISTS soft_delete_task_list(uuid)")
+    op.drop_index("ix_task_list_deleted_at", table_name="task_list")
+    op.drop_column("task_list", "deleted_at")
@@ -0,0 +1,83 @@
+"""add bulk task assignment
+
+Revision ID: b8d2e6f4a913
+Revises: 7a3f5d2c8e41
+Create Date: 2026-10-19 23:34:52.671209
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "b8d2e6f4a913"
+down_revision = "7a3f5d2c8e41"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+VISIBLE_TASK = (
+    "EXISTS (SELECT 1 FROM task_list tl WHERE tl.id = t.task_list_id AND tl.deleted_at IS NULL)"
+)
+
+
+def upgrade():
+    # Keep the oldest of any duplicated assignment before making the pairs unique. Archived
+    # assignments are deduplicated too, or restoring their task would break the constraint.
+    for table in ("assigned_task", "assigned_task_archive"):
+        op.execute(
+            f"""
+            DELETE FROM {table} a
+            USING {table} older
+            WHERE older.task_id = a.task_id
+                AND older.user_id = a.user_id
+                AND (older.created_at, older.id) < (a.created_at, a.id)
+            """
+        )
+        op.create_unique_constraint(
+            f"uq_{table}_task_id_user_id", table, ["task_id", "user_id"]
+        )
+
+    op.execute(
+        f"""
+        CREATE FUNCTION visible_tasks(task_ids uuid[]) RETURNS SETOF task AS $$
+            SELECT t.* FROM task t WHERE t.id = ANY(task_ids) AND {VISIBLE_TASK}
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+    # Assign the n-th task to the n-th user, for every pair whose task and user still exist.
+    # Pairs already assigned are skipped; only the new assignments are returned.
+    op.execute(
+        """
+        CREATE FUNCTION assign_tasks(task_ids uuid[], user_ids uuid[])
+        RETURNS SETOF assigned_task AS $$
+            INSERT INTO assigned_task (task_id, user_id)
+            SELECT p.task_id, p.user_id
+            FROM unnest(task_ids, user_ids) AS p(task_id, user_id)
+            JOIN task t ON t.id = p.task_id
+            JOIN "user" u ON u.id = p.user_id
+            ON CONFLICT (task_id, user_id) DO NOTHING
+            RETURNING *
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION enqueue_jobs(job_kind text, payloads jsonb) RETURNS integer AS $$
+            WITH queued AS (
+                INSERT INTO job (kind, payload)
+                SELECT job_kind, p.payload FROM jsonb_array_elements(payloads) AS p(payload)
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM queued
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP FUNCTION IF EXISTS enqueue_jobs(text, jsonb)")
+    op.execute("DROP FUNCTION IF EXISTS assign_tasks(uuid[], uuid[])")
+    op.execute("DROP FUNCTION IF EXISTS visible_tasks(uuid[])")
+    for table in ("assigned_task_archive", "assigned_task"):
+        op.drop_constraint(f"uq_{table}_task_id_user_id", table, type_="unique")
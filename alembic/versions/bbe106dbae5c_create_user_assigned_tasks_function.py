@@ -0,0 +1,69 @@
+"""create user assigned tasks function
+
+Revision ID: bbe106dbae5c
+Revises: 49e71f33e01f
+Create Date: 2026-10-19 14:02:18.950372
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "bbe106dbae5c"
+down_revision = "49e71f33e01f"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # Keyset pagination needs a total order on (created_at, id).
+    op.execute("UPDATE assigned_task SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column(
+        "assigned_task", "created_at", existing_type=sa.TIMESTAMP(), nullable=False
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_assigned_task_user_id_created_at
+        ON assigned_task (user_id, created_at, id) INCLUDE (task_id)
+        """
+    )
+
+    # Newest assignments first; a page continues strictly after the (created_at, id)
+    # of the last row of the previous page, so each page is one index range scan.
+    op.execute(
+        """
+        CREATE FUNCTION user_assigned_tasks(
+            assignee_id uuid,
+            status_filter task_status DEFAULT NULL,
+            priority_filter task_priority DEFAULT NULL,
+            after_created_at timestamp DEFAULT NULL,
+            after_id uuid DEFAULT NULL,
+            page_size integer DEFAULT 20
+        ) RETURNS SETOF assigned_task AS $$
+            SELECT a.*
+            FROM assigned_task a
+            JOIN task t ON t.id = a.task_id
+            WHERE a.user_id = assignee_id
+                AND (status_filter IS NULL OR t.status = status_filter)
+                AND (priority_filter IS NULL OR t.priority = priority_filter)
+                AND (
+                    after_created_at IS NULL
+                    OR (a.created_at, a.id) < (after_created_at, after_id)
+                )
+            ORDER BY a.created_at DESC, a.id DESC
+            LIMIT page_size
+        $$ LANGUAGE sql STABLE
+        """
+    )
+
+
+def downgrade():
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "user_assigned_tasks(uuid, task_status, task_priority, timestamp, uuid, integer)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_assigned_task_user_id_created_at")
+    op.alter_column(
+        "assigned_task", "created_at", existing_type=sa.TIMESTAMP(), nullable=True
+    )
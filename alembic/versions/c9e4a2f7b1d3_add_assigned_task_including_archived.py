@@ -0,0 +1,42 @@
+"""add assigned task including archived
+
+Revision ID: c9e4a2f7b1d3
+Revises: f2b6d8a4c1e7
+Create Date: 2026-10-20 14:02:51.376120
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "c9e4a2f7b1d3"
+down_revision = "f2b6d8a4c1e7"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    # Reads with include_archived and include=assignees select the assignees of every task of
+    # the task_including_archived view through this one; the smart tags give PostGraphile its
+    # primary key, its relations to that view and to user, and keep it read-only.
+    op.execute(
+        """
+        CREATE VIEW assigned_task_including_archived AS
+            SELECT id, task_id, user_id, created_at FROM assigned_task
+            UNION ALL
+            SELECT id, task_id, user_id, created_at FROM assigned_task_archive
+        """
+    )
+    smart_tags = (
+        "@primaryKey id",
+        "@foreignKey (task_id) references task_including_archived (id)",
+        '@foreignKey (user_id) references "user" (id)',
+        "@omit create,update,delete",
+    )
+    op.execute(
+        "COMMENT ON VIEW assigned_task_including_archived IS E'" + "\\n".join(smart_tags) + "'"
+    )
+
+
+def downgrade():
+    op.execute("DROP VIEW IF EXISTS assigned_task_including_archived")
@@ -0,0 +1,168 @@
+"""record bulk task activity
+
+Revision ID: d5a7c3e9f1b8
+Revises: b8d2e6f4a913
+Create Date: 2026-10-20 10:41:27.518364
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "d5a7c3e9f1b8"
+down_revision = "b8d2e6f4a913"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+TASK_COLUMNS = (
+    "id, title, priority, status, completed_percentage, task_list_id, created_at, updated_at, "
+    "version"
+)
+
+VISIBLE_LIST = (
+    "EXISTS (SELECT 1 FROM task_list tl WHERE tl.id = list_id AND tl.deleted_at IS NULL)"
+)
+
+BULK_UPDATE_ARGUMENTS = (
+    "uuid, uuid[], task_status[], task_priority[], task_status, task_priority, integer"
+)
+BULK_DELETE_ARGUMENTS = "uuid, uuid[], task_status[], task_priority[]"
+RESTORE_ARCHIVED_ARGUMENTS = "uuid, uuid[]"
+
+BULK_UPDATE_DETAILS = (
+    "jsonb_build_object('patch', jsonb_strip_nulls(jsonb_build_object("
+    "'status', new_status, 'priority', new_priority, "
+    "'completed_percentage', new_completed_percentage)))"
+)
+
+
+def _acting_user(record: bool) -> str:
+    return ",\n            acting_user_id uuid DEFAULT NULL" if record else ""
+
+
+def _recorded(record: bool, action: str, changed: str, details: str = "'{}'::jsonb") -> str:
+    """
+    Common table expression writing one activity log entry per changed task, in the statement
+    that changes them.
+    """
+    if not record:
+        return ""
+    return f""",
+            recorded AS (
+                INSERT INTO activity_log (task_list_id, task_id, user_id, action, details)
+                SELECT list_id, c.id, acting_user_id, '{action}', {details}
+                FROM {changed} c
+            )"""
+
+
+def _bulk_update_tasks(record: bool) -> str:
+    return f"""
+        CREATE FUNCTION bulk_update_tasks(
+            list_id uuid,
+            task_ids uuid[] DEFAULT NULL,
+            statuses task_status[] DEFAULT NULL,
+            priorities task_priority[] DEFAULT NULL,
+            new_status task_status DEFAULT NULL,
+            new_priority task_priority DEFAULT NULL,
+            new_completed_percentage integer DEFAULT NULL{_acting_user(record)}
+        ) RETURNS integer AS $$
+            WITH updated AS (
+                UPDATE task SET
+                    status = coalesce(new_status, status),
+                    priority = coalesce(new_priority, priority),
+                    completed_percentage = coalesce(new_completed_percentage, completed_percentage)
+                WHERE task_list_id = list_id
+                    AND (task_ids IS NULL OR id = ANY (task_ids))
+                    AND (statuses IS NULL OR status = ANY (statuses))
+                    AND (priorities IS NULL OR priority = ANY (priorities))
+                    AND (coalesce(new_status, status), coalesce(new_priority, priority),
+                         coalesce(new_completed_percentage, completed_percentage))
+                        IS DISTINCT FROM (status, priority, completed_percentage)
+                    AND {VISIBLE_LIST}
+                RETURNING id
+            ){_recorded(record, "tasks.bulk_updated", "updated", BULK_UPDATE_DETAILS)}
+            SELECT count(*)::integer FROM updated
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def _bulk_delete_tasks(record: bool) -> str:
+    return f"""
+        CREATE FUNCTION bulk_delete_tasks(
+            list_id uuid,
+            task_ids uuid[] DEFAULT NULL,
+            statuses task_status[] DEFAULT NULL,
+            priorities task_priority[] DEFAULT NULL{_acting_user(record)}
+        ) RETURNS integer AS $$
+            WITH deleted AS (
+                DELETE FROM task
+                WHERE task_list_id = list_id
+                    AND (task_ids IS NULL OR id = ANY (task_ids))
+                    AND (statuses IS NULL OR status = ANY (statuses))
+                    AND (priorities IS NULL OR priority = ANY (priorities))
+                    AND {VISIBLE_LIST}
+                RETURNING id
+            ){_recorded(record, "tasks.bulk_deleted", "deleted")}
+            SELECT count(*)::integer FROM deleted
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def _restore_archived_tasks(record: bool) -> str:
+    return f"""
+        CREATE FUNCTION restore_archived_tasks(
+            list_id uuid,
+            task_ids uuid[]{_acting_user(record)}
+        ) RETURNS integer AS $$
+            WITH restored AS (
+                DELETE FROM task_archive
+                WHERE task_list_id = list_id AND id = ANY (task_ids)
+                RETURNING {TASK_COLUMNS}
+            ),
+            inserted AS (
+                INSERT INTO task ({TASK_COLUMNS})
+                SELECT id, title, priority, status, completed_percentage, task_list_id,
+                    created_at, now(), version
+                FROM restored
+                RETURNING id
+            ),
+            reassigned AS (
+                INSERT INTO assigned_task (id, task_id, user_id, created_at)
+                SELECT a.id, a.task_id, a.user_id, a.created_at
+                FROM assigned_task_archive a
+                JOIN restored r ON a.task_id = r.id
+            ),
+            forgotten AS (
+                DELETE FROM task_tombstone tt
+                USING restored r
+                WHERE tt.task_id = r.id AND tt.task_list_id = r.task_list_id
+            ){_recorded(record, "tasks.restored", "inserted")}
+            SELECT count(*)::integer FROM inserted
+        $$ LANGUAGE sql VOLATILE
+    """
+
+
+def _replace_functions(record: bool):
+    # Adding an argument creates another function, so the previous one is dropped first.
+    dropped = (
+        ("bulk_update_tasks", BULK_UPDATE_ARGUMENTS),
+        ("bulk_delete_tasks", BULK_DELETE_ARGUMENTS),
+        ("restore_archived_tasks", RESTORE_ARCHIVED_ARGUMENTS),
+    )
+    for name, arguments in dropped:
+        if not record:
+            arguments += ", uuid"
+        op.execute(f"DROP FUNCTION IF EXISTS {name}({arguments})")
+    op.execute(_bulk_update_tasks(record))
+    op.execute(_bulk_delete_tasks(record))
+    op.execute(_restore_archived_tasks(record))
+
+
+def upgrade():
+    # Bulk changes write the history of every task they change in the same statement, so it
+    # neither passes through the bounded in-process activity log queue nor depends on it.
+    _replace_functions(record=True)
+
+
+def downgrade():
+    _replace_functions(record=False)
@@ -0,0 +1,80 @@
+"""create bulk task functions
+
+Revision ID: e566880d5789
+Revises: bbe106dbae5c
+Create Date: 2026-10-19 15:17:33.480216
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = "e566880d5789"
+down_revision = "bbe106dbae5c"
+branch_labels = None
+depends_on = None
+
+from alembic import op
+
+
+def upgrade():
+    # A NULL filter matches every task of the list; a NULL patch field keeps the current
+    # value. Rows the patch would not change are skipped and not counted.
+    op.execute(
+        """
+        CREATE FUNCTION bulk_update_tasks(
+            list_id uuid,
+            task_ids uuid[] DEFAULT NULL,
+            statuses task_status[] DEFAULT NULL,
+            priorities task_priority[] DEFAULT NULL,
+            new_status task_status DEFAULT NULL,
+            new_priority task_priority DEFAULT NULL,
+            new_completed_percentage integer DEFAULT NULL
+        ) RETURNS integer AS $$
+            WITH updated AS (
+                UPDATE task SET
+                    status = coalesce(new_status, status),
+                    priority = coalesce(new_priority, priority),
+                    completed_percentage = coalesce(new_completed_percentage, completed_percentage)
+                WHERE task_list_id = list_id
+                    AND (task_ids IS NULL OR id = ANY (task_ids))
+                    AND (statuses IS NULL OR status = ANY (statuses))
+                    AND (priorities IS NULL OR priority = ANY (priorities))
+                    AND (coalesce(new_status, status), coalesce(new_priority, priority),
+                         coalesce(new_completed_percentage, completed_percentage))
+                        IS DISTINCT FROM (status, priority, completed_percentage)
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM updated
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION bulk_delete_tasks(
+            list_id uuid,
+            task_ids uuid[] DEFAULT NULL,
+            statuses task_status[] DEFAULT NULL,
+            priorities task_priority[] DEFAULT NULL
+        ) RETURNS integer AS $$
+            WITH deleted AS (
+                DELETE FROM task
+                WHERE task_list_id = list_id
+                    AND (task_ids IS NULL OR id = ANY (task_ids))
+                    AND (statuses IS NULL OR status = ANY (statuses))
+                    AND (priorities IS NULL OR priority = ANY (priorities))
+                RETURNING 1
+            )
+            SELECT count(*)::integer FROM deleted
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+
+
+def downgrade():
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "bulk_delete_tasks(uuid, uuid[], task_status[], task_priority[])"
+    )
+    op.execute(
+        "DROP FUNCTION IF EXISTS bulk_update_tasks("
+        "uuid, uuid[], task_status[], task_priority[], task_status, task_priority, integer)"
+    )
@@ -0,0 +1,83 @@
+"""
+Compare the latency of service operations sent to PostGraphile over HTTP with the same
+operations executed in process. Needs the database and PostGraphile of docker compose.
+
+Usage:
+    python -m benchmarks.graphql_transport TASK_LIST_ID [--requests N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from src.infrastructure import graphql_client
+from src.services.task_list_graphql import (
+    get_task_list_stats_graphql,
+    get_task_list_with_task_with_filters_graphql,
+)
+
+TRANSPORTS = ("http", "inprocess")
+
+
+async def _timed(operation) -> float:
+    started = time.perf_counter()
+    result = await operation()
+    if "errors" in result:
+        raise RuntimeError(result["errors"])
+    return time.perf_counter() - started
+
+
+async def run_operation(operation, requests: int, concurrency: int) -> list:
+    """
+    Run an operation repeatedly with a bounded number of concurrent calls.
+    :param operation: Callable returning the awaitable of one call.
+    :param requests: Total number of calls.
+    :param concurrency: Maximum number of calls in flight.
+    :return: Latencies of the calls in seconds.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call():
+        async with semaphore:
+            return await _timed(operation)
+
+    return await asyncio.gather(*(call() for _ in range(requests)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("task_list_id", help="Existing task list to read.")
+    parser.add_argument("--requests", type=int, default=500, help="Calls per operation.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Calls in flight.")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> int:
+    args = parse_args(argv)
+    operations = {
+        "FetchTaskListStats": lambda: get_task_list_stats_graphql(args.task_list_id),
+        "FetchTaskListWithTasks": lambda: get_task_list_with_task_with_filters_graphql(
+            args.task_list_id
+        ),
+    }
+
+    for name, operation in operations.items():
+        for transport in TRANSPORTS:
+            graphql_client.GRAPHQL_TRANSPORT = transport
+            await _timed(operation)  # warm up connections
+            started = time.perf_counter()
+            latencies = sorted(await run_operation(operation, args.requests, args.concurrency))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:24} {transport:9} "
+                f"{args.requests / elapsed:8.0f} req/s  "
+                f"p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+                f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,88 @@
+"""
+End-to-end load test of the API on the in-memory backend: no database or PostGraphile needed.
+Seeds task lists of growing size and measures filtered reads and statistics through the whole
+ASGI stack: filtered reads grow with the number of matches and statistics stay constant.
+
+Usage:
+    python -m benchmarks.memory_load [--sizes 100 1000 10000] [--requests 500]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from src.application.auth import create_access_token
+from src.domain.enums import TASK_PRIORITIES, TASK_STATUSES
+from src.infrastructure import graphql_client
+from src.infrastructure.memory_backend import memory_backend
+
+
+async def _seed(client: AsyncClient, size: int) -> str:
+    response = await client.post("/task-lists", json={"name": f"Load {size}"})
+    task_list_id = response.json()["id"]
+    for number in range(size):
+        await client.post(
+            "/tasks",
+            json={
+                "title": f"Task {number}",
+                "task_list_id": task_list_id,
+                "status": TASK_STATUSES[number % len(TASK_STATUSES)],
+                "priority": TASK_PRIORITIES[number // len(TASK_STATUSES) % len(TASK_PRIORITIES)],
+            },
+        )
+    return task_list_id
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--requests", type=int, default=500, help="Reads per task list size.")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> int:
+    args = parse_args(argv)
+    graphql_client.GRAPHQL_TRANSPORT = "memory"
+    memory_backend.reset()
+
+    from src.main import app
+
+    token = create_access_token({"sub": "load@example.com", "user_id": "load"})
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://load",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        for size in args.sizes:
+            task_list_id = await _seed(client, size)
+            url = f"/task-lists/{task_list_id}/tasks?status=pending&priority=high"
+            latencies = []
+            for _ in range(args.requests):
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+            print(
+                f"{size:>7} tasks  {len(response.json()):>5} matches  "
+                f"p50 {statistics.median(latencies) * 1000:7.2f} ms  "
+                f"stats p50 {await _stats_latency(client, task_list_id) * 1000:6.2f} ms"
+            )
+    return 0
+
+
+async def _stats_latency(client: AsyncClient, task_list_id: str, requests: int = 100) -> float:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await client.get(f"/task-lists/{task_list_id}/stats")
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
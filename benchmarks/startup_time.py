@@ -0,0 +1,81 @@
+"""
+Measure the cold-start import time of the application and report the slowest imports.
+
+Usage:
+    python benchmarks/startup_time.py [--runs N] [--budget SECONDS] [--top N] [--module NAME]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = 1.5
+
+
+def measure_import(module: str) -> tuple:
+    """
+    Import a module in a fresh interpreter with `-X importtime`.
+    :param module: Name of the module to import.
+    :return: Tuple with the total import time in seconds and a dictionary with the cumulative
+        time in seconds of every module imported directly by a top-level import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.partition(":")[2].split("|")
+        # Nested imports are indented by two spaces per level and already counted in the
+        # cumulative time of the module importing them.
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        seconds = int(cumulative) / 1_000_000
+        if depth == 0:
+            total += seconds
+        elif depth == 1:
+            modules[name.strip()] = modules.get(name.strip(), 0) + seconds
+    return total, modules
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="src.main", help="Module to import.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to time.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=DEFAULT_BUDGET,
+        help="Fail when the median import time exceeds this many seconds.",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    runs = [measure_import(args.module) for _ in range(args.runs)]
+    median = statistics.median(total for total, _ in runs)
+
+    _, modules = runs[-1]
+    print(f"{args.module}: median {median * 1000:.1f} ms over {args.runs} runs")
+    for name, seconds in sorted(modules.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+    if median > args.budget:
+        print(f"Import time exceeds the {args.budget * 1000:.0f} ms budget.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
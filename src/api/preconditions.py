@@ -0,0 +1,38 @@
+import re
+
+from fastapi import HTTPException, Response
+
+# The compression middleware suffixes the ETag of compressed responses with their coding.
+VERSION_ETAG = re.compile(r'^"(\d+)(?:-(?:gzip|br|zstd))?"$')
+
+
+def set_version_etag(response: Response, node: dict):
+    """
+    Send the version of a task or task list as a strong ETag, to be echoed in If-Match.
+    :param response: The response to set the header on.
+    :param node: The task or task list returned, if any.
+    """
+    if node and node.get("version") is not None:
+        response.headers["ETag"] = f'"{node["version"]}"'
+
+
+def expected_version(if_match: str):
+    """
+    Version a conditional update requires, from the If-Match request header.
+    :param if_match: Value of the If-Match header, or None.
+    :return: The version, or None when the header is missing or "*" (any existing row).
+    :raises HTTPException: 412 for a weak or malformed entity tag, which can never match;
+        400 for a list of entity tags, since an update compares a single version.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    tags = [tag.strip() for tag in if_match.split(",") if tag.strip()]
+    if len(tags) != 1:
+        raise HTTPException(status_code=400, detail="If-Match must carry a single entity tag.")
+
+    tag = tags[0]
+    match = VERSION_ETAG.match(tag)
+    if match:
+        return int(match.group(1))
+    raise HTTPException(status_code=412, detail=f"If-Match {tag} matches no version.")
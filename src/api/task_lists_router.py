@@ -1,11 +1,86 @@
-from fastapi import APIRouter, HTTPException, Path, Request
-
-from src.application.auth import require_authentication
+import io
+import json
+import tempfile
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, ValidationError, conint
+
+from src.api.preconditions import expected_version, set_version_etag
+from src.application.auth import require_authentication, streamed_body_user
 from src.controllers.task_lists_controller import TaskListController
+from src.controllers.webhooks_controller import WebhookController
+from src.domain.enums import TASK_PRIORITIES, TASK_STATUSES
+from src.infrastructure.event_broker import EVENT_HEARTBEAT_SECONDS
+from src.services.task_import import IMPORT_FORMATS
+from src.services.task_list_graphql import TASK_ORDER_FIELDS
+
+IMPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
 
 router = APIRouter(prefix="/task-lists", tags=["Task Lists"])
 
 
+class TaskFilter(BaseModel):
+    ids: Optional[List[UUID]] = None
+    status: Optional[List[Literal[TASK_STATUSES]]] = None
+    priority: Optional[List[Literal[TASK_PRIORITIES]]] = None
+
+
+TASK_ORDERINGS = tuple(TASK_ORDER_FIELDS) + tuple(f"-{field}" for field in TASK_ORDER_FIELDS)
+
+
+class TaskQuery(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    status: Optional[List[Literal[TASK_STATUSES]]] = None
+    priority: Optional[List[Literal[TASK_PRIORITIES]]] = None
+    completed_min: Optional[conint(ge=0, le=100)] = None
+    completed_max: Optional[conint(ge=0, le=100)] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    order_by: Optional[List[Literal[TASK_ORDERINGS]]] = None
+
+
+class TaskPatch(BaseModel):
+    status: Optional[Literal[TASK_STATUSES]] = None
+    priority: Optional[Literal[TASK_PRIORITIES]] = None
+    completed_percentage: Optional[conint(ge=0, le=100)] = None
+
+
+class BulkTaskUpdate(BaseModel):
+    filter: TaskFilter
+    patch: TaskPatch
+
+
+class TaskRestore(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1)
+
+
+class WebhookCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    url: HttpUrl
+    secret: Optional[str] = Field(None, min_length=16)
+
+
+def _validated_bulk_filter(task_filter: TaskFilter) -> dict:
+    """
+    Reject bulk operations without any filter so they never touch a whole task list by accident.
+    :param task_filter: Parsed task filter.
+    :return: The filter as a dictionary without the unset criteria.
+    """
+    filters = task_filter.model_dump(exclude_none=True)
+    if not any(filters.values()):
+        raise HTTPException(
+            status_code=422,
+            detail="At least one of the 'ids', 'status' or 'priority' filters is required.",
+        )
+    return filters
+
+
 @router.post("", summary="Create a new task list")
 @require_authentication
 async def create_task_list(request: Request, current_user: dict = None):
@@ -42,12 +117,14 @@ async def create_task_list(request: Request, current_user: dict = None):
 @require_authentication
 async def fetch_task_list_by_id(
     request: Request,
+    response: Response,
     task_list_id: str = Path(..., description="ID of the task list to be fetched"),
     current_user: dict = None,
 ):
     """
     Fetch a task list by its ID.
     :param request: Request object containing the task list ID.
+    :param response: The response, carrying the version of the task list as its ETag.
     :param task_list_id: ID of the task list to be fetched.
     :param current_user: The currently authenticated user.
     :return: A JSON response containing the task list and its tasks or an error message.
@@ -58,6 +135,7 @@ async def fetch_task_list_by_id(
         if "errors" in result:
             raise HTTPException(status_code=400, detail=result["errors"])
 
+        set_version_etag(response, result["data"]["taskListById"])
         return result["data"]["taskListById"]
 
     except HTTPException as e:
@@ -70,17 +148,21 @@ async def fetch_task_list_by_id(
 @require_authentication
 async def update_task_list(
     request: Request,
+    response: Response,
     task_list_id: str = Path(..., description="ID of the task list to be updated"),
     current_user: dict = None,
 ):
     """
-    Update an existing task list.
+    Update an existing task list. With an If-Match header carrying the ETag of the task list,
+    the update only applies if nobody changed the task list since, and fails with 412 otherwise.
     :param task_list_id: ID of the task list to be updated.
     :param request: Request object containing the JSON body with the new name for the task list.
+    :param response: The response, carrying the new version of the task list as its ETag.
     :param current_user: The currently authenticated user.
     :return: A JSON response containing the updated task list or an error message.
     """
     try:
+        version = expected_version(request.headers.get("If-Match"))
         body = await request.json()
         name = body.get("name")
 
@@ -90,11 +172,12 @@ async def update_task_list(
                 detail="The 'name' field is required and must not be empty.",
             )
 
-        result = await TaskListController.update_task_list(task_list_id, name)
+        result = await TaskListController.update_task_list(task_list_id, name, version)
 
         if "errors" in result:
             raise HTTPException(status_code=400, detail=result["errors"])
 
+        set_version_etag(response, result["data"]["updateTaskListById"]["taskList"])
         return result["data"]["updateTaskListById"]["taskList"]
 
     except HTTPException as e:
@@ -111,7 +194,8 @@ async def delete_task_list(
     current_user: dict = None,
 ):
     """
-    Delete a task list by its ID.
+    Delete a task list by its ID. The task list and its tasks are hidden right away and
+    removed in the background by the purger.
     :param request: Request object containing the task list ID.
     :param task_list_id: ID of the task list to be deleted.
     :param current_user: The currently authenticated user.
@@ -123,7 +207,7 @@ async def delete_task_list(
         if "errors" in result:
             raise HTTPException(status_code=400, detail=result["errors"])
 
-        if not result.get("data", {}).get("deleteTaskListById", {}).get("deletedTaskListId", ""):
+        if not (result.get("data") or {}).get("deleteTaskListById", {}).get("taskList"):
             raise HTTPException(status_code=404, detail="Task list not found or already deleted.")
 
         return {"message": "Task list deleted successfully."}
@@ -134,6 +218,87 @@ async def delete_task_list(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _naive_utc(timestamp: datetime) -> str:
+    """
+    Normalize a timestamp to naive UTC, as stored in the database.
+    :param timestamp: Timestamp received from the client.
+    :return: The normalized ISO 8601 timestamp.
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp.isoformat()
+
+
+def _parse_timestamp(value: str) -> str:
+    """
+    Validate an ISO 8601 timestamp and normalize it to naive UTC, as stored in the database.
+    :param value: Timestamp received from the client.
+    :return: The normalized ISO 8601 timestamp.
+    """
+    try:
+        timestamp = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail="The 'updated_since' parameter must be an ISO 8601 timestamp.",
+        )
+    return _naive_utc(timestamp)
+
+
+def _parse_task_query(query_params: dict) -> dict:
+    """
+    Validate the task filters and ordering of a query string. The 'status', 'priority' and
+    'order_by' parameters take comma-separated lists.
+    :param query_params: Query parameters other than 'updated_since'.
+    :return: The filters as a dictionary without the unset parameters.
+    """
+    raw_query = {
+        key: value.split(",") if key in ("status", "priority", "order_by") else value
+        for key, value in query_params.items()
+        if value
+    }
+    try:
+        task_query = TaskQuery.model_validate(raw_query)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422, detail=e.errors(include_context=False, include_url=False)
+        )
+
+    filters = task_query.model_dump(exclude_none=True)
+    for key in ("created_after", "created_before"):
+        if key in filters:
+            filters[key] = _naive_utc(filters[key])
+    return filters
+
+
+async def _fetch_task_list_changes(
+    task_list_id: str, updated_since: str, include_assignees: bool = False
+):
+    """
+    Fetch the tasks of a task list changed or deleted after `updated_since`.
+    :param task_list_id: ID of the task list to be synchronized.
+    :param updated_since: ISO 8601 timestamp of the last synchronization.
+    :param include_assignees: Also return the users each changed task is assigned to.
+    :return: The changed tasks, the tombstones of the deleted tasks and the watermark to pass
+        as `updated_since` next time.
+    """
+    result = await TaskListController.fetch_task_list_changes(
+        task_list_id, _parse_timestamp(updated_since), include_assignees
+    )
+
+    if "errors" in result:
+        raise HTTPException(status_code=400, detail=result["errors"])
+
+    if not result.get("data", {}).get("taskListById"):
+        raise HTTPException(status_code=404, detail="Task list not found.")
+
+    return {
+        "tasks": result["data"]["tasksUpdatedSince"]["nodes"],
+        "deletedTasks": result["data"]["taskTombstonesSince"]["nodes"],
+        "syncedAt": result["data"]["syncWatermark"],
+    }
+
+
 @router.get("/{task_list_id}/tasks", summary="Fetch all task lists")
 @require_authentication
 async def fetch_task_lists_with_tasks(
@@ -149,12 +314,37 @@ async def fetch_task_lists_with_tasks(
     :param current_user: The currently authenticated user.
     :param filters: Optional filters to apply to the task list.
     :return: A JSON response containing the tasks in the specified task list or an error message.
+    With `updated_since`, only the tasks changed or deleted after that timestamp are returned.
+    With filters (comma-separated 'status' and 'priority', 'completed_min', 'completed_max',
+    'created_after', 'created_before') or 'order_by' ('priority', 'created_at' or
+    'completed_percentage', '-' prefixed for descending), only the matching tasks are returned.
+    With `include_archived=true`, the archived tasks are returned as well.
+    With `include=assignees`, each task has an 'assignees' list of the users it is assigned to.
     """
     try:
         filters = dict(request.query_params)
+        updated_since = filters.pop("updated_since", None)
+        include_archived = filters.pop("include_archived", "").lower() in ("1", "true", "yes")
+        include = {value for value in filters.pop("include", "").split(",") if value}
+
+        if include - {"assignees"}:
+            raise HTTPException(
+                status_code=422, detail="The 'include' parameter only accepts 'assignees'."
+            )
 
+        if updated_since is not None:
+            if filters:
+                raise HTTPException(
+                    status_code=422,
+                    detail="The 'updated_since' parameter cannot be combined with filters.",
+                )
+            return await _fetch_task_list_changes(
+                task_list_id, updated_since, include_assignees="assignees" in include
+            )
+
+        filters = _parse_task_query(filters)
         result = await TaskListController.fetch_task_lists_with_tasks_and_filters(
-            task_list_id, filters
+            task_list_id, filters, include_archived, include_assignees="assignees" in include
         )
 
         if "errors" in result:
@@ -169,3 +359,334 @@ async def fetch_task_lists_with_tasks(
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{task_list_id}/stats", summary="Fetch task statistics of a task list")
+@require_authentication
+async def fetch_task_list_stats(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list to compute statistics for"),
+    current_user: dict = None,
+):
+    """
+    Fetch the task counts by status and priority and the average completion of a task list.
+    :param request: Request object containing the task list ID.
+    :param task_list_id: ID of the task list to compute statistics for.
+    :param current_user: The currently authenticated user.
+    :return: A JSON response containing the task list statistics or an error message.
+    """
+    try:
+        result = await TaskListController.fetch_task_list_stats(task_list_id)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        task_list = result.get("data", {}).get("taskListById")
+        if not task_list:
+            raise HTTPException(status_code=404, detail="Task list not found.")
+
+        return task_list["summary"]
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{task_list_id}/events", summary="Stream changes of a task list")
+@require_authentication
+async def stream_task_list_events(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list to watch"),
+    current_user: dict = None,
+):
+    """
+    Stream the changes of a task list and its tasks as server-sent events.
+    Clients that fall too far behind receive a 'dropped' event and must refetch the list.
+    :param request: Request object containing the task list ID.
+    :param task_list_id: ID of the task list to watch.
+    :param current_user: The currently authenticated user.
+    :return: A text/event-stream response with the task list events.
+    """
+    try:
+        subscription = await TaskListController.subscribe_to_task_list_events(task_list_id)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def event_stream():
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                message = await subscription.next_message(timeout=EVENT_HEARTBEAT_SECONDS)
+                if subscription.dropped:
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                yield message or ": keep-alive\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.patch("/{task_list_id}/tasks", summary="Update the tasks matching a filter")
+@require_authentication
+async def bulk_update_tasks(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list the tasks belong to"),
+    current_user: dict = None,
+):
+    """
+    Apply a patch to every task of a task list matching a filter, in one statement.
+    :param request: Request object containing the JSON body with the 'filter' and the 'patch'.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param current_user: The currently authenticated user.
+    :return: A JSON response containing the number of updated tasks or an error message.
+    """
+    try:
+        try:
+            bulk_update = BulkTaskUpdate.model_validate(await request.json())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        filters = _validated_bulk_filter(bulk_update.filter)
+        patch = bulk_update.patch.model_dump(exclude_none=True)
+        if not patch:
+            raise HTTPException(
+                status_code=422,
+                detail="The 'patch' must set 'status', 'priority' or 'completed_percentage'.",
+            )
+
+        result = await TaskListController.bulk_update_tasks(task_list_id, filters, patch)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return {"updated": result["data"]["bulkUpdateTasks"]["integer"]}
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/{task_list_id}/tasks", summary="Delete the tasks matching a filter")
+@require_authentication
+async def bulk_delete_tasks(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list the tasks belong to"),
+    current_user: dict = None,
+):
+    """
+    Delete every task of a task list matching the comma-separated 'ids', 'status' and
+    'priority' query parameters, in one statement.
+    :param request: Request object containing the filter query parameters.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param current_user: The currently authenticated user.
+    :return: A JSON response containing the number of deleted tasks or an error message.
+    """
+    try:
+        raw_filter = {
+            key: value.split(",")
+            for key, value in request.query_params.items()
+            if key in TaskFilter.model_fields and value
+        }
+        try:
+            task_filter = TaskFilter.model_validate(raw_filter)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        filters = _validated_bulk_filter(task_filter)
+
+        result = await TaskListController.bulk_delete_tasks(task_list_id, filters)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return {"deleted": result["data"]["bulkDeleteTasks"]["integer"]}
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{task_list_id}/tasks/restore", summary="Restore archived tasks")
+@require_authentication
+async def restore_archived_tasks(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list the tasks belong to"),
+    current_user: dict = None,
+):
+    """
+    Move archived tasks of a task list back to the active tasks, with their assignments.
+    :param request: Request object containing the JSON body with the 'ids' of the tasks.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param current_user: The currently authenticated user.
+    :return: A JSON response containing the number of restored tasks or an error message.
+    """
+    try:
+        try:
+            task_restore = TaskRestore.model_validate(await request.json())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        task_ids = [str(task_id) for task_id in task_restore.ids]
+
+        result = await TaskListController.restore_archived_tasks(task_list_id, task_ids)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return {"restored": result["data"]["restoreArchivedTasks"]["integer"]}
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/{task_list_id}/import", summary="Import tasks from a CSV or NDJSON file")
+@require_authentication
+async def import_tasks(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list receiving the tasks"),
+    file_format: Literal[IMPORT_FORMATS] = Query(
+        "csv", alias="format", description="Format of the request body"
+    ),
+    current_user: dict = Depends(streamed_body_user),
+):
+    """
+    Import the tasks sent as the raw request body: a CSV file with a header line or NDJSON.
+    The upload is spooled to a temporary file and loaded with COPY; the response streams one
+    JSON line per batch with the progress, and a last line with the report of the rows that
+    could not be imported.
+    :param request: Request object whose body is the file to import.
+    :param task_list_id: ID of the task list receiving the tasks.
+    :param file_format: Either 'csv' or 'ndjson'.
+    :param current_user: The currently authenticated user.
+    :return: An application/x-ndjson response with the import progress and report.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_MEMORY)
+    text_file = io.TextIOWrapper(spool, encoding="utf-8-sig", errors="surrogateescape", newline="")
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+
+        events = await TaskListController.import_tasks(task_list_id, text_file, file_format)
+
+    except HTTPException as e:
+        text_file.close()
+        raise e
+    except Exception as e:
+        text_file.close()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def import_stream():
+        try:
+            async for event in events:
+                yield json.dumps(event) + "\n"
+        finally:
+            text_file.close()
+
+    return StreamingResponse(import_stream(), media_type="application/x-ndjson")
+
+
+@router.post("/{task_list_id}/webhooks", summary="Subscribe a webhook to a task list")
+@require_authentication
+async def create_webhook(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list to be watched"),
+    current_user: dict = None,
+):
+    """
+    Subscribe an endpoint to the changes of a task list. Changes are posted in batches as
+    {"events": [...]}, signed with the secret in the X-Webhook-Signature header.
+    :param request: Request object containing the JSON body with the 'url' and optional 'secret'.
+    :param task_list_id: ID of the task list to be watched.
+    :param current_user: The currently authenticated user.
+    :return: The subscription, including its secret.
+    """
+    try:
+        try:
+            webhook = WebhookCreate.model_validate(await request.json())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        result = await WebhookController.create_webhook(
+            task_list_id, str(webhook.url), webhook.secret
+        )
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return result["data"]["createWebhookSubscription"]["webhookSubscription"]
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{task_list_id}/webhooks", summary="Fetch the webhooks of a task list")
+@require_authentication
+async def get_webhooks(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list"),
+    current_user: dict = None,
+):
+    """
+    Fetch the webhook subscriptions of a task list.
+    :param request: The HTTP request.
+    :param task_list_id: ID of the task list.
+    :param current_user: The currently authenticated user.
+    :return: The subscriptions, without their secrets.
+    """
+    try:
+        result = await WebhookController.get_webhooks(task_list_id)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return result["data"]["allWebhookSubscriptions"]["nodes"]
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/{task_list_id}/webhooks/{webhook_id}", summary="Delete a webhook")
+@require_authentication
+async def delete_webhook(
+    request: Request,
+    task_list_id: str = Path(..., description="ID of the task list the webhook belongs to"),
+    webhook_id: str = Path(..., description="ID of the webhook to be deleted"),
+    current_user: dict = None,
+):
+    """
+    Remove a webhook subscription of a task list.
+    :param request: The HTTP request.
+    :param task_list_id: ID of the task list the webhook belongs to.
+    :param webhook_id: ID of the webhook to be deleted.
+    :param current_user: The currently authenticated user.
+    :return: A JSON response confirming the deletion.
+    """
+    try:
+        result = await WebhookController.delete_webhook(task_list_id, webhook_id)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return {"message": "Webhook deleted successfully."}
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
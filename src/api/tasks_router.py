@@ -1,11 +1,48 @@
-from fastapi import APIRouter, HTTPException, Request
+import os
+from typing import List, Literal, Optional
+from uuid import UUID
 
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, conint
+
+from src.api.preconditions import expected_version, set_version_etag
 from src.application.auth import require_authentication
+from src.controllers.activity_controller import ActivityController
 from src.controllers.task_controller import TaskController
+from src.domain.enums import TASK_STATUSES
+
+TASK_BATCH_MAX_IDS = int(os.environ.get("TASK_BATCH_MAX_IDS", "100"))
+# The body of POST /tasks/batch is not bound by URL length limits, so it takes more IDs.
+TASK_BATCH_POST_MAX_IDS = int(os.environ.get("TASK_BATCH_POST_MAX_IDS", "1000"))
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
+class TaskProgress(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    status: Optional[Literal[TASK_STATUSES]] = None
+    completed_percentage: Optional[conint(ge=0, le=100)] = None
+
+
+class TaskIds(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=TASK_BATCH_MAX_IDS)
+
+
+class TaskIdsBatch(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=TASK_BATCH_POST_MAX_IDS)
+
+
+class AssignmentPair(BaseModel):
+    task_id: UUID
+    user_id: UUID
+
+
+class BulkAssignment(BaseModel):
+    assignments: List[AssignmentPair] = Field(..., min_length=1, max_length=500)
+
+
 @router.post("", summary="Create a new task")
 @require_authentication
 async def create_task(request: Request, current_user: dict = None):
@@ -31,22 +68,135 @@ async def create_task(request: Request, current_user: dict = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _fetch_tasks_by_ids(task_ids: list) -> dict:
+    """
+    Fetch the tasks with the given IDs, answering the batch reads.
+    :param task_ids: Validated task IDs.
+    :return: The tasks found, in the requested order, and the missing IDs.
+    """
+    result = await TaskController.get_tasks_by_ids([str(task_id) for task_id in task_ids])
+
+    if "errors" in result:
+        raise HTTPException(status_code=400, detail=result["errors"])
+
+    return result
+
+
+@router.get("", summary="Fetch many tasks by ID")
+@require_authentication
+async def get_tasks_by_ids(
+    request: Request,
+    ids: str = Query(..., min_length=1, description="Comma-separated IDs of the tasks"),
+    current_user: dict = None,
+):
+    """
+    Fetch many tasks by their IDs in one request. Use `POST /tasks/batch` for long lists.
+    :param request: The HTTP request.
+    :param ids: Comma-separated IDs of the tasks, at most TASK_BATCH_MAX_IDS (100).
+    :param current_user: The currently authenticated user.
+    :return: The 'tasks' found, in the requested order, and the 'missing' IDs.
+    """
+    try:
+        try:
+            task_ids = TaskIds.model_validate(
+                {"ids": [task_id for task_id in ids.split(",") if task_id]}
+            ).ids
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        return await _fetch_tasks_by_ids(task_ids)
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch", summary="Fetch many tasks by ID")
+@require_authentication
+async def get_tasks_by_ids_batch(request: Request, current_user: dict = None):
+    """
+    Fetch many tasks by their IDs in one request, taking the IDs in the body.
+    :param request: The HTTP request containing the 'ids' list, at most TASK_BATCH_POST_MAX_IDS
+        (1000).
+    :param current_user: The currently authenticated user.
+    :return: The 'tasks' found, in the requested order, and the 'missing' IDs.
+    """
+    try:
+        try:
+            task_ids = TaskIdsBatch.model_validate(await request.json()).ids
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        return await _fetch_tasks_by_ids(task_ids)
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/search", summary="Search tasks by title")
+@require_authentication
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=3, description="Text to look for in the task titles"),
+    task_list_id: str = Query(None, description="Restrict the search to this task list"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of tasks to return"),
+    current_user: dict = None,
+):
+    """
+    Search tasks by title, best match first.
+    :param request: The HTTP request.
+    :param q: Text to look for in the task titles.
+    :param task_list_id: Optional ID of the task list to restrict the search to.
+    :param limit: Maximum number of tasks to return.
+    :param current_user: The currently authenticated user.
+    :return: A JSON response containing the matching tasks.
+    """
+    try:
+        result = await TaskController.search_tasks(q, task_list_id, limit)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return result["data"]["searchTasks"]["nodes"]
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{task_id}", summary="Fetch a task by ID")
 @require_authentication
-async def get_task_by_id(task_id: str, request: Request, current_user: dict = None):
+async def get_task_by_id(
+    task_id: str,
+    request: Request,
+    response: Response,
+    include_archived: bool = Query(False, description="Also look for the task in the archive"),
+    current_user: dict = None,
+):
     """
     Fetch a task by its ID.
     :param task_id: ID of the task to be fetched.
     :param request: The HTTP request.
+    :param response: The response, carrying the version of the task as its ETag unless
+        buffered progress is overlaid on it.
+    :param include_archived: Also look for the task in the archive.
     :param current_user: The currently authenticated user.
     :return: A JSON response containing the task details.
     """
     try:
-        result = await TaskController.get_task_by_id(task_id)
+        result = await TaskController.get_task_by_id(task_id, include_archived)
 
         if "errors" in result:
             raise HTTPException(status_code=404, detail=result["errors"])
 
+        # The version does not cover buffered progress, so a conditional read answered from it
+        # would serve the stored task as unchanged.
+        if not TaskController.has_pending_progress(task_id):
+            set_version_etag(response, result["data"]["taskById"])
         return result["data"]["taskById"]
 
     except HTTPException as e:
@@ -55,24 +205,66 @@ async def get_task_by_id(task_id: str, request: Request, current_user: dict = No
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{task_id}/history", summary="Fetch the history of a task")
+@require_authentication
+async def get_task_history(
+    task_id: str,
+    request: Request,
+    cursor: str = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of entries to return"),
+    current_user: dict = None,
+):
+    """
+    Fetch the changes made to a task, newest first. The history stays available after the
+    task is deleted.
+    :param task_id: ID of the task whose history is fetched.
+    :param request: The HTTP request.
+    :param cursor: Cursor of the page to fetch, as returned in 'nextCursor'.
+    :param limit: Maximum number of entries to return.
+    :param current_user: The currently authenticated user.
+    :return: The page of entries and the cursor of the next page, if any.
+    """
+    try:
+        result = await ActivityController.get_task_history(task_id, cursor, limit)
+
+        if "error" in result:
+            raise HTTPException(status_code=400, detail=result["error"])
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return result
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/{task_id}", summary="Update an existing task")
 @require_authentication
-async def update_task(task_id: str, request: Request, current_user: dict = None):
+async def update_task(
+    task_id: str, request: Request, response: Response, current_user: dict = None
+):
     """
-    Update an existing task.
+    Update an existing task. With an If-Match header carrying the ETag of the task, the update
+    only applies if nobody changed the task since, and fails with 412 otherwise.
     :param task_id: ID of the task to be updated.
     :param request: The HTTP request containing the updated task data.
+    :param response: The response, carrying the new version of the task as its ETag.
     :param current_user: The currently authenticated user.
     :return: A JSON response containing the updated task.
     """
     try:
+        version = expected_version(request.headers.get("If-Match"))
         task_data = await request.json()
 
-        result = await TaskController.update_task(task_id, task_data)
+        result = await TaskController.update_task(task_id, task_data, version)
 
         if "errors" in result:
             raise HTTPException(status_code=400, detail=result["errors"])
 
+        set_version_etag(response, result["data"]["updateTaskById"]["task"])
         return result["data"]["updateTaskById"]["task"]
     except HTTPException as e:
         raise e
@@ -109,23 +301,32 @@ async def delete_task(task_id: str, request: Request, current_user: dict = None)
 
 @router.put("/{task_id}/status", summary="Update task status")
 @require_authentication
-async def update_task_status(task_id: str, request: Request, current_user: dict = None):
+async def update_task_status(
+    task_id: str, request: Request, response: Response, current_user: dict = None
+):
     """
-    Update the status of a task.
+    Update the status of a task, optionally conditional on the If-Match header like `PUT`.
     :param task_id: ID of the task to be updated.
     :param request: The HTTP request containing the new status.
+    :param response: The response, carrying the new version of the task as its ETag.
     :param current_user: The currently authenticated user.
     :return: A JSON response containing the updated task.
     """
     try:
+        version = expected_version(request.headers.get("If-Match"))
         status_data = await request.json()
         status = status_data.get("status")
+        if status not in TASK_STATUSES:
+            raise HTTPException(
+                status_code=422, detail=f"The 'status' must be one of {', '.join(TASK_STATUSES)}."
+            )
 
-        result = await TaskController.update_task_status(task_id, status)
+        result = await TaskController.update_task_status(task_id, status, version)
 
         if "errors" in result:
             raise HTTPException(status_code=400, detail=result["errors"])
 
+        set_version_etag(response, result["data"]["updateTaskById"]["task"])
         return result["data"]["updateTaskById"]["task"]
 
     except HTTPException as e:
@@ -134,6 +335,57 @@ async def update_task_status(task_id: str, request: Request, current_user: dict
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.patch("/{task_id}/progress", summary="Update task progress")
+@require_authentication
+async def update_task_progress(task_id: str, request: Request, current_user: dict = None):
+    """
+    Update the status and/or completed percentage of a task. When write-behind is enabled the
+    update is accepted and written with the next batch.
+    :param task_id: ID of the task to be updated.
+    :param request: The HTTP request containing the new 'status' and/or 'completed_percentage'.
+    :param current_user: The currently authenticated user.
+    :return: The updated task, or a 202 response with the fields pending to be written.
+    """
+    try:
+        try:
+            UUID(task_id)
+        except ValueError:
+            # Buffered updates are only written later, so reject malformed IDs up front.
+            raise HTTPException(status_code=422, detail="The task ID must be a UUID.")
+
+        try:
+            progress = TaskProgress.model_validate(await request.json())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        progress = progress.model_dump(exclude_none=True)
+        if not progress:
+            raise HTTPException(
+                status_code=422, detail="Set 'status' and/or 'completed_percentage'."
+            )
+
+        result = await TaskController.update_task_progress(task_id, progress)
+
+        if "pending" in result:
+            return JSONResponse(
+                status_code=202, content={"id": task_id, "pending": result["pending"]}
+            )
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        task = result["data"]["t0"]
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found.")
+
+        return task["task"]
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/assign", summary="Assign task to user")
 @require_authentication
 async def assign_task_to_user(request: Request, current_user: dict = None):
@@ -159,3 +411,32 @@ async def assign_task_to_user(request: Request, current_user: dict = None):
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/assign/bulk", summary="Assign many tasks to users")
+@require_authentication
+async def assign_tasks_to_users(request: Request, current_user: dict = None):
+    """
+    Assign many tasks to users in one request. Pairs already assigned are left as they are.
+    :param request: The HTTP request containing the 'assignments' list of 'task_id' and 'user_id'.
+    :param current_user: The currently authenticated user.
+    :return: The number of new assignments and the outcome of each pair, in request order.
+    """
+    try:
+        try:
+            body = BulkAssignment.model_validate(await request.json())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+        pairs = [(str(pair.task_id), str(pair.user_id)) for pair in body.assignments]
+        result = await TaskController.assign_tasks_to_users(pairs)
+
+        if "errors" in result:
+            raise HTTPException(status_code=400, detail=result["errors"])
+
+        return result
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
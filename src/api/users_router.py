@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel, EmailStr, constr
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel, EmailStr, ValidationError, constr
+from src.application.auth import require_authentication
 from src.controllers.users_controller import UserController
+from src.domain.enums import TASK_PRIORITIES, TASK_STATUSES
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -16,6 +20,10 @@ class UserLogin(BaseModel):
     password: str
 
 
+class UserInvite(BaseModel):
+    email: EmailStr
+
+
 @router.post("/register", summary="Register a new user")
 async def register_user(user: UserCreate):
     """
@@ -50,18 +58,59 @@ async def login_user(user: UserLogin):
     return result
 
 
-@router.post("/invite", summary="Send an invitation to a user")
-async def send_invitation(request: Request):
+@router.post("/invite", summary="Send an invitation to a user", status_code=202)
+@require_authentication
+async def send_invitation(request: Request, current_user: dict = None):
     """
     Send an invitation to a user by email.
     :param request: The HTTP request containing the email to which the invitation should be sent.
-    :return: Success message if invitation is sent, otherwise raises HTTPException.
+    :param current_user: The currently authenticated user.
+    :return: Success message once the invitation is queued, otherwise raises HTTPException.
+    """
+    try:
+        invitation = UserInvite.model_validate(await request.json())
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_context=False))
+
+    result = await UserController.sent_invitation(invitation.email)
+
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+
+    if "errors" in result:
+        raise HTTPException(status_code=400, detail=result["errors"])
+
+    return result
+
+
+@router.get("/me/tasks", summary="Fetch the tasks assigned to the current user")
+@require_authentication
+async def get_my_tasks(
+    request: Request,
+    status: Literal[TASK_STATUSES] = Query(None, description="Only tasks with this status"),
+    priority: Literal[TASK_PRIORITIES] = Query(None, description="Only tasks with this priority"),
+    cursor: str = Query(None, description="Cursor returned with the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of tasks to return"),
+    current_user: dict = None,
+):
+    """
+    Fetch the tasks assigned to the current user, newest assignment first.
+    :param request: The HTTP request.
+    :param status: Optional task status to filter by.
+    :param priority: Optional task priority to filter by.
+    :param cursor: Opaque cursor of the page to fetch, as returned in 'nextCursor'.
+    :param limit: Maximum number of tasks to return.
+    :param current_user: The currently authenticated user.
+    :return: The page of tasks and the cursor of the next page, if any.
     """
-    user_data = await request.json()
-    email = user_data.get("email")
-    result = await UserController.sent_invitation(email)
+    result = await UserController.get_assigned_tasks(
+        current_user["user_id"], status, priority, cursor, limit
+    )
 
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
 
+    if "errors" in result:
+        raise HTTPException(status_code=400, detail=result["errors"])
+
     return result
@@ -1,3 +1,6 @@
+import os
+from contextvars import ContextVar
+
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from functools import wraps
@@ -8,6 +11,16 @@ SECRET_KEY = "super-secret"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Emails of the users allowed to use operator features such as request profiling.
+ADMIN_EMAILS = frozenset(
+    email.strip().lower()
+    for email in os.environ.get("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+)
+
+# ID of the user authenticated for the request being handled, for the activity log.
+current_user_id: ContextVar = ContextVar("current_user_id", default=None)
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
@@ -26,6 +39,56 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def streamed_body_user() -> None:
+    """
+    Default of `current_user` for endpoints that stream their request body: a plain `dict`
+    parameter would make FastAPI read and parse the whole body. `require_authentication`
+    replaces the value with the authenticated user.
+    """
+    return None
+
+
+def authenticate(auth_header: str) -> dict:
+    """
+    Validate the bearer token of an Authorization header.
+    :param auth_header: Value of the Authorization header, if any.
+    :return: The authenticated user, with its 'user_id' and 'email'.
+    :raises HTTPException: 401 when the header is missing or the token is invalid or expired.
+    """
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Missing or invalid Authorization header",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    token = auth_header.split(" ")[1]
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("user_id")
+        email = payload.get("sub")
+
+        if not user_id:
+            raise HTTPException(status_code=401, detail="Invalid token payload")
+
+        return {"user_id": user_id, "email": email}
+
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is invalid or expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+def is_admin(user: dict) -> bool:
+    """
+    Whether an authenticated user is listed in ADMIN_EMAILS.
+    """
+    return bool(user.get("email")) and user["email"].lower() in ADMIN_EMAILS
+
+
 def require_authentication(fn):
     @wraps(fn)
     async def wrapper(*args, **kwargs):
@@ -34,32 +97,8 @@ def require_authentication(fn):
         if request is None:
             raise HTTPException(status_code=400, detail="Request object is required")
 
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Missing or invalid Authorization header",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        token = auth_header.split(" ")[1]
-
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id = payload.get("user_id")
-            email = payload.get("sub")
-
-            if not user_id:
-                raise HTTPException(status_code=401, detail="Invalid token payload")
-
-            kwargs["current_user"] = {"user_id": user_id, "email": email}
-
-        except JWTError:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token is invalid or expired",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        kwargs["current_user"] = authenticate(request.headers.get("Authorization"))
+        current_user_id.set(kwargs["current_user"]["user_id"])
 
         return await fn(*args, **kwargs)
 
@@ -0,0 +1,94 @@
+"""
+Move the tasks completed longer ago than a number of days to the task archive, in batches.
+
+Usage:
+    python -m src.commands.archive_tasks [--older-than-days N] [--batch-size N]
+        [--pause SECONDS] [--interval SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from src.controllers.task_lists_controller import TaskListController
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.environ.get("TASK_ARCHIVE_BATCH_SIZE", "1000"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=ARCHIVE_AFTER_DAYS,
+        help="Archive the tasks completed and not updated for this many days.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ARCHIVE_BATCH_SIZE,
+        help="Number of tasks moved per transaction.",
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.0,
+        help="Seconds to wait between batches, to spread the load.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        help="Keep running, starting a new pass every this many seconds.",
+    )
+    return parser.parse_args(argv)
+
+
+async def archive_pass(older_than_days: int, batch_size: int, pause: float) -> int:
+    """
+    Archive batches until one comes back short, printing the progress after each batch.
+    :param older_than_days: Minimum number of days since the tasks were last updated.
+    :param batch_size: Maximum number of tasks moved per batch.
+    :param pause: Seconds to wait between batches.
+    :return: Number of tasks archived.
+    :raises RuntimeError: If a batch fails.
+    """
+    total = 0
+    while True:
+        result = await TaskListController.archive_completed_tasks(older_than_days, batch_size)
+        if "errors" in result:
+            raise RuntimeError(result["errors"])
+
+        archived = result["data"]["archiveCompletedTasks"]["integer"]
+        total += archived
+        print(f"Archived {archived} task(s), {total} in this pass.", flush=True)
+        if archived < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def run(args) -> int:
+    while True:
+        try:
+            await archive_pass(args.older_than_days, args.batch_size, args.pause)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            if args.interval is None:
+                return 1
+        if args.interval is None:
+            return 0
+        await asyncio.sleep(args.interval)
+
+
+def main(argv=None) -> int:
+    """
+    Run one archive pass, or one every --interval seconds.
+    :param argv: Optional list of command line arguments.
+    :return: Process exit code, 1 on errors.
+    """
+    return asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
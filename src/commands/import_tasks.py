@@ -0,0 +1,62 @@
+"""
+Bulk import tasks into a task list from a CSV (with a header line) or NDJSON file.
+
+Usage:
+    python -m src.commands.import_tasks --task-list-id ID [--format csv|ndjson] FILE
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from fastapi import HTTPException
+
+from src.controllers.task_lists_controller import TaskListController
+from src.services.task_import import IMPORT_FORMATS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", help="Path of the file to import.")
+    parser.add_argument("--task-list-id", required=True, help="Task list receiving the tasks.")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default="csv", dest="file_format")
+    return parser.parse_args(argv)
+
+
+async def run_import(task_list_id: str, path: str, file_format: str) -> dict:
+    """
+    Import a file, printing the progress to stderr.
+    :param task_list_id: ID of the task list receiving the tasks.
+    :param path: Path of the file to import.
+    :param file_format: Either 'csv' or 'ndjson'.
+    :return: The final 'completed' or 'failed' event of the import.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as text_file:
+        try:
+            events = await TaskListController.import_tasks(task_list_id, text_file, file_format)
+        except HTTPException as e:
+            return {"event": "failed", "error": e.detail}
+        async for event in events:
+            if event["event"] != "progress":
+                return event
+            print(
+                f"{event['processed']} rows processed, {event['failed']} rejected",
+                file=sys.stderr,
+            )
+
+
+def main(argv=None) -> int:
+    """
+    Run the import and print its report as JSON.
+    :param argv: Optional list of command line arguments.
+    :return: Process exit code, 1 when the import failed.
+    """
+    args = parse_args(argv)
+    report = asyncio.run(run_import(args.task_list_id, args.file, args.file_format))
+    print(json.dumps(report, indent=2))
+    return 0 if report["event"] == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Remove the tasks of deleted task lists, and then the task lists, in batches.
+Also prunes the tombstones of tasks deleted longer ago than the sync retention.
+
+Usage:
+    python -m src.commands.purge_deleted_task_lists [--batch-size N] [--pause SECONDS]
+        [--tombstone-retention-days N] [--interval SECONDS]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from src.controllers.task_lists_controller import TOMBSTONE_RETENTION_DAYS, TaskListController
+
+PURGE_BATCH_SIZE = int(os.environ.get("TASK_PURGE_BATCH_SIZE", "1000"))
+PURGE_PAUSE_SECONDS = float(os.environ.get("TASK_PURGE_PAUSE_SECONDS", "0.5"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=PURGE_BATCH_SIZE,
+        help="Number of tasks removed per transaction.",
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=PURGE_PAUSE_SECONDS,
+        help="Seconds to wait between batches, to spread the load.",
+    )
+    parser.add_argument(
+        "--tombstone-retention-days",
+        type=int,
+        default=TOMBSTONE_RETENTION_DAYS,
+        help="Prune the tombstones of tasks deleted more than this many days ago.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        help="Keep running, starting a new pass every this many seconds.",
+    )
+    return parser.parse_args(argv)
+
+
+async def purge_pass(batch_size: int, pause: float) -> int:
+    """
+    Purge batches until one comes back short, printing the progress after each batch.
+    :param batch_size: Maximum number of tasks removed per batch.
+    :param pause: Seconds to wait between batches.
+    :return: Number of tasks removed.
+    :raises RuntimeError: If a batch fails.
+    """
+    total = 0
+    while True:
+        result = await TaskListController.purge_deleted_task_lists(batch_size)
+        if "errors" in result:
+            raise RuntimeError(result["errors"])
+
+        purged = result["data"]["purgeDeletedTaskLists"]["integer"]
+        total += purged
+        print(f"Purged {purged} task(s), {total} in this pass.", flush=True)
+        if purged < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def prune_pass(retention_days: int, batch_size: int, pause: float) -> int:
+    """
+    Prune tombstone batches until one comes back short, printing the progress after each one.
+    :param retention_days: Minimum number of days since the tasks were deleted.
+    :param batch_size: Maximum number of tombstones removed per batch.
+    :param pause: Seconds to wait between batches.
+    :return: Number of tombstones removed.
+    :raises RuntimeError: If a batch fails.
+    """
+    total = 0
+    while True:
+        result = await TaskListController.prune_task_tombstones(retention_days, batch_size)
+        if "errors" in result:
+            raise RuntimeError(result["errors"])
+
+        pruned = result["data"]["pruneTaskTombstones"]["integer"]
+        total += pruned
+        print(f"Pruned {pruned} tombstone(s), {total} in this pass.", flush=True)
+        if pruned < batch_size:
+            return total
+        await asyncio.sleep(pause)
+
+
+async def run(args) -> int:
+    while True:
+        try:
+            await purge_pass(args.batch_size, args.pause)
+            await prune_pass(args.tombstone_retention_days, args.batch_size, args.pause)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            if args.interval is None:
+                return 1
+        if args.interval is None:
+            return 0
+        await asyncio.sleep(args.interval)
+
+
+def main(argv=None) -> int:
+    """
+    Run one purge pass, or one every --interval seconds.
+    :param argv: Optional list of command line arguments.
+    :return: Process exit code, 1 on errors.
+    """
+    return asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""
+Check or repair the `task_list_stats` counters maintained by the task triggers.
+
+Usage:
+    python -m src.commands.rebuild_task_list_stats [--task-list-id ID] [--check]
+"""
+
+import argparse
+import asyncio
+import sys
+
+from src.controllers.task_lists_controller import TaskListController
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--task-list-id", help="Only check the given task list.")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Report drifted task lists without repairing them.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """
+    Run the consistency check and print how many task lists had drifted.
+    :param argv: Optional list of command line arguments.
+    :return: Process exit code, 1 on errors or when --check finds drift.
+    """
+    args = parse_args(argv)
+    result = asyncio.run(
+        TaskListController.rebuild_task_list_stats(args.task_list_id, dry_run=args.check)
+    )
+
+    if "errors" in result:
+        print(result["errors"], file=sys.stderr)
+        return 1
+
+    drifted = result["data"]["rebuildTaskListStats"]["integer"]
+    if args.check:
+        print(f"{drifted} task list(s) with drifted stats.")
+        return 1 if drifted else 0
+
+    print(f"Rebuilt stats for {drifted} task list(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
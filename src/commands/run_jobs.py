@@ -0,0 +1,117 @@
+"""
+Run the background jobs queued by the API: invitation and assignment emails, and webhook
+deliveries.
+
+Usage:
+    python -m src.commands.run_jobs [--concurrency N] [--batch-size N] [--poll SECONDS] [--once]
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+import sys
+
+from src.controllers.jobs_controller import JOB_HANDLERS, JobController
+from src.infrastructure.job_worker import (
+    JOB_BATCH_SIZE,
+    JOB_CONCURRENCY,
+    JOB_POLL_SECONDS,
+    JobWorker,
+)
+from src.infrastructure.webhooks import webhook_sender
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=JOB_CONCURRENCY,
+        help="Maximum number of job batches running at once.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=JOB_BATCH_SIZE,
+        help="Maximum number of jobs per batch, e.g. emails sent over one SMTP connection.",
+    )
+    parser.add_argument(
+        "--poll",
+        type=float,
+        default=JOB_POLL_SECONDS,
+        help="Seconds to wait before polling again when no job is due.",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run the due jobs until none is left, then exit.",
+    )
+    return parser.parse_args(argv)
+
+
+def build_worker(args) -> JobWorker:
+    return JobWorker(
+        JOB_HANDLERS,
+        JobController.claim_jobs,
+        JobController.complete_jobs,
+        JobController.retry_job,
+        concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        poll_seconds=args.poll,
+    )
+
+
+async def drain(worker: JobWorker) -> int:
+    """
+    Run rounds of due jobs until a round comes back short.
+    :param worker: Worker running the jobs.
+    :return: Number of jobs claimed.
+    """
+    total = 0
+    while True:
+        claimed = await worker.run_once()
+        total += claimed
+        if claimed < worker.concurrency * worker.batch_size:
+            print(
+                f"Ran {total} job(s): {worker.completed} completed, {worker.failed} failed.",
+                flush=True,
+            )
+            return total
+
+
+async def run(args) -> int:
+    worker = build_worker(args)
+    try:
+        if args.once:
+            try:
+                await drain(worker)
+            except RuntimeError as e:
+                print(e, file=sys.stderr)
+                return 1
+            return 0
+
+        # Finish the jobs in hand before exiting, so they are not run twice after their lease.
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await worker.run(stop)
+        return 0
+    finally:
+        await webhook_sender.close()
+        if webhook_sender.metrics.deliveries:
+            print(f"Webhook deliveries: {json.dumps(webhook_sender.metrics.summary())}")
+
+
+def main(argv=None) -> int:
+    """
+    Run the job worker until it is stopped, or the due jobs only with --once.
+    :param argv: Optional list of command line arguments.
+    :return: Process exit code, 1 on errors.
+    """
+    return asyncio.run(run(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
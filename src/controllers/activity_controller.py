@@ -0,0 +1,81 @@
+import json
+from datetime import datetime
+
+from src.application.auth import current_user_id
+from src.infrastructure.activity_log import ACTIVITY_LOG_ENABLED, ActivityLogWriter
+from src.services.activity_graphql import get_task_activity_graphql, record_activity_graphql
+
+
+async def _write_activity(entries: list):
+    """
+    Write a batch of activity log entries.
+    :raises RuntimeError: If the mutation reports errors, so the batch is retried.
+    """
+    result = await record_activity_graphql(entries)
+    if "errors" in result:
+        raise RuntimeError(result["errors"])
+
+
+# On by default; ACTIVITY_LOG_ENABLED=false turns the task history off.
+activity_log = ActivityLogWriter(_write_activity) if ACTIVITY_LOG_ENABLED else None
+
+_CURRENT_USER = object()
+
+
+def record_activity(
+    task_list_id: str,
+    action: str,
+    task_id: str = None,
+    details: dict = None,
+    user_id=_CURRENT_USER,
+):
+    """
+    Queue an entry of the activity log. The entry is written in the background; nothing is
+    recorded when the activity log is disabled or its queue is full.
+    :param task_list_id: ID of the task list the change happened in.
+    :param action: Name of the change, e.g. 'task.status_changed'.
+    :param task_id: ID of the changed task, if the change concerns a single task.
+    :param details: JSON-serializable description of the change, e.g. the new field values.
+    :param user_id: ID of the user who made the change; by default the authenticated user of
+        the current request. None for changes no single user made, e.g. coalesced writes.
+    """
+    if activity_log is None or not task_list_id:
+        return
+    activity_log.record(
+        {
+            "taskListId": str(task_list_id),
+            "taskId": str(task_id) if task_id else None,
+            "userId": current_user_id.get() if user_id is _CURRENT_USER else user_id,
+            "action": action,
+            "details": json.loads(json.dumps(details or {}, default=str)),
+            "occurredAt": datetime.utcnow().isoformat(),
+        }
+    )
+
+
+class ActivityController:
+
+    @staticmethod
+    async def get_task_history(task_id: str, cursor: str = None, limit: int = 20):
+        """
+        Fetch a page of the history of a task, newest change first. Changes show up once the
+        activity log has written them, within ACTIVITY_LOG_FLUSH_MS.
+        :param task_id: ID of the task whose history is fetched.
+        :param cursor: Cursor returned with the previous page.
+        :param limit: Maximum number of entries to return.
+        :return: Dictionary with the entries and the cursor of the next page, or an error
+            message.
+        """
+        if cursor is not None and not cursor.isdigit():
+            return {"error": "Invalid cursor."}
+
+        result = await get_task_activity_graphql(task_id, cursor, page_size=limit + 1)
+        if "errors" in result:
+            return result
+
+        entries = result["data"]["taskActivity"]["nodes"]
+        page = entries[:limit]
+        return {
+            "activity": page,
+            "nextCursor": str(page[-1]["id"]) if len(entries) > limit else None,
+        }
@@ -0,0 +1,91 @@
+from src.infrastructure.graphql_client import get_result_field
+from src.infrastructure.mailer import mailer
+from src.infrastructure.webhooks import webhook_sender
+from src.services.job_graphql import (
+    claim_jobs_graphql,
+    complete_jobs_graphql,
+    enqueue_job_graphql,
+    enqueue_jobs_graphql,
+    retry_job_graphql,
+)
+
+
+async def send_emails(emails: list) -> list:
+    """
+    Handler of the 'email' jobs: deliver a batch of emails over one SMTP connection.
+    :param emails: Payloads with the 'to', 'subject' and 'body' of each email.
+    :return: For each email, None when it was sent, or the reason it was refused.
+    """
+    return await mailer.send(emails)
+
+
+async def deliver_webhooks(payloads: list) -> list:
+    """
+    Handler of the 'webhook' jobs queued by the activity_log_webhooks trigger: post the
+    events to the subscribed endpoints, one request per subscription.
+    :param payloads: Payloads with the 'subscriptionId', 'url', 'secret' and 'event'.
+    :return: For each payload, None when it was delivered, or the reason it was not.
+    """
+    return await webhook_sender.deliver(payloads)
+
+
+JOB_HANDLERS = {"email": send_emails, "webhook": deliver_webhooks}
+
+
+def _raise_errors(result: dict):
+    if "errors" in result:
+        raise RuntimeError(result["errors"])
+
+
+class JobController:
+
+    @staticmethod
+    async def enqueue_email(email: dict):
+        """
+        Queue an email to be sent by the job workers.
+        :param email: Dictionary with the 'to', 'subject' and 'body' of the email.
+        :return: A JSON response containing the ID of the job.
+        """
+        return await enqueue_job_graphql("email", email)
+
+    @staticmethod
+    async def enqueue_emails(emails: list):
+        """
+        Queue emails to be sent by the job workers, in a single statement.
+        :param emails: Dictionaries with the 'to', 'subject' and 'body' of each email.
+        :return: A JSON response containing the number of queued jobs.
+        """
+        return await enqueue_jobs_graphql("email", emails)
+
+    @staticmethod
+    async def claim_jobs(batch_size: int, lease_seconds: int) -> list:
+        """
+        Lease due jobs to this worker.
+        :param batch_size: Maximum number of jobs to claim.
+        :param lease_seconds: Seconds after which unfinished jobs can be claimed again.
+        :return: List of the claimed jobs.
+        :raises RuntimeError: If the jobs cannot be claimed.
+        """
+        result = await claim_jobs_graphql(batch_size, lease_seconds)
+        _raise_errors(result)
+        return get_result_field(result, "data", "claimJobs", "jobs") or []
+
+    @staticmethod
+    async def complete_jobs(job_ids: list):
+        """
+        Remove finished jobs from the queue.
+        :param job_ids: IDs of the finished jobs.
+        :raises RuntimeError: If the jobs cannot be removed.
+        """
+        _raise_errors(await complete_jobs_graphql(job_ids))
+
+    @staticmethod
+    async def retry_job(job_id: str, error: str, retry_in_seconds: int = None):
+        """
+        Release a failed job.
+        :param job_id: ID of the failed job.
+        :param error: Description of the failure.
+        :param retry_in_seconds: Delay before the job is run again; None to give up on it.
+        :raises RuntimeError: If the job cannot be released.
+        """
+        _raise_errors(await retry_job_graphql(job_id, error, retry_in_seconds))
@@ -1,12 +1,96 @@
+import asyncio
+import logging
+import os
+from itertools import islice
+
 from fastapi import HTTPException
 
+from src.controllers.activity_controller import record_activity
+from src.controllers.jobs_controller import JobController
+from src.controllers.task_lists_controller import TaskListController
+from src.infrastructure.event_broker import event_broker
+from src.infrastructure.graphql_client import get_result_field
+from src.infrastructure.write_behind import WRITE_BEHIND_ENABLED, WriteBehindBuffer
 from src.services.task_graphql import (
     create_task_graphql,
     get_task_by_id_graphql,
     update_task_graphql,
+    update_task_status_graphql,
     delete_task_graphql,
     assign_task_to_user_graphql,
+    search_tasks_graphql,
+    update_tasks_progress_graphql,
+    get_tasks_by_ids_graphql,
+    assign_tasks_graphql,
 )
+from src.services.user_graphql import get_users_by_ids_graphql
+from src.services.notifications import task_assigned_email
+
+logger = logging.getLogger(__name__)
+
+# Batch reads longer than this are split into several upstream queries, run concurrently, so
+# no single query carries an unbounded ID list.
+TASK_BATCH_QUERY_IDS = int(os.environ.get("TASK_BATCH_QUERY_IDS", "100"))
+
+
+def _publish_task_event(event_type: str, task: dict):
+    """
+    Publish a change of a task to the subscribers of its task list.
+    :param event_type: Name of the event, e.g. 'task.updated'.
+    :param task: Task data including its 'taskListId'.
+    """
+    if task and task.get("taskListId"):
+        event_broker.publish(task["taskListId"], event_type, task)
+
+
+async def _write_task_progress(updates: dict):
+    """
+    Write a batch of coalesced progress updates and notify the task list subscribers.
+    :param updates: Dictionary of task IDs to their merged 'status' and 'completed_percentage'.
+    :raises RuntimeError: If the mutation reports errors, so the batch is retried.
+    """
+    result = await update_tasks_progress_graphql(updates)
+    if "errors" in result:
+        raise RuntimeError(result["errors"])
+    for index, task_id in enumerate(updates):
+        task = get_result_field(result, "data", f"t{index}", "task")
+        if task:
+            _publish_task_event("task.updated", task)
+            # Coalesced from the updates of any number of users.
+            record_activity(
+                task["taskListId"], "task.progress", task_id, updates[task_id], user_id=None
+            )
+        else:
+            logger.warning("Dropped buffered progress update of missing task %s", task_id)
+
+
+# Opt-in with TASK_WRITE_BEHIND: progress updates are then coalesced per task and written
+# in batches instead of one mutation each.
+task_progress_buffer = WriteBehindBuffer(_write_task_progress) if WRITE_BEHIND_ENABLED else None
+
+
+def _with_pending_progress(task: dict) -> dict:
+    """
+    Overlay the buffered progress updates of a task not yet written, so clients read their
+    own writes.
+    """
+    if task_progress_buffer is None or not task:
+        return task
+    pending = task_progress_buffer.pending(task["id"])
+    if "status" in pending:
+        task["status"] = pending["status"]
+    if "completed_percentage" in pending:
+        task["completedPercentage"] = pending["completed_percentage"]
+    return task
+
+
+def _discard_pending_progress(task_id: str, fields=None):
+    """
+    Forget the buffered progress of a task overwritten by a direct write.
+    :param fields: Only the fields the direct write set; all of them when None.
+    """
+    if task_progress_buffer is not None:
+        task_progress_buffer.discard(task_id, fields)
 
 
 class TaskController:
@@ -35,28 +119,135 @@ class TaskController:
         keys 'title', 'priority', 'status', 'completed_percentage', and 'task_list_id'.
         :return: A JSON response containing the created task.
         """
-        return await create_task_graphql(task_data)
+        if task_data.get("task_list_id") is not None:
+            await TaskListController._get_validated_task_list(task_data["task_list_id"])
+        result = await create_task_graphql(task_data)
+        task = get_result_field(result, "data", "createTask", "task")
+        _publish_task_event("task.created", task)
+        if task:
+            record_activity(task["taskListId"], "task.created", task["id"], task_data)
+        return result
 
     @staticmethod
-    async def get_task_by_id(task_id: str):
+    async def get_task_by_id(task_id: str, include_archived: bool = False):
         """
         Fetch a task by its ID.
         :param task_id: ID of the task to be fetched.
+        :param include_archived: Also look for the task in the archive.
         :return: A JSON response containing the task details.
         """
-        await TaskController._get_validated_task(task_id)
-        return await get_task_by_id_graphql(task_id)
+        result = await get_task_by_id_graphql(task_id, include_archived)
+        if not result or "errors" in result:
+            raise HTTPException(status_code=404, detail="Task not found or invalid ID.")
+
+        task = get_result_field(result, "data", "taskById")
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found.")
+        _with_pending_progress(task)
+        return result
+
+    @staticmethod
+    def has_pending_progress(task_id: str) -> bool:
+        """
+        Whether buffered progress of a task is not yet written, so its version does not
+        identify what a read returns.
+        :param task_id: ID of the task.
+        :return: True while progress updates of the task are buffered.
+        """
+        return task_progress_buffer is not None and bool(task_progress_buffer.pending(task_id))
+
+    @staticmethod
+    async def get_tasks_by_ids(task_ids: list):
+        """
+        Fetch many tasks by their IDs, in one query per TASK_BATCH_QUERY_IDS of them.
+        :param task_ids: IDs of the tasks to be fetched.
+        :return: Dictionary with the 'tasks' found, in the requested order and without repeats,
+            and the 'missing' IDs; or the GraphQL errors of the first failed query.
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        remaining = iter(task_ids)
+        chunks = []
+        while chunk := list(islice(remaining, TASK_BATCH_QUERY_IDS)):
+            chunks.append(chunk)
+        results = await asyncio.gather(*(get_tasks_by_ids_graphql(chunk) for chunk in chunks))
+        tasks = {}
+        for result in results:
+            if "errors" in result:
+                return result
+            tasks.update((task["id"], task) for task in result["data"]["visibleTasks"]["nodes"])
+        return {
+            "tasks": [
+                _with_pending_progress(tasks[task_id]) for task_id in task_ids if task_id in tasks
+            ],
+            "missing": [task_id for task_id in task_ids if task_id not in tasks],
+        }
+
+    @staticmethod
+    async def _raise_update_failure(task_id: str, expected_version: int = None):
+        """
+        Explain why a compare-and-set update matched no task. The task is only read on this
+        failure path.
+        :param task_id: ID of the task that was to be updated.
+        :param expected_version: Version the update expected, if any.
+        :raises HTTPException: 412 when the task exists with another version, 404 otherwise.
+        """
+        if expected_version is not None:
+            task = get_result_field(await get_task_by_id_graphql(task_id), "data", "taskById")
+            if task:
+                raise HTTPException(
+                    status_code=412,
+                    detail=f"Task was modified; its current version is {task['version']}.",
+                )
+        raise HTTPException(status_code=404, detail="Task not found.")
 
     @staticmethod
-    async def update_task(task_id: str, task_data: dict):
+    async def _updated_task(
+        task_id: str,
+        result: dict,
+        action: str,
+        details: dict,
+        written: tuple,
+        expected_version: int = None,
+    ):
+        """
+        Check the result of a compare-and-set task update, announce the updated task and record
+        the change in the activity log.
+        :param action: Name of the change for the activity log.
+        :param details: Changed fields for the activity log.
+        :param written: Progress fields set by the update; their buffered values are stale now,
+            while the other buffered fields are still written.
+        :return: The GraphQL result.
+        """
+        if "errors" in result:
+            return result
+
+        task = get_result_field(result, "data", "updateTaskById", "task")
+        if not task:
+            await TaskController._raise_update_failure(task_id, expected_version)
+        _discard_pending_progress(task_id, written)
+        _publish_task_event("task.updated", task)
+        record_activity(task["taskListId"], action, task_id, details)
+        return result
+
+    @staticmethod
+    async def update_task(task_id: str, task_data: dict, expected_version: int = None):
         """
         Update an existing task.
         :param task_id: ID of the task to be updated.
         :param task_data: Dictionary containing updated task data.
+        :param expected_version: Version the task must still have, from an If-Match header.
         :return: A JSON response containing the updated task.
         """
-        await TaskController.get_task_by_id(task_id)
-        return await update_task_graphql(task_id, task_data)
+        result = await update_task_graphql(task_id, task_data, expected_version)
+        # Missing fields are reset to their defaults, but explicit nulls leave them unchanged.
+        written = tuple(
+            field
+            for field in ("status", "completed_percentage")
+            if field not in task_data or task_data[field] is not None
+        )
+        return await TaskController._updated_task(
+            task_id, result, "task.updated", task_data, written, expected_version
+        )
 
     @staticmethod
     async def delete_task(task_id: str):
@@ -65,28 +256,161 @@ class TaskController:
         :param task_id: ID of the task to be deleted.
         :return: A JSON response confirming the deletion.
         """
-        await TaskController._get_validated_task(task_id)
-        return await delete_task_graphql(task_id)
+        task = await TaskController._get_validated_task(task_id)
+        _discard_pending_progress(task_id)
+        result = await delete_task_graphql(task_id)
+        if get_result_field(result, "data", "deleteTaskById", "deletedTaskId"):
+            _publish_task_event("task.deleted", {"id": task_id, "taskListId": task["taskListId"]})
+            record_activity(task["taskListId"], "task.deleted", task_id)
+        return result
 
     @staticmethod
-    async def update_task_status(task_id: str, status: str):
+    async def update_task_status(task_id: str, status: str, expected_version: int = None):
         """
         Change the status of a task.
         :param task_id: ID of the task whose status is to be changed.
         :param status: New status for the task.
+        :param expected_version: Version the task must still have, from an If-Match header.
         :return: A JSON response containing the updated task.
         """
-        task_data = await TaskController._get_validated_task(task_id)
-        task_data["status"] = status
-        return await update_task_graphql(task_id, task_data)
+        result = await update_task_status_graphql(task_id, status, expected_version)
+        return await TaskController._updated_task(
+            task_id,
+            result,
+            "task.status_changed",
+            {"status": status},
+            ("status",),
+            expected_version,
+        )
+
+    @staticmethod
+    async def update_task_progress(task_id: str, progress: dict):
+        """
+        Change the status and/or completed percentage of a task. With write-behind enabled
+        the change is queued and merged with other changes to the task before it is written.
+        :param task_id: ID of the task to be updated.
+        :param progress: Dictionary with the new 'status' and/or 'completed_percentage'.
+        :return: Dictionary with the 'pending' fields of a queued change, or the GraphQL result.
+        """
+        if task_progress_buffer is not None:
+            return {"pending": task_progress_buffer.submit(task_id, progress)}
+
+        result = await update_tasks_progress_graphql({task_id: progress})
+        task = get_result_field(result, "data", "t0", "task")
+        _publish_task_event("task.updated", task)
+        if task:
+            record_activity(task["taskListId"], "task.progress", task_id, progress)
+        return result
+
+    @staticmethod
+    async def _notify_assignees(emails: list):
+        """
+        Queue the emails telling users about their new tasks. The assignments stand even if
+        the emails cannot be queued.
+        :param emails: Rendered `task_assigned_email` messages.
+        """
+        if not emails:
+            return
+        try:
+            result = await JobController.enqueue_emails(emails)
+        except Exception:
+            logger.exception("Queueing the assignment email failed")
+            return
+        if "errors" in result:
+            logger.error("Queueing the assignment email failed: %s", result["errors"])
 
     @staticmethod
     async def assign_task_to_user(task_id: str, user_id: str):
         """
-        Assign a task to a user.
+        Assign a task to a user and queue an email to notify them.
         :param task_id: ID of the task to be assigned.
         :param user_id: ID of the user to whom the task is assigned.
         :return: A JSON response containing the updated task with the assigned user.
         """
-        await TaskController._get_validated_task(task_id)
-        return await assign_task_to_user_graphql(task_id, user_id)
+        task = await TaskController._get_validated_task(task_id)
+        result = await assign_task_to_user_graphql(task_id, user_id)
+        assignment = get_result_field(result, "data", "createAssignedTask", "assignedTask")
+        if assignment:
+            _publish_task_event(
+                "task.assigned",
+                {"id": task_id, "taskListId": task["taskListId"], "userId": user_id},
+            )
+            record_activity(task["taskListId"], "task.assigned", task_id, {"userId": user_id})
+            user = assignment.get("userByUserId")
+            if user:
+                await TaskController._notify_assignees(
+                    [task_assigned_email(user, assignment["taskByTaskId"])]
+                )
+        return result
+
+    @staticmethod
+    async def assign_tasks_to_users(pairs: list):
+        """
+        Assign many tasks to users at once: the tasks and the users are each validated in one
+        query, and the new assignments inserted in one statement that skips those existing.
+        :param pairs: List of (task ID, user ID) tuples.
+        :return: Dictionary with the number of new assignments and, for each pair in order, its
+            'status': 'assigned', 'already_assigned', 'task_not_found' or 'user_not_found';
+            or the GraphQL errors.
+        """
+        task_ids = list(dict.fromkeys(task_id for task_id, _ in pairs))
+        user_ids = list(dict.fromkeys(user_id for _, user_id in pairs))
+        tasks_result, users_result = await asyncio.gather(
+            get_tasks_by_ids_graphql(task_ids), get_users_by_ids_graphql(user_ids)
+        )
+        for result in (tasks_result, users_result):
+            if "errors" in result:
+                return result
+        tasks = {task["id"]: task for task in tasks_result["data"]["visibleTasks"]["nodes"]}
+        users = {user["id"]: user for user in users_result["data"]["allUsers"]["nodes"]}
+
+        valid = [pair for pair in dict.fromkeys(pairs) if pair[0] in tasks and pair[1] in users]
+        assigned = set()
+        if valid:
+            result = await assign_tasks_graphql(valid)
+            if "errors" in result:
+                return result
+            assigned = {
+                (assignment["taskId"], assignment["userId"])
+                for assignment in result["data"]["assignTasks"]["assignedTasks"]
+            }
+
+        results = []
+        reported = set()
+        for task_id, user_id in pairs:
+            if task_id not in tasks:
+                status = "task_not_found"
+            elif user_id not in users:
+                status = "user_not_found"
+            elif (task_id, user_id) in assigned and (task_id, user_id) not in reported:
+                status = "assigned"
+                reported.add((task_id, user_id))
+            else:
+                status = "already_assigned"
+            results.append({"taskId": task_id, "userId": user_id, "status": status})
+
+        emails = []
+        for task_id, user_id in valid:
+            if (task_id, user_id) not in assigned:
+                continue
+            task = tasks[task_id]
+            _publish_task_event(
+                "task.assigned",
+                {"id": task_id, "taskListId": task["taskListId"], "userId": user_id},
+            )
+            record_activity(task["taskListId"], "task.assigned", task_id, {"userId": user_id})
+            emails.append(task_assigned_email(users[user_id], task))
+        await TaskController._notify_assignees(emails)
+
+        return {"assigned": len(assigned), "results": results}
+
+    @staticmethod
+    async def search_tasks(search: str, task_list_id: str = None, limit: int = 20):
+        """
+        Search tasks by title.
+        :param search: Text to look for in the task titles.
+        :param task_list_id: Optional ID of the task list to restrict the search to.
+        :param limit: Maximum number of tasks to return.
+        :return: A JSON response containing the matching tasks, best match first.
+        """
+        return await search_tasks_graphql(search, task_list_id, limit)
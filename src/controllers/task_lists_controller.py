@@ -1,13 +1,89 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
 from fastapi import HTTPException
 
+from src.application.auth import current_user_id
+from src.controllers.activity_controller import record_activity
+from src.infrastructure.event_broker import Subscription, event_broker
+from src.infrastructure.graphql_client import get_result_field
+from src.services.task_import import TaskImporter
 from src.services.task_list_graphql import (
     create_task_list_graphql,
     get_task_lists_by_id_graphql,
     update_task_list_graphql,
     delete_task_list_graphql,
     get_task_list_with_task_with_filters_graphql,
+    get_task_list_stats_graphql,
+    rebuild_task_list_stats_graphql,
+    get_task_list_changes_graphql,
+    bulk_update_tasks_graphql,
+    bulk_delete_tasks_graphql,
+    archive_completed_tasks_graphql,
+    restore_archived_tasks_graphql,
+    purge_deleted_task_lists_graphql,
+    prune_task_tombstones_graphql,
 )
 
+# Tombstones of deleted tasks are kept this long; clients that last synchronized earlier must
+# fetch the whole task list again.
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get("TASK_TOMBSTONE_RETENTION_DAYS", "30"))
+# Changes are re-read this far before the watermark, for the transactions that committed after
+# the previous synchronization with an earlier timestamp.
+SYNC_OVERLAP_SECONDS = float(os.environ.get("TASK_SYNC_OVERLAP_SECONDS", "60"))
+
+
+def _flatten_assignees(tasks: list):
+    """
+    Replace the assignment connection selected with the assignees of each task by an
+    'assignees' list of its users.
+    :param tasks: Task nodes read with `include_assignees`.
+    """
+    for task in tasks:
+        assignments = task.pop("assignedTasksByTaskId")["nodes"]
+        task["assignees"] = [assignment["userByUserId"] for assignment in assignments]
+
+
+async def _stream_task_import(task_list_id: str, text_file, file_format: str):
+    """
+    Run a task import in a worker thread and yield its progress as it happens.
+    :param task_list_id: ID of the task list receiving the tasks.
+    :param text_file: Text file object with the rows to import.
+    :param file_format: Either 'csv' or 'ndjson'.
+    :return: An async iterator of 'progress' events followed by a 'completed' or 'failed' event.
+    """
+    loop = asyncio.get_running_loop()
+    updates = asyncio.Queue()
+    importer = TaskImporter(
+        task_list_id,
+        progress=lambda update: loop.call_soon_threadsafe(updates.put_nowait, update),
+    )
+    job = asyncio.ensure_future(asyncio.to_thread(importer.run, text_file, file_format))
+
+    while not job.done() or not updates.empty():
+        next_update = asyncio.ensure_future(updates.get())
+        done, _ = await asyncio.wait({next_update, job}, return_when=asyncio.FIRST_COMPLETED)
+        if next_update in done:
+            yield {"event": "progress", **next_update.result()}
+        else:
+            next_update.cancel()
+
+    try:
+        report = job.result()
+    except Exception as e:
+        yield {"event": "failed", "error": str(e)}
+        return
+
+    if report["imported"]:
+        event_broker.publish(
+            task_list_id,
+            "tasks.imported",
+            {"taskListId": task_list_id, "count": report["imported"]},
+        )
+        record_activity(task_list_id, "tasks.imported", details={"count": report["imported"]})
+    yield {"event": "completed", **report}
+
 
 class TaskListController:
 
@@ -34,7 +110,11 @@ class TaskListController:
         :param name: Name of the task list to be created.
         :return: A JSON response containing the created task list.
         """
-        return await create_task_list_graphql(name)
+        result = await create_task_list_graphql(name)
+        task_list = get_result_field(result, "data", "createTaskList", "taskList")
+        if task_list:
+            record_activity(task_list["id"], "task_list.created", details={"name": name})
+        return result
 
     @staticmethod
     async def fetch_task_list_by_id(task_list_id: str):
@@ -47,33 +127,233 @@ class TaskListController:
         return await get_task_lists_by_id_graphql(task_list_id)
 
     @staticmethod
-    async def update_task_list(task_list_id: str, name: str):
+    async def update_task_list(task_list_id: str, name: str, expected_version: int = None):
         """
-        Update an existing task list.
+        Update an existing task list in a single compare-and-set statement.
         :param task_list_id: ID of the task list to be updated.
         :param name: New name for the task list.
+        :param expected_version: Version the task list must still have, from an If-Match header.
         :return: A JSON response containing the updated task list.
         """
-        await TaskListController._get_validated_task_list(task_list_id)
-        return await update_task_list_graphql(task_list_id, name)
+        result = await update_task_list_graphql(task_list_id, name, expected_version)
+        if "errors" in result:
+            return result
+
+        task_list = get_result_field(result, "data", "updateTaskListById", "taskList")
+        if not task_list:
+            # Only read the task list to tell a version conflict from a missing task list.
+            current = None
+            if expected_version is not None:
+                current = get_result_field(
+                    await get_task_lists_by_id_graphql(task_list_id), "data", "taskListById"
+                )
+            if current:
+                raise HTTPException(
+                    status_code=412,
+                    detail=f"Task list was modified; its current version is {current['version']}.",
+                )
+            raise HTTPException(status_code=404, detail="Task list not found.")
+
+        event_broker.publish(task_list_id, "task_list.updated", task_list)
+        record_activity(task_list_id, "task_list.updated", details={"name": name})
+        return result
 
     @staticmethod
     async def delete_task_list(task_list_id: str):
         """
-        Delete a task list by its ID.
+        Delete a task list by its ID. The task list and its tasks disappear from every read at
+        once; the tasks themselves are removed later by `purge_deleted_task_lists`.
         :param task_list_id: ID of the task list to be deleted.
         :return: A JSON response indicating success or failure.
         """
         await TaskListController._get_validated_task_list(task_list_id)
-        return await delete_task_list_graphql(task_list_id)
+        result = await delete_task_list_graphql(task_list_id)
+        if get_result_field(result, "data", "deleteTaskListById", "taskList"):
+            event_broker.publish(task_list_id, "task_list.deleted", {"id": task_list_id})
+            record_activity(task_list_id, "task_list.deleted")
+        return result
 
     @staticmethod
-    async def fetch_task_lists_with_tasks_and_filters(task_list_id: str, filters: dict = None):
+    async def fetch_task_lists_with_tasks_and_filters(
+        task_list_id: str,
+        filters: dict = None,
+        include_archived: bool = False,
+        include_assignees: bool = False,
+    ):
         """
         Fetch all task lists with their tasks.
         :param task_list_id: ID of the task list to fetch tasks for.
         :param filters: Optional filters to apply to the task list.
+        :param include_archived: Also return the archived tasks of the task list.
+        :param include_assignees: Also return, in an 'assignees' list of each task, the users it
+            is assigned to.
         :return: A JSON response containing the task list and its tasks.
         """
         await TaskListController._get_validated_task_list(task_list_id)
-        return await get_task_list_with_task_with_filters_graphql(task_list_id, filters)
+        result = await get_task_list_with_task_with_filters_graphql(
+            task_list_id, filters, include_archived, include_assignees
+        )
+        tasks = get_result_field(result, "data", "allTasks", "nodes") or get_result_field(
+            result, "data", "taskListById", "tasksByTaskListId", "nodes"
+        )
+        if include_assignees and tasks:
+            _flatten_assignees(tasks)
+        return result
+
+    @staticmethod
+    async def fetch_task_list_stats(task_list_id: str):
+        """
+        Fetch the task statistics of a task list.
+        :param task_list_id: ID of the task list to compute the statistics for.
+        :return: A JSON response containing the task list summary.
+        """
+        return await get_task_list_stats_graphql(task_list_id)
+
+    @staticmethod
+    async def rebuild_task_list_stats(task_list_id: str = None, dry_run: bool = False):
+        """
+        Check the task list counters against the task table and repair any drift.
+        :param task_list_id: Optional ID of a single task list; all lists when omitted.
+        :param dry_run: Only report the drift without repairing it.
+        :return: A JSON response containing the number of drifted task lists.
+        """
+        return await rebuild_task_list_stats_graphql(task_list_id, dry_run)
+
+    @staticmethod
+    async def subscribe_to_task_list_events(task_list_id: str) -> Subscription:
+        """
+        Subscribe to the changes of a task list and its tasks.
+        :param task_list_id: ID of the task list to watch.
+        :return: A subscription receiving the task list events.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        return event_broker.subscribe(task_list_id)
+
+    @staticmethod
+    async def fetch_task_list_changes(
+        task_list_id: str, updated_since: str, include_assignees: bool = False
+    ):
+        """
+        Fetch the tasks of a task list changed or deleted after a point in time. The changes of
+        the last SYNC_OVERLAP_SECONDS before it are returned again, so clients must apply them
+        idempotently.
+        :param task_list_id: ID of the task list to be synchronized.
+        :param updated_since: Naive UTC ISO 8601 watermark returned by the last synchronization.
+        :param include_assignees: Also return, in an 'assignees' list of each changed task, the
+            users it is assigned to.
+        :return: A JSON response containing the changed tasks, the deleted task IDs and the
+            watermark of this synchronization.
+        :raises HTTPException: 410 if the tombstones since then may already be pruned.
+        """
+        since = datetime.fromisoformat(updated_since)
+        if since < datetime.utcnow() - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(
+                status_code=410,
+                detail="The 'updated_since' timestamp is too old; fetch the whole task list.",
+            )
+        since -= timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        result = await get_task_list_changes_graphql(
+            task_list_id, since.isoformat(), include_assignees
+        )
+        tasks = get_result_field(result, "data", "tasksUpdatedSince", "nodes")
+        if include_assignees and tasks:
+            _flatten_assignees(tasks)
+        return result
+
+    @staticmethod
+    async def bulk_update_tasks(task_list_id: str, filters: dict, patch: dict):
+        """
+        Update every task of a task list matching the filters. The history of every updated
+        task is written by the same statement.
+        :param task_list_id: ID of the task list the tasks belong to.
+        :param filters: Dictionary with optional 'ids', 'status' and 'priority' lists.
+        :param patch: Dictionary with the new 'status', 'priority' and/or 'completed_percentage'.
+        :return: A JSON response containing the number of updated tasks.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        result = await bulk_update_tasks_graphql(
+            task_list_id, filters, patch, current_user_id.get()
+        )
+        updated = get_result_field(result, "data", "bulkUpdateTasks", "integer")
+        if updated:
+            event_broker.publish(
+                task_list_id, "tasks.bulk_updated", {"taskListId": task_list_id, "count": updated}
+            )
+        return result
+
+    @staticmethod
+    async def bulk_delete_tasks(task_list_id: str, filters: dict):
+        """
+        Delete every task of a task list matching the filters. The deletion is recorded in the
+        history of every deleted task by the same statement.
+        :param task_list_id: ID of the task list the tasks belong to.
+        :param filters: Dictionary with optional 'ids', 'status' and 'priority' lists.
+        :return: A JSON response containing the number of deleted tasks.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        result = await bulk_delete_tasks_graphql(task_list_id, filters, current_user_id.get())
+        deleted = get_result_field(result, "data", "bulkDeleteTasks", "integer")
+        if deleted:
+            event_broker.publish(
+                task_list_id, "tasks.bulk_deleted", {"taskListId": task_list_id, "count": deleted}
+            )
+        return result
+
+    @staticmethod
+    async def purge_deleted_task_lists(batch_size: int):
+        """
+        Remove one batch of tasks of deleted task lists, and the task lists left empty.
+        :param batch_size: Maximum number of tasks to remove.
+        :return: A JSON response containing the number of removed tasks.
+        """
+        return await purge_deleted_task_lists_graphql(batch_size)
+
+    @staticmethod
+    async def prune_task_tombstones(older_than_days: int, batch_size: int):
+        """
+        Remove one batch of the tombstones of tasks deleted before a number of days ago.
+        :param older_than_days: Minimum number of days since the tasks were deleted.
+        :param batch_size: Maximum number of tombstones to remove.
+        :return: A JSON response containing the number of removed tombstones.
+        """
+        return await prune_task_tombstones_graphql(older_than_days, batch_size)
+
+    @staticmethod
+    async def archive_completed_tasks(older_than_days: int, batch_size: int):
+        """
+        Move one batch of tasks completed before a number of days ago to the task archive.
+        :param older_than_days: Minimum number of days since the tasks were last updated.
+        :param batch_size: Maximum number of tasks to move.
+        :return: A JSON response containing the number of archived tasks.
+        """
+        return await archive_completed_tasks_graphql(older_than_days, batch_size)
+
+    @staticmethod
+    async def restore_archived_tasks(task_list_id: str, task_ids: list):
+        """
+        Move archived tasks of a task list back to the active tasks. The restore is recorded in
+        the history of every restored task by the same statement.
+        :param task_list_id: ID of the task list the tasks belong to.
+        :param task_ids: IDs of the archived tasks to restore.
+        :return: A JSON response containing the number of restored tasks.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        result = await restore_archived_tasks_graphql(task_list_id, task_ids, current_user_id.get())
+        restored = get_result_field(result, "data", "restoreArchivedTasks", "integer")
+        if restored:
+            event_broker.publish(
+                task_list_id, "tasks.restored", {"taskListId": task_list_id, "count": restored}
+            )
+        return result
+
+    @staticmethod
+    async def import_tasks(task_list_id: str, text_file, file_format: str = "csv"):
+        """
+        Bulk import tasks from a CSV or NDJSON file into a task list.
+        :param task_list_id: ID of the task list receiving the tasks.
+        :param text_file: Text file object with the rows to import.
+        :param file_format: Either 'csv' (with a header line) or 'ndjson'.
+        :return: An async iterator of progress events ending with the import report.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        return _stream_task_import(task_list_id, text_file, file_format)
@@ -1,23 +1,67 @@
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
 from pydantic import EmailStr
 from src.application.auth import verify_password, create_access_token
-from src.services.user_graphql import check_existing_users_by_email, create_user_graphql
+from src.controllers.jobs_controller import JobController
+from src.services.notifications import invitation_email
+from src.services.user_graphql import (
+    check_existing_users_by_email,
+    create_user_graphql,
+    get_user_assigned_tasks_graphql,
+)
+
+EMAIL_UNIQUE_CONSTRAINT = "user_email_key"
+
+
+def _encode_cursor(created_at: str, assignment_id: str) -> str:
+    payload = json.dumps([created_at, assignment_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _is_duplicate_email(result: dict) -> bool:
+    return any(
+        f'unique constraint "{EMAIL_UNIQUE_CONSTRAINT}"' in str(error.get("message", ""))
+        for error in result.get("errors") or ()
+    )
+
+
+def _decode_cursor(cursor: str):
+    """
+    Decode a cursor made by `_encode_cursor`.
+    :return: The ISO 8601 creation time and the UUID of the last assignment of the previous
+        page, or None when the cursor is not one of ours.
+    """
+    try:
+        created_at, assignment_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(created_at, str) or not isinstance(assignment_id, str):
+            return None
+        datetime.fromisoformat(created_at)
+        uuid.UUID(assignment_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    return created_at, assignment_id
 
 
 class UserController:
     @staticmethod
     async def register_user(user_data: dict):
         """
-        Register a new user by checking if the email already exists and then creating the user.
+        Register a new user in a single mutation, relying on the unique constraint on the email
+        to reject the emails already registered.
         :param user_data: Dictionary containing user data with keys
         'email', 'password', and 'full_name'.
         :return: Dictionary with either an error message or the created user data.
         """
-        existing_users = await check_existing_users_by_email(user_data["email"])
+        result = await create_user_graphql(user_data)
 
-        if existing_users:
+        if _is_duplicate_email(result):
             return {"error": "Email is already registered."}
 
-        return await create_user_graphql(user_data)
+        return result
 
     @staticmethod
     async def login_user(email: EmailStr, password: str):
@@ -53,7 +97,7 @@ class UserController:
     @staticmethod
     async def sent_invitation(email: EmailStr):
         """
-        Send an invitation to a user by email.
+        Queue an invitation email to a user; the job workers send it.
         :param email: Email address of the user to invite.
         :return: Dictionary with either an error message or a success message.
         """
@@ -62,6 +106,51 @@ class UserController:
         if existing_users:
             return {"error": "Email is already registered."}
 
-        # Here you would implement the logic to send an invitation email
-        # For now, we will just return a success message
-        return {"message": "Invitation sent successfully."}
+        result = await JobController.enqueue_email(invitation_email(email))
+        if "errors" in result:
+            return result
+        return {"message": "Invitation queued."}
+
+    @staticmethod
+    async def get_assigned_tasks(
+        user_id: str,
+        status: str = None,
+        priority: str = None,
+        cursor: str = None,
+        limit: int = 20,
+    ):
+        """
+        Fetch a page of the tasks assigned to a user, newest assignment first.
+        :param user_id: ID of the user whose assigned tasks are fetched.
+        :param status: Optional task status to filter by.
+        :param priority: Optional task priority to filter by.
+        :param cursor: Opaque cursor returned with the previous page.
+        :param limit: Maximum number of tasks to return.
+        :return: Dictionary with the tasks and the cursor of the next page, or an error message.
+        """
+        after_created_at = after_id = None
+        if cursor:
+            decoded = _decode_cursor(cursor)
+            if decoded is None:
+                return {"error": "Invalid cursor."}
+            after_created_at, after_id = decoded
+
+        result = await get_user_assigned_tasks_graphql(
+            user_id, status, priority, after_created_at, after_id, page_size=limit + 1
+        )
+        if "errors" in result:
+            return result
+
+        assignments = result["data"]["userAssignedTasks"]["nodes"]
+        page = assignments[:limit]
+        next_cursor = None
+        if len(assignments) > limit:
+            next_cursor = _encode_cursor(page[-1]["createdAt"], page[-1]["id"])
+
+        return {
+            "tasks": [
+                {**assignment["taskByTaskId"], "assignedAt": assignment["createdAt"]}
+                for assignment in page
+            ],
+            "nextCursor": next_cursor,
+        }
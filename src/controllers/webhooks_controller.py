@@ -0,0 +1,57 @@
+import secrets
+
+from fastapi import HTTPException
+
+from src.controllers.task_lists_controller import TaskListController
+from src.infrastructure.graphql_client import get_result_field
+from src.infrastructure.webhooks import WEBHOOK_ALLOW_LOCAL_URLS, WebhookURLError, check_webhook_url
+from src.services.webhook_graphql import (
+    create_webhook_graphql,
+    delete_webhook_graphql,
+    get_webhooks_graphql,
+)
+
+
+class WebhookController:
+
+    @staticmethod
+    async def create_webhook(task_list_id: str, url: str, secret: str = None):
+        """
+        Subscribe an endpoint to the changes of a task list.
+        :param task_list_id: ID of the task list to be watched.
+        :param url: URL the changes are posted to; an https URL of a public host.
+        :param secret: Key signing the deliveries; generated when omitted.
+        :return: A JSON response containing the subscription and its secret.
+        :raises HTTPException: 422 when the URL is not acceptable.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        try:
+            await check_webhook_url(url, WEBHOOK_ALLOW_LOCAL_URLS)
+        except WebhookURLError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return await create_webhook_graphql(task_list_id, url, secret or secrets.token_urlsafe(32))
+
+    @staticmethod
+    async def get_webhooks(task_list_id: str):
+        """
+        Fetch the webhook subscriptions of a task list.
+        :param task_list_id: ID of the task list.
+        :return: A JSON response containing the subscriptions, without their secrets.
+        """
+        await TaskListController._get_validated_task_list(task_list_id)
+        return await get_webhooks_graphql(task_list_id)
+
+    @staticmethod
+    async def delete_webhook(task_list_id: str, webhook_id: str):
+        """
+        Remove a webhook subscription of a task list. Deliveries already queued still go out.
+        :param task_list_id: ID of the task list the subscription belongs to.
+        :param webhook_id: ID of the subscription.
+        :return: A JSON response confirming the deletion.
+        """
+        result = await delete_webhook_graphql(task_list_id, webhook_id)
+        if "errors" in result:
+            return result
+        if not get_result_field(result, "data", "deleteWebhookSubscription", "webhookSubscription"):
+            raise HTTPException(status_code=404, detail="Webhook not found.")
+        return result
@@ -10,8 +10,14 @@ from sqlalchemy import (
     Enum,
     text,
     Integer,
+    BigInteger,
+    Index,
+    Identity,
+    UniqueConstraint,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from src.domain.enums import TASK_PRIORITIES, TASK_STATUSES
 
 metadata = MetaData()
 
@@ -36,11 +42,40 @@ task_list_table = Table(
     ),
     Column("name", String, nullable=False),
     Column("created_at", TIMESTAMP, server_default=func.now()),
+    Column("updated_at", TIMESTAMP, nullable=False, server_default=func.now()),
+    Column("version", Integer, nullable=False, server_default="1"),
+    # Set when the task list is deleted; its tasks are purged in the background.
+    Column("deleted_at", TIMESTAMP, nullable=True),
+)
+
+Index(
+    "ix_task_list_deleted_at",
+    task_list_table.c.deleted_at,
+    postgresql_where=task_list_table.c.deleted_at.isnot(None),
 )
 
-task_priority_enum = Enum("low", "medium", "high", name="task_priority", metadata=metadata)
+task_list_stats_table = Table(
+    "task_list_stats",
+    metadata,
+    Column(
+        "task_list_id",
+        UUID(as_uuid=True),
+        ForeignKey("task_list.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("total_count", Integer, nullable=False, server_default="0"),
+    Column("pending_count", Integer, nullable=False, server_default="0"),
+    Column("in_process_count", Integer, nullable=False, server_default="0"),
+    Column("completed_count", Integer, nullable=False, server_default="0"),
+    Column("low_priority_count", Integer, nullable=False, server_default="0"),
+    Column("medium_priority_count", Integer, nullable=False, server_default="0"),
+    Column("high_priority_count", Integer, nullable=False, server_default="0"),
+    Column("completed_percentage_sum", BigInteger, nullable=False, server_default="0"),
+)
 
-task_status_enum = Enum("pending", "in_process", "completed", name="task_status", metadata=metadata)
+task_priority_enum = Enum(*TASK_PRIORITIES, name="task_priority", metadata=metadata)
+
+task_status_enum = Enum(*TASK_STATUSES, name="task_status", metadata=metadata)
 
 task_table = Table(
     "task",
@@ -60,8 +95,90 @@ task_table = Table(
         UUID(as_uuid=True),
         ForeignKey("task_list.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     ),
     Column("created_at", TIMESTAMP, server_default=func.now()),
+    Column("updated_at", TIMESTAMP, nullable=False, server_default=func.now()),
+    Column("version", Integer, nullable=False, server_default="1"),
+)
+
+Index("ix_task_task_list_id_updated_at", task_table.c.task_list_id, task_table.c.updated_at)
+
+Index(
+    "ix_task_task_list_id_status_priority",
+    task_table.c.task_list_id,
+    task_table.c.status,
+    task_table.c.priority,
+)
+
+Index(
+    "ix_task_task_list_id_priority_id",
+    task_table.c.task_list_id,
+    task_table.c.priority,
+    task_table.c.id,
+)
+
+Index(
+    "ix_task_task_list_id_created_at_id",
+    task_table.c.task_list_id,
+    task_table.c.created_at,
+    task_table.c.id,
+)
+
+Index(
+    "ix_task_task_list_id_completed_percentage_id",
+    task_table.c.task_list_id,
+    task_table.c.completed_percentage,
+    task_table.c.id,
+)
+
+Index(
+    "ix_task_title_trgm",
+    task_table.c.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+)
+
+Index(
+    "ix_task_completed_updated_at",
+    task_table.c.updated_at,
+    postgresql_where=task_table.c.status == "completed",
+)
+
+# Completed tasks moved out of the task table by the archiver, see `task_including_archived`.
+task_archive_table = Table(
+    "task_archive",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("title", String, nullable=False),
+    Column("priority", task_priority_enum, nullable=False),
+    Column("status", task_status_enum, nullable=False),
+    Column("completed_percentage", Integer, nullable=True),
+    Column(
+        "task_list_id",
+        UUID(as_uuid=True),
+        ForeignKey("task_list.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    Column("created_at", TIMESTAMP),
+    Column("updated_at", TIMESTAMP, nullable=False),
+    Column("version", Integer, nullable=False),
+    Column("archived_at", TIMESTAMP, nullable=False, server_default=func.now()),
+)
+
+task_tombstone_table = Table(
+    "task_tombstone",
+    metadata,
+    Column("task_id", UUID(as_uuid=True), primary_key=True),
+    Column("task_list_id", UUID(as_uuid=True), nullable=False),
+    Column("deleted_at", TIMESTAMP, nullable=False, server_default=func.now()),
+)
+
+Index(
+    "ix_task_tombstone_task_list_id_deleted_at",
+    task_tombstone_table.c.task_list_id,
+    task_tombstone_table.c.deleted_at,
 )
 
 assigned_task = Table(
@@ -85,5 +202,100 @@ assigned_task = Table(
         ForeignKey("user.id", ondelete="CASCADE"),
         nullable=False,
     ),
-    Column("created_at", TIMESTAMP, server_default=func.now()),
+    Column("created_at", TIMESTAMP, nullable=False, server_default=func.now()),
+    UniqueConstraint("task_id", "user_id", name="uq_assigned_task_task_id_user_id"),
+)
+
+Index(
+    "ix_assigned_task_user_id_created_at",
+    assigned_task.c.user_id,
+    assigned_task.c.created_at,
+    assigned_task.c.id,
+    postgresql_include=["task_id"],
+)
+
+assigned_task_archive = Table(
+    "assigned_task_archive",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column(
+        "task_id",
+        UUID(as_uuid=True),
+        ForeignKey("task_archive.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    Column(
+        "user_id",
+        UUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("created_at", TIMESTAMP),
+)
+
+# Task history written in batches by `ActivityLogWriter`. No foreign keys: the entries outlive
+# the tasks and task lists they describe.
+activity_log_table = Table(
+    "activity_log",
+    metadata,
+    Column("id", BigInteger, Identity(), primary_key=True),
+    Column("task_list_id", UUID(as_uuid=True), nullable=False),
+    Column("task_id", UUID(as_uuid=True), nullable=True),
+    Column("user_id", UUID(as_uuid=True), nullable=True),
+    Column("action", String, nullable=False),
+    Column("details", JSONB, nullable=False, server_default=text("'{}'::jsonb")),
+    Column("created_at", TIMESTAMP, nullable=False, server_default=func.now()),
+)
+
+Index(
+    "ix_activity_log_task_id_id",
+    activity_log_table.c.task_id,
+    activity_log_table.c.id,
+    postgresql_where=activity_log_table.c.task_id.isnot(None),
+)
+
+# Durable queue of background jobs, claimed by `python -m src.commands.run_jobs` workers.
+job_table = Table(
+    "job",
+    metadata,
+    Column("id", BigInteger, Identity(), primary_key=True),
+    Column("kind", String, nullable=False),
+    Column("payload", JSONB, nullable=False, server_default=text("'{}'::jsonb")),
+    Column("attempts", Integer, nullable=False, server_default="0"),
+    Column("max_attempts", Integer, nullable=False, server_default="5"),
+    Column("run_at", TIMESTAMP, nullable=False, server_default=func.now()),
+    Column("locked_until", TIMESTAMP, nullable=True),
+    Column("last_error", String, nullable=True),
+    Column("failed_at", TIMESTAMP, nullable=True),
+    Column("created_at", TIMESTAMP, nullable=False, server_default=func.now()),
+)
+
+Index(
+    "ix_job_run_at",
+    job_table.c.run_at,
+    job_table.c.id,
+    postgresql_where=job_table.c.failed_at.is_(None),
+)
+
+# Endpoints notified of the changes of a task list, see the activity_log_webhooks trigger.
+webhook_subscription_table = Table(
+    "webhook_subscription",
+    metadata,
+    Column(
+        "id",
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+    ),
+    Column(
+        "task_list_id",
+        UUID(as_uuid=True),
+        ForeignKey("task_list.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    ),
+    Column("url", String, nullable=False),
+    Column("secret", String, nullable=False),
+    Column("created_at", TIMESTAMP, nullable=False, server_default=func.now()),
 )
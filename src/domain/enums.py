@@ -0,0 +1,3 @@
+TASK_PRIORITIES = ("low", "medium", "high")
+
+TASK_STATUSES = ("pending", "in_process", "completed")
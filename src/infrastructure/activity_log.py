@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+
+ACTIVITY_LOG_ENABLED = os.environ.get("ACTIVITY_LOG_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+ACTIVITY_LOG_MAX_QUEUE = int(os.environ.get("ACTIVITY_LOG_MAX_QUEUE", "10000"))
+ACTIVITY_LOG_BATCH_SIZE = int(os.environ.get("ACTIVITY_LOG_BATCH_SIZE", "500"))
+ACTIVITY_LOG_FLUSH_SECONDS = float(os.environ.get("ACTIVITY_LOG_FLUSH_MS", "1000")) / 1000
+ACTIVITY_LOG_MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """
+    Bounded in-process queue of activity log entries, written in batches off the request
+    path. Entries are handed to `flush_batch` once `batch_size` are queued or `flush_seconds`
+    after the first one, whichever comes first. When the queue is full new entries are
+    dropped and counted instead of slowing down or failing the requests recording them.
+    """
+
+    def __init__(
+        self,
+        flush_batch,
+        max_queue: int = ACTIVITY_LOG_MAX_QUEUE,
+        batch_size: int = ACTIVITY_LOG_BATCH_SIZE,
+        flush_seconds: float = ACTIVITY_LOG_FLUSH_SECONDS,
+        max_attempts: int = ACTIVITY_LOG_MAX_ATTEMPTS,
+    ):
+        """
+        :param flush_batch: Coroutine function receiving a list of at most `batch_size`
+            entries. If it raises, the batch is retried with the next flush, and dropped
+            after `max_attempts` consecutive failures.
+        :param max_queue: Maximum number of entries waiting to be written.
+        :param batch_size: Number of queued entries that triggers an immediate flush, and
+            maximum number of entries per call of `flush_batch`.
+        :param flush_seconds: Maximum time an entry waits before a flush is started.
+        :param max_attempts: Number of times a batch is tried before it is dropped.
+        """
+        self.flush_batch = flush_batch
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_attempts = max_attempts
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self._pending = []
+        self._failures = 0
+        self._lock = asyncio.Lock()
+        self._timer = None
+        self._timer_loop = None
+        self._flushes = set()
+
+    def record(self, entry: dict) -> bool:
+        """
+        Queue an entry. Must be called from the event loop; never blocks.
+        :param entry: Entry to be written, as expected by `flush_batch`.
+        :return: False when the queue was full and the entry was dropped.
+        """
+        if len(self._pending) >= self.max_queue:
+            if not self.dropped % self.max_queue:
+                logger.warning("Activity log queue is full; dropping entries")
+            self.dropped += 1
+            return False
+
+        self.recorded += 1
+        self._pending.append(entry)
+        loop = asyncio.get_running_loop()
+        if len(self._pending) >= self.batch_size:
+            if all(task.done() or task.get_loop() is not loop for task in self._flushes):
+                self._start_flush()
+        elif self._timer is None or self._timer_loop is not loop:
+            # A timer of another, closed, event loop would never fire.
+            self._schedule(loop)
+        return True
+
+    def _schedule(self, loop):
+        self._timer_loop = loop
+        self._timer = loop.call_later(self.flush_seconds, self._start_flush)
+
+    def _start_flush(self):
+        # The event loop only keeps weak references to tasks, so hold on to each flush.
+        task = asyncio.ensure_future(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task):
+        self._flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Flushing the activity log failed", exc_info=task.exception())
+
+    async def flush(self):
+        """
+        Write every queued entry now, one batch at a time.
+        """
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            while self._pending:
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                try:
+                    await self.flush_batch(batch)
+                except Exception:
+                    self._failures += 1
+                    if self._failures < self.max_attempts:
+                        logger.exception("Writing %d activity log entries failed", len(batch))
+                        self._pending[:0] = batch
+                        self._schedule(asyncio.get_running_loop())
+                        return
+                    logger.exception(
+                        "Dropping %d activity log entries after %d attempts",
+                        len(batch),
+                        self._failures,
+                    )
+                    self.dropped += len(batch)
+                else:
+                    self.written += len(batch)
+                self._failures = 0
+
+    async def close(self):
+        """
+        Write the queued entries before shutting down, after the flushes already started.
+        """
+        loop = asyncio.get_running_loop()
+        flushes = [task for task in self._flushes if task.get_loop() is loop]
+        await asyncio.gather(*flushes, return_exceptions=True)
+        await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
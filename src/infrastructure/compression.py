@@ -0,0 +1,226 @@
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get("COMPRESSION_MINIMUM_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.environ.get("COMPRESSION_LEVEL", "6"))
+COMPRESSION_CACHE_SIZE = int(os.environ.get("COMPRESSION_CACHE_SIZE", "256"))
+
+# Streamed responses are forwarded untouched so events reach the client immediately.
+STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def _available_encodings(level: int) -> dict:
+    """
+    Compressors by content-coding, in order of server preference.
+    :param level: Compression level, 1 (fastest) to 9 (smallest); mapped onto each codec's scale.
+    """
+    encodings = {}
+    if brotli is not None:
+        encodings["br"] = lambda body: brotli.compress(body, quality=min(level, 11))
+    if zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=level)
+        encodings["zstd"] = compressor.compress
+    encodings["gzip"] = lambda body: gzip.compress(body, compresslevel=level, mtime=0)
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, available) -> str:
+    """
+    Pick the content-coding to use for a request.
+    :param accept_encoding: Value of the Accept-Encoding request header.
+    :param available: Supported content-codings in order of server preference.
+    :return: The chosen content-coding, or None to send the body uncompressed.
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encoding_etag(etag: bytes, encoding: str) -> bytes:
+    """
+    Entity tag of the representation of a response compressed with `encoding`: each content-coding
+    is a different representation, so it needs its own tag, e.g. "3" becomes "3-gzip".
+    """
+    if not etag.endswith(b'"'):
+        return etag
+    return etag[:-1] + b"-" + encoding.encode() + b'"'
+
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """
+    Weak comparison of an ETag with the tags of an If-None-Match request header.
+    """
+    tags = [tag.strip() for tag in if_none_match.split(b",")]
+    if b"*" in tags:
+        return True
+    opaque = etag.removeprefix(b"W/")
+    return any(tag.removeprefix(b"W/") == opaque for tag in tags)
+
+
+def _with_vary(headers: list) -> list:
+    varying = [
+        value for name, value in headers if name.lower() == b"vary" for value in value.split(b",")
+    ]
+    if any(value.strip().lower() in (b"accept-encoding", b"*") for value in varying):
+        return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete responses above a minimum size with gzip, or with
+    brotli/zstd when those packages are installed and accepted by the client.
+    Complete 200 responses carry an ETag, the application's or a digest of the body, suffixed
+    with the content-coding when compressed, and GET requests with a matching If-None-Match
+    are answered with 304. Compressed bodies are cached by a digest of their content, so
+    repeated reads of an unchanged resource are compressed only once.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        level: int = COMPRESSION_LEVEL,
+        cache_size: int = COMPRESSION_CACHE_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_size = cache_size
+        self.encodings = _available_encodings(level)
+        self._cache = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        encoding = negotiate_encoding(
+            headers.get(b"accept-encoding", b"").decode("latin-1"), self.encodings
+        )
+        if_none_match = headers.get(b"if-none-match") if scope["method"] == "GET" else None
+
+        start_message = None
+        body_parts = []
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                response_headers = dict(message.get("headers", []))
+                media_type = response_headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in response_headers or media_type.startswith(
+                    STREAMING_MEDIA_TYPES
+                ):
+                    passthrough = True
+                    await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                # A streamed body of unknown length: forward it without compression.
+                passthrough = True
+                await send(start_message)
+                await send(
+                    {"type": "http.response.body", "body": b"".join(body_parts), "more_body": True}
+                )
+                return
+
+            await self._send_response(
+                send, start_message, b"".join(body_parts), encoding, if_none_match
+            )
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compress(self, digest: bytes, body: bytes, encoding: str) -> bytes:
+        key = (digest, encoding)
+        compressed = self._cache.get(key)
+        if compressed is not None:
+            self._cache.move_to_end(key)
+            return compressed
+
+        compressed = self.encodings[encoding](body)
+        if self.cache_size > 0:
+            self._cache[key] = compressed
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compressed
+
+    async def _send_response(
+        self,
+        send,
+        start_message: dict,
+        body: bytes,
+        encoding: str,
+        if_none_match: bytes = None,
+    ):
+        """
+        Send a complete response, compressed with `encoding` (None for identity) when it is a
+        200 of at least `minimum_size` bytes, or a 304 when `if_none_match` matches its ETag.
+        """
+        if start_message["status"] != 200:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = _with_vary(
+            [
+                (name, value)
+                for name, value in start_message.get("headers", [])
+                if name.lower() not in (b"content-length", b"etag")
+            ]
+        )
+        # The cache is keyed by a digest of the body: an ETag set by the application may
+        # only be unique per resource, not across resources.
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest().encode()
+        etag = dict(start_message.get("headers", [])).get(b"etag") or b'"' + digest + b'"'
+        if encoding is not None and len(body) < self.minimum_size:
+            encoding = None
+        if encoding is not None:
+            etag = encoding_etag(etag, encoding)
+        headers.append((b"etag", etag))
+
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            headers = [(name, value) for name, value in headers if name != b"content-type"]
+            await send({**start_message, "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if encoding is not None:
+            body = self._compress(digest, body, encoding)
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(body)).encode()))
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
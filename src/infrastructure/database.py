@@ -0,0 +1,34 @@
+import os
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "postgres://crehana:secret@db:5432/crehana_tasks")
+DATABASE_POOL_SIZE = int(os.environ.get("DATABASE_POOL_SIZE", "10"))
+
+_engine = None
+
+
+def connect():
+    """
+    Open a new connection to the PostgreSQL database, for work that PostGraphile cannot do
+    efficiently such as COPY.
+    :return: A psycopg2 connection; the caller is responsible for closing it.
+    """
+    # Imported on first use: only imports and maintenance commands need a direct connection,
+    # so the driver stays out of the server's cold start.
+    import psycopg2
+
+    return psycopg2.connect(DATABASE_URL)
+
+
+def get_engine():
+    """
+    Return the process-wide SQLAlchemy engine, creating its connection pool on first use.
+    :return: A SQLAlchemy engine bound to DATABASE_URL.
+    """
+    global _engine
+    if _engine is None:
+        from sqlalchemy import create_engine
+
+        # SQLAlchemy only accepts the "postgresql" scheme, not libpq's "postgres" alias.
+        url = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+        _engine = create_engine(url, pool_size=DATABASE_POOL_SIZE, pool_pre_ping=True)
+    return _engine
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+from collections import defaultdict
+
+EVENT_BUFFER_SIZE = int(os.environ.get("EVENT_BUFFER_SIZE", "100"))
+EVENT_HEARTBEAT_SECONDS = float(os.environ.get("EVENT_HEARTBEAT_SECONDS", "15"))
+
+_DROPPED = object()
+
+
+class Subscription:
+    """
+    A subscriber's bounded buffer of server-sent event messages for one topic.
+    When the buffer overflows the broker drops the subscription instead of blocking publishers.
+    """
+
+    def __init__(self, broker: "EventBroker", topic: str, buffer_size: int):
+        self.topic = topic
+        self.dropped = False
+        self._broker = broker
+        self._queue = asyncio.Queue(maxsize=buffer_size)
+
+    def _offer(self, message: str) -> bool:
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _drop(self):
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(_DROPPED)
+
+    async def next_message(self, timeout: float = None):
+        """
+        Wait for the next message of the subscription.
+        :param timeout: Optional number of seconds to wait before giving up.
+        :return: The encoded event message, or None on timeout or once the subscription is dropped.
+        """
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return None if message is _DROPPED else message
+
+    def close(self):
+        """
+        Unsubscribe from the broker.
+        """
+        self._broker.unsubscribe(self)
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe hub for task list change events.
+    Events are only seen by subscribers connected to the same process as the publisher.
+    """
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, topic: str) -> Subscription:
+        """
+        Subscribe to the events published on a topic.
+        :param topic: Topic to subscribe to, the task list ID.
+        :return: The new subscription.
+        """
+        subscription = Subscription(self, topic, self.buffer_size)
+        self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Remove a subscription from its topic.
+        :param subscription: Subscription to be removed.
+        """
+        subscribers = self._subscriptions.get(subscription.topic)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscriptions[subscription.topic]
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscriptions.get(topic, ()))
+
+    def publish(self, topic: str, event_type: str, data: dict) -> int:
+        """
+        Publish an event to every subscriber of a topic without waiting on any of them.
+        The message is encoded once and shared by all subscribers; subscribers whose
+        buffer is full are dropped.
+        :param topic: Topic to publish to, the task list ID.
+        :param event_type: Name of the event, e.g. 'task.updated'.
+        :param data: JSON serializable event payload.
+        :return: Number of subscribers the event was delivered to.
+        """
+        subscribers = self._subscriptions.get(topic)
+        if not subscribers:
+            return 0
+
+        message = f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+        delivered = 0
+        for subscription in list(subscribers):
+            if subscription._offer(message):
+                delivered += 1
+            else:
+                subscription._drop()
+                self.unsubscribe(subscription)
+        return delivered
+
+
+event_broker = EventBroker()
@@ -1,19 +1,94 @@
+import json
 import os
 import httpx
 from string import Template
 
 GRAPHQL_URL = os.environ.get("GRAPHQL_URL", "http://postgraphile:5000/graphql")
+# "http" sends operations to PostGraphile; "inprocess" resolves them directly against the
+# database with `src.infrastructure.graphql_executor`; "memory" serves them from the
+# in-memory `src.infrastructure.memory_backend`, without any database.
+GRAPHQL_TRANSPORT = os.environ.get("GRAPHQL_TRANSPORT", "http")
+
+
+class GraphQLString(str):
+    """
+    A variable that is rendered as a quoted and escaped GraphQL string literal.
+    Plain strings are substituted verbatim because the query templates quote them themselves.
+    """
+
+
+class GraphQLEnum(str):
+    """
+    A variable that is rendered as a bare GraphQL enum value, also inside lists and objects.
+    """
+
+
+def to_graphql_literal(value) -> str:
+    """
+    Render a Python value as a GraphQL input literal.
+    :param value: None, bool, number, string, list or dict to be rendered.
+    :return: The GraphQL literal representation of the value.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, GraphQLEnum):
+        return str(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(to_graphql_literal(item) for item in value) + "]"
+    if isinstance(value, dict):
+        fields = ", ".join(f"{key}: {to_graphql_literal(item)}" for key, item in value.items())
+        return "{" + fields + "}"
+    raise TypeError(f"Cannot render {type(value).__name__} as a GraphQL literal")
+
+
+def get_result_field(result: dict, *path):
+    """
+    Walk a GraphQL response along the given keys.
+    :param result: JSON response from the GraphQL server.
+    :param path: Keys to follow, e.g. "data", "createTask", "task".
+    :return: The value found, or None when any level is missing or null.
+    """
+    value = result
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _render_variable(value) -> str:
+    if isinstance(value, str) and not isinstance(value, GraphQLString):
+        return value
+    return to_graphql_literal(value)
 
 
 async def execute_graphql(query: str, variables: dict = None):
     """
-    Execute a GraphQL query against the PostGraphile server.
+    Execute a GraphQL query against the PostGraphile server, or in process when
+    GRAPHQL_TRANSPORT is "inprocess" or "memory".
     :param query: GraphQL query string to be executed.
     :param variables: Optional dictionary of variables to be substituted in the query.
     :return: JSON response from the GraphQL server.
     """
+    if GRAPHQL_TRANSPORT == "inprocess":
+        # Imported here so the HTTP transport does not load SQLAlchemy and the table models.
+        from src.infrastructure.graphql_executor import executor
+
+        return await executor.execute(query, variables)
+    if GRAPHQL_TRANSPORT == "memory":
+        from src.infrastructure.memory_backend import memory_backend
+
+        return await memory_backend.execute(query, variables)
+
     if variables:
-        query = Template(query).safe_substitute(variables)
+        rendered = {key: _render_variable(value) for key, value in variables.items()}
+        query = Template(query).safe_substitute(rendered)
 
     async with httpx.AsyncClient() as client:
         response = await client.post(
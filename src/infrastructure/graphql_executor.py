@@ -0,0 +1,789 @@
+"""
+In-process execution of the GraphQL operations issued by `src/services/`.
+
+Every service sends a fixed document with a named operation, so instead of parsing GraphQL
+the executor dispatches on the operation name and resolves it against the tables of
+`src/domain/db_models.py` (and the SQL functions PostGraphile would call), returning the
+same response shape PostGraphile does. Variables are used as the Python values the services
+pass, without rendering them into the document.
+"""
+
+import asyncio
+import json
+
+from sqlalchemy import (
+    TIMESTAMP,
+    cast,
+    delete,
+    func,
+    insert,
+    null,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import StatementError
+
+from src.domain.db_models import (
+    assigned_task,
+    assigned_task_archive,
+    task_archive_table,
+    task_list_table,
+    task_table,
+    user_table,
+    webhook_subscription_table,
+)
+from src.infrastructure.database import get_engine
+from src.infrastructure.graphql_operations import (
+    ACTIVITY_FIELDS,
+    JOB_FIELDS,
+    ARCHIVED_TASK_FIELDS,
+    SUMMARY_FIELDS,
+    TASK_FIELDS,
+    TASK_LIST_FIELDS,
+    TASK_PROGRESS_EXCLUDED_FIELDS,
+    TOMBSTONE_FIELDS,
+    USER_FIELDS,
+    WEBHOOK_FIELDS,
+    OperationError,
+    OperationRegistry,
+    aliased_task_patches,
+    filter_conditions,
+    json_value,
+    node_id,
+    not_deleted_error,
+    operation_name,
+    order_by_columns,
+    to_node,
+    unknown_operation,
+)
+
+_TASK_COLUMNS = [task_table.c[column] for column in TASK_FIELDS.values()]
+
+_COMPARISONS = {
+    "equalTo": lambda column, value: column == value,
+    "in": lambda column, value: column.in_(value),
+    "greaterThan": lambda column, value: column > value,
+    "greaterThanOrEqualTo": lambda column, value: column >= value,
+    "lessThan": lambda column, value: column < value,
+    "lessThanOrEqualTo": lambda column, value: column <= value,
+}
+
+operations = OperationRegistry()
+
+_VISIBLE_TASK_LIST = task_list_table.c.deleted_at.is_(None)
+
+
+def _in_visible_task_list(table):
+    """
+    Condition leaving out the rows of soft-deleted task lists.
+    """
+    return table.c.task_list_id.in_(select(task_list_table.c.id).where(_VISIBLE_TASK_LIST))
+
+
+def _task_source(include_archived: bool):
+    """
+    The task table, or a subquery equivalent to the `task_including_archived` view.
+    """
+    if not include_archived:
+        return task_table
+    return union_all(
+        select(*_TASK_COLUMNS, cast(null(), TIMESTAMP).label("archived_at")).where(
+            _in_visible_task_list(task_table)
+        ),
+        select(*(task_archive_table.c[column] for column in ARCHIVED_TASK_FIELDS.values())).where(
+            _in_visible_task_list(task_archive_table)
+        ),
+    ).subquery("task_including_archived")
+
+
+# Like PostGraphile's create mutations: the column defaults only apply to the fields left out,
+# an explicit null is inserted as is.
+_CREATE_TASK_ARGUMENTS = {
+    "title": "title",
+    "priority": "priority",
+    "status": "status",
+    "completed_percentage": "completed_percentage",
+    "taskListId": "task_list_id",
+}
+
+
+def _present(values: dict) -> dict:
+    """
+    Fields of an update; a null keeps the current value, like `update_task_if_version`.
+    """
+    return {key: value for key, value in values.items() if value is not None}
+
+
+@operations.register("CreateTask")
+def create_task(connection, variables: dict) -> dict:
+    row = connection.execute(
+        insert(task_table)
+        .values(
+            {
+                column: variables[key]
+                for key, column in _CREATE_TASK_ARGUMENTS.items()
+                if key in variables
+            }
+        )
+        .returning(*_TASK_COLUMNS)
+    ).first()
+    return {"createTask": {"task": to_node(row, TASK_FIELDS, exclude=("updatedAt",))}}
+
+
+@operations.register("FetchTaskById")
+def fetch_task_by_id(connection, variables: dict, include_archived: bool = False) -> dict:
+    source = _task_source(include_archived)
+    fields = ARCHIVED_TASK_FIELDS if include_archived else TASK_FIELDS
+    row = connection.execute(
+        select(*(source.c[column] for column in fields.values())).where(
+            source.c.id == variables["id"], _in_visible_task_list(source)
+        )
+    ).first()
+    return {"taskById": to_node(row, fields, exclude=("updatedAt",))}
+
+
+@operations.register("FetchTaskByIdIncludingArchived")
+def fetch_task_by_id_including_archived(connection, variables: dict) -> dict:
+    return fetch_task_by_id(connection, variables, include_archived=True)
+
+
+def _compare_and_set(
+    connection, table, row_id, expected_version, values: dict, columns, *conditions
+):
+    """
+    Update a row only while it still has the expected version, like the `*_if_version` SQL
+    functions.
+    :return: The updated row, or None when the row does not exist or its version differs.
+    """
+    statement = update(table).where(table.c.id == row_id, *conditions)
+    if expected_version is not None:
+        statement = statement.where(table.c.version == expected_version)
+    return connection.execute(statement.values(values).returning(*columns)).first()
+
+
+@operations.register("UpdateTask")
+@operations.register("UpdateTaskStatus")
+def update_task(connection, variables: dict) -> dict:
+    row = _compare_and_set(
+        connection,
+        task_table,
+        variables["id"],
+        variables.get("expected_version"),
+        _present(
+            {
+                "title": variables.get("title"),
+                "priority": variables.get("priority"),
+                "status": variables.get("status"),
+                "completed_percentage": variables.get("completed_percentage"),
+            }
+        ),
+        _TASK_COLUMNS,
+        _in_visible_task_list(task_table),
+    )
+    return {"updateTaskById": {"task": to_node(row, TASK_FIELDS, exclude=("updatedAt",))}}
+
+
+@operations.register("UpdateTasksProgress")
+def update_tasks_progress(connection, variables: dict) -> dict:
+    data = {}
+    for alias, task_id, values in aliased_task_patches(variables):
+        row = _compare_and_set(
+            connection,
+            task_table,
+            task_id,
+            None,
+            values,
+            _TASK_COLUMNS,
+            _in_visible_task_list(task_table),
+        )
+        task = to_node(row, TASK_FIELDS, exclude=TASK_PROGRESS_EXCLUDED_FIELDS)
+        data[alias] = {"task": task} if task else None
+    return data
+
+
+@operations.register("DeleteTask")
+def delete_task(connection, variables: dict) -> dict:
+    task_id = connection.execute(
+        delete(task_table).where(task_table.c.id == variables["id"]).returning(task_table.c.id)
+    ).scalar()
+    if task_id is None:
+        raise not_deleted_error("tasks")
+    return {"deleteTaskById": {"deletedTaskId": node_id("tasks", task_id)}}
+
+
+@operations.register("createAssignedTask")
+def create_assigned_task(connection, variables: dict) -> dict:
+    assignment = connection.execute(
+        insert(assigned_task)
+        .values(task_id=variables["taskId"], user_id=variables["userId"])
+        .returning(assigned_task.c.task_id, assigned_task.c.user_id)
+    ).first()
+    row = connection.execute(
+        select(*_TASK_COLUMNS).where(task_table.c.id == assignment.task_id)
+    ).first()
+    user = connection.execute(
+        select(user_table.c.email, user_table.c.full_name).where(
+            user_table.c.id == assignment.user_id
+        )
+    ).first()
+    return {
+        "createAssignedTask": {
+            "assignedTask": {
+                "taskByTaskId": to_node(row, TASK_FIELDS, exclude=("updatedAt",)),
+                "userByUserId": to_node(user, USER_FIELDS, exclude=("id", "password")),
+            }
+        }
+    }
+
+
+@operations.register("FetchTasksByIds")
+def fetch_tasks_by_ids(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        text("SELECT * FROM visible_tasks(CAST(:ids AS uuid[]))"), {"ids": variables["ids"]}
+    )
+    return {"visibleTasks": {"nodes": [to_node(row, TASK_FIELDS) for row in rows]}}
+
+
+@operations.register("AssignTasks")
+def assign_tasks(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        text("SELECT * FROM assign_tasks(CAST(:task_ids AS uuid[]), CAST(:user_ids AS uuid[]))"),
+        {"task_ids": variables["taskIds"], "user_ids": variables["userIds"]},
+    )
+    nodes = [
+        {
+            "id": json_value(row.id),
+            "taskId": json_value(row.task_id),
+            "userId": json_value(row.user_id),
+            "createdAt": json_value(row.created_at),
+        }
+        for row in rows
+    ]
+    return {"assignTasks": {"assignedTasks": nodes}}
+
+
+@operations.register("SearchTasks")
+def search_tasks(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        text("SELECT * FROM search_tasks(:search, CAST(:list_id AS uuid), :max_results)"),
+        {
+            "search": variables["search"],
+            "list_id": variables.get("listId"),
+            "max_results": variables.get("limit", 20),
+        },
+    )
+    nodes = [to_node(row, TASK_FIELDS, exclude=("updatedAt",)) for row in rows]
+    return {"searchTasks": {"nodes": nodes}}
+
+
+@operations.register("CreateTaskList")
+def create_task_list(connection, variables: dict) -> dict:
+    row = connection.execute(
+        insert(task_list_table)
+        .values(name=variables["name"])
+        .returning(*(task_list_table.c[column] for column in TASK_LIST_FIELDS.values()))
+    ).first()
+    return {"createTaskList": {"taskList": to_node(row, TASK_LIST_FIELDS)}}
+
+
+def _task_list_with_summary(connection, task_list_id) -> dict:
+    row = connection.execute(
+        text(
+            "SELECT tl.id, tl.name, tl.created_at, tl.version, s.* "
+            "FROM task_list tl, task_list_summary(tl) s "
+            "WHERE tl.id = CAST(:id AS uuid) AND tl.deleted_at IS NULL"
+        ),
+        {"id": task_list_id},
+    ).first()
+    if row is None:
+        return None
+    return {**to_node(row, TASK_LIST_FIELDS), "summary": to_node(row, SUMMARY_FIELDS)}
+
+
+@operations.register("FetchTaskListById")
+def fetch_task_list_by_id(connection, variables: dict) -> dict:
+    return {"taskListById": _task_list_with_summary(connection, variables["id"])}
+
+
+@operations.register("FetchTaskListStats")
+def fetch_task_list_stats(connection, variables: dict) -> dict:
+    task_list = _task_list_with_summary(connection, variables["id"])
+    if task_list is not None:
+        task_list = {"id": task_list["id"], "summary": task_list["summary"]}
+    return {"taskListById": task_list}
+
+
+@operations.register("UpdateTaskList")
+def update_task_list(connection, variables: dict) -> dict:
+    row = _compare_and_set(
+        connection,
+        task_list_table,
+        variables["id"],
+        variables.get("expected_version"),
+        {"name": variables["name"]},
+        [task_list_table.c[column] for column in TASK_LIST_FIELDS.values()],
+        _VISIBLE_TASK_LIST,
+    )
+    return {"updateTaskListById": {"taskList": to_node(row, TASK_LIST_FIELDS)}}
+
+
+@operations.register("DeleteTaskList")
+def delete_task_list(connection, variables: dict) -> dict:
+    row = connection.execute(
+        update(task_list_table)
+        .where(task_list_table.c.id == variables["id"], _VISIBLE_TASK_LIST)
+        .values(deleted_at=func.now())
+        .returning(task_list_table.c.id, task_list_table.c.deleted_at)
+    ).first()
+    task_list = {"id": json_value(row.id), "deletedAt": json_value(row.deleted_at)} if row else None
+    return {"deleteTaskListById": {"taskList": task_list}}
+
+
+def _with_assignees(connection, nodes: list, include_archived: bool = False) -> list:
+    """
+    Add the `assignedTasksByTaskId` connection selected with `@include(if: $assignees)` to
+    task nodes; archived tasks read the assignments archived with them.
+    """
+    columns = ("id", "task_id", "user_id", "created_at")
+    source = assigned_task
+    if include_archived:
+        source = union_all(
+            select(*(assigned_task.c[column] for column in columns)),
+            select(*(assigned_task_archive.c[column] for column in columns)),
+        ).subquery("assigned_task_including_archived")
+
+    rows = connection.execute(
+        select(source.c.task_id, user_table.c.id, user_table.c.full_name, user_table.c.email)
+        .join(user_table, user_table.c.id == source.c.user_id)
+        .where(source.c.task_id.in_([node["id"] for node in nodes]))
+        .order_by(source.c.created_at, source.c.id)
+    )
+    assignments = {}
+    for row in rows:
+        user = to_node(row, USER_FIELDS, exclude=("password",))
+        assignments.setdefault(json_value(row.task_id), []).append({"userByUserId": user})
+    for node in nodes:
+        node["assignedTasksByTaskId"] = {"nodes": assignments.get(node["id"], [])}
+    return nodes
+
+
+@operations.register("FetchTaskListWithTasks")
+def fetch_task_list_with_tasks(connection, variables: dict, include_archived: bool = False) -> dict:
+    row = connection.execute(
+        select(*(task_list_table.c[column] for column in TASK_LIST_FIELDS.values())).where(
+            task_list_table.c.id == variables["id"], _VISIBLE_TASK_LIST
+        )
+    ).first()
+    if row is None:
+        return {"taskListById": None}
+
+    source = _task_source(include_archived)
+    fields = ARCHIVED_TASK_FIELDS if include_archived else TASK_FIELDS
+    tasks = connection.execute(
+        select(*(source.c[column] for column in fields.values()))
+        .where(source.c.task_list_id == row.id)
+        .order_by(source.c.id)
+    )
+    nodes = [to_node(task, fields, exclude=("taskListId",)) for task in tasks]
+    if variables.get("assignees"):
+        _with_assignees(connection, nodes, include_archived)
+    return {
+        "taskListById": {**to_node(row, TASK_LIST_FIELDS), "tasksByTaskListId": {"nodes": nodes}}
+    }
+
+
+@operations.register("FetchTaskListWithTasksIncludingArchived")
+def fetch_task_list_with_tasks_including_archived(connection, variables: dict) -> dict:
+    return fetch_task_list_with_tasks(connection, variables, include_archived=True)
+
+
+@operations.register("allTasksByFilter")
+def all_tasks_by_filter(connection, variables: dict, include_archived: bool = False) -> dict:
+    source = _task_source(include_archived)
+    fields = ARCHIVED_TASK_FIELDS if include_archived else TASK_FIELDS
+    query = select(*(source.c[column] for column in fields.values()))
+    for column, operator, value in filter_conditions(variables.get("filter"), TASK_FIELDS):
+        query = query.where(_COMPARISONS[operator](source.c[column], value))
+    for column, descending in order_by_columns(variables.get("orderBy")):
+        query = query.order_by(source.c[column].desc() if descending else source.c[column])
+
+    rows = connection.execute(query)
+    nodes = [to_node(row, fields, exclude=("taskListId", "updatedAt")) for row in rows]
+    if variables.get("assignees"):
+        _with_assignees(connection, nodes, include_archived)
+    return {"allTasks": {"nodes": nodes}}
+
+
+@operations.register("allTasksIncludingArchivedByFilter")
+def all_tasks_including_archived_by_filter(connection, variables: dict) -> dict:
+    return all_tasks_by_filter(connection, variables, include_archived=True)
+
+
+@operations.register("RebuildTaskListStats")
+def rebuild_task_list_stats(connection, variables: dict) -> dict:
+    drifted = connection.execute(
+        text("SELECT rebuild_task_list_stats(CAST(:list_id AS uuid), :dry_run)"),
+        {"list_id": variables.get("listId"), "dry_run": bool(variables.get("dryRun"))},
+    ).scalar()
+    return {"rebuildTaskListStats": {"integer": drifted}}
+
+
+@operations.register("FetchTaskListChanges")
+def fetch_task_list_changes(connection, variables: dict) -> dict:
+    arguments = {"list_id": variables["id"], "since": variables["since"]}
+    task_list_id = connection.execute(
+        select(task_list_table.c.id).where(
+            task_list_table.c.id == variables["id"], _VISIBLE_TASK_LIST
+        )
+    ).scalar()
+    tasks = connection.execute(
+        text(
+            "SELECT * FROM tasks_updated_since(CAST(:list_id AS uuid), CAST(:since AS timestamp))"
+        ),
+        arguments,
+    )
+    tombstones = connection.execute(
+        text(
+            "SELECT task_id, deleted_at "
+            "FROM task_tombstones_since(CAST(:list_id AS uuid), CAST(:since AS timestamp))"
+        ),
+        arguments,
+    )
+    nodes = [to_node(row, TASK_FIELDS, exclude=("taskListId",)) for row in tasks]
+    if variables.get("assignees"):
+        _with_assignees(connection, nodes)
+    watermark = connection.execute(text("SELECT sync_watermark()")).scalar()
+    return {
+        "syncWatermark": json_value(watermark),
+        "taskListById": {"id": json_value(task_list_id)} if task_list_id else None,
+        "tasksUpdatedSince": {"nodes": nodes},
+        "taskTombstonesSince": {"nodes": [to_node(row, TOMBSTONE_FIELDS) for row in tombstones]},
+    }
+
+
+def _bulk_filter_arguments(variables: dict) -> dict:
+    return {
+        "list_id": variables["listId"],
+        "task_ids": variables.get("taskIds"),
+        "statuses": variables.get("statuses"),
+        "priorities": variables.get("priorities"),
+        "acting_user_id": variables.get("userId"),
+    }
+
+
+@operations.register("BulkUpdateTasks")
+def bulk_update_tasks(connection, variables: dict) -> dict:
+    updated = connection.execute(
+        text(
+            "SELECT bulk_update_tasks("
+            "CAST(:list_id AS uuid), CAST(:task_ids AS uuid[]), "
+            "CAST(:statuses AS task_status[]), CAST(:priorities AS task_priority[]), "
+            "CAST(:new_status AS task_status), CAST(:new_priority AS task_priority), "
+            ":new_completed_percentage, CAST(:acting_user_id AS uuid))"
+        ),
+        {
+            **_bulk_filter_arguments(variables),
+            "new_status": variables.get("newStatus"),
+            "new_priority": variables.get("newPriority"),
+            "new_completed_percentage": variables.get("newCompletedPercentage"),
+        },
+    ).scalar()
+    return {"bulkUpdateTasks": {"integer": updated}}
+
+
+@operations.register("BulkDeleteTasks")
+def bulk_delete_tasks(connection, variables: dict) -> dict:
+    deleted = connection.execute(
+        text(
+            "SELECT bulk_delete_tasks("
+            "CAST(:list_id AS uuid), CAST(:task_ids AS uuid[]), "
+            "CAST(:statuses AS task_status[]), CAST(:priorities AS task_priority[]), "
+            "CAST(:acting_user_id AS uuid))"
+        ),
+        _bulk_filter_arguments(variables),
+    ).scalar()
+    return {"bulkDeleteTasks": {"integer": deleted}}
+
+
+@operations.register("ArchiveCompletedTasks")
+def archive_completed_tasks(connection, variables: dict) -> dict:
+    archived = connection.execute(
+        text("SELECT archive_completed_tasks(:older_than_days, :batch_size)"),
+        {"older_than_days": variables["olderThanDays"], "batch_size": variables["batchSize"]},
+    ).scalar()
+    return {"archiveCompletedTasks": {"integer": archived}}
+
+
+@operations.register("RestoreArchivedTasks")
+def restore_archived_tasks(connection, variables: dict) -> dict:
+    restored = connection.execute(
+        text(
+            "SELECT restore_archived_tasks("
+            "CAST(:list_id AS uuid), CAST(:task_ids AS uuid[]), CAST(:acting_user_id AS uuid))"
+        ),
+        {
+            "list_id": variables["listId"],
+            "task_ids": variables["taskIds"],
+            "acting_user_id": variables.get("userId"),
+        },
+    ).scalar()
+    return {"restoreArchivedTasks": {"integer": restored}}
+
+
+@operations.register("PurgeDeletedTaskLists")
+def purge_deleted_task_lists(connection, variables: dict) -> dict:
+    purged = connection.execute(
+        text("SELECT purge_deleted_task_lists(:batch_size)"),
+        {"batch_size": variables["batchSize"]},
+    ).scalar()
+    return {"purgeDeletedTaskLists": {"integer": purged}}
+
+
+@operations.register("PruneTaskTombstones")
+def prune_task_tombstones(connection, variables: dict) -> dict:
+    pruned = connection.execute(
+        text("SELECT prune_task_tombstones(:older_than_days, :batch_size)"),
+        {"older_than_days": variables["olderThanDays"], "batch_size": variables["batchSize"]},
+    ).scalar()
+    return {"pruneTaskTombstones": {"integer": pruned}}
+
+
+@operations.register("RecordActivity")
+def record_activity(connection, variables: dict) -> dict:
+    recorded = connection.execute(
+        text("SELECT record_activity(CAST(:entries AS jsonb))"),
+        {"entries": json.dumps(variables["entries"])},
+    ).scalar()
+    return {"recordActivity": {"integer": recorded}}
+
+
+@operations.register("FetchTaskActivity")
+def fetch_task_activity(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        text(
+            "SELECT * FROM task_activity("
+            "CAST(:task_id AS uuid), CAST(:before_id AS bigint), :page_size)"
+        ),
+        {
+            "task_id": variables["taskId"],
+            "before_id": variables.get("beforeId"),
+            "page_size": variables.get("pageSize", 20),
+        },
+    )
+    # PostGraphile serializes bigint as a string.
+    nodes = [{**to_node(row, ACTIVITY_FIELDS), "id": str(row.id)} for row in rows]
+    return {"taskActivity": {"nodes": nodes}}
+
+
+def _job_node(row) -> dict:
+    # PostGraphile serializes bigint as a string.
+    return {**to_node(row, JOB_FIELDS), "id": str(row.id)}
+
+
+@operations.register("EnqueueJob")
+def enqueue_job(connection, variables: dict) -> dict:
+    row = connection.execute(
+        text("SELECT * FROM enqueue_job(:kind, CAST(:payload AS jsonb), :max_attempts)"),
+        {
+            "kind": variables["kind"],
+            "payload": json.dumps(variables.get("payload") or {}),
+            "max_attempts": variables.get("maxAttempts", 5),
+        },
+    ).first()
+    return {"enqueueJob": {"job": {"id": str(row.id)}}}
+
+
+@operations.register("EnqueueJobs")
+def enqueue_jobs(connection, variables: dict) -> dict:
+    queued = connection.execute(
+        text("SELECT enqueue_jobs(:kind, CAST(:payloads AS jsonb))"),
+        {"kind": variables["kind"], "payloads": json.dumps(variables["payloads"])},
+    ).scalar()
+    return {"enqueueJobs": {"integer": queued}}
+
+
+@operations.register("ClaimJobs")
+def claim_jobs(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        text("SELECT * FROM claim_jobs(:batch_size, :lease_seconds) ORDER BY run_at, id"),
+        {"batch_size": variables["batchSize"], "lease_seconds": variables["leaseSeconds"]},
+    )
+    return {"claimJobs": {"jobs": [_job_node(row) for row in rows]}}
+
+
+@operations.register("CompleteJobs")
+def complete_jobs(connection, variables: dict) -> dict:
+    completed = connection.execute(
+        text("SELECT complete_jobs(CAST(:job_ids AS bigint[]))"),
+        {"job_ids": [int(job_id) for job_id in variables["jobIds"]]},
+    ).scalar()
+    return {"completeJobs": {"integer": completed}}
+
+
+@operations.register("RetryJob")
+def retry_job(connection, variables: dict) -> dict:
+    row = connection.execute(
+        text("SELECT * FROM retry_job(CAST(:job_id AS bigint), :error, :retry_in_seconds)"),
+        {
+            "job_id": variables["jobId"],
+            "error": variables["error"],
+            "retry_in_seconds": variables.get("retryInSeconds"),
+        },
+    ).first()
+    job = {"id": str(row.id), "failedAt": json_value(row.failed_at)} if row.id else None
+    return {"retryJob": {"job": job}}
+
+
+@operations.register("CreateWebhook")
+def create_webhook(connection, variables: dict) -> dict:
+    row = connection.execute(
+        insert(webhook_subscription_table)
+        .values(
+            task_list_id=variables["taskListId"],
+            url=variables["url"],
+            secret=variables["secret"],
+        )
+        .returning(*webhook_subscription_table.c)
+    ).first()
+    return {"createWebhookSubscription": {"webhookSubscription": to_node(row, WEBHOOK_FIELDS)}}
+
+
+@operations.register("FetchWebhooks")
+def fetch_webhooks(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        select(webhook_subscription_table)
+        .where(webhook_subscription_table.c.task_list_id == variables["taskListId"])
+        .order_by(webhook_subscription_table.c.created_at, webhook_subscription_table.c.id)
+    )
+    nodes = [to_node(row, WEBHOOK_FIELDS, exclude=("secret",)) for row in rows]
+    return {"allWebhookSubscriptions": {"nodes": nodes}}
+
+
+@operations.register("DeleteWebhook")
+def delete_webhook(connection, variables: dict) -> dict:
+    webhook_id = connection.execute(
+        text(
+            "SELECT id FROM remove_webhook_subscription("
+            "CAST(:list_id AS uuid), CAST(:webhook_id AS uuid))"
+        ),
+        {"list_id": variables["taskListId"], "webhook_id": variables["webhookId"]},
+    ).scalar()
+    webhook = {"id": json_value(webhook_id)} if webhook_id else None
+    return {"deleteWebhookSubscription": {"webhookSubscription": webhook}}
+
+
+@operations.register("GetUserByEmail")
+def get_user_by_email(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        select(*(user_table.c[column] for column in USER_FIELDS.values())).where(
+            user_table.c.email == variables["email"]
+        )
+    )
+    return {"allUsers": {"nodes": [to_node(row, USER_FIELDS) for row in rows]}}
+
+
+@operations.register("FetchUsersByIds")
+def fetch_users_by_ids(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        select(user_table.c.id, user_table.c.email, user_table.c.full_name).where(
+            user_table.c.id.in_(variables["ids"])
+        )
+    )
+    return {
+        "allUsers": {"nodes": [to_node(row, USER_FIELDS, exclude=("password",)) for row in rows]}
+    }
+
+
+@operations.register("CreateUser")
+def create_user(connection, variables: dict) -> dict:
+    row = connection.execute(
+        insert(user_table)
+        .values(
+            email=variables["email"],
+            password=variables["password"],
+            full_name=variables["fullName"],
+        )
+        .returning(user_table.c.id, user_table.c.email, user_table.c.full_name)
+    ).first()
+    return {"createUser": {"user": to_node(row, USER_FIELDS, exclude=("password",))}}
+
+
+@operations.register("FetchUserAssignedTasks")
+def fetch_user_assigned_tasks(connection, variables: dict) -> dict:
+    rows = connection.execute(
+        text(
+            "SELECT a.id AS assignment_id, a.created_at AS assigned_at, t.* "
+            "FROM user_assigned_tasks("
+            "CAST(:user_id AS uuid), CAST(:status AS task_status), "
+            "CAST(:priority AS task_priority), CAST(:after_created_at AS timestamp), "
+            "CAST(:after_id AS uuid), :page_size) a "
+            "JOIN task t ON t.id = a.task_id "
+            "ORDER BY a.created_at DESC, a.id DESC"
+        ),
+        {
+            "user_id": variables["userId"],
+            "status": variables.get("status"),
+            "priority": variables.get("priority"),
+            "after_created_at": variables.get("afterCreatedAt"),
+            "after_id": variables.get("afterId"),
+            "page_size": variables.get("pageSize", 20),
+        },
+    )
+    nodes = [
+        {
+            "id": json_value(row.assignment_id),
+            "createdAt": json_value(row.assigned_at),
+            "taskByTaskId": to_node(row, TASK_FIELDS),
+        }
+        for row in rows
+    ]
+    return {"userAssignedTasks": {"nodes": nodes}}
+
+
+class InProcessExecutor:
+    """
+    Runs service operations directly against the database, each in its own transaction on
+    a pooled connection, in a worker thread so the event loop is never blocked.
+    """
+
+    def __init__(self, engine=None):
+        """
+        :param engine: SQLAlchemy engine; the application engine when omitted.
+        """
+        self._engine = engine
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = get_engine()
+        return self._engine
+
+    def _run(self, resolver, variables: dict) -> dict:
+        with self.engine.begin() as connection:
+            return resolver(connection, variables)
+
+    async def execute(self, query: str, variables: dict = None) -> dict:
+        """
+        Execute a service operation.
+        :param query: GraphQL document of the operation; only its name is used.
+        :param variables: Variables of the operation as Python values.
+        :return: A response dictionary with either `data` or `errors`, like PostGraphile's.
+        """
+        name = operation_name(query)
+        resolver = operations.get(name)
+        if resolver is None:
+            return unknown_operation(name)
+
+        try:
+            data = await asyncio.to_thread(self._run, resolver, variables or {})
+        except OperationError as e:
+            return {"data": None, "errors": [{"message": str(e)}]}
+        except StatementError as e:
+            message = str(e.orig if e.orig is not None else e).strip().splitlines()[0]
+            return {"data": None, "errors": [{"message": message}]}
+        return {"data": data}
+
+
+executor = InProcessExecutor()
@@ -0,0 +1,198 @@
+"""
+Pieces shared by the backends that serve the GraphQL operations of `src/services/` without
+PostGraphile: operation dispatch, the fields each operation selects and PostGraphile's
+response conventions.
+"""
+
+import base64
+import json
+import re
+from datetime import datetime
+from uuid import UUID
+
+OPERATION_NAME = re.compile(r"^\s*(?:query|mutation)\s+(\w+)")
+
+TASK_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "priority": "priority",
+    "status": "status",
+    "completedPercentage": "completed_percentage",
+    "taskListId": "task_list_id",
+    "createdAt": "created_at",
+    "updatedAt": "updated_at",
+    "version": "version",
+}
+ARCHIVED_TASK_FIELDS = {**TASK_FIELDS, "archivedAt": "archived_at"}
+TASK_PROGRESS_EXCLUDED_FIELDS = ("title", "priority", "createdAt")
+TASK_LIST_FIELDS = {"id": "id", "name": "name", "createdAt": "created_at", "version": "version"}
+SUMMARY_FIELDS = {
+    "totalCount": "total_count",
+    "pendingCount": "pending_count",
+    "inProcessCount": "in_process_count",
+    "completedCount": "completed_count",
+    "lowPriorityCount": "low_priority_count",
+    "mediumPriorityCount": "medium_priority_count",
+    "highPriorityCount": "high_priority_count",
+    "averageCompletedPercentage": "average_completed_percentage",
+}
+FILTER_OPERATORS = (
+    "equalTo",
+    "in",
+    "greaterThan",
+    "greaterThanOrEqualTo",
+    "lessThan",
+    "lessThanOrEqualTo",
+)
+USER_FIELDS = {"id": "id", "email": "email", "fullName": "full_name", "password": "password"}
+TOMBSTONE_FIELDS = {"taskId": "task_id", "deletedAt": "deleted_at"}
+JOB_FIELDS = {
+    "id": "id",
+    "kind": "kind",
+    "payload": "payload",
+    "attempts": "attempts",
+    "maxAttempts": "max_attempts",
+}
+WEBHOOK_FIELDS = {
+    "id": "id",
+    "taskListId": "task_list_id",
+    "url": "url",
+    "secret": "secret",
+    "createdAt": "created_at",
+}
+ACTIVITY_FIELDS = {
+    "id": "id",
+    "taskListId": "task_list_id",
+    "taskId": "task_id",
+    "userId": "user_id",
+    "action": "action",
+    "details": "details",
+    "createdAt": "created_at",
+}
+
+
+class OperationError(Exception):
+    """
+    An error reported in the `errors` list of the response, like PostGraphile does.
+    """
+
+
+class OperationRegistry(dict):
+    """
+    Resolvers of a backend by operation name.
+    """
+
+    def register(self, name: str):
+        """
+        Register the decorated function as the resolver of a named operation.
+        :param name: Operation name used in the service query documents.
+        """
+
+        def register(resolver):
+            self[name] = resolver
+            return resolver
+
+        return register
+
+
+def operation_name(query: str) -> str:
+    """
+    Extract the name of the operation defined by a query document.
+    :param query: GraphQL document with a single named query or mutation.
+    :return: The operation name, or None for anonymous documents.
+    """
+    match = OPERATION_NAME.match(query)
+    return match.group(1) if match else None
+
+
+def filter_conditions(connection_filter: dict, fields: dict) -> list:
+    """
+    Flatten a connection `filter` argument (postgraphile-plugin-connection-filter) into
+    conditions. Only the comparison operators the services use are supported.
+    :param connection_filter: Filter object keyed by GraphQL field name, e.g.
+        {"status": {"in": ["pending"]}}.
+    :param fields: Mapping of GraphQL field names to column names.
+    :return: List of (column, operator, value) tuples.
+    """
+    conditions = []
+    for field, comparisons in (connection_filter or {}).items():
+        if field not in fields:
+            raise OperationError(f"Filtering on '{field}' is not supported.")
+        for operator, value in comparisons.items():
+            if operator not in FILTER_OPERATORS:
+                raise OperationError(f"Filter operator '{operator}' is not supported.")
+            conditions.append((fields[field], operator, value))
+    return conditions
+
+
+def order_by_columns(order_by) -> list:
+    """
+    Translate an `orderBy` argument such as ["PRIORITY_DESC", "PRIMARY_KEY_DESC"].
+    :param order_by: List of PostGraphile ordering enum values.
+    :return: List of (column, descending) tuples.
+    """
+    columns = []
+    for ordering in order_by or ():
+        field, _, direction = str(ordering).rpartition("_")
+        column = "id" if field == "PRIMARY_KEY" else field.lower()
+        columns.append((column, direction == "DESC"))
+    return columns
+
+
+def aliased_task_patches(variables: dict):
+    """
+    Yield the alias, task ID and column values of each mutation of an `UpdateTasksProgress`
+    document, whose variables are `id0`, `status0`, `completed_percentage0`, `id1`, ...
+    """
+    index = 0
+    while f"id{index}" in variables:
+        values = {
+            column: variables[f"{column}{index}"]
+            for column in ("status", "completed_percentage")
+            if variables.get(f"{column}{index}") is not None
+        }
+        yield f"t{index}", variables[f"id{index}"], values
+        index += 1
+
+
+def unknown_operation(name: str) -> dict:
+    return {"errors": [{"message": f"Unknown operation '{name}'."}]}
+
+
+def json_value(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def to_node(row, fields: dict, exclude=()) -> dict:
+    """
+    Convert a row to a GraphQL node with camelCase field names and JSON values.
+    :param row: Result row or dictionary keyed by column name, or None.
+    :param fields: Mapping of GraphQL field names to column names.
+    :param exclude: GraphQL fields not selected by the operation.
+    """
+    if row is None:
+        return None
+    mapping = getattr(row, "_mapping", row)
+    return {
+        field: json_value(mapping[column])
+        for field, column in fields.items()
+        if field not in exclude
+    }
+
+
+def node_id(collection: str, primary_key) -> str:
+    """
+    Global node ID of a row, encoded the way PostGraphile does.
+    """
+    return base64.b64encode(json.dumps([collection, str(primary_key)]).encode()).decode()
+
+
+def not_deleted_error(collection: str) -> OperationError:
+    return OperationError(
+        f"No values were deleted in collection '{collection}' because no values you asked "
+        "for matched"
+    )
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+from collections import defaultdict
+
+JOB_CONCURRENCY = int(os.environ.get("JOB_CONCURRENCY", "4"))
+JOB_BATCH_SIZE = int(os.environ.get("JOB_BATCH_SIZE", "20"))
+JOB_LEASE_SECONDS = int(os.environ.get("JOB_LEASE_SECONDS", "300"))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "1"))
+JOB_RETRY_BASE_SECONDS = int(os.environ.get("JOB_RETRY_BASE_SECONDS", "10"))
+JOB_RETRY_MAX_SECONDS = int(os.environ.get("JOB_RETRY_MAX_SECONDS", "3600"))
+
+logger = logging.getLogger(__name__)
+
+
+def retry_delay(
+    attempts: int, base: int = JOB_RETRY_BASE_SECONDS, maximum: int = JOB_RETRY_MAX_SECONDS
+) -> int:
+    """
+    Exponential backoff: `base` seconds after the first attempt, doubling with every further
+    attempt up to `maximum`.
+    """
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+class JobWorker:
+    """
+    Runs the jobs of a durable queue. Each poll claims up to `concurrency * batch_size` due
+    jobs, groups them by kind and hands them to the handler of their kind in batches of up to
+    `batch_size`, at most `concurrency` batches at a time. Failed jobs are retried with
+    exponential backoff until they run out of attempts.
+    """
+
+    def __init__(
+        self,
+        handlers: dict,
+        claim_jobs,
+        complete_jobs,
+        retry_job,
+        concurrency: int = JOB_CONCURRENCY,
+        batch_size: int = JOB_BATCH_SIZE,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        poll_seconds: float = JOB_POLL_SECONDS,
+    ):
+        """
+        :param handlers: Dictionary of job kinds to coroutine functions receiving a list of
+            payloads and returning, for each one, None on success or the error.
+            If a handler raises, the whole batch failed.
+        :param claim_jobs: Coroutine function(batch_size, lease_seconds) returning the claimed
+            jobs, with their 'id', 'kind', 'payload', 'attempts' and 'maxAttempts'.
+        :param complete_jobs: Coroutine function receiving the IDs of the finished jobs.
+        :param retry_job: Coroutine function(job_id, error, retry_in_seconds) releasing a
+            failed job; `retry_in_seconds` is None when the job is out of attempts.
+        :param concurrency: Maximum number of handler batches running at once.
+        :param batch_size: Maximum number of jobs per handler call.
+        :param lease_seconds: Seconds after which jobs of a stuck worker are claimed again.
+        :param poll_seconds: Seconds to wait before polling again when the queue ran dry.
+        """
+        self.handlers = handlers
+        self.claim_jobs = claim_jobs
+        self.complete_jobs = complete_jobs
+        self.retry_job = retry_job
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.completed = 0
+        self.failed = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _handle(self, kind: str, jobs: list) -> list:
+        handler = self.handlers.get(kind)
+        if handler is None:
+            return [f"No handler for jobs of kind '{kind}'."] * len(jobs)
+        try:
+            async with self._semaphore:
+                return await handler([job["payload"] for job in jobs])
+        except Exception as e:
+            logger.exception("Handling %d job(s) of kind '%s' failed", len(jobs), kind)
+            return [str(e) or type(e).__name__] * len(jobs)
+
+    async def _run_batch(self, kind: str, jobs: list):
+        errors = await self._handle(kind, jobs)
+        done = [job["id"] for job, error in zip(jobs, errors) if error is None]
+        if done:
+            await self.complete_jobs(done)
+            self.completed += len(done)
+
+        for job, error in zip(jobs, errors):
+            if error is None:
+                continue
+            self.failed += 1
+            retry_in = None
+            if job["attempts"] < job["maxAttempts"]:
+                retry_in = retry_delay(job["attempts"])
+            else:
+                logger.error("Job %s of kind '%s' failed for good: %s", job["id"], kind, error)
+            await self.retry_job(job["id"], error, retry_in)
+
+    async def run_once(self) -> int:
+        """
+        Claim one round of due jobs and run them.
+        :return: Number of jobs claimed.
+        """
+        jobs = await self.claim_jobs(self.concurrency * self.batch_size, self.lease_seconds)
+        batches = defaultdict(list)
+        for job in jobs:
+            kind_batches = batches[job["kind"]]
+            if not kind_batches or len(kind_batches[-1]) == self.batch_size:
+                kind_batches.append([])
+            kind_batches[-1].append(job)
+
+        await asyncio.gather(
+            *(
+                self._run_batch(kind, batch)
+                for kind, kind_batches in batches.items()
+                for batch in kind_batches
+            )
+        )
+        return len(jobs)
+
+    async def run(self, stop: asyncio.Event = None):
+        """
+        Keep running jobs, polling every `poll_seconds` while the queue is empty.
+        :param stop: Optional event ending the loop once the current round is done.
+        """
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Claiming jobs failed")
+                claimed = 0
+            if claimed < self.concurrency * self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import smtplib
+from email.message import EmailMessage
+
+SMTP_HOST = os.environ.get("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "25"))
+SMTP_SENDER = os.environ.get("SMTP_SENDER", "Crehana Tasks <no-reply@crehana-tasks.local>")
+SMTP_USERNAME = os.environ.get("SMTP_USERNAME")
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD")
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "").lower() in ("1", "true", "yes")
+SMTP_TIMEOUT_SECONDS = float(os.environ.get("SMTP_TIMEOUT_SECONDS", "10"))
+
+# Failures concerning a single message; anything else means the connection is unusable.
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+    smtplib.SMTPNotSupportedError,
+)
+# Payloads that cannot be turned into a message, e.g. a header value containing CR or LF.
+INVALID_MESSAGE_ERRORS = (KeyError, TypeError, ValueError)
+
+
+class Mailer:
+    """
+    Sends batches of plain text emails over a single SMTP connection each.
+    """
+
+    def __init__(
+        self,
+        host: str = SMTP_HOST,
+        port: int = SMTP_PORT,
+        sender: str = SMTP_SENDER,
+        username: str = SMTP_USERNAME,
+        password: str = SMTP_PASSWORD,
+        starttls: bool = SMTP_STARTTLS,
+        timeout: float = SMTP_TIMEOUT_SECONDS,
+    ):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def _message(self, email: dict) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = email["to"]
+        message["Subject"] = email["subject"]
+        message.set_content(email["body"])
+        return message
+
+    def send_batch(self, emails: list) -> list:
+        """
+        Send emails in a blocking way, reusing one connection for the whole batch.
+        :param emails: List of dictionaries with the 'to', 'subject' and 'body' of each email.
+        :return: For each email, None when it was accepted, or the reason it was refused or
+            could not be built. When the connection fails midway, the emails accepted until
+            then are still reported as sent and the rest as failed.
+        :raises smtplib.SMTPException: If the server cannot be used at all.
+        :raises OSError: If the server cannot be reached.
+        """
+        errors = []
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for index, email in enumerate(emails):
+                try:
+                    message = self._message(email)
+                except INVALID_MESSAGE_ERRORS as e:
+                    errors.append(f"Invalid email: {e!r}")
+                    continue
+                try:
+                    smtp.send_message(message)
+                    errors.append(None)
+                except MESSAGE_ERRORS as e:
+                    errors.append(str(e))
+                except (smtplib.SMTPException, OSError) as e:
+                    errors.extend(f"Connection failed: {e!r}" for _ in emails[index:])
+                    break
+        return errors
+
+    async def send(self, emails: list) -> list:
+        """
+        Send emails from a worker thread, see `send_batch`.
+        """
+        return await asyncio.to_thread(self.send_batch, emails)
+
+
+mailer = Mailer()
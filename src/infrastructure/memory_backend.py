@@ -0,0 +1,1217 @@
+"""
+In-memory backend serving the GraphQL operations of `src/services/`, for development, tests
+and load tests without Postgres or PostGraphile. Selected with GRAPHQL_TRANSPORT=memory.
+
+Rows are kept in dictionaries by ID and every read the services make is answered from a
+secondary index, so its cost grows with the result rather than with the table. Behaviour
+follows the constraints, triggers and SQL functions of the migrations; title search matches
+substrings and only approximates the trigram ranking.
+"""
+
+import bisect
+import operator
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from src.domain.enums import TASK_PRIORITIES, TASK_STATUSES
+from src.infrastructure.graphql_operations import (
+    ACTIVITY_FIELDS,
+    JOB_FIELDS,
+    ARCHIVED_TASK_FIELDS,
+    SUMMARY_FIELDS,
+    TASK_FIELDS,
+    TASK_LIST_FIELDS,
+    TASK_PROGRESS_EXCLUDED_FIELDS,
+    TOMBSTONE_FIELDS,
+    USER_FIELDS,
+    WEBHOOK_FIELDS,
+    OperationError,
+    OperationRegistry,
+    aliased_task_patches,
+    filter_conditions,
+    json_value,
+    node_id,
+    not_deleted_error,
+    operation_name,
+    order_by_columns,
+    to_node,
+    unknown_operation,
+)
+
+operations = OperationRegistry()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _touch(row: dict):
+    """
+    Mark a row as updated, like the set_updated_at and bump_row_version triggers.
+    """
+    row.update(updated_at=_now(), version=row["version"] + 1)
+
+
+def _has_version(row: dict, expected_version) -> bool:
+    """
+    Whether a compare-and-set update applies to a row: it exists and, when a version is
+    expected, still has it.
+    """
+    return row is not None and expected_version in (None, row["version"])
+
+
+def _uuid(value) -> str:
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        raise OperationError(f'invalid input syntax for type uuid: "{value}"')
+
+
+def _optional_uuid(value) -> str:
+    return None if value is None else _uuid(value)
+
+
+def _timestamp(value) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise OperationError(f'invalid input syntax for type timestamp: "{value}"')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _enum(value, allowed: tuple, type_name: str) -> str:
+    if value is None:
+        return None
+    if value not in allowed:
+        raise OperationError(f'invalid input value for enum {type_name}: "{value}"')
+    return str(value)
+
+
+def _enum_list(values, allowed: tuple, type_name: str) -> list:
+    if values is None:
+        return None
+    return [_enum(value, allowed, type_name) for value in values]
+
+
+def _foreign_key_error(table: str, constraint: str) -> OperationError:
+    return OperationError(
+        f'insert or update on table "{table}" violates foreign key constraint "{constraint}"'
+    )
+
+
+def _unique_violation(constraint: str) -> OperationError:
+    return OperationError(f'duplicate key value violates unique constraint "{constraint}"')
+
+
+class MemoryStore:
+    """
+    Tables and secondary indexes of the in-memory backend. Index buckets map row IDs to
+    rows, keeping the insertion order, and are removed once empty.
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.task_lists = {}
+        self.tasks = {}
+        self.assignments = {}
+        self.tombstones = {}
+        self.archived_tasks = {}
+        self.archived_assignments = {}
+        self.activity = []
+        # Jobs by ID, in ID order; failed jobs move to `failed_jobs` and are never claimed.
+        self.jobs = {}
+        self.failed_jobs = {}
+        self.last_job_id = 0
+        self.webhooks = {}
+
+        self.users_by_email = {}
+        self.tasks_by_list = defaultdict(dict)
+        self.tasks_by_list_status_priority = defaultdict(dict)
+        self.assignments_by_user = defaultdict(dict)
+        self.assignments_by_task = defaultdict(dict)
+        self.tombstones_by_list = defaultdict(dict)
+        self.completed_percentage_sums = defaultdict(int)
+        self.archived_tasks_by_list = defaultdict(dict)
+        self.archived_assignments_by_task = defaultdict(dict)
+        # Entries of each task in ID order, for the keyset pages of task_activity.
+        self.activity_by_task = defaultdict(list)
+        self.webhooks_by_list = defaultdict(dict)
+
+    @staticmethod
+    def _discard(index: dict, key, row_id: str):
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(row_id, None)
+            if not bucket:
+                del index[key]
+
+    @staticmethod
+    def _task_key(task: dict) -> tuple:
+        return task["task_list_id"], task["status"], task["priority"]
+
+    def is_visible(self, task_list_id: str) -> bool:
+        """
+        Whether a task list exists and was not deleted.
+        """
+        task_list = self.task_lists.get(task_list_id)
+        return task_list is not None and task_list["deleted_at"] is None
+
+    def tasks_of_list(
+        self, task_list_id: str, statuses=None, priorities=None, include_archived=False
+    ):
+        """
+        Yield the tasks of a task list, optionally restricted to some statuses and priorities,
+        from the (task_list_id, status, priority) index. Archived tasks, when included, follow
+        the active ones like in the `task_including_archived` view.
+        """
+        if statuses is None and priorities is None:
+            yield from self.tasks_by_list.get(task_list_id, {}).values()
+        else:
+            for status in statuses or TASK_STATUSES:
+                for priority in priorities or TASK_PRIORITIES:
+                    key = (task_list_id, status, priority)
+                    bucket = self.tasks_by_list_status_priority.get(key)
+                    if bucket:
+                        yield from bucket.values()
+
+        if include_archived:
+            for task in self.archived_tasks_by_list.get(task_list_id, {}).values():
+                if (statuses is None or task["status"] in statuses) and (
+                    priorities is None or task["priority"] in priorities
+                ):
+                    yield task
+
+    def insert_task(self, task: dict):
+        self.tasks[task["id"]] = task
+        self.tasks_by_list[task["task_list_id"]][task["id"]] = task
+        self.tasks_by_list_status_priority[self._task_key(task)][task["id"]] = task
+        self.completed_percentage_sums[task["task_list_id"]] += task["completed_percentage"] or 0
+        self.queue_webhooks("task.created", task, task=to_node(task, TASK_FIELDS))
+
+    def update_task(self, task: dict, changes: dict) -> bool:
+        """
+        Apply changes to a task, keeping the indexes and statistics up to date.
+        :return: Whether any value changed.
+        """
+        if all(task[column] == value for column, value in changes.items()):
+            return False
+
+        self._discard(self.tasks_by_list_status_priority, self._task_key(task), task["id"])
+        self.completed_percentage_sums[task["task_list_id"]] -= task["completed_percentage"] or 0
+        task.update(changes)
+        _touch(task)
+        self.tasks_by_list_status_priority[self._task_key(task)][task["id"]] = task
+        self.completed_percentage_sums[task["task_list_id"]] += task["completed_percentage"] or 0
+        self.queue_webhooks("task.updated", task, task=to_node(task, TASK_FIELDS))
+        return True
+
+    def touch_task(self, task: dict):
+        """
+        Update a task without changing any value, as an UPDATE setting the same values does.
+        """
+        _touch(task)
+        self.queue_webhooks("task.updated", task, task=to_node(task, TASK_FIELDS))
+
+    def delete_task(self, task: dict):
+        task_id, task_list_id = task["id"], task["task_list_id"]
+        del self.tasks[task_id]
+        self._discard(self.tasks_by_list, task_list_id, task_id)
+        self._discard(self.tasks_by_list_status_priority, self._task_key(task), task_id)
+        self.completed_percentage_sums[task_list_id] -= task["completed_percentage"] or 0
+        self.queue_webhooks("task.deleted", task, task=to_node(task, TASK_FIELDS))
+
+        for assignment in list(self.assignments_by_task.pop(task_id, {}).values()):
+            del self.assignments[assignment["id"]]
+            self._discard(self.assignments_by_user, assignment["user_id"], assignment["id"])
+
+        # Like the task_tombstone_record trigger: no tombstone when the list itself is gone.
+        if self.is_visible(task_list_id):
+            tombstone = {"task_id": task_id, "task_list_id": task_list_id, "deleted_at": _now()}
+            self.tombstones[task_id] = tombstone
+            self.tombstones_by_list[task_list_id][task_id] = tombstone
+
+    def purge_deleted_task_lists(self, batch_size: int) -> int:
+        """
+        Remove up to `batch_size` tasks and archived tasks of deleted task lists, then the task
+        lists left empty, like `purge_deleted_task_lists`.
+        :return: Number of tasks removed.
+        """
+        deleted = [
+            task_list_id
+            for task_list_id, task_list in self.task_lists.items()
+            if task_list["deleted_at"] is not None
+        ]
+        purged = 0
+        for task_list_id in deleted:
+            for task in list(self.tasks_by_list.get(task_list_id, {}).values()):
+                if purged == batch_size:
+                    return purged
+                self.delete_task(task)
+                purged += 1
+        for task_list_id in deleted:
+            for task_id in list(self.archived_tasks_by_list.get(task_list_id, {})):
+                if purged == batch_size:
+                    return purged
+                del self.archived_tasks[task_id]
+                self._discard(self.archived_tasks_by_list, task_list_id, task_id)
+                for assignment_id in self.archived_assignments_by_task.pop(task_id, {}):
+                    del self.archived_assignments[assignment_id]
+                purged += 1
+
+        if purged < batch_size:
+            for task_list_id in deleted:
+                del self.task_lists[task_list_id]
+                self.completed_percentage_sums.pop(task_list_id, None)
+                for task_id in self.tombstones_by_list.pop(task_list_id, {}):
+                    del self.tombstones[task_id]
+                for webhook_id in self.webhooks_by_list.pop(task_list_id, {}):
+                    del self.webhooks[webhook_id]
+        return purged
+
+    def prune_tombstones(self, older_than_days: int, batch_size: int) -> int:
+        """
+        Remove up to `batch_size` tombstones older than `older_than_days`, like
+        `prune_task_tombstones`.
+        :return: Number of tombstones removed.
+        """
+        cutoff = _now() - timedelta(days=older_than_days)
+        expired = [
+            tombstone for tombstone in self.tombstones.values() if tombstone["deleted_at"] < cutoff
+        ][:batch_size]
+        for tombstone in expired:
+            del self.tombstones[tombstone["task_id"]]
+            self._discard(self.tombstones_by_list, tombstone["task_list_id"], tombstone["task_id"])
+        return len(expired)
+
+    def enqueue_job(self, kind: str, payload: dict, max_attempts: int = 5) -> dict:
+        """
+        Add a job to the queue, like `enqueue_job`.
+        """
+        self.last_job_id += 1
+        job = {
+            "id": self.last_job_id,
+            "kind": kind,
+            "payload": payload,
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_at": _now(),
+            "locked_until": None,
+            "last_error": None,
+            "failed_at": None,
+        }
+        self.jobs[job["id"]] = job
+        return job
+
+    def record_activity(self, entry: dict):
+        """
+        Append an activity log entry.
+        """
+        entry["id"] = len(self.activity) + 1
+        self.activity.append(entry)
+        if entry["task_id"] is not None:
+            self.activity_by_task[entry["task_id"]].append(entry)
+
+    def queue_webhooks(self, action: str, changed: dict, **event):
+        """
+        Queue a 'webhook' job per subscription of the task list of a changed task, like the
+        task_webhooks and assigned_task_webhooks triggers.
+        :param action: Name of the change, e.g. 'task.updated'.
+        :param changed: The changed task.
+        :param event: Further fields of the event.
+        """
+        task_list_id = changed["task_list_id"]
+        if not self.is_visible(task_list_id):
+            return
+        for webhook in self.webhooks_by_list.get(task_list_id, {}).values():
+            self.enqueue_job(
+                "webhook",
+                {
+                    "subscriptionId": webhook["id"],
+                    "url": webhook["url"],
+                    "secret": webhook["secret"],
+                    "event": {
+                        "id": str(uuid.uuid4()),
+                        "action": action,
+                        "taskListId": task_list_id,
+                        "taskId": changed["id"],
+                        **event,
+                        "occurredAt": _now().isoformat(),
+                    },
+                },
+            )
+
+    def archive_task(self, task: dict):
+        """
+        Move a task and its assignments to the archive, like `archive_completed_tasks`.
+        """
+        assignments = list(self.assignments_by_task.get(task["id"], {}).values())
+        self.delete_task(task)
+
+        archived = {**task, "archived_at": _now()}
+        self.archived_tasks[task["id"]] = archived
+        self.archived_tasks_by_list[task["task_list_id"]][task["id"]] = archived
+        for assignment in assignments:
+            self.archived_assignments[assignment["id"]] = assignment
+            self.archived_assignments_by_task[task["id"]][assignment["id"]] = assignment
+
+    def restore_task(self, archived: dict):
+        """
+        Move an archived task and its assignments back, like `restore_archived_tasks`.
+        """
+        task_id, task_list_id = archived["id"], archived["task_list_id"]
+        del self.archived_tasks[task_id]
+        self._discard(self.archived_tasks_by_list, task_list_id, task_id)
+
+        task = {column: value for column, value in archived.items() if column != "archived_at"}
+        task["updated_at"] = _now()
+        self.insert_task(task)
+        for assignment in self.archived_assignments_by_task.pop(task_id, {}).values():
+            del self.archived_assignments[assignment["id"]]
+            self.insert_assignment(assignment)
+
+        self.tombstones.pop(task_id, None)
+        self._discard(self.tombstones_by_list, task_list_id, task_id)
+
+    def insert_assignment(self, assignment: dict):
+        self.assignments[assignment["id"]] = assignment
+        self.assignments_by_user[assignment["user_id"]][assignment["id"]] = assignment
+        self.assignments_by_task[assignment["task_id"]][assignment["id"]] = assignment
+        task = self.tasks.get(assignment["task_id"])
+        if task is not None:
+            self.queue_webhooks("task.assigned", task, userId=assignment["user_id"])
+
+    def assignment(self, task_id: str, user_id: str) -> dict:
+        """
+        The assignment of a task to a user, or None.
+        """
+        for assignment in self.assignments_by_task.get(task_id, {}).values():
+            if assignment["user_id"] == user_id:
+                return assignment
+        return None
+
+    def summary(self, task_list_id: str) -> dict:
+        """
+        Task statistics of a task list, in the shape of the `task_list_summary` SQL type.
+        """
+        counts = {
+            (status, priority): len(
+                self.tasks_by_list_status_priority.get((task_list_id, status, priority), ())
+            )
+            for status in TASK_STATUSES
+            for priority in TASK_PRIORITIES
+        }
+        total = sum(counts.values())
+        summary = {"total_count": total}
+        for status in TASK_STATUSES:
+            summary[f"{status}_count"] = sum(counts[status, p] for p in TASK_PRIORITIES)
+        for priority in TASK_PRIORITIES:
+            summary[f"{priority}_priority_count"] = sum(counts[s, priority] for s in TASK_STATUSES)
+        summary["average_completed_percentage"] = (
+            self.completed_percentage_sums[task_list_id] / total if total else 0
+        )
+        return summary
+
+
+def _task_values(variables: dict) -> dict:
+    return {
+        "title": variables.get("title"),
+        "priority": _enum(variables.get("priority"), TASK_PRIORITIES, "task_priority"),
+        "status": _enum(variables.get("status"), TASK_STATUSES, "task_status"),
+        "completed_percentage": variables.get("completed_percentage"),
+    }
+
+
+def _task_changes(variables: dict) -> dict:
+    """
+    Fields of an update; a null keeps the current value, like `update_task_if_version`.
+    """
+    return {column: value for column, value in _task_values(variables).items() if value is not None}
+
+
+def _get_task(store: MemoryStore, task_id) -> dict:
+    return store.tasks.get(_uuid(task_id))
+
+
+@operations.register("CreateTask")
+def create_task(store: MemoryStore, variables: dict) -> dict:
+    task_list_id = _uuid(variables.get("taskListId"))
+    # Like an INSERT: the defaults only apply to the fields left out, a null is stored as is.
+    task = {
+        "title": None,
+        "priority": "medium",
+        "status": "pending",
+        "completed_percentage": None,
+        **{
+            column: value
+            for column, value in _task_values(variables).items()
+            if column in variables
+        },
+        "task_list_id": task_list_id,
+    }
+    for column in ("title", "priority", "status"):
+        if task[column] is None:
+            raise OperationError(f'null value in column "{column}" violates not-null constraint')
+    if task_list_id not in store.task_lists:
+        raise _foreign_key_error("task", "task_task_list_id_fkey")
+
+    now = _now()
+    task.update(id=str(uuid.uuid4()), created_at=now, updated_at=now, version=1)
+    store.insert_task(task)
+    return {"createTask": {"task": to_node(task, TASK_FIELDS, exclude=("updatedAt",))}}
+
+
+def _visible_task(store: MemoryStore, task: dict) -> dict:
+    return task if task is not None and store.is_visible(task["task_list_id"]) else None
+
+
+@operations.register("FetchTaskById")
+def fetch_task_by_id(store: MemoryStore, variables: dict) -> dict:
+    task = _visible_task(store, _get_task(store, variables["id"]))
+    return {"taskById": to_node(task, TASK_FIELDS, exclude=("updatedAt",))}
+
+
+@operations.register("FetchTaskByIdIncludingArchived")
+def fetch_task_by_id_including_archived(store: MemoryStore, variables: dict) -> dict:
+    task_id = _uuid(variables["id"])
+    task = store.tasks.get(task_id)
+    if task is not None:
+        task = {**task, "archived_at": None}
+    else:
+        task = store.archived_tasks.get(task_id)
+    task = _visible_task(store, task)
+    return {"taskById": to_node(task, ARCHIVED_TASK_FIELDS, exclude=("updatedAt",))}
+
+
+@operations.register("UpdateTask")
+@operations.register("UpdateTaskStatus")
+def update_task(store: MemoryStore, variables: dict) -> dict:
+    task = _visible_task(store, _get_task(store, variables["id"]))
+    changes = _task_changes(variables)
+    if not _has_version(task, variables.get("expected_version")):
+        return {"updateTaskById": {"task": None}}
+
+    # An UPDATE touches the row even without changes.
+    if not store.update_task(task, changes):
+        store.touch_task(task)
+    return {"updateTaskById": {"task": to_node(task, TASK_FIELDS, exclude=("updatedAt",))}}
+
+
+@operations.register("UpdateTasksProgress")
+def update_tasks_progress(store: MemoryStore, variables: dict) -> dict:
+    patches = [
+        (alias, _visible_task(store, _get_task(store, task_id)), _task_changes(values))
+        for alias, task_id, values in aliased_task_patches(variables)
+    ]
+    data = {}
+    for alias, task, changes in patches:
+        if task is None:
+            data[alias] = None
+            continue
+        if not store.update_task(task, changes):
+            store.touch_task(task)
+        data[alias] = {"task": to_node(task, TASK_FIELDS, exclude=TASK_PROGRESS_EXCLUDED_FIELDS)}
+    return data
+
+
+@operations.register("DeleteTask")
+def delete_task(store: MemoryStore, variables: dict) -> dict:
+    task = _get_task(store, variables["id"])
+    if task is None:
+        raise not_deleted_error("tasks")
+
+    store.delete_task(task)
+    return {"deleteTaskById": {"deletedTaskId": node_id("tasks", task["id"])}}
+
+
+@operations.register("createAssignedTask")
+def create_assigned_task(store: MemoryStore, variables: dict) -> dict:
+    task = _get_task(store, variables["taskId"])
+    user_id = _uuid(variables["userId"])
+    if task is None:
+        raise _foreign_key_error("assigned_task", "assigned_task_task_id_fkey")
+    if user_id not in store.users:
+        raise _foreign_key_error("assigned_task", "assigned_task_user_id_fkey")
+
+    if store.assignment(task["id"], user_id) is not None:
+        raise _unique_violation("uq_assigned_task_task_id_user_id")
+
+    store.insert_assignment(
+        {"id": str(uuid.uuid4()), "task_id": task["id"], "user_id": user_id, "created_at": _now()}
+    )
+    return {
+        "createAssignedTask": {
+            "assignedTask": {
+                "taskByTaskId": to_node(task, TASK_FIELDS, exclude=("updatedAt",)),
+                "userByUserId": to_node(
+                    store.users[user_id], USER_FIELDS, exclude=("id", "password")
+                ),
+            }
+        }
+    }
+
+
+@operations.register("FetchTasksByIds")
+def fetch_tasks_by_ids(store: MemoryStore, variables: dict) -> dict:
+    tasks = (_visible_task(store, _get_task(store, task_id)) for task_id in set(variables["ids"]))
+    return {"visibleTasks": {"nodes": [to_node(task, TASK_FIELDS) for task in tasks if task]}}
+
+
+@operations.register("AssignTasks")
+def assign_tasks(store: MemoryStore, variables: dict) -> dict:
+    pairs = [
+        (_uuid(task_id), _uuid(user_id))
+        for task_id, user_id in zip(variables["taskIds"], variables["userIds"])
+    ]
+    nodes = []
+    for task_id, user_id in pairs:
+        if task_id not in store.tasks or user_id not in store.users:
+            continue
+        if store.assignment(task_id, user_id) is not None:
+            continue
+        assignment = {
+            "id": str(uuid.uuid4()),
+            "task_id": task_id,
+            "user_id": user_id,
+            "created_at": _now(),
+        }
+        store.insert_assignment(assignment)
+        nodes.append(
+            {
+                "id": assignment["id"],
+                "taskId": task_id,
+                "userId": user_id,
+                "createdAt": assignment["created_at"].isoformat(),
+            }
+        )
+    return {"assignTasks": {"assignedTasks": nodes}}
+
+
+@operations.register("SearchTasks")
+def search_tasks(store: MemoryStore, variables: dict) -> dict:
+    search = str(variables["search"]).lower()
+    task_list_id = _optional_uuid(variables.get("listId"))
+    candidates = store.tasks_of_list(task_list_id) if task_list_id else store.tasks.values()
+
+    def rank(task: dict) -> tuple:
+        words = task["title"].lower().split()
+        return (
+            search not in words,
+            not any(word.startswith(search) for word in words),
+            -task["created_at"].timestamp(),
+            task["id"],
+        )
+
+    matches = sorted(
+        (
+            task
+            for task in candidates
+            if search in task["title"].lower() and store.is_visible(task["task_list_id"])
+        ),
+        key=rank,
+    )
+    nodes = [
+        to_node(task, TASK_FIELDS, exclude=("updatedAt",))
+        for task in matches[: variables.get("limit", 20)]
+    ]
+    return {"searchTasks": {"nodes": nodes}}
+
+
+@operations.register("CreateTaskList")
+def create_task_list(store: MemoryStore, variables: dict) -> dict:
+    now = _now()
+    task_list = {"id": str(uuid.uuid4()), "name": variables["name"], "created_at": now}
+    task_list.update(updated_at=now, version=1, deleted_at=None)
+    store.task_lists[task_list["id"]] = task_list
+    return {"createTaskList": {"taskList": to_node(task_list, TASK_LIST_FIELDS)}}
+
+
+def _get_task_list(store: MemoryStore, task_list_id) -> dict:
+    """
+    A task list, or None when it does not exist or was deleted.
+    """
+    task_list_id = _uuid(task_list_id)
+    return store.task_lists[task_list_id] if store.is_visible(task_list_id) else None
+
+
+@operations.register("FetchTaskListById")
+def fetch_task_list_by_id(store: MemoryStore, variables: dict) -> dict:
+    task_list = _get_task_list(store, variables["id"])
+    if task_list is None:
+        return {"taskListById": None}
+
+    summary = to_node(store.summary(task_list["id"]), SUMMARY_FIELDS)
+    return {"taskListById": {**to_node(task_list, TASK_LIST_FIELDS), "summary": summary}}
+
+
+@operations.register("FetchTaskListStats")
+def fetch_task_list_stats(store: MemoryStore, variables: dict) -> dict:
+    task_list = _get_task_list(store, variables["id"])
+    if task_list is None:
+        return {"taskListById": None}
+
+    summary = to_node(store.summary(task_list["id"]), SUMMARY_FIELDS)
+    return {"taskListById": {"id": task_list["id"], "summary": summary}}
+
+
+@operations.register("UpdateTaskList")
+def update_task_list(store: MemoryStore, variables: dict) -> dict:
+    task_list = _get_task_list(store, variables["id"])
+    if not _has_version(task_list, variables.get("expected_version")):
+        return {"updateTaskListById": {"taskList": None}}
+
+    task_list["name"] = variables["name"]
+    _touch(task_list)
+    return {"updateTaskListById": {"taskList": to_node(task_list, TASK_LIST_FIELDS)}}
+
+
+@operations.register("DeleteTaskList")
+def delete_task_list(store: MemoryStore, variables: dict) -> dict:
+    task_list = _get_task_list(store, variables["id"])
+    if task_list is None:
+        return {"deleteTaskListById": {"taskList": None}}
+
+    task_list["deleted_at"] = _now()
+    _touch(task_list)
+    deleted = {"id": task_list["id"], "deletedAt": task_list["deleted_at"].isoformat()}
+    return {"deleteTaskListById": {"taskList": deleted}}
+
+
+def _task_fields(include_archived: bool) -> dict:
+    return ARCHIVED_TASK_FIELDS if include_archived else TASK_FIELDS
+
+
+def _task_row(task: dict, include_archived: bool) -> dict:
+    # Active tasks read through the task_including_archived view have a NULL archived_at.
+    if include_archived and "archived_at" not in task:
+        return {**task, "archived_at": None}
+    return task
+
+
+def _with_assignees(store: MemoryStore, nodes: list, include_archived: bool = False) -> list:
+    """
+    Add the `assignedTasksByTaskId` connection selected with `@include(if: $assignees)` to
+    task nodes; archived tasks read the assignments archived with them.
+    """
+    for node in nodes:
+        assignments = list(store.assignments_by_task.get(node["id"], {}).values())
+        if include_archived:
+            assignments += store.archived_assignments_by_task.get(node["id"], {}).values()
+        assignments.sort(key=lambda assignment: (assignment["created_at"], assignment["id"]))
+        node["assignedTasksByTaskId"] = {
+            "nodes": [
+                {
+                    "userByUserId": to_node(
+                        store.users[assignment["user_id"]], USER_FIELDS, exclude=("password",)
+                    )
+                }
+                for assignment in assignments
+            ]
+        }
+    return nodes
+
+
+@operations.register("FetchTaskListWithTasks")
+def fetch_task_list_with_tasks(
+    store: MemoryStore, variables: dict, include_archived: bool = False
+) -> dict:
+    task_list = _get_task_list(store, variables["id"])
+    if task_list is None:
+        return {"taskListById": None}
+
+    tasks = sorted(
+        store.tasks_of_list(task_list["id"], include_archived=include_archived),
+        key=lambda task: task["id"],
+    )
+    fields = _task_fields(include_archived)
+    nodes = [
+        to_node(_task_row(task, include_archived), fields, exclude=("taskListId",))
+        for task in tasks
+    ]
+    if variables.get("assignees"):
+        _with_assignees(store, nodes, include_archived)
+    return {
+        "taskListById": {
+            **to_node(task_list, TASK_LIST_FIELDS),
+            "tasksByTaskListId": {"nodes": nodes},
+        }
+    }
+
+
+@operations.register("FetchTaskListWithTasksIncludingArchived")
+def fetch_task_list_with_tasks_including_archived(store: MemoryStore, variables: dict) -> dict:
+    return fetch_task_list_with_tasks(store, variables, include_archived=True)
+
+
+_COMPARISONS = {
+    "equalTo": operator.eq,
+    "in": lambda value, values: value in values,
+    "greaterThan": operator.gt,
+    "greaterThanOrEqualTo": operator.ge,
+    "lessThan": operator.lt,
+    "lessThanOrEqualTo": operator.le,
+}
+_ENUM_ORDER = {"status": TASK_STATUSES, "priority": TASK_PRIORITIES}
+
+
+def _comparable(column: str, value):
+    if column in ("created_at", "updated_at"):
+        return _timestamp(value)
+    if column in ("id", "task_list_id"):
+        return _uuid(value)
+    return value
+
+
+def _sort_key(column: str):
+    # Enums sort in declaration order; NULLs sort after every value, as in PostgreSQL.
+    order = _ENUM_ORDER.get(column)
+
+    def key(task: dict) -> tuple:
+        value = task[column]
+        if value is None:
+            return 1, 0
+        return 0, order.index(value) if order else value
+
+    return key
+
+
+@operations.register("allTasksByFilter")
+def all_tasks_by_filter(
+    store: MemoryStore, variables: dict, include_archived: bool = False
+) -> dict:
+    task_list_id = statuses = priorities = None
+    conditions = []
+    for column, comparison, value in filter_conditions(variables.get("filter"), TASK_FIELDS):
+        if (column, comparison) == ("task_list_id", "equalTo"):
+            task_list_id = _uuid(value)
+        elif (column, comparison) == ("status", "in"):
+            statuses = _enum_list(value, TASK_STATUSES, "task_status")
+        elif (column, comparison) == ("priority", "in"):
+            priorities = _enum_list(value, TASK_PRIORITIES, "task_priority")
+        elif comparison == "in":
+            conditions.append((column, comparison, [_comparable(column, item) for item in value]))
+        else:
+            conditions.append((column, comparison, _comparable(column, value)))
+    if task_list_id is None:
+        raise OperationError("Tasks can only be filtered within a task list.")
+    # The task_including_archived view leaves out the tasks of deleted task lists.
+    if include_archived and not store.is_visible(task_list_id):
+        return {"allTasks": {"nodes": []}}
+
+    tasks = [
+        task
+        for task in store.tasks_of_list(task_list_id, statuses, priorities, include_archived)
+        if all(
+            task[column] is not None and _COMPARISONS[comparison](task[column], value)
+            for column, comparison, value in conditions
+        )
+    ]
+    for column, descending in reversed(order_by_columns(variables.get("orderBy"))):
+        tasks.sort(key=_sort_key(column), reverse=descending)
+
+    nodes = [
+        to_node(
+            _task_row(task, include_archived),
+            _task_fields(include_archived),
+            exclude=("taskListId", "updatedAt"),
+        )
+        for task in tasks
+    ]
+    if variables.get("assignees"):
+        _with_assignees(store, nodes, include_archived)
+    return {"allTasks": {"nodes": nodes}}
+
+
+@operations.register("allTasksIncludingArchivedByFilter")
+def all_tasks_including_archived_by_filter(store: MemoryStore, variables: dict) -> dict:
+    return all_tasks_by_filter(store, variables, include_archived=True)
+
+
+@operations.register("RebuildTaskListStats")
+def rebuild_task_list_stats(store: MemoryStore, variables: dict) -> dict:
+    task_list_id = _optional_uuid(variables.get("listId"))
+    task_list_ids = [task_list_id] if task_list_id else list(store.task_lists)
+
+    drifted = 0
+    for list_id in task_list_ids:
+        actual = sum(task["completed_percentage"] or 0 for task in store.tasks_of_list(list_id))
+        if store.completed_percentage_sums[list_id] != actual:
+            drifted += 1
+            if not variables.get("dryRun"):
+                store.completed_percentage_sums[list_id] = actual
+    return {"rebuildTaskListStats": {"integer": drifted}}
+
+
+@operations.register("FetchTaskListChanges")
+def fetch_task_list_changes(store: MemoryStore, variables: dict) -> dict:
+    task_list_id = _uuid(variables["id"])
+    since = _timestamp(variables["since"])
+
+    tasks = sorted(
+        (task for task in store.tasks_of_list(task_list_id) if task["updated_at"] > since),
+        key=lambda task: (task["updated_at"], task["id"]),
+    )
+    tombstones = sorted(
+        (
+            tombstone
+            for tombstone in store.tombstones_by_list.get(task_list_id, {}).values()
+            if tombstone["deleted_at"] > since
+        ),
+        key=lambda tombstone: (tombstone["deleted_at"], tombstone["task_id"]),
+    )
+    nodes = [to_node(task, TASK_FIELDS, exclude=("taskListId",)) for task in tasks]
+    if variables.get("assignees"):
+        _with_assignees(store, nodes)
+    return {
+        "syncWatermark": json_value(_now()),
+        "taskListById": {"id": task_list_id} if store.is_visible(task_list_id) else None,
+        "tasksUpdatedSince": {"nodes": nodes},
+        "taskTombstonesSince": {
+            "nodes": [to_node(tombstone, TOMBSTONE_FIELDS) for tombstone in tombstones]
+        },
+    }
+
+
+def _bulk_selection(store: MemoryStore, variables: dict) -> list:
+    """
+    Tasks matched by the filter arguments of the bulk mutations, like the WHERE clause of
+    the `bulk_update_tasks` and `bulk_delete_tasks` SQL functions.
+    """
+    task_list_id = _uuid(variables["listId"])
+    statuses = _enum_list(variables.get("statuses"), TASK_STATUSES, "task_status")
+    priorities = _enum_list(variables.get("priorities"), TASK_PRIORITIES, "task_priority")
+    task_ids = variables.get("taskIds")
+
+    if not store.is_visible(task_list_id):
+        return []
+    if task_ids is None:
+        return list(store.tasks_of_list(task_list_id, statuses, priorities))
+
+    tasks = (store.tasks.get(_uuid(task_id)) for task_id in task_ids)
+    return [
+        task
+        for task in {task["id"]: task for task in tasks if task is not None}.values()
+        if task["task_list_id"] == task_list_id
+        and (statuses is None or task["status"] in statuses)
+        and (priorities is None or task["priority"] in priorities)
+    ]
+
+
+def _record_bulk_activity(
+    store: MemoryStore, variables: dict, action: str, tasks: list, details: dict = None
+):
+    """
+    Write one activity log entry per task changed by a bulk operation, like the bulk SQL
+    functions do in the statement that changes the tasks.
+    """
+    user_id = _optional_uuid(variables.get("userId"))
+    now = _now()
+    for task in tasks:
+        store.record_activity(
+            {
+                "task_list_id": task["task_list_id"],
+                "task_id": task["id"],
+                "user_id": user_id,
+                "action": action,
+                "details": details or {},
+                "created_at": now,
+            }
+        )
+
+
+@operations.register("BulkUpdateTasks")
+def bulk_update_tasks(store: MemoryStore, variables: dict) -> dict:
+    changes = {
+        "status": _enum(variables.get("newStatus"), TASK_STATUSES, "task_status"),
+        "priority": _enum(variables.get("newPriority"), TASK_PRIORITIES, "task_priority"),
+        "completed_percentage": variables.get("newCompletedPercentage"),
+    }
+    changes = {column: value for column, value in changes.items() if value is not None}
+
+    tasks = _bulk_selection(store, variables)
+    updated = [task for task in tasks if store.update_task(task, changes)]
+    _record_bulk_activity(store, variables, "tasks.bulk_updated", updated, {"patch": changes})
+    return {"bulkUpdateTasks": {"integer": len(updated)}}
+
+
+@operations.register("BulkDeleteTasks")
+def bulk_delete_tasks(store: MemoryStore, variables: dict) -> dict:
+    tasks = _bulk_selection(store, variables)
+    for task in tasks:
+        store.delete_task(task)
+    _record_bulk_activity(store, variables, "tasks.bulk_deleted", tasks)
+    return {"bulkDeleteTasks": {"integer": len(tasks)}}
+
+
+@operations.register("ArchiveCompletedTasks")
+def archive_completed_tasks(store: MemoryStore, variables: dict) -> dict:
+    cutoff = _now() - timedelta(days=variables["olderThanDays"])
+    completed = (
+        task
+        for (_, status, _), bucket in store.tasks_by_list_status_priority.items()
+        if status == "completed"
+        for task in bucket.values()
+        if task["updated_at"] < cutoff
+    )
+    batch = sorted(completed, key=lambda task: task["updated_at"])[: variables["batchSize"]]
+    for task in batch:
+        store.archive_task(task)
+    return {"archiveCompletedTasks": {"integer": len(batch)}}
+
+
+@operations.register("RestoreArchivedTasks")
+def restore_archived_tasks(store: MemoryStore, variables: dict) -> dict:
+    task_list_id = _uuid(variables["listId"])
+    archived = [
+        store.archived_tasks_by_list.get(task_list_id, {}).get(task_id)
+        for task_id in {_uuid(task_id) for task_id in variables["taskIds"]}
+    ]
+    restored = [task for task in archived if task is not None]
+    for task in restored:
+        store.restore_task(task)
+    _record_bulk_activity(store, variables, "tasks.restored", restored)
+    return {"restoreArchivedTasks": {"integer": len(restored)}}
+
+
+@operations.register("PurgeDeletedTaskLists")
+def purge_deleted_task_lists(store: MemoryStore, variables: dict) -> dict:
+    purged = store.purge_deleted_task_lists(variables["batchSize"])
+    return {"purgeDeletedTaskLists": {"integer": purged}}
+
+
+@operations.register("PruneTaskTombstones")
+def prune_task_tombstones(store: MemoryStore, variables: dict) -> dict:
+    pruned = store.prune_tombstones(variables["olderThanDays"], variables["batchSize"])
+    return {"pruneTaskTombstones": {"integer": pruned}}
+
+
+@operations.register("RecordActivity")
+def record_activity(store: MemoryStore, variables: dict) -> dict:
+    entries = [
+        {
+            "task_list_id": _uuid(entry["taskListId"]),
+            "task_id": _optional_uuid(entry.get("taskId")),
+            "user_id": _optional_uuid(entry.get("userId")),
+            "action": entry["action"],
+            "details": entry.get("details") or {},
+            "created_at": (_timestamp(entry["occurredAt"]) if entry.get("occurredAt") else _now()),
+        }
+        for entry in variables["entries"]
+    ]
+    for entry in entries:
+        store.record_activity(entry)
+    return {"recordActivity": {"integer": len(entries)}}
+
+
+@operations.register("FetchTaskActivity")
+def fetch_task_activity(store: MemoryStore, variables: dict) -> dict:
+    entries = store.activity_by_task.get(_uuid(variables["taskId"]), [])
+    end = len(entries)
+    if variables.get("beforeId") is not None:
+        end = bisect.bisect_left(entries, int(variables["beforeId"]), key=lambda e: e["id"])
+    start = max(end - variables.get("pageSize", 20), 0)
+    # PostGraphile serializes bigint as a string.
+    nodes = [
+        {**to_node(entry, ACTIVITY_FIELDS), "id": str(entry["id"])}
+        for entry in reversed(entries[start:end])
+    ]
+    return {"taskActivity": {"nodes": nodes}}
+
+
+def _job_node(job: dict) -> dict:
+    # PostGraphile serializes bigint as a string.
+    return {**to_node(job, JOB_FIELDS), "id": str(job["id"])}
+
+
+@operations.register("EnqueueJob")
+def enqueue_job(store: MemoryStore, variables: dict) -> dict:
+    job = store.enqueue_job(
+        variables["kind"], variables.get("payload") or {}, variables.get("maxAttempts", 5)
+    )
+    return {"enqueueJob": {"job": {"id": str(job["id"])}}}
+
+
+@operations.register("EnqueueJobs")
+def enqueue_jobs(store: MemoryStore, variables: dict) -> dict:
+    for payload in variables["payloads"]:
+        store.enqueue_job(variables["kind"], payload)
+    return {"enqueueJobs": {"integer": len(variables["payloads"])}}
+
+
+@operations.register("ClaimJobs")
+def claim_jobs(store: MemoryStore, variables: dict) -> dict:
+    now = _now()
+    due = sorted(
+        (
+            job
+            for job in store.jobs.values()
+            if job["run_at"] <= now and (job["locked_until"] is None or job["locked_until"] <= now)
+        ),
+        key=lambda job: (job["run_at"], job["id"]),
+    )[: variables["batchSize"]]
+    for job in due:
+        job["attempts"] += 1
+        job["locked_until"] = now + timedelta(seconds=variables["leaseSeconds"])
+    return {"claimJobs": {"jobs": [_job_node(job) for job in due]}}
+
+
+@operations.register("CompleteJobs")
+def complete_jobs(store: MemoryStore, variables: dict) -> dict:
+    completed = [store.jobs.pop(int(job_id), None) for job_id in set(variables["jobIds"])]
+    return {"completeJobs": {"integer": sum(job is not None for job in completed)}}
+
+
+@operations.register("RetryJob")
+def retry_job(store: MemoryStore, variables: dict) -> dict:
+    job = store.jobs.get(int(variables["jobId"]))
+    if job is None:
+        return {"retryJob": {"job": None}}
+
+    job.update(last_error=variables["error"], locked_until=None)
+    if variables.get("retryInSeconds") is None:
+        job["failed_at"] = _now()
+        store.failed_jobs[job["id"]] = store.jobs.pop(job["id"])
+    else:
+        job["run_at"] = _now() + timedelta(seconds=variables["retryInSeconds"])
+    return {"retryJob": {"job": {"id": str(job["id"]), "failedAt": json_value(job["failed_at"])}}}
+
+
+@operations.register("CreateWebhook")
+def create_webhook(store: MemoryStore, variables: dict) -> dict:
+    task_list_id = _uuid(variables["taskListId"])
+    if task_list_id not in store.task_lists:
+        raise _foreign_key_error("webhook_subscription", "webhook_subscription_task_list_id_fkey")
+
+    webhook = {
+        "id": str(uuid.uuid4()),
+        "task_list_id": task_list_id,
+        "url": str(variables["url"]),
+        "secret": str(variables["secret"]),
+        "created_at": _now(),
+    }
+    store.webhooks[webhook["id"]] = webhook
+    store.webhooks_by_list[task_list_id][webhook["id"]] = webhook
+    return {"createWebhookSubscription": {"webhookSubscription": to_node(webhook, WEBHOOK_FIELDS)}}
+
+
+@operations.register("FetchWebhooks")
+def fetch_webhooks(store: MemoryStore, variables: dict) -> dict:
+    webhooks = store.webhooks_by_list.get(_uuid(variables["taskListId"]), {}).values()
+    nodes = [to_node(webhook, WEBHOOK_FIELDS, exclude=("secret",)) for webhook in webhooks]
+    return {"allWebhookSubscriptions": {"nodes": nodes}}
+
+
+@operations.register("DeleteWebhook")
+def delete_webhook(store: MemoryStore, variables: dict) -> dict:
+    task_list_id = _uuid(variables["taskListId"])
+    webhook = store.webhooks_by_list.get(task_list_id, {}).get(_uuid(variables["webhookId"]))
+    if webhook is None:
+        return {"deleteWebhookSubscription": {"webhookSubscription": None}}
+
+    del store.webhooks[webhook["id"]]
+    store._discard(store.webhooks_by_list, task_list_id, webhook["id"])
+    return {"deleteWebhookSubscription": {"webhookSubscription": {"id": webhook["id"]}}}
+
+
+@operations.register("GetUserByEmail")
+def get_user_by_email(store: MemoryStore, variables: dict) -> dict:
+    user = store.users_by_email.get(str(variables["email"]))
+    return {"allUsers": {"nodes": [to_node(user, USER_FIELDS)] if user else []}}
+
+
+@operations.register("FetchUsersByIds")
+def fetch_users_by_ids(store: MemoryStore, variables: dict) -> dict:
+    users = (store.users.get(_uuid(user_id)) for user_id in set(variables["ids"]))
+    nodes = [to_node(user, USER_FIELDS, exclude=("password",)) for user in users if user]
+    return {"allUsers": {"nodes": nodes}}
+
+
+@operations.register("CreateUser")
+def create_user(store: MemoryStore, variables: dict) -> dict:
+    email = str(variables["email"])
+    if email in store.users_by_email:
+        raise _unique_violation("user_email_key")
+
+    user = {
+        "id": str(uuid.uuid4()),
+        "email": email,
+        "password": variables["password"],
+        "full_name": variables["fullName"],
+        "created_at": _now(),
+    }
+    store.users[user["id"]] = user
+    store.users_by_email[email] = user
+    return {"createUser": {"user": to_node(user, USER_FIELDS, exclude=("password",))}}
+
+
+@operations.register("FetchUserAssignedTasks")
+def fetch_user_assigned_tasks(store: MemoryStore, variables: dict) -> dict:
+    status = _enum(variables.get("status"), TASK_STATUSES, "task_status")
+    priority = _enum(variables.get("priority"), TASK_PRIORITIES, "task_priority")
+    after = None
+    if variables.get("afterCreatedAt") is not None:
+        # A missing ID sorts before every ID, excluding the whole timestamp like a NULL in SQL.
+        after_id = _optional_uuid(variables.get("afterId")) or ""
+        after = (_timestamp(variables["afterCreatedAt"]), after_id)
+
+    assignments = []
+    for assignment in store.assignments_by_user.get(_uuid(variables["userId"]), {}).values():
+        task = store.tasks[assignment["task_id"]]
+        if not store.is_visible(task["task_list_id"]):
+            continue
+        if status is not None and task["status"] != status:
+            continue
+        if priority is not None and task["priority"] != priority:
+            continue
+        if after is not None and (assignment["created_at"], assignment["id"]) >= after:
+            continue
+        assignments.append((assignment, task))
+
+    assignments.sort(key=lambda pair: (pair[0]["created_at"], pair[0]["id"]), reverse=True)
+    nodes = [
+        {
+            "id": assignment["id"],
+            "createdAt": assignment["created_at"].isoformat(),
+            "taskByTaskId": to_node(task, TASK_FIELDS),
+        }
+        for assignment, task in assignments[: variables.get("pageSize", 20)]
+    ]
+    return {"userAssignedTasks": {"nodes": nodes}}
+
+
+class MemoryBackend:
+    """
+    Runs service operations against a `MemoryStore`. Operations run on the event loop
+    without awaiting, so each one is atomic; the data lives in the process that serves it.
+    """
+
+    def __init__(self):
+        self.store = MemoryStore()
+
+    def reset(self):
+        """
+        Drop all the data.
+        """
+        self.store = MemoryStore()
+
+    async def execute(self, query: str, variables: dict = None) -> dict:
+        """
+        Execute a service operation.
+        :param query: GraphQL document of the operation; only its name is used.
+        :param variables: Variables of the operation as Python values.
+        :return: A response dictionary with either `data` or `errors`, like PostGraphile's.
+        """
+        name = operation_name(query)
+        resolver = operations.get(name)
+        if resolver is None:
+            return unknown_operation(name)
+
+        try:
+            return {"data": resolver(self.store, variables or {})}
+        except OperationError as e:
+            return {"data": None, "errors": [{"message": str(e)}]}
+
+
+memory_backend = MemoryBackend()
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+from fastapi import HTTPException
+
+from src.application.auth import authenticate, is_admin
+
+PROFILE_HEADER = b"x-profile"
+PROFILER_DIR = os.environ.get(
+    "PROFILER_DIR", os.path.join(tempfile.gettempdir(), "crehana-profiles")
+)
+PROFILER_INTERVAL_SECONDS = float(os.environ.get("PROFILER_INTERVAL_MS", "5")) / 1000
+PROFILER_MAX_PER_MINUTE = int(os.environ.get("PROFILER_MAX_PER_MINUTE", "6"))
+
+# Frames of modules in this package mark a worker thread as running application code.
+APPLICATION_PACKAGE = "src."
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples the stacks of running threads from a background thread and counts them in the
+    folded format read by flamegraph.pl, speedscope and most flamegraph viewers.
+    The thread being profiled is always sampled; other threads only while they run
+    application code, e.g. the in-process GraphQL executor in its worker threads.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILER_INTERVAL_SECONDS):
+        """
+        :param thread_id: Identifier of the thread to profile, usually the event loop's.
+        :param interval: Seconds between samples. Samples are only taken when the profiled
+            thread releases the GIL, so the effective interval is at least the switch interval.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == threading.get_ident():
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if thread_id != self.thread_id and not any(
+                label.startswith(APPLICATION_PACKAGE) for label in stack
+            ):
+                continue
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """
+        :return: One line per distinct stack, root first, followed by its number of samples.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfileRateLimiter:
+    """
+    Global cap on profiled requests: one at a time, and at most `max_per_minute` started in
+    any 60 second window.
+    """
+
+    def __init__(self, max_per_minute: int = PROFILER_MAX_PER_MINUTE):
+        self.max_per_minute = max_per_minute
+        self._started = deque()
+        self._running = False
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        while self._started and now - self._started[0] >= 60:
+            self._started.popleft()
+        if self._running or len(self._started) >= self.max_per_minute:
+            return False
+        self._started.append(now)
+        self._running = True
+        return True
+
+    def release(self):
+        self._running = False
+
+
+def _write_profile(directory: str, profile_id: str, folded: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{profile_id}.folded")
+    with open(path, "w", encoding="utf-8") as profile_file:
+        profile_file.write(folded)
+    return path
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware profiling single requests on demand. A request carrying an `X-Profile`
+    header and a bearer token of an admin (see `is_admin`) runs under a `StackSampler`,
+    covering routing, authentication, the controllers and `execute_graphql`; the folded
+    stacks are written to `<directory>/<profile id>.folded` and the ID is returned in the
+    `X-Profile` response header, or 'rate-limited' when the global cap was reached.
+    Requests without the header only pay for the header lookup.
+    """
+
+    def __init__(
+        self,
+        app,
+        directory: str = PROFILER_DIR,
+        interval: float = PROFILER_INTERVAL_SECONDS,
+        max_per_minute: int = PROFILER_MAX_PER_MINUTE,
+    ):
+        self.app = app
+        self.directory = directory
+        self.interval = interval
+        self.limiter = ProfileRateLimiter(max_per_minute)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(
+            name == PROFILE_HEADER for name, _ in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            user = authenticate(dict(scope["headers"]).get(b"authorization", b"").decode())
+        except HTTPException:
+            user = None
+        if user is None or not is_admin(user):
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire():
+            await self.app(scope, receive, self._with_profile_header(send, "rate-limited"))
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, self._with_profile_header(send, profile_id))
+        finally:
+            sampler.stop()
+            self.limiter.release()
+            path = await asyncio.to_thread(
+                _write_profile, self.directory, profile_id, sampler.folded()
+            )
+            logger.info(
+                "Profile of %s %s by %s written to %s",
+                scope["method"],
+                scope["path"],
+                user["email"],
+                path,
+            )
+
+    @staticmethod
+    def _with_profile_header(send, value: str):
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", [])) + [(PROFILE_HEADER, value.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        return send_with_header
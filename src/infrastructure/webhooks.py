@@ -0,0 +1,200 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import httpx
+
+WEBHOOK_TIMEOUT_SECONDS = float(os.environ.get("WEBHOOK_TIMEOUT_SECONDS", "10"))
+WEBHOOK_MAX_CONNECTIONS = int(os.environ.get("WEBHOOK_MAX_CONNECTIONS", "100"))
+WEBHOOK_ENDPOINT_CONCURRENCY = int(os.environ.get("WEBHOOK_ENDPOINT_CONCURRENCY", "2"))
+# Development only: allow plain http and endpoints on loopback or private networks.
+WEBHOOK_ALLOW_LOCAL_URLS = os.environ.get("WEBHOOK_ALLOW_LOCAL_URLS", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SIGNATURE_HEADER = "X-Webhook-Signature"
+
+logger = logging.getLogger(__name__)
+
+
+def sign(secret: str, body: bytes) -> str:
+    """
+    Signature of a delivery, sent in the X-Webhook-Signature header so receivers can check
+    it came from us: 'sha256=' followed by the hex HMAC-SHA256 of the body.
+    """
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class WebhookURLError(ValueError):
+    """
+    A webhook URL the deliveries must not be sent to.
+    """
+
+
+async def check_webhook_url(url: str, allow_local_urls: bool = False):
+    """
+    Make sure a webhook URL uses https and that its host only resolves to public addresses,
+    so subscriptions cannot make the job workers post to services inside the deployment
+    network (PostGraphile, cloud metadata endpoints, localhost...).
+    :param url: URL of the endpoint.
+    :param allow_local_urls: Accept http and loopback, private or link-local addresses.
+    :raises WebhookURLError: If the URL is not acceptable or its host cannot be resolved.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https" and not (allow_local_urls and parts.scheme == "http"):
+        raise WebhookURLError("Webhook URLs must use https.")
+    if not parts.hostname:
+        raise WebhookURLError("Webhook URLs must have a host.")
+    if allow_local_urls:
+        return
+
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(
+            parts.hostname, parts.port or 443, type=socket.SOCK_STREAM
+        )
+    except (socket.gaierror, UnicodeError):
+        raise WebhookURLError(f"The host {parts.hostname} cannot be resolved.")
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0])
+        if getattr(address, "ipv4_mapped", None):
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise WebhookURLError(f"The host {parts.hostname} is not a public address.")
+
+
+class DeliveryMetrics:
+    """
+    Delivery counts and latencies per endpoint, over the last `window` deliveries of each.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.deliveries = defaultdict(int)
+        self.failures = defaultdict(int)
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, endpoint: str, latency: float, ok: bool):
+        self.deliveries[endpoint] += 1
+        if not ok:
+            self.failures[endpoint] += 1
+        self._latencies[endpoint].append(latency)
+
+    def summary(self) -> dict:
+        """
+        :return: Dictionary of endpoints to their 'deliveries', 'failures' and the 'p50Ms',
+            'p95Ms' and 'maxMs' latencies.
+        """
+        summary = {}
+        for endpoint, latencies in self._latencies.items():
+            ordered = sorted(latencies)
+            summary[endpoint] = {
+                "deliveries": self.deliveries[endpoint],
+                "failures": self.failures[endpoint],
+                "p50Ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "p95Ms": round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)] * 1000, 1),
+                "maxMs": round(ordered[-1] * 1000, 1),
+            }
+        return summary
+
+
+class WebhookSender:
+    """
+    Delivers webhook events over a shared connection pool. The events of a batch are
+    coalesced per subscription into a single signed POST of {"events": [...]}, and at most
+    `endpoint_concurrency` deliveries run at once against the same host.
+    """
+
+    def __init__(
+        self,
+        timeout: float = WEBHOOK_TIMEOUT_SECONDS,
+        max_connections: int = WEBHOOK_MAX_CONNECTIONS,
+        endpoint_concurrency: int = WEBHOOK_ENDPOINT_CONCURRENCY,
+        allow_local_urls: bool = WEBHOOK_ALLOW_LOCAL_URLS,
+    ):
+        self.timeout = timeout
+        self.allow_local_urls = allow_local_urls
+        self.max_connections = max_connections
+        self.endpoint_concurrency = endpoint_concurrency
+        self.metrics = DeliveryMetrics()
+        self._client = None
+        self._endpoint_limits = defaultdict(lambda: asyncio.Semaphore(self.endpoint_concurrency))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.max_connections),
+            )
+        return self._client
+
+    async def _post(self, url: str, secret: str, events: list) -> str:
+        """
+        :return: None when the endpoint accepted the events, or the reason it did not.
+        """
+        # Checked again on delivery, as the host may resolve elsewhere than when subscribed.
+        try:
+            await check_webhook_url(url, self.allow_local_urls)
+        except WebhookURLError as e:
+            logger.warning("Webhook delivery to %s refused: %s", url, e)
+            return f"Refused: {e}"
+
+        body = json.dumps({"events": events}).encode()
+        headers = {"Content-Type": "application/json", SIGNATURE_HEADER: sign(secret, body)}
+        endpoint = urlsplit(url).netloc
+        async with self._endpoint_limits[endpoint]:
+            started = time.perf_counter()
+            try:
+                response = await self._get_client().post(url, content=body, headers=headers)
+                error = None if response.is_success else f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+            latency = time.perf_counter() - started
+
+        self.metrics.record(endpoint, latency, error is None)
+        logger.info(
+            "Webhook delivery of %d event(s) to %s %s in %.1f ms",
+            len(events),
+            endpoint,
+            error or "succeeded",
+            latency * 1000,
+        )
+        return error
+
+    async def deliver(self, payloads: list) -> list:
+        """
+        Handler of the 'webhook' jobs.
+        :param payloads: Jobs with the 'subscriptionId', 'url', 'secret' and 'event' to send.
+        :return: For each payload, None when it was delivered, or the reason it was not.
+        """
+        by_subscription = defaultdict(list)
+        for index, payload in enumerate(payloads):
+            by_subscription[payload["subscriptionId"]].append(index)
+
+        async def deliver_subscription(indexes):
+            first = payloads[indexes[0]]
+            events = [payloads[index]["event"] for index in indexes]
+            return indexes, await self._post(first["url"], first["secret"], events)
+
+        errors = [None] * len(payloads)
+        for indexes, error in await asyncio.gather(
+            *(deliver_subscription(indexes) for indexes in by_subscription.values())
+        ):
+            for index in indexes:
+                errors[index] = error
+        return errors
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+webhook_sender = WebhookSender()
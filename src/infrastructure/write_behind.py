@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import os
+
+WRITE_BEHIND_ENABLED = os.environ.get("TASK_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+WRITE_BEHIND_WINDOW_SECONDS = float(os.environ.get("TASK_WRITE_BEHIND_WINDOW_MS", "250")) / 1000
+WRITE_BEHIND_MAX_BATCH = int(os.environ.get("TASK_WRITE_BEHIND_MAX_BATCH", "100"))
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Coalesces field updates per key and writes them in batches.
+    Updates to the same key within the window are merged, the last write winning per field,
+    and every key pending when the window closes (or once `max_batch` keys are pending) is
+    handed to `flush_batch` in a single call. Batches are written one at a time, in order.
+    """
+
+    def __init__(
+        self,
+        flush_batch,
+        window_seconds: float = WRITE_BEHIND_WINDOW_SECONDS,
+        max_batch: int = WRITE_BEHIND_MAX_BATCH,
+    ):
+        """
+        :param flush_batch: Coroutine function receiving a dictionary of keys to merged fields.
+            If it raises, the batch is merged back under any newer updates and retried with
+            the next flush.
+        :param window_seconds: How long updates are collected before they are written.
+        :param max_batch: Number of pending keys that triggers an immediate flush.
+        """
+        self.flush_batch = flush_batch
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.submitted = 0
+        self.batches = 0
+        self._pending = {}
+        self._in_flight = {}
+        self._lock = asyncio.Lock()
+        self._timer = None
+        self._flushes = set()
+
+    def submit(self, key: str, fields: dict) -> dict:
+        """
+        Queue an update. Must be called from the event loop.
+        :param key: Key of the updated item, e.g. a task ID.
+        :param fields: Changed fields and their new values.
+        :return: All the fields of the item not yet written, after the merge.
+        """
+        self.submitted += 1
+        self._pending.setdefault(key, {}).update(fields)
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._start_flush
+            )
+        return self.pending(key)
+
+    def _start_flush(self):
+        # The event loop only keeps weak references to tasks, so hold on to each flush.
+        task = asyncio.ensure_future(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task):
+        self._flushes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Flushing buffered updates failed", exc_info=task.exception())
+
+    def pending(self, key: str) -> dict:
+        """
+        Fields of an item not yet written, including those of a batch being written, so reads
+        can overlay them on the stored item.
+        :param key: Key of the item.
+        :return: Dictionary of fields, empty when nothing is pending.
+        """
+        return {**self._in_flight.get(key, {}), **self._pending.get(key, {})}
+
+    def discard(self, key: str, fields=None):
+        """
+        Forget the pending updates of an item, e.g. because it was written or deleted directly.
+        :param key: Key of the item.
+        :param fields: Only forget these fields, keeping the other pending ones; all when None.
+        """
+        if fields is None:
+            self._pending.pop(key, None)
+            return
+
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+        for field in fields:
+            pending.pop(field, None)
+        if not pending:
+            del self._pending[key]
+
+    async def flush(self):
+        """
+        Write every pending update now.
+        """
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+
+            batch, self._pending = self._pending, {}
+            self._in_flight = batch
+            try:
+                await self.flush_batch(batch)
+                self.batches += 1
+            except Exception:
+                logger.exception("Writing %d buffered updates failed; retrying", len(batch))
+                for key, fields in batch.items():
+                    self._pending[key] = {**fields, **self._pending.get(key, {})}
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(
+                        self.window_seconds, self._start_flush
+                    )
+            finally:
+                self._in_flight = {}
+
+    async def close(self):
+        """
+        Flush the pending updates before shutting down, after the flushes already started.
+        """
+        loop = asyncio.get_running_loop()
+        flushes = [task for task in self._flushes if task.get_loop() is loop]
+        await asyncio.gather(*flushes, return_exceptions=True)
+        await self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
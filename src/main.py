@@ -1,9 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from src.api import users_router
 from src.api.task_lists_router import router as task_lists_router
 from src.api.tasks_router import router as tasks_router
+from src.controllers import activity_controller, task_controller
+from src.infrastructure.compression import CompressionMiddleware
+from src.infrastructure.profiler import ProfilerMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write the buffered task progress updates before the worker exits.
+    if task_controller.task_progress_buffer is not None:
+        await task_controller.task_progress_buffer.close()
+    # Progress updates written above are recorded in the activity log too, so it goes last.
+    if activity_controller.activity_log is not None:
+        await activity_controller.activity_log.close()
+
+
+app = FastAPI(title="Crehana Tasks API", lifespan=lifespan)
 
-app = FastAPI(title="Crehana Tasks API")
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilerMiddleware)
 
 app.include_router(users_router.router)
 app.include_router(task_lists_router)
@@ -0,0 +1,203 @@
+"""
+Production entrypoint: imports the application once, binds the listening socket and forks
+uvicorn worker processes that share both, then supervises them.
+
+Usage:
+    python -m src.server
+"""
+
+import gc
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+import uvicorn
+
+HOST = os.environ.get("HOST", "0.0.0.0")
+PORT = int(os.environ.get("PORT", "8000"))
+BACKLOG = int(os.environ.get("BACKLOG", "2048"))
+KEEPALIVE_TIMEOUT = int(os.environ.get("KEEPALIVE_TIMEOUT", "5"))
+GRACEFUL_TIMEOUT = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+RESPAWN_DELAY = 1.0
+MAX_RESPAWN_DELAY = 30.0
+MAX_STARTUP_FAILURES = int(os.environ.get("WORKER_MAX_STARTUP_FAILURES", "5"))
+# Exit status of a worker whose application failed to start, as with the uvicorn CLI.
+STARTUP_FAILURE = 3
+
+
+def worker_count() -> int:
+    """
+    Number of worker processes: WEB_CONCURRENCY, or one per CPU available to this process.
+    """
+    if os.environ.get("WEB_CONCURRENCY"):
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def build_config(app) -> uvicorn.Config:
+    """
+    Build the uvicorn configuration shared by every worker, using uvloop and httptools
+    when they are installed.
+    :param app: The preloaded ASGI application.
+    :return: The uvicorn configuration.
+    """
+    return uvicorn.Config(
+        app,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        backlog=BACKLOG,
+        timeout_keep_alive=KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        proxy_headers=True,
+        access_log=False,
+    )
+
+
+def bind_socket(host: str = HOST, port: int = PORT, backlog: int = BACKLOG) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def describe_exit(exit_code: int) -> str:
+    if exit_code < 0:
+        return f"was killed by {signal.Signals(-exit_code).name}"
+    return f"exited with status {exit_code}"
+
+
+class Supervisor:
+    """
+    Forks the workers, replaces the ones that die, and on SIGTERM/SIGINT asks every worker to
+    finish its in-flight requests before exiting, killing those still running after
+    GRACEFUL_TIMEOUT seconds. Workers failing to start are replaced with a doubling delay, up
+    to MAX_RESPAWN_DELAY; after MAX_STARTUP_FAILURES in a row the supervisor shuts down.
+    """
+
+    def __init__(self, config: uvicorn.Config, sock: socket.socket, workers: int):
+        self.config = config
+        self.sock = sock
+        self.workers = workers
+        self.children = set()
+        self.stopping = False
+        self.startup_failures = 0
+
+    def spawn(self):
+        pid = os.fork()
+        if pid:
+            self.children.add(pid)
+            return
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, signal.SIG_DFL)
+        exit_code = 1
+        try:
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self.sock])
+            exit_code = 0 if server.started else STARTUP_FAILURE
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            os._exit(exit_code)
+
+    def _signal_children(self, signum: int):
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                self.children.discard(pid)
+
+    def _handle_stop(self, signum, frame):
+        self.stopping = True
+        self._signal_children(signal.SIGTERM)
+
+    def _reap(self, block: bool):
+        """
+        Wait for a worker to exit and log how it ended.
+        :return: The exit code of the worker, negative when it was killed by a signal, or
+            None when no worker exited.
+        """
+        try:
+            pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            self.children.clear()
+            return None
+        if not pid:
+            return None
+        self.children.discard(pid)
+        exit_code = os.waitstatus_to_exitcode(status)
+        if not self.stopping:
+            print(f"Worker {pid} {describe_exit(exit_code)}", file=sys.stderr)
+        return exit_code
+
+    def _respawn_delay(self, exit_code: int) -> float:
+        """
+        Count the consecutive startup failures and compute the delay before the next worker.
+        """
+        if exit_code == STARTUP_FAILURE:
+            self.startup_failures += 1
+        else:
+            self.startup_failures = 0
+        return min(RESPAWN_DELAY * 2**self.startup_failures, MAX_RESPAWN_DELAY)
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        # Objects created while importing the app are never collected; freezing them keeps
+        # the garbage collector from touching, and so copying, the pages shared with workers.
+        gc.freeze()
+        for _ in range(self.workers):
+            self.spawn()
+
+        result = 0
+        while not self.stopping:
+            exit_code = self._reap(block=True)
+            if exit_code is None or self.stopping:
+                continue
+            delay = self._respawn_delay(exit_code)
+            if self.startup_failures >= MAX_STARTUP_FAILURES:
+                print(
+                    f"{self.startup_failures} workers in a row failed to start; shutting down",
+                    file=sys.stderr,
+                )
+                self._handle_stop(signal.SIGTERM, None)
+                result = 1
+                break
+            time.sleep(delay)
+            if not self.stopping:
+                self.spawn()
+
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        while self.children and time.monotonic() < deadline:
+            if self._reap(block=False) is None:
+                time.sleep(0.1)
+        self._signal_children(signal.SIGKILL)
+        while self.children and self._reap(block=True) is not None:
+            pass
+        return result
+
+
+def main() -> int:
+    from src.main import app
+
+    config = build_config(app)
+    sock = bind_socket()
+    print(
+        f"Serving on {HOST}:{PORT} with {worker_count()} workers "
+        f"(loop={config.loop}, http={config.http})",
+        file=sys.stderr,
+    )
+    return Supervisor(config, sock, worker_count()).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
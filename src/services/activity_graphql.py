@@ -0,0 +1,53 @@
+from src.infrastructure.graphql_client import GraphQLString, execute_graphql
+
+
+async def record_activity_graphql(entries: list):
+    """
+    Append a batch of entries to the activity log in a single insert, using GraphQL.
+    :param entries: List of dictionaries with the 'taskListId', 'taskId', 'userId', 'action',
+        'details' and 'occurredAt' of each entry.
+    :return: Result of the GraphQL mutation containing the number of recorded entries.
+    """
+    query = """
+        mutation RecordActivity {
+            recordActivity(input: { entries: $entries }) {
+                integer
+            }
+        }
+    """
+    return await execute_graphql(query, {"entries": entries})
+
+
+async def get_task_activity_graphql(task_id: str, before_id: str = None, page_size: int = 20):
+    """
+    Fetch a page of the activity log of a task, newest entry first, using GraphQL.
+    :param task_id: ID of the task whose history is fetched.
+    :param before_id: ID of the last entry of the previous page.
+    :param page_size: Maximum number of entries to return.
+    :return: Result of the GraphQL query containing the entries.
+    """
+    query = """
+        query FetchTaskActivity {
+            taskActivity(
+                targetTaskId: "$taskId",
+                beforeId: $beforeId,
+                pageSize: $pageSize
+            ) {
+                nodes {
+                    id
+                    taskListId
+                    taskId
+                    userId
+                    action
+                    details
+                    createdAt
+                }
+            }
+        }
+    """
+    variables = {
+        "taskId": task_id,
+        "beforeId": GraphQLString(before_id) if before_id else None,
+        "pageSize": page_size,
+    }
+    return await execute_graphql(query, variables)
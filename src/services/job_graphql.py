@@ -0,0 +1,114 @@
+from src.infrastructure.graphql_client import GraphQLString, execute_graphql
+
+
+async def enqueue_job_graphql(kind: str, payload: dict, max_attempts: int = 5):
+    """
+    Add a job to the background job queue using GraphQL.
+    :param kind: Kind of the job, selecting the handler that runs it, e.g. 'email'.
+    :param payload: JSON-serializable arguments of the handler.
+    :param max_attempts: Number of times the job is tried before it is marked as failed.
+    :return: Result of the GraphQL mutation containing the ID of the job.
+    """
+    query = """
+        mutation EnqueueJob {
+            enqueueJob(input: {
+                jobKind: "$kind",
+                jobPayload: $payload,
+                attemptLimit: $maxAttempts
+            }) {
+                job {
+                    id
+                }
+            }
+        }
+    """
+    variables = {"kind": kind, "payload": payload, "maxAttempts": max_attempts}
+    return await execute_graphql(query, variables)
+
+
+async def claim_jobs_graphql(batch_size: int, lease_seconds: int):
+    """
+    Lease due jobs to the calling worker, skipping those claimed by other workers, using
+    GraphQL.
+    :param batch_size: Maximum number of jobs to claim.
+    :param lease_seconds: Seconds after which unfinished jobs can be claimed again.
+    :return: Result of the GraphQL mutation containing the claimed jobs.
+    """
+    query = """
+        mutation ClaimJobs {
+            claimJobs(input: { batchSize: $batchSize, leaseSeconds: $leaseSeconds }) {
+                jobs {
+                    id
+                    kind
+                    payload
+                    attempts
+                    maxAttempts
+                }
+            }
+        }
+    """
+    variables = {"batchSize": batch_size, "leaseSeconds": lease_seconds}
+    return await execute_graphql(query, variables)
+
+
+async def complete_jobs_graphql(job_ids: list):
+    """
+    Remove finished jobs from the queue using GraphQL.
+    :param job_ids: IDs of the finished jobs.
+    :return: Result of the GraphQL mutation containing the number of removed jobs.
+    """
+    query = """
+        mutation CompleteJobs {
+            completeJobs(input: { jobIds: $jobIds }) {
+                integer
+            }
+        }
+    """
+    return await execute_graphql(query, {"jobIds": [GraphQLString(job_id) for job_id in job_ids]})
+
+
+async def retry_job_graphql(job_id: str, error: str, retry_in_seconds: int = None):
+    """
+    Release a failed job, to be run again later or marked as failed for good, using GraphQL.
+    :param job_id: ID of the failed job.
+    :param error: Description of the failure.
+    :param retry_in_seconds: Delay before the job is run again; None to give up on it.
+    :return: Result of the GraphQL mutation containing the released job.
+    """
+    query = """
+        mutation RetryJob {
+            retryJob(input: {
+                jobId: "$jobId",
+                error: $error,
+                retryInSeconds: $retryInSeconds
+            }) {
+                job {
+                    id
+                    failedAt
+                }
+            }
+        }
+    """
+    variables = {
+        "jobId": job_id,
+        "error": GraphQLString(error),
+        "retryInSeconds": retry_in_seconds,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def enqueue_jobs_graphql(kind: str, payloads: list):
+    """
+    Add jobs of one kind to the background job queue in a single statement using GraphQL.
+    :param kind: Kind of the jobs, selecting the handler that runs them, e.g. 'email'.
+    :param payloads: JSON-serializable arguments of the handler, one per job.
+    :return: Result of the GraphQL mutation containing the number of queued jobs.
+    """
+    query = """
+        mutation EnqueueJobs {
+            enqueueJobs(input: { jobKind: "$kind", payloads: $payloads }) {
+                integer
+            }
+        }
+    """
+    return await execute_graphql(query, {"kind": kind, "payloads": payloads})
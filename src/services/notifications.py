@@ -0,0 +1,40 @@
+"""
+Emails sent to the users, rendered when they are queued; the 'email' jobs only deliver them.
+"""
+
+import os
+
+APP_URL = os.environ.get("APP_URL", "http://localhost:8000")
+
+
+def invitation_email(email: str) -> dict:
+    """
+    :param email: Address of the invited person.
+    :return: Dictionary with the 'to', 'subject' and 'body' of the invitation.
+    """
+    return {
+        "to": email,
+        "subject": "You are invited to Crehana Tasks",
+        "body": (
+            "Hello,\n\n"
+            "You have been invited to Crehana Tasks. Create your account at "
+            f"{APP_URL}/docs#/Users to start organizing your tasks.\n"
+        ),
+    }
+
+
+def task_assigned_email(user: dict, task: dict) -> dict:
+    """
+    :param user: Assignee, with its 'email' and 'fullName'.
+    :param task: Assigned task, with its 'id' and 'title'.
+    :return: Dictionary with the 'to', 'subject' and 'body' of the notification.
+    """
+    return {
+        "to": user["email"],
+        "subject": f"New task assigned: {task['title']}",
+        "body": (
+            f"Hello {user.get('fullName') or user['email']},\n\n"
+            f"The task \"{task['title']}\" has been assigned to you.\n"
+            f"{APP_URL}/tasks/{task['id']}\n"
+        ),
+    }
@@ -1,4 +1,4 @@
-from src.infrastructure.graphql_client import execute_graphql
+from src.infrastructure.graphql_client import GraphQLEnum, GraphQLString, execute_graphql
 
 
 async def create_task_graphql(
@@ -14,11 +14,11 @@ async def create_task_graphql(
         mutation CreateTask {
             createTask(input: {
                 task: {
-                    title: "$title",
+                    title: $title,
                     priority: $priority,
                     status: $status,
                     completedPercentage: $completed_percentage
-                    taskListId: "$taskListId"
+                    taskListId: $taskListId
                 }
             }) {
                 task {
@@ -27,60 +27,85 @@ async def create_task_graphql(
                     priority
                     status
                     completedPercentage
+                    taskListId
                     createdAt
+                    version
                 }
             }
         }
     """
+    title, task_list_id = task_data.get("title"), task_data.get("task_list_id")
     variables = {
-        "title": task_data.get("title"),
+        "title": GraphQLString(title) if title is not None else None,
         "priority": task_data.get("priority", "medium"),
         "status": task_data.get("status", "pending"),
         "completed_percentage": task_data.get("completed_percentage", 0),
-        "taskListId": task_data.get("task_list_id"),
+        "taskListId": GraphQLString(task_list_id) if task_list_id is not None else None,
     }
 
     return await execute_graphql(query, variables)
 
 
-async def get_task_by_id_graphql(task_id: str):
+async def get_task_by_id_graphql(task_id: str, include_archived: bool = False):
     """
-    Fetch a task by its ID using GraphQL.
+    Fetch a task by its ID using GraphQL. Tasks of deleted task lists are not returned.
     :param task_id: ID of the task to be fetched.
+    :param include_archived: Also look for the task in the archive; archived tasks have an
+        'archivedAt' timestamp.
     :return: Result of the GraphQL query containing the task details.
     """
     query = """
         query FetchTaskById {
-            taskById(id: "$id") {
+            taskById: visibleTask(taskId: "$id") {
                 id
                 title
                 priority
                 status
                 completedPercentage
+                taskListId
                 createdAt
+                version
             }
         }
     """
+    if include_archived:
+        query = """
+            query FetchTaskByIdIncludingArchived {
+                taskById: taskIncludingArchivedById(id: "$id") {
+                    id
+                    title
+                    priority
+                    status
+                    completedPercentage
+                    taskListId
+                    createdAt
+                    version
+                    archivedAt
+                }
+            }
+        """
     return await execute_graphql(query, {"id": task_id})
 
 
-async def update_task_graphql(task_id: str, task_data: dict):
+async def update_task_graphql(task_id: str, task_data: dict, expected_version: int = None):
     """
-    Update an existing task using GraphQL.
+    Update an existing task using GraphQL, in a single compare-and-set statement.
     :param task_id: ID of the task to be updated.
     :param task_data: Dictionary containing the updated task data.
-    :return: Result of the GraphQL mutation.
+    :param expected_version: Version the task must still have to be updated, or None to update
+        it unconditionally.
+    :return: Result of the GraphQL mutation; the task is null when it does not exist or its
+        version differs.
     """
     query = """
         mutation UpdateTask {
-            updateTaskById(input: {
-                id: "$id",
-                taskPatch: {
-                    title: "$title",
-                    priority: $priority,
-                    status: $status,
-                    completedPercentage: $completed_percentage
-                }
+            updateTaskById: updateTaskIfVersion(input: {
+                taskId: "$id",
+                expectedVersion: $expected_version,
+                newTitle: $title,
+                newPriority: $priority,
+                newStatus: $status,
+                newCompletedPercentage: $completed_percentage
             }) {
                 task {
                     id
@@ -88,14 +113,18 @@ async def update_task_graphql(task_id: str, task_data: dict):
                     priority
                     status
                     completedPercentage
+                    taskListId
                     createdAt
+                    version
                 }
             }
         }
     """
+    title = task_data.get("title")
     variables = {
         "id": task_id,
-        "title": task_data.get("title"),
+        "expected_version": expected_version,
+        "title": GraphQLString(title) if title is not None else None,
         "priority": task_data.get("priority", "medium"),
         "status": task_data.get("status", "pending"),
         "completed_percentage": task_data.get("completed_percentage", 0),
@@ -104,6 +133,44 @@ async def update_task_graphql(task_id: str, task_data: dict):
     return await execute_graphql(query, variables)
 
 
+async def update_task_status_graphql(task_id: str, status: str, expected_version: int = None):
+    """
+    Change the status of a task using GraphQL, leaving its other fields untouched.
+    :param task_id: ID of the task to be updated.
+    :param status: New status for the task.
+    :param expected_version: Version the task must still have to be updated, or None to update
+        it unconditionally.
+    :return: Result of the GraphQL mutation; the task is null when it does not exist or its
+        version differs.
+    """
+    query = """
+        mutation UpdateTaskStatus {
+            updateTaskById: updateTaskIfVersion(input: {
+                taskId: $id,
+                expectedVersion: $expected_version,
+                newStatus: $status
+            }) {
+                task {
+                    id
+                    title
+                    priority
+                    status
+                    completedPercentage
+                    taskListId
+                    createdAt
+                    version
+                }
+            }
+        }
+    """
+    variables = {
+        "id": GraphQLString(task_id),
+        "expected_version": expected_version,
+        "status": GraphQLEnum(status),
+    }
+    return await execute_graphql(query, variables)
+
+
 async def delete_task_graphql(task_id: str):
     """
     Delete a task by its ID using GraphQL.
@@ -144,7 +211,13 @@ async def assign_task_to_user_graphql(task_id: str, user_id: str):
                         priority
                         status
                         completedPercentage
+                        taskListId
                         createdAt
+                        version
+                    }
+                    userByUserId {
+                        email
+                        fullName
                     }
                 }
             }
@@ -152,3 +225,127 @@ async def assign_task_to_user_graphql(task_id: str, user_id: str):
     """
     variables = {"taskId": task_id, "userId": user_id}
     return await execute_graphql(query, variables)
+
+
+async def search_tasks_graphql(search: str, task_list_id: str = None, limit: int = 20):
+    """
+    Search tasks by title using GraphQL.
+    The `search_tasks` database function ranks the matches using the trigram index on titles.
+    :param search: Text to look for in the task titles.
+    :param task_list_id: Optional ID of the task list to restrict the search to.
+    :param limit: Maximum number of tasks to return.
+    :return: Result of the GraphQL query containing the matching tasks, best match first.
+    """
+    query = """
+        query SearchTasks {
+            searchTasks(search: $search, listId: $listId, maxResults: $limit) {
+                nodes {
+                    id
+                    title
+                    priority
+                    status
+                    completedPercentage
+                    taskListId
+                    createdAt
+                    version
+                }
+            }
+        }
+    """
+    variables = {
+        "search": GraphQLString(search),
+        "listId": GraphQLString(task_list_id) if task_list_id else None,
+        "limit": limit,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def update_tasks_progress_graphql(updates: dict):
+    """
+    Update the status and/or completed percentage of several tasks in one request using GraphQL.
+    Every task is updated by its own aliased mutation, `t0`, `t1`, ... in the order of `updates`.
+    Tasks of deleted task lists are left unchanged.
+    :param updates: Dictionary of task IDs to dictionaries with the new 'status' and/or
+        'completed_percentage'.
+    :return: Result of the GraphQL mutation; the alias of a task that does not exist is null.
+    """
+    mutations = []
+    variables = {}
+    for index, (task_id, fields) in enumerate(updates.items()):
+        mutations.append(
+            f"""
+            t{index}: updateTaskIfVersion(input: {{
+                taskId: $id{index},
+                newStatus: $status{index},
+                newCompletedPercentage: $completed_percentage{index}
+            }}) {{
+                task {{
+                    id
+                    status
+                    completedPercentage
+                    taskListId
+                    updatedAt
+                    version
+                }}
+            }}"""
+        )
+        status = fields.get("status")
+        variables[f"id{index}"] = GraphQLString(task_id)
+        variables[f"status{index}"] = GraphQLEnum(status) if status is not None else None
+        variables[f"completed_percentage{index}"] = fields.get("completed_percentage")
+
+    query = "mutation UpdateTasksProgress {" + "".join(mutations) + "\n}"
+    return await execute_graphql(query, variables)
+
+
+async def get_tasks_by_ids_graphql(task_ids: list):
+    """
+    Fetch the tasks with the given IDs in a single query using GraphQL. Tasks of deleted task
+    lists are left out.
+    :param task_ids: IDs of the tasks.
+    :return: Result of the GraphQL query containing the tasks found, in any order.
+    """
+    query = """
+        query FetchTasksByIds {
+            visibleTasks(taskIds: $ids) {
+                nodes {
+                    id
+                    title
+                    priority
+                    status
+                    completedPercentage
+                    taskListId
+                    createdAt
+                    updatedAt
+                    version
+                }
+            }
+        }
+    """
+    return await execute_graphql(query, {"ids": [GraphQLString(task_id) for task_id in task_ids]})
+
+
+async def assign_tasks_graphql(pairs: list):
+    """
+    Assign tasks to users in a single statement using GraphQL. Pairs already assigned, or whose
+    task or user does not exist, are skipped.
+    :param pairs: List of (task ID, user ID) tuples.
+    :return: Result of the GraphQL mutation containing the new assignments.
+    """
+    query = """
+        mutation AssignTasks {
+            assignTasks(input: { taskIds: $taskIds, userIds: $userIds }) {
+                assignedTasks {
+                    id
+                    taskId
+                    userId
+                    createdAt
+                }
+            }
+        }
+    """
+    variables = {
+        "taskIds": [GraphQLString(task_id) for task_id, _ in pairs],
+        "userIds": [GraphQLString(user_id) for _, user_id in pairs],
+    }
+    return await execute_graphql(query, variables)
@@ -0,0 +1,219 @@
+import csv
+import io
+import json
+import os
+from itertools import islice
+
+from src.domain.enums import TASK_PRIORITIES, TASK_STATUSES
+from src.infrastructure.database import connect
+
+IMPORT_BATCH_SIZE = int(os.environ.get("TASK_IMPORT_BATCH_SIZE", "5000"))
+MAX_REPORTED_ERRORS = 1000
+IMPORT_FORMATS = ("csv", "ndjson")
+
+_STAGING_COLUMNS = "title, priority, status, completed_percentage"
+
+
+def validate_task_row(row: dict) -> tuple:
+    """
+    Validate an imported row against the task table and apply the same defaults as task creation.
+    :param row: Dictionary with the 'title', 'priority', 'status' and 'completed_percentage' keys.
+    :return: Tuple with the title, priority, status and completed percentage of the task.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object.")
+
+    title = row.get("title")
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError("The 'title' field is required and must not be empty.")
+
+    priority = row.get("priority") or "medium"
+    if priority not in TASK_PRIORITIES:
+        raise ValueError(f"Invalid priority '{priority}'.")
+
+    status = row.get("status") or "pending"
+    if status not in TASK_STATUSES:
+        raise ValueError(f"Invalid status '{status}'.")
+
+    completed_percentage = row.get("completed_percentage")
+    if completed_percentage in (None, ""):
+        completed_percentage = 0
+    try:
+        completed_percentage = int(completed_percentage)
+    except (TypeError, ValueError):
+        raise ValueError("The 'completed_percentage' field must be an integer.")
+    if not 0 <= completed_percentage <= 100:
+        raise ValueError("The 'completed_percentage' field must be between 0 and 100.")
+
+    return title, priority, status, completed_percentage
+
+
+def _undecodable(value) -> bool:
+    """
+    Tell whether a value read with the 'surrogateescape' error handler holds invalid UTF-8.
+    """
+    if not isinstance(value, str):
+        return False
+    try:
+        value.encode("utf-8")
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+def _safe_rows(rows):
+    """
+    Yield the items of an iterator, turning the parse and decode errors raised while reading
+    one item into a ValueError yielded in its place, so the next items can still be read.
+    """
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield ValueError(f"Invalid CSV: {e}")
+        except UnicodeDecodeError as e:
+            yield ValueError(f"Invalid UTF-8: {e}")
+        else:
+            yield row
+
+
+def _read_rows(text_file, file_format: str):
+    """
+    Yield the rows of a CSV file with a header line or of an NDJSON file as dictionaries.
+    Rows that cannot be parsed or decoded are yielded as the exception describing the problem.
+    """
+    if file_format == "csv":
+        for row in _safe_rows(csv.DictReader(text_file)):
+            if isinstance(row, Exception):
+                yield row
+            elif None in row:
+                yield ValueError("Too many columns.")
+            elif any(_undecodable(value) for value in row.values()):
+                yield ValueError("Invalid UTF-8.")
+            else:
+                yield row
+        return
+
+    for line in _safe_rows(iter(text_file)):
+        if isinstance(line, Exception):
+            yield line
+            continue
+        if not line.strip():
+            continue
+        if _undecodable(line):
+            yield ValueError("Invalid UTF-8.")
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+
+
+def _copy_value(value) -> str:
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class TaskImporter:
+    """
+    Bulk load tasks into a task list: rows are validated in batches and streamed with COPY
+    into a temporary staging table, then moved into the task table with a single INSERT,
+    so either every valid row is imported or none is.
+    """
+
+    def __init__(self, task_list_id: str, batch_size: int = IMPORT_BATCH_SIZE, progress=None):
+        """
+        :param task_list_id: ID of the task list receiving the tasks.
+        :param batch_size: Number of rows validated and copied at a time.
+        :param progress: Optional callable receiving a progress dictionary after every batch.
+        """
+        self.task_list_id = task_list_id
+        self.batch_size = batch_size
+        self.progress = progress
+        self.processed = 0
+        self.staged = 0
+        self.failed = 0
+        self.errors = []
+
+    def _report_progress(self):
+        if self.progress:
+            self.progress(
+                {"processed": self.processed, "staged": self.staged, "failed": self.failed}
+            )
+
+    def _record_error(self, row_number: int, error: Exception):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": str(error)})
+
+    def _copy_batch(self, cursor, batch: list) -> int:
+        buffer = io.StringIO()
+        copied = 0
+        for row_number, row in batch:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                values = validate_task_row(row)
+            except ValueError as e:
+                self._record_error(row_number, e)
+                continue
+            buffer.write("\t".join(_copy_value(value) for value in values) + "\n")
+            copied += 1
+
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY task_import_staging ({_STAGING_COLUMNS}) FROM STDIN", buffer)
+        return copied
+
+    def run(self, text_file, file_format: str = "csv") -> dict:
+        """
+        Import the tasks of a file. Blocking: run it in a worker thread from async code.
+        :param text_file: Text file object with the rows to import.
+        :param file_format: Either 'csv' (with a header line) or 'ndjson'.
+        :return: Dictionary with the processed, imported and failed counts and the error report.
+        """
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format '{file_format}'.")
+
+        rows = enumerate(_read_rows(text_file, file_format), start=1)
+        connection = connect()
+        try:
+            with connection, connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    CREATE TEMP TABLE task_import_staging (
+                        title text NOT NULL,
+                        priority task_priority NOT NULL,
+                        status task_status NOT NULL,
+                        completed_percentage integer NOT NULL
+                    ) ON COMMIT DROP
+                    """
+                )
+                while batch := list(islice(rows, self.batch_size)):
+                    self.processed += len(batch)
+                    self.staged += self._copy_batch(cursor, batch)
+                    self._report_progress()
+
+                cursor.execute(
+                    f"""
+                    INSERT INTO task ({_STAGING_COLUMNS}, task_list_id)
+                    SELECT {_STAGING_COLUMNS}, %s FROM task_import_staging
+                    """,
+                    (self.task_list_id,),
+                )
+                imported = cursor.rowcount
+        finally:
+            connection.close()
+
+        return {
+            "processed": self.processed,
+            "imported": imported,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
@@ -1,4 +1,4 @@
-from src.infrastructure.graphql_client import execute_graphql
+from src.infrastructure.graphql_client import GraphQLEnum, GraphQLString, execute_graphql
 
 
 async def create_task_list_graphql(name: str):
@@ -11,114 +11,209 @@ async def create_task_list_graphql(name: str):
         mutation CreateTaskList {
             createTaskList(input: {
                 taskList: {
-                    name: "$name"
+                    name: $name
                 }
             }) {
                 taskList {
                     id
                     name
                     createdAt
+                    version
                 }
             }
         }
     """
-    variables = {"name": name}
+    variables = {"name": GraphQLString(name)}
     return await execute_graphql(query, variables)
 
 
 async def get_task_lists_by_id_graphql(task_list_id: str):
     """
-    Fetch a task list by its ID using GraphQL.
+    Fetch a task list by its ID using GraphQL. Deleted task lists are not returned.
     :param task_list_id: ID of the task list to be fetched.
-    :return: Result of the GraphQL query containing the task list and its tasks.
+    :return: Result of the GraphQL query containing the task list and its task statistics.
     """
     query = """
         query FetchTaskListById {
-            taskListById(id: "$id") {
+            taskListById: visibleTaskList(listId: "$id") {
                 id
                 name
                 createdAt
+                version
+                summary {
+                    totalCount
+                    pendingCount
+                    inProcessCount
+                    completedCount
+                    lowPriorityCount
+                    mediumPriorityCount
+                    highPriorityCount
+                    averageCompletedPercentage
+                }
             }
         }
     """
     return await execute_graphql(query, {"id": task_list_id})
 
 
-async def update_task_list_graphql(task_list_id: str, name: str):
+async def update_task_list_graphql(task_list_id: str, name: str, expected_version: int = None):
     """
-    Update an existing task list using GraphQL.
+    Update an existing task list using GraphQL, in a single compare-and-set statement.
     :param task_list_id: ID of the task list to be updated.
     :param name: New name for the task list.
-    :return: Result of the GraphQL mutation.
+    :param expected_version: Version the task list must still have to be updated, or None to
+        update it unconditionally.
+    :return: Result of the GraphQL mutation; the task list is null when it does not exist or
+        its version differs.
     """
     query = """
         mutation UpdateTaskList {
-            updateTaskListById(input: {
-                id: "$id",
-                taskListPatch: {
-                    name: "$name"
-                }
+            updateTaskListById: updateTaskListIfVersion(input: {
+                listId: "$id",
+                expectedVersion: $expected_version,
+                newName: $name
             }) {
                 taskList {
                     id
                     name
                     createdAt
+                    version
                 }
             }
         }
     """
-    variables = {"id": task_list_id, "name": name}
+    variables = {
+        "id": task_list_id,
+        "expected_version": expected_version,
+        "name": GraphQLString(name),
+    }
     return await execute_graphql(query, variables)
 
 
 async def delete_task_list_graphql(task_list_id: str):
     """
-    Delete a task list by its ID using GraphQL.
+    Delete a task list by its ID using GraphQL. The task list is only marked as deleted, which
+    hides it and its tasks from every read; `purge_deleted_task_lists_graphql` removes them.
     :param task_list_id: ID of the task list to be deleted.
-    :return: Result of the GraphQL mutation.
+    :return: Result of the GraphQL mutation; the task list is null when it does not exist or
+        was already deleted.
     """
     query = """
         mutation DeleteTaskList {
-            deleteTaskListById(input: {
-                id: "$id"
+            deleteTaskListById: softDeleteTaskList(input: {
+                listId: "$id"
             }) {
-                deletedTaskListId
+                taskList {
+                    id
+                    deletedAt
+                }
             }
         }
     """
     return await execute_graphql(query, {"id": task_list_id})
 
 
-async def get_task_list_with_task_with_filters_graphql(task_list_id: str, filters: dict = None):
+TASK_ORDER_FIELDS = {
+    "priority": "PRIORITY",
+    "created_at": "CREATED_AT",
+    "completed_percentage": "COMPLETED_PERCENTAGE",
+}
+
+
+def _task_filter_variables(task_list_id: str, filters: dict) -> dict:
+    """
+    Build the `filter` and `orderBy` arguments of the filtered task query.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param filters: Dictionary with optional 'status' and 'priority' lists, 'completed_min',
+        'completed_max', 'created_after' and 'created_before' bounds and an 'order_by' list of
+        field names, each prefixed with '-' for descending order.
+    :return: Variables for the filtered task query template.
+    """
+    task_filter = {"taskListId": {"equalTo": GraphQLString(task_list_id)}}
+    for key in ("status", "priority"):
+        if filters.get(key):
+            task_filter[key] = {"in": [GraphQLEnum(value) for value in filters[key]]}
+
+    completed = {}
+    if filters.get("completed_min") is not None:
+        completed["greaterThanOrEqualTo"] = filters["completed_min"]
+    if filters.get("completed_max") is not None:
+        completed["lessThanOrEqualTo"] = filters["completed_max"]
+    if completed:
+        task_filter["completedPercentage"] = completed
+
+    created = {}
+    if filters.get("created_after"):
+        created["greaterThan"] = GraphQLString(filters["created_after"])
+    if filters.get("created_before"):
+        created["lessThan"] = GraphQLString(filters["created_before"])
+    if created:
+        task_filter["createdAt"] = created
+
+    order_by = []
+    for field in filters.get("order_by") or ():
+        direction = "DESC" if field.startswith("-") else "ASC"
+        order_by.append(GraphQLEnum(f"{TASK_ORDER_FIELDS[field.lstrip('-')]}_{direction}"))
+    # Ties are broken by ID in the direction of the last ordering, so a composite index
+    # ending in the ID can be scanned in either direction.
+    direction = order_by[-1].rsplit("_", 1)[1] if order_by else "ASC"
+    order_by.append(GraphQLEnum(f"PRIMARY_KEY_{direction}"))
+
+    return {"filter": task_filter, "orderBy": order_by}
+
+
+async def get_task_list_with_task_with_filters_graphql(
+    task_list_id: str,
+    filters: dict = None,
+    include_archived: bool = False,
+    include_assignees: bool = False,
+):
     """
     Fetch a task list along with its tasks by the task list ID using GraphQL.
     :param task_list_id: ID of the task list to be fetched.
-    :param filters: Optional filters to apply to the task list.
+    :param filters: Optional filters and ordering to apply to the tasks, see
+        `_task_filter_variables`. With filters only the matching tasks are returned, without
+        checking the task list, so callers make sure it was not deleted.
+    :param include_archived: Read the tasks from the `task_including_archived` view instead of
+        the task table; archived tasks have an 'archivedAt' timestamp.
+    :param include_assignees: Also fetch the users each task is assigned to, in the same query.
     :return: Result of the GraphQL query containing the task list and its tasks.
     """
-    query = """
-        query FetchTaskListWithTasks {
-            taskListById(id: "$id") {
-                id
-                name
-                createdAt
-                tasksByTaskListId {
+    if filters and include_archived:
+        query = """
+            query allTasksIncludingArchivedByFilter {
+                allTasks: allTaskIncludingArchiveds(filter: $filter, orderBy: $orderBy) {
                     nodes {
                         id
-                        status
-                        priority
                         title
+                        priority
+                        status
                         completedPercentage
                         createdAt
+                        version
+                        archivedAt
+                        assignedTasksByTaskId: assignedTaskIncludingArchivedsByTaskId(
+                            orderBy: [CREATED_AT_ASC, ID_ASC]
+                        ) @include(if: $assignees) {
+                            nodes {
+                                userByUserId {
+                                    id
+                                    fullName
+                                    email
+                                }
+                            }
+                        }
                     }
                 }
             }
-        }
-    """
+        """
+        variables = _task_filter_variables(task_list_id, filters)
+        return await execute_graphql(query, {**variables, "assignees": include_assignees})
+
     if filters:
         query = """
             query allTasksByFilter {
-                allTasks(condition: { priority: $priority, status: $status, taskListId: "$id" }) {
+                allTasks(filter: $filter, orderBy: $orderBy) {
                     nodes {
                         id
                         title
@@ -126,15 +221,362 @@ async def get_task_list_with_task_with_filters_graphql(task_list_id: str, filter
                         status
                         completedPercentage
                         createdAt
+                        version
+                        assignedTasksByTaskId(orderBy: [CREATED_AT_ASC, ID_ASC])
+                        @include(if: $assignees) {
+                            nodes {
+                                userByUserId {
+                                    id
+                                    fullName
+                                    email
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+        variables = _task_filter_variables(task_list_id, filters)
+        return await execute_graphql(query, {**variables, "assignees": include_assignees})
+
+    if include_archived:
+        query = """
+            query FetchTaskListWithTasksIncludingArchived {
+                taskListById: visibleTaskList(listId: "$id") {
+                    id
+                    name
+                    createdAt
+                    version
+                    tasksByTaskListId: taskIncludingArchivedsByTaskListId {
+                        nodes {
+                            id
+                            status
+                            priority
+                            title
+                            completedPercentage
+                            createdAt
+                            updatedAt
+                            version
+                            archivedAt
+                            assignedTasksByTaskId: assignedTaskIncludingArchivedsByTaskId(
+                                orderBy: [CREATED_AT_ASC, ID_ASC]
+                            ) @include(if: $assignees) {
+                                nodes {
+                                    userByUserId {
+                                        id
+                                        fullName
+                                        email
+                                    }
+                                }
+                            }
+                        }
                     }
                 }
             }
         """
-        variables = {
-            "id": task_list_id,
-            "priority": filters.get("priority"),
-            "status": filters.get("status"),
+        return await execute_graphql(query, {"id": task_list_id, "assignees": include_assignees})
+
+    query = """
+        query FetchTaskListWithTasks {
+            taskListById: visibleTaskList(listId: "$id") {
+                id
+                name
+                createdAt
+                version
+                tasksByTaskListId {
+                    nodes {
+                        id
+                        status
+                        priority
+                        title
+                        completedPercentage
+                        createdAt
+                        updatedAt
+                        version
+                        assignedTasksByTaskId(orderBy: [CREATED_AT_ASC, ID_ASC])
+                        @include(if: $assignees) {
+                            nodes {
+                                userByUserId {
+                                    id
+                                    fullName
+                                    email
+                                }
+                            }
+                        }
+                    }
+                }
+            }
         }
-        return await execute_graphql(query, variables)
+    """
+    return await execute_graphql(query, {"id": task_list_id, "assignees": include_assignees})
+
 
+async def get_task_list_stats_graphql(task_list_id: str):
+    """
+    Fetch the task statistics of a task list using GraphQL.
+    The statistics are read from the `task_list_stats` counters kept up to date by triggers.
+    :param task_list_id: ID of the task list to compute the statistics for.
+    :return: Result of the GraphQL query containing the task list summary.
+    """
+    query = """
+        query FetchTaskListStats {
+            taskListById: visibleTaskList(listId: "$id") {
+                id
+                summary {
+                    totalCount
+                    pendingCount
+                    inProcessCount
+                    completedCount
+                    lowPriorityCount
+                    mediumPriorityCount
+                    highPriorityCount
+                    averageCompletedPercentage
+                }
+            }
+        }
+    """
     return await execute_graphql(query, {"id": task_list_id})
+
+
+async def rebuild_task_list_stats_graphql(task_list_id: str = None, dry_run: bool = False):
+    """
+    Recompute the `task_list_stats` counters from the task table using GraphQL.
+    :param task_list_id: Optional ID of a single task list to check; all lists when omitted.
+    :param dry_run: Only count the drifted task lists without repairing them.
+    :return: Result of the GraphQL mutation containing the number of drifted task lists.
+    """
+    query = """
+        mutation RebuildTaskListStats {
+            rebuildTaskListStats(input: { listId: $listId, dryRun: $dryRun }) {
+                integer
+            }
+        }
+    """
+    variables = {
+        "listId": GraphQLString(task_list_id) if task_list_id else None,
+        "dryRun": dry_run,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def get_task_list_changes_graphql(
+    task_list_id: str, updated_since: str, include_assignees: bool = False
+):
+    """
+    Fetch the tasks of a task list changed or deleted after a point in time using GraphQL.
+    :param task_list_id: ID of the task list to be synchronized.
+    :param updated_since: ISO 8601 timestamp of the last synchronization.
+    :param include_assignees: Also fetch the users each changed task is assigned to.
+    :return: Result of the GraphQL query containing the changed tasks, the deleted task IDs and
+        the watermark to synchronize from next time.
+    """
+    query = """
+        query FetchTaskListChanges {
+            syncWatermark
+            taskListById: visibleTaskList(listId: "$id") {
+                id
+            }
+            tasksUpdatedSince(listId: "$id", since: $since) {
+                nodes {
+                    id
+                    title
+                    priority
+                    status
+                    completedPercentage
+                    createdAt
+                    updatedAt
+                    version
+                    assignedTasksByTaskId(orderBy: [CREATED_AT_ASC, ID_ASC])
+                    @include(if: $assignees) {
+                        nodes {
+                            userByUserId {
+                                id
+                                fullName
+                                email
+                            }
+                        }
+                    }
+                }
+            }
+            taskTombstonesSince(listId: "$id", since: $since) {
+                nodes {
+                    taskId
+                    deletedAt
+                }
+            }
+        }
+    """
+    variables = {
+        "id": task_list_id,
+        "since": GraphQLString(updated_since),
+        "assignees": include_assignees,
+    }
+    return await execute_graphql(query, variables)
+
+
+def _bulk_filter_variables(task_list_id: str, filters: dict) -> dict:
+    """
+    Build the task selection arguments shared by the bulk task mutations.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param filters: Dictionary with optional 'ids', 'status' and 'priority' lists.
+    :return: Variables for the bulk mutation templates.
+    """
+    ids, statuses, priorities = (filters.get(key) for key in ("ids", "status", "priority"))
+    return {
+        "listId": task_list_id,
+        "taskIds": [str(task_id) for task_id in ids] if ids else None,
+        "statuses": [GraphQLEnum(value) for value in statuses] if statuses else None,
+        "priorities": [GraphQLEnum(value) for value in priorities] if priorities else None,
+    }
+
+
+async def bulk_update_tasks_graphql(
+    task_list_id: str, filters: dict, patch: dict, user_id: str = None
+):
+    """
+    Update every task of a task list matching the filters in one statement using GraphQL. The
+    statement also records the change in the activity log of every updated task.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param filters: Dictionary with optional 'ids', 'status' and 'priority' lists.
+    :param patch: Dictionary with the new 'status', 'priority' and/or 'completed_percentage'.
+    :param user_id: ID of the user making the change, for the activity log.
+    :return: Result of the GraphQL mutation containing the number of updated tasks.
+    """
+    query = """
+        mutation BulkUpdateTasks {
+            bulkUpdateTasks(input: {
+                listId: "$listId",
+                taskIds: $taskIds,
+                statuses: $statuses,
+                priorities: $priorities,
+                newStatus: $newStatus,
+                newPriority: $newPriority,
+                newCompletedPercentage: $newCompletedPercentage,
+                actingUserId: $userId
+            }) {
+                integer
+            }
+        }
+    """
+    variables = {
+        **_bulk_filter_variables(task_list_id, filters),
+        "newStatus": patch.get("status"),
+        "newPriority": patch.get("priority"),
+        "newCompletedPercentage": patch.get("completed_percentage"),
+        "userId": GraphQLString(user_id) if user_id else None,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def bulk_delete_tasks_graphql(task_list_id: str, filters: dict, user_id: str = None):
+    """
+    Delete every task of a task list matching the filters in one statement using GraphQL. The
+    statement also records the deletion in the activity log of every deleted task.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param filters: Dictionary with optional 'ids', 'status' and 'priority' lists.
+    :param user_id: ID of the user making the change, for the activity log.
+    :return: Result of the GraphQL mutation containing the number of deleted tasks.
+    """
+    query = """
+        mutation BulkDeleteTasks {
+            bulkDeleteTasks(input: {
+                listId: "$listId",
+                taskIds: $taskIds,
+                statuses: $statuses,
+                priorities: $priorities,
+                actingUserId: $userId
+            }) {
+                integer
+            }
+        }
+    """
+    variables = {
+        **_bulk_filter_variables(task_list_id, filters),
+        "userId": GraphQLString(user_id) if user_id else None,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def archive_completed_tasks_graphql(older_than_days: int, batch_size: int):
+    """
+    Move one batch of tasks completed before a number of days ago to the task archive using
+    GraphQL.
+    :param older_than_days: Minimum number of days since the tasks were last updated.
+    :param batch_size: Maximum number of tasks to move.
+    :return: Result of the GraphQL mutation containing the number of archived tasks.
+    """
+    query = """
+        mutation ArchiveCompletedTasks {
+            archiveCompletedTasks(input: {
+                olderThanDays: $olderThanDays,
+                batchSize: $batchSize
+            }) {
+                integer
+            }
+        }
+    """
+    variables = {"olderThanDays": older_than_days, "batchSize": batch_size}
+    return await execute_graphql(query, variables)
+
+
+async def restore_archived_tasks_graphql(task_list_id: str, task_ids: list, user_id: str = None):
+    """
+    Move archived tasks of a task list back to the task table using GraphQL. The statement also
+    records the restore in the activity log of every restored task.
+    :param task_list_id: ID of the task list the tasks belong to.
+    :param task_ids: IDs of the archived tasks to restore.
+    :param user_id: ID of the user making the change, for the activity log.
+    :return: Result of the GraphQL mutation containing the number of restored tasks.
+    """
+    query = """
+        mutation RestoreArchivedTasks {
+            restoreArchivedTasks(input: {
+                listId: $listId,
+                taskIds: $taskIds,
+                actingUserId: $userId
+            }) {
+                integer
+            }
+        }
+    """
+    variables = {
+        "listId": GraphQLString(task_list_id),
+        "taskIds": [str(task_id) for task_id in task_ids],
+        "userId": GraphQLString(user_id) if user_id else None,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def purge_deleted_task_lists_graphql(batch_size: int):
+    """
+    Remove one batch of tasks of deleted task lists, and the task lists left empty, using
+    GraphQL.
+    :param batch_size: Maximum number of tasks to remove.
+    :return: Result of the GraphQL mutation containing the number of removed tasks.
+    """
+    query = """
+        mutation PurgeDeletedTaskLists {
+            purgeDeletedTaskLists(input: { batchSize: $batchSize }) {
+                integer
+            }
+        }
+    """
+    return await execute_graphql(query, {"batchSize": batch_size})
+
+
+async def prune_task_tombstones_graphql(older_than_days: int, batch_size: int):
+    """
+    Remove one batch of task tombstones older than a number of days using GraphQL.
+    :param older_than_days: Minimum number of days since the tasks were deleted.
+    :param batch_size: Maximum number of tombstones to remove.
+    :return: Result of the GraphQL mutation containing the number of removed tombstones.
+    """
+    query = """
+        mutation PruneTaskTombstones {
+            pruneTaskTombstones(input: { olderThanDays: $olderThanDays, batchSize: $batchSize }) {
+                integer
+            }
+        }
+    """
+    variables = {"olderThanDays": older_than_days, "batchSize": batch_size}
+    return await execute_graphql(query, variables)
@@ -1,7 +1,9 @@
+import asyncio
+
 from pydantic import EmailStr
 
 from src.application.auth import hash_password
-from src.infrastructure.graphql_client import execute_graphql
+from src.infrastructure.graphql_client import GraphQLString, execute_graphql
 
 
 async def check_existing_users_by_email(email: EmailStr):
@@ -30,13 +32,15 @@ async def check_existing_users_by_email(email: EmailStr):
 async def create_user_graphql(user_data: dict):
     """
     Create a new user using GraphQL.
-    This function hashes the password and sends a mutation to create a user.
+    This function hashes the password, in a worker thread as bcrypt is slow on purpose, and
+    sends a mutation to create a user.
     :param user_data: Dictionary containing user data with keys
     'email', 'password', and 'full_name'.
-    :return: Result of the GraphQL mutation.
+    :return: Result of the GraphQL mutation; an email already registered violates the
+        `user_email_key` unique constraint.
     """
     password = user_data["password"]
-    hashed = hash_password(password)
+    hashed = await asyncio.to_thread(hash_password, password)
 
     create_query = """
         mutation CreateUser {
@@ -63,3 +67,80 @@ async def create_user_graphql(user_data: dict):
     }
 
     return await execute_graphql(create_query, variables)
+
+
+async def get_user_assigned_tasks_graphql(
+    user_id: str,
+    status: str = None,
+    priority: str = None,
+    after_created_at: str = None,
+    after_id: str = None,
+    page_size: int = 20,
+):
+    """
+    Fetch a page of the tasks assigned to a user, newest assignment first, using GraphQL.
+    :param user_id: ID of the user whose assigned tasks are fetched.
+    :param status: Optional task status to filter by.
+    :param priority: Optional task priority to filter by.
+    :param after_created_at: Assignment timestamp of the last row of the previous page.
+    :param after_id: Assignment ID of the last row of the previous page.
+    :param page_size: Maximum number of assignments to return.
+    :return: Result of the GraphQL query containing the assignments and their tasks.
+    """
+    query = """
+        query FetchUserAssignedTasks {
+            userAssignedTasks(
+                assigneeId: "$userId",
+                statusFilter: $status,
+                priorityFilter: $priority,
+                afterCreatedAt: $afterCreatedAt,
+                afterId: $afterId,
+                pageSize: $pageSize
+            ) {
+                nodes {
+                    id
+                    createdAt
+                    taskByTaskId {
+                        id
+                        title
+                        priority
+                        status
+                        completedPercentage
+                        taskListId
+                        createdAt
+                        updatedAt
+                        version
+                    }
+                }
+            }
+        }
+    """
+    variables = {
+        "userId": user_id,
+        "status": status,
+        "priority": priority,
+        "afterCreatedAt": GraphQLString(after_created_at) if after_created_at else None,
+        "afterId": GraphQLString(after_id) if after_id else None,
+        "pageSize": page_size,
+    }
+    return await execute_graphql(query, variables)
+
+
+async def get_users_by_ids_graphql(user_ids: list):
+    """
+    Fetch the users with the given IDs in a single query using GraphQL.
+    :param user_ids: IDs of the users.
+    :return: Result of the GraphQL query containing the users found, in any order.
+    """
+    query = """
+        query FetchUsersByIds {
+            allUsers(filter: { id: { in: $ids } }) {
+                nodes {
+                    id
+                    email
+                    fullName
+                }
+            }
+        }
+    """
+    return await execute_graphql(query, {"ids": [GraphQLString(user_id) for user_id in user_ids]})
@@ -0,0 +1,83 @@
+from src.infrastructure.graphql_client import GraphQLString, execute_graphql
+
+
+async def create_webhook_graphql(task_list_id: str, url: str, secret: str):
+    """
+    Subscribe an endpoint to the changes of a task list using GraphQL.
+    :param task_list_id: ID of the task list to be watched.
+    :param url: URL the changes are posted to.
+    :param secret: Key signing the deliveries.
+    :return: Result of the GraphQL mutation containing the subscription.
+    """
+    query = """
+        mutation CreateWebhook {
+            createWebhookSubscription(input: {
+                webhookSubscription: {
+                    taskListId: "$taskListId",
+                    url: $url,
+                    secret: $secret
+                }
+            }) {
+                webhookSubscription {
+                    id
+                    taskListId
+                    url
+                    secret
+                    createdAt
+                }
+            }
+        }
+    """
+    variables = {
+        "taskListId": task_list_id,
+        "url": GraphQLString(url),
+        "secret": GraphQLString(secret),
+    }
+    return await execute_graphql(query, variables)
+
+
+async def get_webhooks_graphql(task_list_id: str):
+    """
+    Fetch the webhook subscriptions of a task list, without their secrets, using GraphQL.
+    :param task_list_id: ID of the task list.
+    :return: Result of the GraphQL query containing the subscriptions.
+    """
+    query = """
+        query FetchWebhooks {
+            allWebhookSubscriptions(
+                condition: { taskListId: "$taskListId" },
+                orderBy: [CREATED_AT_ASC, PRIMARY_KEY_ASC]
+            ) {
+                nodes {
+                    id
+                    taskListId
+                    url
+                    createdAt
+                }
+            }
+        }
+    """
+    return await execute_graphql(query, {"taskListId": task_list_id})
+
+
+async def delete_webhook_graphql(task_list_id: str, webhook_id: str):
+    """
+    Remove a webhook subscription of a task list using GraphQL.
+    :param task_list_id: ID of the task list the subscription belongs to.
+    :param webhook_id: ID of the subscription.
+    :return: Result of the GraphQL mutation; the subscription is null when it does not exist
+        in that task list.
+    """
+    query = """
+        mutation DeleteWebhook {
+            deleteWebhookSubscription: removeWebhookSubscription(input: {
+                listId: "$taskListId",
+                subscriptionId: "$webhookId"
+            }) {
+                webhookSubscription {
+                    id
+                }
+            }
+        }
+    """
+    return await execute_graphql(query, {"taskListId": task_list_id, "webhookId": webhook_id})
@@ -13,6 +13,16 @@ def disable_authentication():
     patcher.stop()
 
 
+@pytest.fixture(autouse=True)
+def disable_activity_log():
+    """
+    Fixture to keep tests from queueing activity log entries; tests of the activity log patch
+    in their own writer.
+    """
+    with patch("src.controllers.activity_controller.activity_log", None):
+        yield
+
+
 @pytest.fixture
 def test_app():
     from src.main import app
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.activity_log import ActivityLogWriter
+
+
+class RecordingWriter:
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(batch)
+
+
+@pytest.mark.asyncio
+class TestActivityLogWriter:
+
+    async def test_entries_are_written_in_one_batch_after_the_interval(self):
+        writer = RecordingWriter()
+        activity_log = ActivityLogWriter(writer, flush_seconds=0.01)
+
+        for n in range(3):
+            assert activity_log.record({"action": f"action.{n}"})
+        assert writer.batches == []
+        await asyncio.sleep(0.05)
+
+        assert writer.batches == [
+            [{"action": "action.0"}, {"action": "action.1"}, {"action": "action.2"}]
+        ]
+        assert activity_log.written == 3
+
+    async def test_batch_size_flushes_without_waiting(self):
+        writer = RecordingWriter()
+        activity_log = ActivityLogWriter(writer, batch_size=2, flush_seconds=60)
+
+        for n in range(5):
+            activity_log.record({"action": f"action.{n}"})
+        await asyncio.sleep(0)
+        assert [len(batch) for batch in writer.batches] == [2, 2, 1]
+
+        activity_log.record({"action": "action.5"})
+        await asyncio.sleep(0)
+        assert len(writer.batches) == 3
+        await activity_log.close()
+        assert writer.batches[-1] == [{"action": "action.5"}]
+
+    async def test_close_waits_for_the_flushes_in_progress(self):
+        written = asyncio.Event()
+
+        async def slow_writer(batch):
+            await asyncio.sleep(0.01)
+            written.set()
+
+        activity_log = ActivityLogWriter(slow_writer, batch_size=1, flush_seconds=60)
+        activity_log.record({"action": "task.created"})
+        assert len(activity_log._flushes) == 1
+
+        await activity_log.close()
+
+        assert written.is_set()
+        assert activity_log.written == 1
+
+    async def test_entries_are_dropped_when_the_queue_is_full(self):
+        writer = RecordingWriter()
+        activity_log = ActivityLogWriter(writer, max_queue=2, flush_seconds=60)
+
+        results = [activity_log.record({"action": f"action.{n}"}) for n in range(4)]
+        await activity_log.close()
+
+        assert results == [True, True, False, False]
+        assert activity_log.recorded == 2
+        assert activity_log.dropped == 2
+        assert writer.batches == [[{"action": "action.0"}, {"action": "action.1"}]]
+
+    async def test_failed_batches_are_retried_then_dropped(self):
+        writer = RecordingWriter(failures=1)
+        activity_log = ActivityLogWriter(writer, flush_seconds=60, max_attempts=2)
+
+        activity_log.record({"action": "task.created"})
+        await activity_log.flush()
+        assert writer.batches == []
+        await activity_log.flush()
+        assert writer.batches == [[{"action": "task.created"}]]
+
+        writer.failures = 2
+        activity_log.record({"action": "task.deleted"})
+        await activity_log.flush()
+        await activity_log.close()
+        assert writer.batches == [[{"action": "task.created"}]]
+        assert activity_log.dropped == 1
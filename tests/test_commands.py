@@ -0,0 +1,71 @@
+from unittest.mock import patch
+
+from src.commands import archive_tasks, purge_deleted_task_lists, rebuild_task_list_stats
+
+
+class TestRebuildTaskListStatsCommand:
+
+    @patch("src.controllers.task_lists_controller.rebuild_task_list_stats_graphql")
+    def test_check_reports_drift(self, mock_rebuild, capsys):
+        mock_rebuild.return_value = {"data": {"rebuildTaskListStats": {"integer": 2}}}
+
+        exit_code = rebuild_task_list_stats.main(["--check"])
+
+        assert exit_code == 1
+        mock_rebuild.assert_called_once_with(None, True)
+        assert "2 task list(s)" in capsys.readouterr().out
+
+    @patch("src.controllers.task_lists_controller.rebuild_task_list_stats_graphql")
+    def test_rebuild_single_task_list(self, mock_rebuild):
+        mock_rebuild.return_value = {"data": {"rebuildTaskListStats": {"integer": 0}}}
+
+        exit_code = rebuild_task_list_stats.main(["--task-list-id", "123"])
+
+        assert exit_code == 0
+        mock_rebuild.assert_called_once_with("123", False)
+
+
+class TestArchiveTasksCommand:
+
+    @patch("src.controllers.task_lists_controller.archive_completed_tasks_graphql")
+    def test_archives_until_a_batch_comes_back_short(self, mock_archive, capsys):
+        mock_archive.side_effect = [
+            {"data": {"archiveCompletedTasks": {"integer": 2}}},
+            {"data": {"archiveCompletedTasks": {"integer": 1}}},
+        ]
+
+        exit_code = archive_tasks.main(["--older-than-days", "7", "--batch-size", "2"])
+
+        assert exit_code == 0
+        assert mock_archive.call_count == 2
+        mock_archive.assert_called_with(7, 2)
+        assert "3 in this pass" in capsys.readouterr().out
+
+    @patch("src.controllers.task_lists_controller.archive_completed_tasks_graphql")
+    def test_reports_errors(self, mock_archive):
+        mock_archive.return_value = {"errors": [{"message": "boom"}]}
+
+        assert archive_tasks.main([]) == 1
+
+
+class TestPurgeDeletedTaskListsCommand:
+
+    @patch("src.controllers.task_lists_controller.prune_task_tombstones_graphql")
+    @patch("src.controllers.task_lists_controller.purge_deleted_task_lists_graphql")
+    def test_purges_until_a_batch_comes_back_short(self, mock_purge, mock_prune, capsys):
+        mock_purge.side_effect = [
+            {"data": {"purgeDeletedTaskLists": {"integer": 5}}},
+            {"data": {"purgeDeletedTaskLists": {"integer": 0}}},
+        ]
+        mock_prune.return_value = {"data": {"pruneTaskTombstones": {"integer": 3}}}
+
+        exit_code = purge_deleted_task_lists.main(
+            ["--batch-size", "5", "--pause", "0", "--tombstone-retention-days", "7"]
+        )
+
+        assert exit_code == 0
+        assert mock_purge.call_count == 2
+        mock_prune.assert_called_once_with(7, 5)
+        output = capsys.readouterr().out
+        assert "5 in this pass" in output
+        assert "Pruned 3 tombstone(s)" in output
@@ -0,0 +1,121 @@
+import gzip
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from src.infrastructure.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE_BODY = {"tasks": [{"id": index, "title": "Task"} for index in range(200)]}
+
+
+def _create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache_size=8)
+
+    @app.get("/large")
+    async def large():
+        return LARGE_BODY
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield "x" * 1000
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+class TestNegotiateEncoding:
+
+    def test_prefers_server_order_on_equal_quality(self):
+        assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+
+    def test_respects_quality_values(self):
+        assert negotiate_encoding("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+        assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+        assert negotiate_encoding("*", ["gzip"]) == "gzip"
+        assert negotiate_encoding("", ["gzip"]) is None
+
+
+@pytest.mark.asyncio
+class TestCompressionMiddleware:
+
+    async def _get(self, app, path: str, accept_encoding: str = "gzip"):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await ac.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    async def test_compresses_large_responses(self):
+        response = await self._get(_create_app(), "/large")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"].endswith('-gzip"')
+        assert response.json() == LARGE_BODY
+
+    async def test_skips_small_responses(self):
+        response = await self._get(_create_app(), "/small")
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == {"status": "ok"}
+
+    async def test_skips_clients_without_supported_encoding(self):
+        app = _create_app()
+        response = await self._get(app, "/large", accept_encoding="identity")
+        compressed = await self._get(app, "/large")
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] != compressed.headers["etag"]
+        assert compressed.headers["etag"] == response.headers["etag"][:-1] + '-gzip"'
+
+    async def test_streams_are_forwarded_uncompressed(self):
+        response = await self._get(_create_app(), "/stream")
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "x" * 3000
+
+    async def test_identical_bodies_are_compressed_once(self):
+        app = _create_app()
+
+        with patch(
+            "src.infrastructure.compression.gzip.compress", wraps=gzip.compress
+        ) as mock_compress:
+            first = await self._get(app, "/large")
+            second = await self._get(app, "/large")
+
+        assert mock_compress.call_count == 1
+        assert first.headers["etag"] == second.headers["etag"]
+        assert second.json() == LARGE_BODY
+
+    async def test_matching_if_none_match_is_answered_with_304(self):
+        app = _create_app()
+        first = await self._get(app, "/large")
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            cached = await ac.get(
+                "/large",
+                headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+            )
+            other_encoding = await ac.get(
+                "/large",
+                headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["etag"]},
+            )
+
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == first.headers["etag"]
+        assert cached.headers["vary"] == "Accept-Encoding"
+        assert other_encoding.status_code == 200
+        assert other_encoding.json() == LARGE_BODY
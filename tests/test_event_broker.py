@@ -0,0 +1,69 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.controllers.task_controller import TaskController
+from src.infrastructure.event_broker import EventBroker, event_broker
+
+
+@pytest.mark.asyncio
+class TestEventBroker:
+
+    async def test_publish_fans_out_to_topic_subscribers(self):
+        broker = EventBroker(buffer_size=10)
+        first = broker.subscribe("list-1")
+        second = broker.subscribe("list-1")
+        other = broker.subscribe("list-2")
+
+        delivered = broker.publish("list-1", "task.updated", {"id": "t1"})
+
+        assert delivered == 2
+        message = await first.next_message(timeout=0.1)
+        assert message == await second.next_message(timeout=0.1)
+        assert message.startswith("event: task.updated\n")
+        assert json.loads(message.split("data: ")[1]) == {"id": "t1"}
+        assert await other.next_message(timeout=0.01) is None
+
+    async def test_slow_consumer_is_dropped(self):
+        broker = EventBroker(buffer_size=2)
+        slow = broker.subscribe("list-1")
+        fast = broker.subscribe("list-1")
+
+        for index in range(2):
+            broker.publish("list-1", "task.updated", {"id": index})
+            await fast.next_message(timeout=0.1)
+        broker.publish("list-1", "task.updated", {"id": 2})
+
+        assert slow.dropped
+        assert await slow.next_message(timeout=0.1) is None
+        assert not fast.dropped
+        assert broker.subscriber_count("list-1") == 1
+
+    async def test_close_unsubscribes(self):
+        broker = EventBroker()
+        subscription = broker.subscribe("list-1")
+
+        subscription.close()
+
+        assert broker.subscriber_count("list-1") == 0
+        assert broker.publish("list-1", "task.updated", {}) == 0
+
+    @patch("src.controllers.task_controller.create_task_graphql")
+    @patch(
+        "src.controllers.task_lists_controller.TaskListController._get_validated_task_list",
+        new_callable=AsyncMock,
+    )
+    async def test_task_controller_publishes_created_task(self, mock_validate, mock_create):
+        task = {"id": "t1", "title": "New", "taskListId": "list-1"}
+        mock_create.return_value = {"data": {"createTask": {"task": task}}}
+        subscription = event_broker.subscribe("list-1")
+
+        try:
+            await TaskController.create_task({"title": "New", "task_list_id": "list-1"})
+            message = await subscription.next_message(timeout=0.1)
+        finally:
+            subscription.close()
+
+        assert message.startswith("event: task.created\n")
+        assert json.loads(message.split("data: ")[1]) == task
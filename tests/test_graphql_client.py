@@ -0,0 +1,46 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.infrastructure.graphql_client import GraphQLString, execute_graphql, to_graphql_literal
+from src.services.task_list_graphql import get_task_list_with_task_with_filters_graphql
+
+
+class TestGraphQLClient:
+
+    def test_to_graphql_literal(self):
+        assert to_graphql_literal(None) == "null"
+        assert to_graphql_literal(True) == "true"
+        assert to_graphql_literal(5) == "5"
+        assert to_graphql_literal('say "hi"') == '"say \\"hi\\""'
+        assert to_graphql_literal({"ids": ["a", "b"]}) == '{ids: ["a", "b"]}'
+
+    @patch("src.infrastructure.graphql_client.httpx.AsyncClient")
+    async def test_execute_graphql_renders_variables(self, mock_client_cls):
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(json=lambda: {"data": {}}))
+        mock_client_cls.return_value.__aenter__.return_value = client
+
+        query = 'query { searchTasks(search: $search, listId: $listId) { id } x(id: "$id") }'
+        await execute_graphql(query, {"search": GraphQLString('a"b'), "listId": None, "id": "123"})
+
+        sent = client.post.call_args.kwargs["json"]["query"]
+        assert 'search: "a\\"b"' in sent
+        assert "listId: null" in sent
+        assert 'x(id: "123")' in sent
+
+    @patch("src.infrastructure.graphql_client.httpx.AsyncClient")
+    async def test_filtered_tasks_render_connection_filter(self, mock_client_cls):
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(json=lambda: {"data": {}}))
+        mock_client_cls.return_value.__aenter__.return_value = client
+
+        await get_task_list_with_task_with_filters_graphql(
+            "123",
+            {"status": ["pending", "in_process"], "completed_max": 50, "order_by": ["-priority"]},
+        )
+
+        sent = client.post.call_args.kwargs["json"]["query"]
+        assert (
+            'filter: {taskListId: {equalTo: "123"}, status: {in: [pending, in_process]}, '
+            "completedPercentage: {lessThanOrEqualTo: 50}}"
+        ) in sent
+        assert "orderBy: [PRIORITY_DESC, PRIMARY_KEY_DESC]" in sent
@@ -0,0 +1,156 @@
+import re
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import UUID
+
+import pytest
+
+from src.infrastructure.graphql_client import execute_graphql
+from src.infrastructure.graphql_executor import InProcessExecutor, operations
+from src.infrastructure.graphql_operations import node_id, operation_name
+from src.services.task_graphql import create_task_graphql, update_task_graphql
+
+SERVICES_DIR = Path(__file__).resolve().parent.parent / "src" / "services"
+
+
+def _executor_with_connection(connection):
+    engine = MagicMock()
+    engine.begin.return_value.__enter__.return_value = connection
+    return InProcessExecutor(engine)
+
+
+class TestGraphQLExecutor:
+
+    def test_every_service_operation_has_a_resolver(self):
+        names = set()
+        for path in SERVICES_DIR.glob("*.py"):
+            names.update(re.findall(r"(?:query|mutation)\s+(\w+)\s*\{", path.read_text()))
+
+        assert names
+        assert names <= set(operations)
+
+    def test_operation_name(self):
+        assert operation_name("\n  mutation DeleteTask {\n }") == "DeleteTask"
+        assert operation_name("{ allTasks { nodes { id } } }") is None
+
+    async def test_unknown_operation(self):
+        result = await _executor_with_connection(MagicMock()).execute("query Nope { x }")
+
+        assert result == {"errors": [{"message": "Unknown operation 'Nope'."}]}
+
+    async def test_resolves_delete_with_node_id(self):
+        connection = MagicMock()
+        connection.execute.return_value.scalar.return_value = UUID(int=1)
+
+        result = await _executor_with_connection(connection).execute(
+            "mutation DeleteTask { x }", {"id": str(UUID(int=1))}
+        )
+
+        deleted_id = result["data"]["deleteTaskById"]["deletedTaskId"]
+        assert deleted_id == node_id("tasks", UUID(int=1))
+
+    async def test_missing_row_is_reported_as_error(self):
+        connection = MagicMock()
+        connection.execute.return_value.scalar.return_value = None
+
+        result = await _executor_with_connection(connection).execute(
+            "mutation DeleteTask { x }", {"id": "123"}
+        )
+
+        assert result["data"] is None
+        assert "No values were deleted" in result["errors"][0]["message"]
+
+    async def test_compare_and_set_update_checks_the_version(self):
+        connection = MagicMock()
+        connection.execute.return_value.first.return_value = None
+
+        result = await _executor_with_connection(connection).execute(
+            "mutation UpdateTaskList { x }", {"id": "123", "name": "List", "expected_version": 3}
+        )
+
+        assert result == {"data": {"updateTaskListById": {"taskList": None}}}
+        statement = connection.execute.call_args.args[0]
+        assert "task_list.version = " in str(statement)
+
+    @patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "inprocess")
+    @patch("src.infrastructure.graphql_executor.executor.execute", new_callable=AsyncMock)
+    async def test_client_uses_inprocess_transport(self, mock_execute):
+        mock_execute.return_value = {"data": {"taskById": None}}
+
+        result = await execute_graphql("query FetchTaskById { x }", {"id": "123"})
+
+        assert result == {"data": {"taskById": None}}
+        mock_execute.assert_awaited_once_with("query FetchTaskById { x }", {"id": "123"})
+
+
+KEPT = object()
+
+
+class TestTransportsAgree:
+    """
+    The same service calls through the HTTP transport, as rendered for PostGraphile, and
+    through the in-process transport, as written by SQLAlchemy.
+    """
+
+    @staticmethod
+    async def _http_query(call) -> str:
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(json=lambda: {"data": {}}))
+        with patch("src.infrastructure.graphql_client.httpx.AsyncClient") as mock_client_cls:
+            mock_client_cls.return_value.__aenter__.return_value = client
+            await call()
+        return client.post.call_args.kwargs["json"]["query"]
+
+    @staticmethod
+    async def _inprocess_values(call) -> dict:
+        connection = MagicMock()
+        connection.execute.return_value.first.return_value = None
+        with (
+            patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "inprocess"),
+            patch(
+                "src.infrastructure.graphql_executor.executor",
+                _executor_with_connection(connection),
+            ),
+        ):
+            await call()
+        return connection.execute.call_args.args[0].compile().params
+
+    @pytest.mark.parametrize(
+        "call, rendered, column, value",
+        [
+            (
+                lambda: update_task_graphql("1", {"status": "completed"}),
+                "newTitle: null",
+                "title",
+                KEPT,
+            ),
+            (
+                lambda: update_task_graphql("1", {"title": 'Say "hi"'}),
+                'newTitle: "Say \\"hi\\""',
+                "title",
+                'Say "hi"',
+            ),
+            (
+                lambda: create_task_graphql({"task_list_id": "2"}),
+                "title: null",
+                "title",
+                None,
+            ),
+            (
+                lambda: create_task_graphql(
+                    {"title": "Task", "task_list_id": "2", "completed_percentage": None}
+                ),
+                "completedPercentage: null",
+                "completed_percentage",
+                None,
+            ),
+        ],
+    )
+    async def test_null_and_string_arguments(self, call, rendered, column, value):
+        assert rendered in await self._http_query(call)
+
+        values = await self._inprocess_values(call)
+        if value is KEPT:
+            assert column not in values
+        else:
+            assert values[column] == value
@@ -0,0 +1,279 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from src.commands import run_jobs
+from src.controllers import jobs_controller
+from src.controllers.jobs_controller import JobController
+from src.infrastructure.job_worker import JobWorker, retry_delay
+from src.infrastructure.mailer import Mailer
+from src.infrastructure.memory_backend import memory_backend
+
+HEADERS = {"Authorization": "Bearer test.jwt.token"}
+
+
+class FakeSMTPServer:
+    """
+    Local SMTP stand-in accepting every message, except those to the `refused` addresses.
+    With `disconnect_after`, each session is dropped once that many messages were accepted.
+    """
+
+    def __init__(self, refused=(), disconnect_after=None):
+        self.refused = set(refused)
+        self.disconnect_after = disconnect_after
+        self.messages = []
+        self.connections = 0
+        self.port = None
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+
+        async def reply(line):
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 fake-smtp ready")
+        recipients = []
+        accepted = 0
+        while line := (await reader.readline()).decode().strip():
+            command = line.split(" ", 1)[0].upper()
+            if command == "MAIL" and accepted == self.disconnect_after:
+                break
+            if command == "RCPT":
+                address = line.split(":", 1)[1].strip(" <>")
+                if address in self.refused:
+                    await reply("550 no such user")
+                    continue
+                recipients.append(address)
+            elif command == "DATA":
+                await reply("354 end with <CRLF>.<CRLF>")
+                data = []
+                while (data_line := await reader.readline()) != b".\r\n":
+                    data.append(data_line.decode())
+                self.messages.append({"to": recipients, "data": "".join(data)})
+                recipients = []
+                accepted += 1
+            elif command == "RSET":
+                recipients = []
+            elif command == "QUIT":
+                await reply("221 bye")
+                break
+            await reply("250 ok")
+        writer.close()
+
+
+@pytest.fixture
+async def smtp_server():
+    server = FakeSMTPServer(refused={"nobody@example.com"})
+    await server.start()
+    with patch.object(jobs_controller, "mailer", Mailer("127.0.0.1", server.port)):
+        yield server
+    await server.stop()
+
+
+def _email(to):
+    return {"to": to, "subject": "Hello", "body": "Hi there"}
+
+
+@pytest.mark.asyncio
+class TestMailer:
+
+    async def test_batch_is_sent_over_one_connection(self, smtp_server):
+        mailer = Mailer("127.0.0.1", smtp_server.port)
+
+        errors = await mailer.send(
+            [_email("ana@example.com"), _email("nobody@example.com"), _email("luis@example.com")]
+        )
+
+        assert errors[0] is None and errors[2] is None
+        assert "550" in errors[1]
+        assert smtp_server.connections == 1
+        assert [message["to"] for message in smtp_server.messages] == [
+            ["ana@example.com"],
+            ["luis@example.com"],
+        ]
+        assert "Subject: Hello" in smtp_server.messages[0]["data"]
+
+    async def test_invalid_email_only_fails_itself(self, smtp_server):
+        mailer = Mailer("127.0.0.1", smtp_server.port)
+        invalid = {**_email("ana@example.com"), "subject": "New task assigned: Edit\nvideo"}
+
+        errors = await mailer.send([invalid, _email("luis@example.com"), {"to": "ana@example.com"}])
+
+        assert errors[0].startswith("Invalid email") and errors[2].startswith("Invalid email")
+        assert errors[1] is None
+        assert [message["to"] for message in smtp_server.messages] == [["luis@example.com"]]
+
+    async def test_disconnect_only_fails_the_unsent_emails(self):
+        server = FakeSMTPServer(disconnect_after=2)
+        await server.start()
+        try:
+            errors = await Mailer("127.0.0.1", server.port).send(
+                [_email(f"user{n}@example.com") for n in range(4)]
+            )
+        finally:
+            await server.stop()
+
+        assert errors[:2] == [None, None]
+        assert all(error.startswith("Connection failed") for error in errors[2:])
+        assert len(server.messages) == 2
+
+
+class FakeQueue:
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.completed = []
+        self.retried = []
+
+    async def claim(self, batch_size, lease_seconds):
+        claimed, self.jobs = self.jobs[:batch_size], self.jobs[batch_size:]
+        return claimed
+
+    async def complete(self, job_ids):
+        self.completed.extend(job_ids)
+
+    async def retry(self, job_id, error, retry_in_seconds):
+        self.retried.append((job_id, error, retry_in_seconds))
+
+
+def _job(job_id, kind="email", attempts=1, max_attempts=5):
+    return {
+        "id": str(job_id),
+        "kind": kind,
+        "payload": {"n": job_id},
+        "attempts": attempts,
+        "maxAttempts": max_attempts,
+    }
+
+
+@pytest.mark.asyncio
+class TestJobWorker:
+
+    async def test_batches_run_with_limited_concurrency(self):
+        running = peak = 0
+        batches = []
+
+        async def handler(payloads):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            batches.append(payloads)
+            return [None] * len(payloads)
+
+        queue = FakeQueue(_job(n) for n in range(10))
+        worker = JobWorker(
+            {"email": handler},
+            queue.claim,
+            queue.complete,
+            queue.retry,
+            concurrency=2,
+            batch_size=2,
+        )
+
+        assert await worker.run_once() == 4
+        assert peak == 2
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert queue.completed == ["0", "1", "2", "3"]
+
+    async def test_failed_jobs_are_retried_with_backoff(self):
+        async def handler(payloads):
+            return ["refused" if payload["n"] == 1 else None for payload in payloads]
+
+        async def broken(payloads):
+            raise ConnectionError("smtp down")
+
+        queue = FakeQueue(
+            [_job(0), _job(1, attempts=2), _job(2, kind="sms"), _job(3, kind="push", attempts=5)]
+        )
+        worker = JobWorker(
+            {"email": handler, "push": broken}, queue.claim, queue.complete, queue.retry
+        )
+
+        await worker.run_once()
+
+        assert queue.completed == ["0"]
+        assert queue.retried == [
+            ("1", "refused", retry_delay(2)),
+            ("2", "No handler for jobs of kind 'sms'.", retry_delay(1)),
+            ("3", "smtp down", None),
+        ]
+        assert worker.failed == 3
+
+
+def test_retry_delay_doubles_up_to_the_maximum():
+    assert [retry_delay(n, base=10, maximum=60) for n in range(1, 6)] == [10, 20, 40, 60, 60]
+
+
+@pytest.mark.asyncio
+class TestEmailJobs:
+
+    @pytest.fixture
+    async def client(self, test_app):
+        memory_backend.reset()
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            transport = ASGITransport(app=test_app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                yield ac
+
+    async def test_invitations_are_queued_and_sent_by_the_worker(self, client, smtp_server):
+        for email in ("ana@example.com", "nobody@example.com"):
+            response = await client.post("/users/invite", json={"email": email}, headers=HEADERS)
+            assert response.status_code == status.HTTP_202_ACCEPTED
+        assert smtp_server.messages == []
+
+        worker = run_jobs.build_worker(run_jobs.parse_args(["--once"]))
+        assert await run_jobs.drain(worker) == 2
+
+        assert [message["to"] for message in smtp_server.messages] == [["ana@example.com"]]
+        assert "invited to Crehana Tasks" in smtp_server.messages[0]["data"]
+        store = memory_backend.store
+        assert list(store.jobs) == [2]
+        refused = store.jobs[2]
+        assert refused["attempts"] == 1 and "550" in refused["last_error"]
+
+        # Not due again before its backoff delay.
+        assert await JobController.claim_jobs(10, 60) == []
+        refused["run_at"] -= timedelta(seconds=retry_delay(1))
+        refused["max_attempts"] = 2
+        await run_jobs.drain(worker)
+        assert store.jobs == {} and list(store.failed_jobs) == [2]
+
+    async def test_assignments_queue_an_email_to_the_assignee(self, client, smtp_server):
+        response = await client.post(
+            "/users/register",
+            json={"email": "luis@example.com", "password": "secret1", "full_name": "Luis"},
+        )
+        user_id = response.json()["id"]
+        response = await client.post("/task-lists", json={"name": "Sprint"}, headers=HEADERS)
+        response = await client.post(
+            "/tasks",
+            json={"title": "Edit video", "task_list_id": response.json()["id"]},
+            headers=HEADERS,
+        )
+        task_id = response.json()["id"]
+
+        response = await client.post(
+            "/tasks/assign", json={"task_id": task_id, "user_id": user_id}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        await run_jobs.drain(run_jobs.build_worker(run_jobs.parse_args(["--once"])))
+        assert [message["to"] for message in smtp_server.messages] == [["luis@example.com"]]
+        assert "Subject: New task assigned: Edit video" in smtp_server.messages[0]["data"]
+        assert f"/tasks/{task_id}" in smtp_server.messages[0]["data"]
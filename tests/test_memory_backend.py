@@ -0,0 +1,695 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from src.commands import archive_tasks, purge_deleted_task_lists
+from src.controllers import activity_controller, task_controller
+from src.controllers.users_controller import UserController
+from src.infrastructure.graphql_executor import operations as executor_operations
+from src.infrastructure.memory_backend import memory_backend, operations
+from src.infrastructure.activity_log import ActivityLogWriter
+from src.infrastructure.write_behind import WriteBehindBuffer
+
+HEADERS = {"Authorization": "Bearer test.jwt.token"}
+
+
+@pytest.fixture
+async def client(test_app):
+    memory_backend.reset()
+    with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            yield ac
+
+
+async def _create_task_list(client, name="Sprint"):
+    response = await client.post("/task-lists", json={"name": name}, headers=HEADERS)
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()["id"]
+
+
+async def _create_task(client, task_list_id, title, **fields):
+    response = await client.post(
+        "/tasks", json={"title": title, "task_list_id": task_list_id, **fields}, headers=HEADERS
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+class TestMemoryBackend:
+
+    def test_serves_the_same_operations_as_the_executor(self):
+        assert set(operations) == set(executor_operations)
+
+    async def test_task_lifecycle(self, client):
+        started_at = datetime.utcnow()
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Write report", priority="high")
+        await _create_task(client, task_list_id, "Review report", status="completed")
+
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        assert response.json()["priority"] == "high"
+
+        response = await client.put(
+            f"/tasks/{task['id']}/status", json={"status": "in_process"}, headers=HEADERS
+        )
+        assert response.json()["status"] == "in_process"
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks?status=in_process&priority=high", headers=HEADERS
+        )
+        assert [node["id"] for node in response.json()] == [task["id"]]
+
+        response = await client.get(f"/task-lists/{task_list_id}/stats", headers=HEADERS)
+        stats = response.json()
+        assert stats["totalCount"] == 2
+        assert stats["inProcessCount"] == 1
+        assert stats["completedCount"] == 1
+        assert stats["highPriorityCount"] == 1
+
+        response = await client.delete(f"/tasks/{task['id']}", headers=HEADERS)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"updated_since": started_at.isoformat()},
+            headers=HEADERS,
+        )
+        changes = response.json()
+        assert [node["title"] for node in changes["tasks"]] == ["Review report"]
+        assert changes["deletedTasks"][0]["taskId"] == task["id"]
+
+        # The overlap sends the changes right before the watermark again.
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"updated_since": changes["syncedAt"]},
+            headers=HEADERS,
+        )
+        assert response.json()["deletedTasks"] == changes["deletedTasks"]
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks?updated_since=2000-01-01T00:00:00", headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_410_GONE
+
+        memory_backend.store.tombstones[task["id"]]["deleted_at"] -= timedelta(days=31)
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            assert await purge_deleted_task_lists.prune_pass(30, batch_size=10, pause=0) == 1
+        assert not memory_backend.store.tombstones
+
+    async def test_bulk_update_and_search(self, client):
+        task_list_id = await _create_task_list(client)
+        for title in ("Plan release", "Release notes", "Fix login"):
+            await _create_task(client, task_list_id, title)
+
+        response = await client.patch(
+            f"/task-lists/{task_list_id}/tasks",
+            json={"filter": {"status": ["pending"]}, "patch": {"status": "completed"}},
+            headers=HEADERS,
+        )
+        assert response.json() == {"updated": 3}
+
+        response = await client.get(f"/task-lists/{task_list_id}/stats", headers=HEADERS)
+        assert response.json()["completedCount"] == 3
+
+        response = await client.get("/tasks/search?q=release", headers=HEADERS)
+        assert [node["title"] for node in response.json()] == ["Release notes", "Plan release"]
+
+    async def test_missing_rows_and_invalid_ids(self, client):
+        task_list_id = await _create_task_list(client)
+
+        response = await client.post(
+            "/tasks", json={"title": "Orphan", "task_list_id": "not-a-uuid"}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = await client.delete(f"/task-lists/{task_list_id}", headers=HEADERS)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(f"/task-lists/{task_list_id}/stats", headers=HEADERS)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_register_assign_and_page_assigned_tasks(self, client):
+        response = await client.post(
+            "/users/register",
+            json={"email": "ana@example.com", "password": "secret1", "full_name": "Ana"},
+        )
+        user_id = response.json()["id"]
+
+        response = await client.post(
+            "/users/register",
+            json={"email": "ana@example.com", "password": "secret1", "full_name": "Ana"},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        task_list_id = await _create_task_list(client)
+        for title in ("First", "Second", "Third"):
+            task = await _create_task(client, task_list_id, title)
+            response = await client.post(
+                "/tasks/assign", json={"task_id": task["id"], "user_id": user_id}, headers=HEADERS
+            )
+            assert response.status_code == status.HTTP_200_OK
+
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            first_page = await UserController.get_assigned_tasks(user_id, limit=2)
+            second_page = await UserController.get_assigned_tasks(
+                user_id, cursor=first_page["nextCursor"], limit=2
+            )
+
+        titles = [task["title"] for task in first_page["tasks"] + second_page["tasks"]]
+        assert sorted(titles) == ["First", "Second", "Third"]
+        assert second_page["nextCursor"] is None
+
+    async def test_bulk_assignment_skips_existing_pairs(self, client):
+        response = await client.post(
+            "/users/register",
+            json={"email": "ana@example.com", "password": "secret1", "full_name": "Ana"},
+        )
+        user_id = response.json()["id"]
+        task_list_id = await _create_task_list(client)
+        first = await _create_task(client, task_list_id, "First")
+        second = await _create_task(client, task_list_id, "Second")
+        await client.post(
+            "/tasks/assign", json={"task_id": first["id"], "user_id": user_id}, headers=HEADERS
+        )
+        missing = str(uuid.uuid4())
+
+        pairs = [
+            (first["id"], user_id),
+            (second["id"], user_id),
+            (second["id"], user_id),
+            (missing, user_id),
+            (second["id"], missing),
+        ]
+        response = await client.post(
+            "/tasks/assign/bulk",
+            json={"assignments": [{"task_id": t, "user_id": u} for t, u in pairs]},
+            headers=HEADERS,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["assigned"] == 1
+        assert [result["status"] for result in response.json()["results"]] == [
+            "already_assigned",
+            "assigned",
+            "already_assigned",
+            "task_not_found",
+            "user_not_found",
+        ]
+        store = memory_backend.store
+        assert len(store.assignments) == 2
+        # One email for the single assignment and one for the new bulk assignment.
+        assert [job["payload"]["to"] for job in store.jobs.values()] == ["ana@example.com"] * 2
+
+        response = await client.post(
+            "/tasks/assign", json={"task_id": second["id"], "user_id": user_id}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_task_list_with_assignees(self, client):
+        started_at = datetime.utcnow()
+        user_ids = []
+        for name in ("Ana", "Luis"):
+            response = await client.post(
+                "/users/register",
+                json={
+                    "email": f"{name.lower()}@example.com",
+                    "password": "secret1",
+                    "full_name": name,
+                },
+            )
+            user_ids.append(response.json()["id"])
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Shared")
+        await _create_task(client, task_list_id, "Unassigned")
+        for user_id in user_ids:
+            await client.post(
+                "/tasks/assign", json={"task_id": task["id"], "user_id": user_id}, headers=HEADERS
+            )
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks", params={"include": "assignees"}, headers=HEADERS
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assignees = {
+            node["title"]: node["assignees"]
+            for node in response.json()["tasksByTaskListId"]["nodes"]
+        }
+        assert assignees["Unassigned"] == []
+        assert assignees["Shared"] == [
+            {"id": user_ids[0], "email": "ana@example.com", "fullName": "Ana"},
+            {"id": user_ids[1], "email": "luis@example.com", "fullName": "Luis"},
+        ]
+
+        response = await client.get(f"/task-lists/{task_list_id}/tasks", headers=HEADERS)
+        assert "assignees" not in response.json()["tasksByTaskListId"]["nodes"][0]
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"include": "assignees", "status": "pending", "order_by": "-created_at"},
+            headers=HEADERS,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [len(node["assignees"]) for node in response.json()] == [0, 2]
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"include": "assignees", "updated_since": started_at.isoformat()},
+            headers=HEADERS,
+        )
+        assert {node["title"]: len(node["assignees"]) for node in response.json()["tasks"]} == {
+            "Shared": 2,
+            "Unassigned": 0,
+        }
+
+        await client.put(
+            f"/tasks/{task['id']}/status", json={"status": "completed"}, headers=HEADERS
+        )
+        memory_backend.store.tasks[task["id"]]["updated_at"] -= timedelta(days=40)
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            assert await archive_tasks.archive_pass(30, batch_size=10, pause=0) == 1
+        for params in ({}, {"status": "completed"}):
+            response = await client.get(
+                f"/task-lists/{task_list_id}/tasks",
+                params={"include": "assignees", "include_archived": "true", **params},
+                headers=HEADERS,
+            )
+            nodes = response.json()
+            nodes = nodes["tasksByTaskListId"]["nodes"] if not params else nodes
+            archived = next(node for node in nodes if node["title"] == "Shared")
+            assert archived["archivedAt"] is not None
+            assert [user["fullName"] for user in archived["assignees"]] == ["Ana", "Luis"]
+
+    async def test_get_tasks_by_ids(self, client):
+        task_list_id = await _create_task_list(client)
+        first = await _create_task(client, task_list_id, "First")
+        second = await _create_task(client, task_list_id, "Second")
+        missing = str(uuid.uuid4())
+
+        ids = [second["id"], missing, first["id"], second["id"]]
+        with patch.object(
+            task_controller,
+            "get_tasks_by_ids_graphql",
+            wraps=task_controller.get_tasks_by_ids_graphql,
+        ) as fetch:
+            response = await client.get("/tasks", params={"ids": ",".join(ids)}, headers=HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["title"] for task in response.json()["tasks"]] == ["Second", "First"]
+        assert response.json()["missing"] == [missing]
+        fetch.assert_called_once()
+
+        response = await client.post("/tasks/batch", json={"ids": ids}, headers=HEADERS)
+        assert [task["title"] for task in response.json()["tasks"]] == ["Second", "First"]
+
+        response = await client.get("/tasks", params={"ids": "123"}, headers=HEADERS)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        too_many = [str(uuid.uuid4()) for _ in range(101)]
+        response = await client.get("/tasks", params={"ids": ",".join(too_many)}, headers=HEADERS)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        many = [*too_many[:60], first["id"], *too_many[60:], second["id"]]
+        with patch.object(
+            task_controller,
+            "get_tasks_by_ids_graphql",
+            wraps=task_controller.get_tasks_by_ids_graphql,
+        ) as fetch:
+            response = await client.post("/tasks/batch", json={"ids": many}, headers=HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["title"] for task in response.json()["tasks"]] == ["First", "Second"]
+        assert response.json()["missing"] == too_many
+        assert [len(call.args[0]) for call in fetch.call_args_list] == [100, 3]
+
+        too_many = [str(uuid.uuid4()) for _ in range(1001)]
+        response = await client.post("/tasks/batch", json={"ids": too_many}, headers=HEADERS)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_filter_ranges_and_ordering(self, client):
+        task_list_id = await _create_task_list(client)
+        for title, priority, completed in (
+            ("Low", "low", 10),
+            ("High", "high", 80),
+            ("Medium", "medium", 50),
+            ("Done", "high", 100),
+        ):
+            await _create_task(
+                client,
+                task_list_id,
+                title,
+                priority=priority,
+                completed_percentage=completed,
+                status="completed" if completed == 100 else "in_process",
+            )
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"status": "in_process", "completed_min": "20", "order_by": "-priority"},
+            headers=HEADERS,
+        )
+        assert [node["title"] for node in response.json()] == ["High", "Medium"]
+
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"order_by": "completed_percentage", "completed_max": "80"},
+            headers=HEADERS,
+        )
+        assert [node["title"] for node in response.json()] == ["Low", "Medium", "High"]
+
+    async def test_progress_updates(self, client):
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Upload video")
+
+        response = await client.patch(
+            f"/tasks/{task['id']}/progress", json={"completed_percentage": 30}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["completedPercentage"] == 30
+
+        buffer = WriteBehindBuffer(task_controller._write_task_progress, window_seconds=60)
+        with patch("src.controllers.task_controller.task_progress_buffer", buffer):
+            for percentage in (60, 90, 100):
+                response = await client.patch(
+                    f"/tasks/{task['id']}/progress",
+                    json={"completed_percentage": percentage},
+                    headers=HEADERS,
+                )
+                assert response.status_code == status.HTTP_202_ACCEPTED
+            await client.patch(
+                f"/tasks/{task['id']}/progress", json={"status": "completed"}, headers=HEADERS
+            )
+
+            response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+            assert response.json()["completedPercentage"] == 100
+            assert response.json()["status"] == "completed"
+            stats = await client.get(f"/task-lists/{task_list_id}/stats", headers=HEADERS)
+            assert stats.json()["completedCount"] == 0
+
+            await buffer.close()
+
+        assert buffer.batches == 1
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        assert response.json()["completedPercentage"] == 100
+        assert response.json()["status"] == "completed"
+
+    async def test_failed_progress_batch_is_retried(self, client):
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Upload video")
+        failure = {"data": None, "errors": [{"message": "deadlock detected"}]}
+
+        buffer = WriteBehindBuffer(task_controller._write_task_progress, window_seconds=60)
+        with patch("src.controllers.task_controller.task_progress_buffer", buffer):
+            response = await client.patch(
+                f"/tasks/{task['id']}/progress", json={"completed_percentage": 40}, headers=HEADERS
+            )
+            assert response.status_code == status.HTTP_202_ACCEPTED
+            with patch(
+                "src.controllers.task_controller.update_tasks_progress_graphql",
+                AsyncMock(return_value=failure),
+            ):
+                await buffer.flush()
+
+            assert buffer.batches == 0
+            assert buffer.pending(task["id"]) == {"completed_percentage": 40}
+            await buffer.close()
+
+        assert buffer.batches == 1
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        assert response.json()["completedPercentage"] == 40
+
+    async def test_buffered_progress_is_not_served_as_unchanged(self, client):
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Upload video")
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        etag = response.headers["ETag"]
+
+        buffer = WriteBehindBuffer(task_controller._write_task_progress, window_seconds=60)
+        with patch("src.controllers.task_controller.task_progress_buffer", buffer):
+            await client.patch(
+                f"/tasks/{task['id']}/progress", json={"completed_percentage": 40}, headers=HEADERS
+            )
+            response = await client.get(
+                f"/tasks/{task['id']}", headers={**HEADERS, "If-None-Match": etag}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["completedPercentage"] == 40
+            assert response.headers["ETag"] != etag
+            await buffer.close()
+
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        assert response.headers["ETag"] == '"2"'
+
+    async def test_status_change_keeps_buffered_progress(self, client):
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Upload video")
+
+        buffer = WriteBehindBuffer(task_controller._write_task_progress, window_seconds=60)
+        with patch("src.controllers.task_controller.task_progress_buffer", buffer):
+            await client.patch(
+                f"/tasks/{task['id']}/progress",
+                json={"status": "in_process", "completed_percentage": 70},
+                headers=HEADERS,
+            )
+            response = await client.put(
+                f"/tasks/{task['id']}/status", json={"status": "completed"}, headers=HEADERS
+            )
+            assert response.status_code == status.HTTP_200_OK
+            await buffer.close()
+
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        assert response.json()["completedPercentage"] == 70
+        assert response.json()["status"] == "completed"
+
+    async def test_null_fields(self, client):
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Draft", completed_percentage=None)
+        assert task["completedPercentage"] is None
+
+        response = await client.put(
+            f"/tasks/{task['id']}", json={"priority": "high"}, headers=HEADERS
+        )
+        assert response.json()["title"] == "Draft"
+
+        response = await client.post(
+            "/tasks", json={"task_list_id": task_list_id, "priority": None}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_conditional_updates(self, client):
+        task_list_id = await _create_task_list(client)
+        task = await _create_task(client, task_list_id, "Draft")
+
+        response = await client.get(f"/tasks/{task['id']}", headers=HEADERS)
+        etag = response.headers["ETag"]
+        assert etag == '"1"'
+
+        response = await client.put(
+            f"/tasks/{task['id']}",
+            json={"title": "Final", "priority": "high"},
+            headers={**HEADERS, "If-Match": etag},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == '"2"'
+
+        response = await client.put(
+            f"/tasks/{task['id']}/status",
+            json={"status": "completed"},
+            headers={**HEADERS, "If-Match": etag},
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert "current version is 2" in response.text
+
+        response = await client.put(
+            f"/tasks/{task['id']}/status", json={"status": "completed"}, headers=HEADERS
+        )
+        assert response.json()["status"] == "completed"
+        assert response.json()["title"] == "Final"
+        assert response.json()["priority"] == "high"
+        assert response.json()["version"] == 3
+
+        # The ETag of a compressed response carries its content-coding.
+        response = await client.put(
+            f"/tasks/{task['id']}/status",
+            json={"status": "in_process"},
+            headers={**HEADERS, "If-Match": '"3-gzip"'},
+        )
+        assert response.json()["version"] == 4
+
+        response = await client.put(
+            f"/tasks/{uuid.uuid4()}", json={"title": "Ghost"}, headers={**HEADERS, "If-Match": etag}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = await client.put(
+            f"/task-lists/{task_list_id}",
+            json={"name": "Renamed"},
+            headers={**HEADERS, "If-Match": '"1"'},
+        )
+        assert response.headers["ETag"] == '"2"'
+        response = await client.put(
+            f"/task-lists/{task_list_id}",
+            json={"name": "Stale"},
+            headers={**HEADERS, "If-Match": '"1"'},
+        )
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    async def test_archive_and_restore_tasks(self, client):
+        task_list_id = await _create_task_list(client)
+        done = await _create_task(client, task_list_id, "Ship v1", status="completed")
+        await _create_task(client, task_list_id, "Ship v2", status="completed")
+        memory_backend.store.tasks[done["id"]]["updated_at"] -= timedelta(days=40)
+
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            archived = await archive_tasks.archive_pass(30, batch_size=1, pause=0)
+        assert archived == 1
+
+        response = await client.get(f"/tasks/{done['id']}", headers=HEADERS)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.get(f"/task-lists/{task_list_id}/stats", headers=HEADERS)
+        assert response.json()["totalCount"] == 1
+
+        response = await client.get(
+            f"/tasks/{done['id']}", params={"include_archived": "true"}, headers=HEADERS
+        )
+        assert response.json()["archivedAt"] is not None
+        response = await client.get(
+            f"/task-lists/{task_list_id}/tasks",
+            params={"status": "completed", "include_archived": "true"},
+            headers=HEADERS,
+        )
+        assert sorted(node["title"] for node in response.json()) == ["Ship v1", "Ship v2"]
+
+        response = await client.post(
+            f"/task-lists/{task_list_id}/tasks/restore", json={"ids": [done["id"]]}, headers=HEADERS
+        )
+        assert response.json() == {"restored": 1}
+        response = await client.get(f"/tasks/{done['id']}", headers=HEADERS)
+        assert response.json()["title"] == "Ship v1"
+
+    async def test_task_history(self, client):
+        activity_log = ActivityLogWriter(activity_controller._write_activity, flush_seconds=60)
+        with patch("src.controllers.activity_controller.activity_log", activity_log):
+            task_list_id = await _create_task_list(client)
+            task = await _create_task(client, task_list_id, "Record intro")
+            await client.put(
+                f"/tasks/{task['id']}/status", json={"status": "in_process"}, headers=HEADERS
+            )
+            await client.patch(
+                f"/tasks/{task['id']}/progress", json={"completed_percentage": 50}, headers=HEADERS
+            )
+            await client.delete(f"/tasks/{task['id']}", headers=HEADERS)
+
+            response = await client.get(f"/tasks/{task['id']}/history", headers=HEADERS)
+            assert response.json() == {"activity": [], "nextCursor": None}
+            await activity_log.close()
+
+        response = await client.get(f"/tasks/{task['id']}/history?limit=3", headers=HEADERS)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert [entry["action"] for entry in page["activity"]] == [
+            "task.deleted",
+            "task.progress",
+            "task.status_changed",
+        ]
+        assert page["activity"][1]["details"] == {"completed_percentage": 50}
+        assert page["activity"][0]["taskListId"] == task_list_id
+
+        response = await client.get(
+            f"/tasks/{task['id']}/history?cursor={page['nextCursor']}", headers=HEADERS
+        )
+        assert [entry["action"] for entry in response.json()["activity"]] == ["task.created"]
+        assert response.json()["nextCursor"] is None
+
+        response = await client.get(f"/tasks/{task['id']}/history?cursor=abc", headers=HEADERS)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_bulk_changes_are_recorded_per_task(self, client):
+        activity_log = ActivityLogWriter(activity_controller._write_activity, flush_seconds=60)
+        with patch("src.controllers.activity_controller.activity_log", activity_log):
+            task_list_id = await _create_task_list(client)
+            tasks = [await _create_task(client, task_list_id, f"Task {n}") for n in range(2)]
+            await activity_log.close()
+
+        # Written by the bulk operations themselves, without the activity log queue.
+        response = await client.patch(
+            f"/task-lists/{task_list_id}/tasks",
+            json={"filter": {"status": ["pending"]}, "patch": {"priority": "high"}},
+            headers=HEADERS,
+        )
+        assert response.json() == {"updated": 2}
+        response = await client.delete(
+            f"/task-lists/{task_list_id}/tasks?status=pending", headers=HEADERS
+        )
+        assert response.json() == {"deleted": 2}
+
+        for task in tasks:
+            response = await client.get(f"/tasks/{task['id']}/history", headers=HEADERS)
+            activity = response.json()["activity"]
+            assert [entry["action"] for entry in activity] == [
+                "tasks.bulk_deleted",
+                "tasks.bulk_updated",
+                "task.created",
+            ]
+            assert activity[1]["details"] == {"patch": {"priority": "high"}}
+
+    async def test_soft_delete_and_purge_task_list(self, client):
+        task_list_id = await _create_task_list(client)
+        tasks = [await _create_task(client, task_list_id, f"Task {n}") for n in range(3)]
+        other_list_id = await _create_task_list(client, "Other")
+        kept = await _create_task(client, other_list_id, "Task kept")
+
+        response = await client.delete(f"/task-lists/{task_list_id}", headers=HEADERS)
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(f"/task-lists/{task_list_id}", headers=HEADERS)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.get(f"/tasks/{tasks[0]['id']}", headers=HEADERS)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.get("/tasks/search?q=task", headers=HEADERS)
+        assert [node["id"] for node in response.json()] == [kept["id"]]
+        response = await client.delete(f"/task-lists/{task_list_id}", headers=HEADERS)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = await client.post(
+            "/tasks", json={"title": "Late", "task_list_id": task_list_id}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.patch(
+            f"/task-lists/{task_list_id}/tasks",
+            json={"filter": {"status": ["pending"]}, "patch": {"status": "completed"}},
+            headers=HEADERS,
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.delete(
+            f"/task-lists/{task_list_id}/tasks?status=pending", headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        task_id = tasks[0]["id"]
+        response = await client.put(f"/tasks/{task_id}", json={"title": "Late"}, headers=HEADERS)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.put(
+            f"/tasks/{task_id}/status", json={"status": "completed"}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.patch(
+            f"/tasks/{task_id}/progress", json={"completed_percentage": 50}, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        hidden = memory_backend.store.tasks[task_id]
+        assert (hidden["title"], hidden["status"], hidden["version"]) == ("Task 0", "pending", 1)
+
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            purged = await purge_deleted_task_lists.purge_pass(batch_size=2, pause=0)
+        assert purged == 3
+
+        store = memory_backend.store
+        assert task_list_id not in store.task_lists
+        assert [task["id"] for task in store.tasks.values()] == [kept["id"]]
+        assert not store.tombstones
@@ -0,0 +1,83 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from src.application.auth import create_access_token
+from src.infrastructure.profiler import ProfileRateLimiter, ProfilerMiddleware
+
+ADMIN_HEADERS = {
+    "Authorization": "Bearer " + create_access_token({"sub": "ops@example.com", "user_id": "1"}),
+    "X-Profile": "1",
+}
+
+
+def _create_app(directory: str, max_per_minute: int = 6) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        ProfilerMiddleware, directory=directory, interval=0.001, max_per_minute=max_per_minute
+    )
+
+    @app.get("/slow")
+    async def slow(request: Request):
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"status": "ok"}
+
+    return app
+
+
+@pytest.mark.asyncio
+@patch("src.application.auth.ADMIN_EMAILS", frozenset({"ops@example.com"}))
+class TestProfilerMiddleware:
+
+    async def test_profiles_admin_requests(self, tmp_path):
+        transport = ASGITransport(app=_create_app(str(tmp_path)))
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/slow", headers=ADMIN_HEADERS)
+
+        assert response.json() == {"status": "ok"}
+        profile_id = response.headers["X-Profile"]
+        with open(os.path.join(tmp_path, f"{profile_id}.folded")) as profile_file:
+            lines = profile_file.read().splitlines()
+        assert lines
+        assert any("tests.test_profiler:slow" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    async def test_ignores_the_header_without_an_admin_token(self, tmp_path):
+        token = create_access_token({"sub": "ana@example.com", "user_id": "2"})
+        transport = ASGITransport(app=_create_app(str(tmp_path)))
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/slow", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"}
+            )
+            anonymous = await ac.get("/slow", headers={"X-Profile": "1"})
+
+        assert "X-Profile" not in response.headers
+        assert "X-Profile" not in anonymous.headers
+        assert not os.listdir(tmp_path)
+
+    async def test_rate_limits_profiles(self, tmp_path):
+        transport = ASGITransport(app=_create_app(str(tmp_path), max_per_minute=1))
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            await ac.get("/slow", headers=ADMIN_HEADERS)
+            response = await ac.get("/slow", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        assert response.headers["X-Profile"] == "rate-limited"
+        assert len(os.listdir(tmp_path)) == 1
+
+
+class TestProfileRateLimiter:
+
+    def test_allows_one_profile_at_a_time(self):
+        limiter = ProfileRateLimiter(max_per_minute=5)
+
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        limiter.release()
+        assert limiter.try_acquire()
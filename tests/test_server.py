@@ -0,0 +1,94 @@
+import signal
+import subprocess
+import sys
+from unittest.mock import patch
+
+from src import server
+
+# Generous enough for slow CI machines; benchmarks/startup_time.py tracks the real figure.
+COLD_START_BUDGET_SECONDS = 5
+
+
+class TestServer:
+
+    @patch.dict("os.environ", {"WEB_CONCURRENCY": "3"})
+    def test_worker_count_from_environment(self):
+        assert server.worker_count() == 3
+
+    @patch.dict("os.environ", {"WEB_CONCURRENCY": ""})
+    @patch("os.sched_getaffinity", return_value={0, 1}, create=True)
+    def test_worker_count_defaults_to_available_cpus(self, _):
+        assert server.worker_count() == 2
+
+    @patch("importlib.util.find_spec", return_value=None)
+    def test_config_falls_back_without_optional_packages(self, _):
+        config = server.build_config(object())
+
+        assert config.loop == "asyncio"
+        assert config.http == "h11"
+        assert config.timeout_keep_alive == server.KEEPALIVE_TIMEOUT
+        assert config.timeout_graceful_shutdown == server.GRACEFUL_TIMEOUT
+        assert config.backlog == server.BACKLOG
+
+    @patch("src.server.time.sleep")
+    @patch("src.server.signal.signal")
+    @patch("src.server.os.waitpid")
+    def test_gives_up_after_repeated_startup_failures(self, mock_waitpid, _, mock_sleep, capsys):
+        supervisor = server.Supervisor(config=None, sock=None, workers=1)
+        pids = iter(range(100, 200))
+        supervisor.spawn = lambda: supervisor.children.add(next(pids))
+
+        def waitpid(pid, options):
+            if not supervisor.children:
+                raise ChildProcessError()
+            return min(supervisor.children), server.STARTUP_FAILURE << 8
+
+        mock_waitpid.side_effect = waitpid
+
+        with patch.object(server, "MAX_STARTUP_FAILURES", 4):
+            assert supervisor.run() == 1
+
+        assert [call.args[0] for call in mock_sleep.call_args_list] == [2.0, 4.0, 8.0]
+        output = capsys.readouterr().err
+        assert "Worker 100 exited with status 3" in output
+        assert "4 workers in a row failed to start" in output
+
+    @patch("src.server.os.waitpid")
+    def test_reap_reports_the_exit_status(self, mock_waitpid, capsys):
+        supervisor = server.Supervisor(config=None, sock=None, workers=1)
+        supervisor.children = {100, 101}
+        mock_waitpid.side_effect = [(100, signal.SIGKILL), (101, 1 << 8)]
+
+        assert supervisor._reap(block=True) == -signal.SIGKILL
+        assert supervisor._reap(block=True) == 1
+        assert supervisor._respawn_delay(1) == server.RESPAWN_DELAY
+        assert not supervisor.children
+        output = capsys.readouterr().err
+        assert "Worker 100 was killed by SIGKILL" in output
+        assert "Worker 101 exited with status 1" in output
+
+    def test_cold_start_import_within_budget(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "benchmarks/startup_time.py",
+                "--runs",
+                "1",
+                "--budget",
+                str(COLD_START_BUDGET_SECONDS),
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
+    def test_database_driver_not_imported_at_startup(self):
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, src.main; print('psycopg2' in sys.modules)"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,142 @@
+import io
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from src.services.task_import import TaskImporter, validate_task_row
+
+
+def _mock_connection():
+    connection = MagicMock()
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.rowcount = 0
+    copied = []
+
+    def copy_expert(sql, buffer):
+        rows = [line.split("\t") for line in buffer.read().splitlines()]
+        copied.extend(rows)
+        cursor.rowcount = len(copied)
+
+    cursor.copy_expert.side_effect = copy_expert
+    return connection, copied
+
+
+class TestTaskImporter:
+
+    def test_validate_task_row_applies_defaults(self):
+        assert validate_task_row({"title": "Write report"}) == (
+            "Write report",
+            "medium",
+            "pending",
+            0,
+        )
+
+    @pytest.mark.parametrize(
+        "row",
+        [
+            {"title": " "},
+            {"title": "Task", "priority": "urgent"},
+            {"title": "Task", "status": "done"},
+            {"title": "Task", "completed_percentage": "150"},
+        ],
+    )
+    def test_validate_task_row_rejects_invalid_rows(self, row):
+        with pytest.raises(ValueError):
+            validate_task_row(row)
+
+    @patch("src.services.task_import.connect")
+    def test_run_copies_valid_rows_and_reports_errors(self, mock_connect):
+        connection, copied = _mock_connection()
+        mock_connect.return_value = connection
+        progress = []
+        text_file = io.StringIO(
+            "title,priority,status,completed_percentage\n"
+            "First\thalf,high,in_process,50\n"
+            ",low,pending,0\n"
+            "Third,,,\n"
+        )
+
+        report = TaskImporter("list-1", batch_size=2, progress=progress.append).run(text_file)
+
+        assert copied == [
+            ["First\\thalf", "high", "in_process", "50"],
+            ["Third", "medium", "pending", "0"],
+        ]
+        assert report["processed"] == 3
+        assert report["imported"] == 2
+        assert report["failed"] == 1
+        assert report["errors"][0]["row"] == 2
+        assert progress == [
+            {"processed": 2, "staged": 1, "failed": 1},
+            {"processed": 3, "staged": 2, "failed": 1},
+        ]
+        connection.close.assert_called_once()
+
+    @patch("src.services.task_import.connect")
+    def test_run_reports_undecodable_and_unparsable_rows(self, mock_connect):
+        connection, copied = _mock_connection()
+        mock_connect.return_value = connection
+        raw = (
+            b"title,priority\n"
+            b"First,high\n"
+            b"Caf\xe9,low\n" + b'"' + b"x" * 200_000 + b'",low\n' + b"Last,low\n"
+        )
+        text_file = io.TextIOWrapper(
+            io.BytesIO(raw), encoding="utf-8-sig", errors="surrogateescape", newline=""
+        )
+
+        report = TaskImporter("list-1").run(text_file)
+
+        assert [row[0] for row in copied] == ["First", "Last"]
+        assert report["processed"] == 4
+        assert report["failed"] == 2
+        assert report["errors"][0] == {"row": 2, "error": "Invalid UTF-8."}
+        assert report["errors"][1]["row"] == 3
+        assert report["errors"][1]["error"].startswith("Invalid CSV:")
+
+    @patch("src.services.task_import.connect")
+    def test_run_reports_decode_errors_of_a_strict_file(self, mock_connect):
+        connection, copied = _mock_connection()
+        mock_connect.return_value = connection
+        text_file = io.TextIOWrapper(io.BytesIO(b'{"title": "Caf\xe9"}\n'), encoding="utf-8")
+
+        report = TaskImporter("list-1").run(text_file, "ndjson")
+
+        assert copied == []
+        assert report["failed"] == 1
+        assert report["errors"][0]["error"].startswith("Invalid UTF-8:")
+
+
+@pytest.mark.asyncio
+class TestImportTasksEndpoint:
+
+    @patch("src.services.task_import.connect")
+    @patch(
+        "src.controllers.task_lists_controller.TaskListController._get_validated_task_list",
+        new_callable=AsyncMock,
+    )
+    async def test_import_ndjson_streams_progress_and_report(
+        self, mock_validate, mock_connect, test_app
+    ):
+        connection, copied = _mock_connection()
+        mock_connect.return_value = connection
+        body = '{"title": "First"}\nnot json\n{"title": "Second", "status": "completed"}\n'
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/task-lists/123/import?format=ndjson",
+                content=body,
+                headers={"Authorization": "Bearer test.jwt.token"},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert events[0]["event"] == "progress"
+        assert events[-1]["event"] == "completed"
+        assert events[-1]["imported"] == 2
+        assert events[-1]["errors"][0]["row"] == 2
+        assert len(copied) == 2
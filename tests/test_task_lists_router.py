@@ -1,6 +1,6 @@
 import pytest
 from httpx import AsyncClient, ASGITransport
-from fastapi import status
+from fastapi import HTTPException, status
 from unittest.mock import patch
 
 
@@ -80,7 +80,7 @@ class TestTaskListsRouter:
 
     @patch("src.controllers.task_lists_controller.TaskListController.delete_task_list")
     async def test_delete_task_list_success(self, mock_delete, test_app):
-        mock_delete.return_value = {"data": {"deleteTaskListById": {"deletedTaskListId": "123"}}}
+        mock_delete.return_value = {"data": {"deleteTaskListById": {"taskList": {"id": "123"}}}}
 
         transport = ASGITransport(app=test_app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -91,7 +91,7 @@ class TestTaskListsRouter:
 
     @patch("src.controllers.task_lists_controller.TaskListController.delete_task_list")
     async def test_delete_task_list_not_found(self, mock_delete, test_app):
-        mock_delete.return_value = {"data": {"deleteTaskListById": {"deletedTaskListId": ""}}}
+        mock_delete.return_value = {"data": {"deleteTaskListById": {"taskList": None}}}
 
         transport = ASGITransport(app=test_app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
@@ -129,3 +129,221 @@ class TestTaskListsRouter:
 
         assert response.status_code == status.HTTP_200_OK
         assert response.json()[0]["id"] == "t1"
+
+    @patch(
+        "src.controllers.task_lists_controller.TaskListController."
+        "fetch_task_lists_with_tasks_and_filters"
+    )
+    async def test_fetch_tasks_with_ranges_and_ordering(self, mock_fetch, test_app):
+        mock_fetch.return_value = {"data": {"allTasks": {"nodes": []}}}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/task-lists/123/tasks",
+                params={
+                    "status": "pending,in_process",
+                    "completed_min": "20",
+                    "created_after": "2026-01-01T05:00:00+05:00",
+                    "order_by": "-priority,created_at",
+                },
+                headers=self.HEADERS,
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_fetch.assert_called_once_with(
+            "123",
+            {
+                "status": ["pending", "in_process"],
+                "completed_min": 20,
+                "created_after": "2026-01-01T00:00:00",
+                "order_by": ["-priority", "created_at"],
+            },
+            False,
+            include_assignees=False,
+        )
+
+    async def test_fetch_tasks_with_invalid_filters(self, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            invalid_order = await ac.get(
+                "/task-lists/123/tasks?order_by=title", headers=self.HEADERS
+            )
+            unknown_filter = await ac.get("/task-lists/123/tasks?colour=red", headers=self.HEADERS)
+
+        assert invalid_order.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert unknown_filter.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_fetch_tasks_with_invalid_include(self, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            unknown = await ac.get("/task-lists/123/tasks?include=owners", headers=self.HEADERS)
+
+        assert unknown.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @patch(
+        "src.controllers.task_lists_controller.TaskListController."
+        "fetch_task_lists_with_tasks_and_filters"
+    )
+    async def test_fetch_tasks_with_filters_and_assignees(self, mock_fetch, test_app):
+        mock_fetch.return_value = {"data": {"allTasks": {"nodes": []}}}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/task-lists/123/tasks?include=assignees&status=pending&include_archived=true",
+                headers=self.HEADERS,
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        mock_fetch.assert_called_once_with(
+            "123", {"status": ["pending"]}, True, include_assignees=True
+        )
+
+    @patch("src.controllers.task_lists_controller.TaskListController.fetch_task_list_stats")
+    async def test_fetch_task_list_stats_success(self, mock_stats, test_app):
+        mock_stats.return_value = {
+            "data": {
+                "taskListById": {
+                    "id": "123",
+                    "summary": {
+                        "totalCount": 3,
+                        "pendingCount": 1,
+                        "inProcessCount": 1,
+                        "completedCount": 1,
+                        "lowPriorityCount": 0,
+                        "mediumPriorityCount": 2,
+                        "highPriorityCount": 1,
+                        "averageCompletedPercentage": 50.0,
+                    },
+                }
+            }
+        }
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/task-lists/123/stats", headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["totalCount"] == 3
+        assert response.json()["averageCompletedPercentage"] == 50.0
+
+    @patch("src.controllers.task_lists_controller.TaskListController.fetch_task_list_stats")
+    async def test_fetch_task_list_stats_not_found(self, mock_stats, test_app):
+        mock_stats.return_value = {"data": {"taskListById": None}}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/task-lists/999/stats", headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "not found" in response.text
+
+    @patch("src.controllers.task_lists_controller.TaskListController.subscribe_to_task_list_events")
+    async def test_stream_task_list_events_not_found(self, mock_subscribe, test_app):
+        mock_subscribe.side_effect = HTTPException(status_code=404, detail="Task list not found.")
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/task-lists/999/events", headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "not found" in response.text
+
+    @patch("src.controllers.task_lists_controller.TaskListController.fetch_task_list_changes")
+    async def test_fetch_tasks_updated_since(self, mock_changes, test_app):
+        mock_changes.return_value = {
+            "data": {
+                "syncWatermark": "2026-01-02T00:00:05",
+                "taskListById": {"id": "123"},
+                "tasksUpdatedSince": {"nodes": [{"id": "t1", "updatedAt": "2026-01-02T00:00:00"}]},
+                "taskTombstonesSince": {
+                    "nodes": [{"taskId": "t2", "deletedAt": "2026-01-02T00:00:00"}]
+                },
+            }
+        }
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/task-lists/123/tasks",
+                params={"updated_since": "2026-01-01T05:00:00+05:00"},
+                headers=self.HEADERS,
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tasks"][0]["id"] == "t1"
+        assert response.json()["deletedTasks"][0]["taskId"] == "t2"
+        assert response.json()["syncedAt"] == "2026-01-02T00:00:05"
+        mock_changes.assert_called_once_with("123", "2026-01-01T00:00:00", False)
+
+    async def test_fetch_tasks_updated_since_invalid(self, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/task-lists/123/tasks?updated_since=yesterday", headers=self.HEADERS
+            )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @patch("src.controllers.task_lists_controller.TaskListController.bulk_update_tasks")
+    async def test_bulk_update_tasks_success(self, mock_bulk_update, test_app):
+        mock_bulk_update.return_value = {"data": {"bulkUpdateTasks": {"integer": 4}}}
+
+        payload = {
+            "filter": {"status": ["pending", "in_process"]},
+            "patch": {"status": "completed"},
+        }
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch("/task-lists/123/tasks", json=payload, headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"updated": 4}
+        mock_bulk_update.assert_called_once_with(
+            "123", {"status": ["pending", "in_process"]}, {"status": "completed"}
+        )
+
+    async def test_bulk_update_tasks_requires_filter(self, test_app):
+        payload = {"filter": {}, "patch": {"status": "completed"}}
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch("/task-lists/123/tasks", json=payload, headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "filters is required" in response.text
+
+    @patch("src.controllers.task_lists_controller.TaskListController.bulk_delete_tasks")
+    async def test_bulk_delete_tasks_success(self, mock_bulk_delete, test_app):
+        mock_bulk_delete.return_value = {"data": {"bulkDeleteTasks": {"integer": 2}}}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.delete(
+                "/task-lists/123/tasks?status=completed&priority=low,medium", headers=self.HEADERS
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"deleted": 2}
+        mock_bulk_delete.assert_called_once_with(
+            "123", {"status": ["completed"], "priority": ["low", "medium"]}
+        )
+
+    @patch("src.controllers.task_lists_controller.TaskListController.restore_archived_tasks")
+    async def test_restore_archived_tasks_success(self, mock_restore, test_app):
+        mock_restore.return_value = {"data": {"restoreArchivedTasks": {"integer": 1}}}
+        task_id = "2f1d7c3e-8a4b-4f6a-9c2d-1e5b7a9c0d3f"
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post(
+                "/task-lists/123/tasks/restore", json={"ids": [task_id]}, headers=self.HEADERS
+            )
+            empty = await ac.post(
+                "/task-lists/123/tasks/restore", json={"ids": []}, headers=self.HEADERS
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"restored": 1}
+        mock_restore.assert_called_once_with("123", [task_id])
+        assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,6 +1,8 @@
+import uuid
+
 import pytest
 from httpx import AsyncClient, ASGITransport
-from fastapi import status
+from fastapi import HTTPException, status
 from unittest.mock import patch
 
 
@@ -123,6 +125,59 @@ class TestTasksRouter:
         assert response.json()["title"] == "Updated Task"
         assert response.json()["completedPercentage"] == 75
 
+    @patch("src.controllers.task_controller.TaskController.update_task")
+    async def test_update_task_if_match(self, mock_update, test_app):
+        mock_update.return_value = {
+            "data": {"updateTaskById": {"task": {"id": "123", "title": "Task", "version": 4}}}
+        }
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.put(
+                "/tasks/123",
+                json={"title": "Task"},
+                headers={**self.HEADERS, "If-Match": '"3"'},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == '"4"'
+        mock_update.assert_called_once_with("123", {"title": "Task"}, 3)
+
+    @patch("src.controllers.task_controller.TaskController.update_task")
+    async def test_update_task_version_conflict(self, mock_update, test_app):
+        mock_update.side_effect = HTTPException(status_code=412, detail="Task was modified")
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.put(
+                "/tasks/123",
+                json={"title": "Task"},
+                headers={**self.HEADERS, "If-Match": '"3"'},
+            )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    @pytest.mark.parametrize(
+        "if_match, status_code",
+        [
+            ('W/"3"', status.HTTP_412_PRECONDITION_FAILED),
+            ("3", status.HTTP_412_PRECONDITION_FAILED),
+            ('"3", "4"', status.HTTP_400_BAD_REQUEST),
+        ],
+    )
+    @patch("src.controllers.task_controller.TaskController.update_task")
+    async def test_update_task_invalid_if_match(self, mock_update, if_match, status_code, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.put(
+                "/tasks/123",
+                json={"title": "Task"},
+                headers={**self.HEADERS, "If-Match": if_match},
+            )
+
+        assert response.status_code == status_code
+        mock_update.assert_not_called()
+
     @patch("src.controllers.task_controller.TaskController.delete_task")
     async def test_delete_task_success(self, mock_delete, test_app):
         mock_delete.return_value = {"data": {"deleteTaskById": {"deletedTaskId": "123"}}}
@@ -212,3 +267,126 @@ class TestTasksRouter:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "Task or user not found" in response.text
+
+    @patch("src.controllers.task_controller.TaskController.assign_tasks_to_users")
+    async def test_assign_tasks_to_users_success(self, mock_assign, test_app):
+        task_id, user_id = str(uuid.uuid4()), str(uuid.uuid4())
+        mock_assign.return_value = {
+            "assigned": 1,
+            "results": [{"taskId": task_id, "userId": user_id, "status": "assigned"}],
+        }
+
+        payload = {"assignments": [{"task_id": task_id, "user_id": user_id}]}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post("/tasks/assign/bulk", json=payload, headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["assigned"] == 1
+        mock_assign.assert_called_once_with([(task_id, user_id)])
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"assignments": []},
+            {"assignments": [{"task_id": "123", "user_id": "user-456"}]},
+        ],
+    )
+    async def test_assign_tasks_to_users_invalid_body(self, payload, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post("/tasks/assign/bulk", json=payload, headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @patch("src.controllers.task_controller.TaskController.search_tasks")
+    async def test_search_tasks_success(self, mock_search, test_app):
+        mock_search.return_value = {
+            "data": {"searchTasks": {"nodes": [{"id": "123", "title": "Write report"}]}}
+        }
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/tasks/search?q=report&task_list_id=list-123&limit=5", headers=self.HEADERS
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["title"] == "Write report"
+        mock_search.assert_called_once_with("report", "list-123", 5)
+
+    async def test_search_tasks_query_too_short(self, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/tasks/search?q=ab", headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @patch("src.controllers.activity_controller.get_task_activity_graphql")
+    async def test_get_task_history_pages(self, mock_activity, test_app):
+        task_id = "5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11"
+        entries = [
+            {"id": str(n), "taskId": task_id, "action": "task.updated", "details": {}}
+            for n in (9, 7, 4)
+        ]
+        mock_activity.return_value = {"data": {"taskActivity": {"nodes": entries}}}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                f"/tasks/{task_id}/history?cursor=12&limit=2", headers=self.HEADERS
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"activity": entries[:2], "nextCursor": "7"}
+        mock_activity.assert_called_once_with(task_id, "12", page_size=3)
+
+    @patch("src.controllers.task_controller.TaskController.update_task_progress")
+    async def test_update_task_progress_accepted(self, mock_progress, test_app):
+        mock_progress.return_value = {"pending": {"completed_percentage": 40}}
+        task_id = "5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11"
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch(
+                f"/tasks/{task_id}/progress",
+                json={"completed_percentage": 40},
+                headers=self.HEADERS,
+            )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {"id": task_id, "pending": {"completed_percentage": 40}}
+        mock_progress.assert_called_once_with(task_id, {"completed_percentage": 40})
+
+    @patch("src.controllers.task_controller.TaskController.update_task_progress")
+    async def test_update_task_progress_not_found(self, mock_progress, test_app):
+        mock_progress.return_value = {"data": {"t0": None}}
+
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch(
+                "/tasks/5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11/progress",
+                json={"status": "completed"},
+                headers=self.HEADERS,
+            )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize(
+        "task_id, payload",
+        [
+            ("5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11", {}),
+            ("5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11", {"completed_percentage": 101}),
+            ("5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11", {"title": "Renamed"}),
+            ("not-a-uuid", {"status": "completed"}),
+        ],
+    )
+    async def test_update_task_progress_invalid(self, task_id, payload, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.patch(
+                f"/tasks/{task_id}/progress", json=payload, headers=self.HEADERS
+            )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,113 @@
+import base64
+import json
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+
+from src.controllers.users_controller import UserController
+
+
+def _assignment(index: int) -> dict:
+    return {
+        "id": str(UUID(int=index)),
+        "createdAt": f"2026-01-0{index}T00:00:00",
+        "taskByTaskId": {"id": f"t{index}", "title": f"Task {index}"},
+    }
+
+
+@pytest.mark.asyncio
+class TestUserControllerAssignedTasks:
+
+    @patch("src.controllers.users_controller.get_user_assigned_tasks_graphql")
+    async def test_first_page_returns_next_cursor(self, mock_fetch):
+        mock_fetch.return_value = {
+            "data": {"userAssignedTasks": {"nodes": [_assignment(3), _assignment(2)]}}
+        }
+
+        result = await UserController.get_assigned_tasks("u1", status="pending", limit=1)
+
+        assert result["tasks"] == [
+            {"id": "t3", "title": "Task 3", "assignedAt": "2026-01-03T00:00:00"}
+        ]
+        assert result["nextCursor"]
+        mock_fetch.assert_called_once_with("u1", "pending", None, None, None, page_size=2)
+
+    @patch("src.controllers.users_controller.get_user_assigned_tasks_graphql")
+    async def test_cursor_continues_after_last_assignment(self, mock_fetch):
+        mock_fetch.return_value = {
+            "data": {"userAssignedTasks": {"nodes": [_assignment(3), _assignment(2)]}}
+        }
+        first_page = await UserController.get_assigned_tasks("u1", limit=1)
+        mock_fetch.return_value = {"data": {"userAssignedTasks": {"nodes": [_assignment(2)]}}}
+
+        result = await UserController.get_assigned_tasks(
+            "u1", cursor=first_page["nextCursor"], limit=1
+        )
+
+        assert result["tasks"][0]["id"] == "t2"
+        assert result["nextCursor"] is None
+        mock_fetch.assert_called_with(
+            "u1", None, None, "2026-01-03T00:00:00", str(UUID(int=3)), page_size=2
+        )
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            None,
+            [None, None],
+            ["2026-01-03T00:00:00", 3],
+            ["yesterday", str(UUID(int=3))],
+            ["2026-01-03T00:00:00", "a3"],
+            ["2026-01-03T00:00:00"],
+        ],
+    )
+    async def test_invalid_cursor(self, payload):
+        cursor = "not-a-cursor"
+        if payload is not None:
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        result = await UserController.get_assigned_tasks("u1", cursor=cursor)
+
+        assert result == {"error": "Invalid cursor."}
+
+
+@pytest.mark.asyncio
+class TestUserControllerRegister:
+
+    USER = {"email": "ana@example.com", "password": "secret1", "full_name": "Ana"}
+
+    @patch("src.services.user_graphql.execute_graphql")
+    async def test_registers_with_one_upstream_call(self, mock_execute):
+        created = {"id": "u1", "email": "ana@example.com", "fullName": "Ana"}
+        mock_execute.return_value = {"data": {"createUser": {"user": created}}}
+
+        result = await UserController.register_user(self.USER)
+
+        assert result["data"]["createUser"]["user"] == created
+        mock_execute.assert_called_once()
+        query, variables = mock_execute.call_args.args
+        assert "mutation CreateUser" in query
+        assert variables["password"] != "secret1"
+
+    @patch("src.services.user_graphql.execute_graphql")
+    async def test_duplicate_email_is_reported(self, mock_execute):
+        mock_execute.return_value = {
+            "data": None,
+            "errors": [
+                {"message": 'duplicate key value violates unique constraint "user_email_key"'}
+            ],
+        }
+
+        result = await UserController.register_user(self.USER)
+
+        assert result == {"error": "Email is already registered."}
+        mock_execute.assert_called_once()
+
+    @patch("src.services.user_graphql.execute_graphql")
+    async def test_other_errors_are_passed_through(self, mock_execute):
+        mock_execute.return_value = {"data": None, "errors": [{"message": "connection refused"}]}
+
+        result = await UserController.register_user(self.USER)
+
+        assert result["errors"] == [{"message": "connection refused"}]
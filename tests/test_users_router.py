@@ -7,6 +7,8 @@ from unittest.mock import patch
 @pytest.mark.asyncio
 class TestUsersRouter:
 
+    HEADERS = {"Authorization": "Bearer test.jwt.token"}
+
     @patch("src.controllers.users_controller.UserController.register_user")
     async def test_register_user_success(self, mock_register, test_app):
         mock_register.return_value = {
@@ -64,6 +66,24 @@ class TestUsersRouter:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
         assert "email" in response.text
 
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {},
+            {"email": None},
+            {"email": ["ana@example.com", "luis@example.com"]},
+            {"email": "ana@example.com\r\nBcc: luis@example.com"},
+        ],
+    )
+    @patch("src.controllers.users_controller.UserController.sent_invitation")
+    async def test_send_invitation_invalid_email(self, mock_invite, payload, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.post("/users/invite", json=payload, headers=self.HEADERS)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_invite.assert_not_called()
+
     @patch("src.controllers.users_controller.UserController.login_user")
     async def test_login_user_success(self, mock_login, test_app):
         mock_login.return_value = {
@@ -94,3 +114,14 @@ class TestUsersRouter:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Invalid credentials" in response.text
+
+    async def test_get_my_tasks_invalid_status(self, test_app):
+        transport = ASGITransport(app=test_app)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get(
+                "/users/me/tasks?status=unknown",
+                headers={"Authorization": "Bearer test.jwt.token"},
+            )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "status" in response.text
@@ -0,0 +1,259 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from httpx import ASGITransport, AsyncClient
+
+from src.commands import run_jobs
+from src.infrastructure.memory_backend import memory_backend
+from src.infrastructure.webhooks import (
+    SIGNATURE_HEADER,
+    WebhookSender,
+    WebhookURLError,
+    check_webhook_url,
+    sign,
+)
+
+HEADERS = {"Authorization": "Bearer test.jwt.token"}
+SECRET = "0123456789abcdef0123"
+
+
+class WebhookReceiver:
+    """
+    Local HTTP stand-in recording the deliveries it receives. Requests to paths starting
+    with /fail are answered with 500; every request takes `delay` seconds.
+    """
+
+    def __init__(self, delay: float = 0):
+        self.deliveries = []
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                with receiver._lock:
+                    receiver.in_flight += 1
+                    receiver.peak_in_flight = max(receiver.peak_in_flight, receiver.in_flight)
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(receiver.delay)
+                with receiver._lock:
+                    receiver.in_flight -= 1
+                    receiver.deliveries.append(
+                        {"path": self.path, "headers": dict(self.headers), "body": body}
+                    )
+                self.send_response(500 if self.path.startswith("/fail") else 204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _payload(subscription_id, url, event_id):
+    return {
+        "subscriptionId": subscription_id,
+        "url": url,
+        "secret": SECRET,
+        "event": {"id": str(event_id), "action": "task.updated"},
+    }
+
+
+@pytest.mark.asyncio
+class TestWebhookSender:
+
+    async def test_events_are_coalesced_per_subscription_and_signed(self):
+        sender = WebhookSender(allow_local_urls=True)
+        with WebhookReceiver() as receiver:
+            errors = await sender.deliver(
+                [
+                    _payload("a", f"{receiver.url}/a", 1),
+                    _payload("b", f"{receiver.url}/b", 2),
+                    _payload("a", f"{receiver.url}/a", 3),
+                ]
+            )
+            await sender.close()
+
+        assert errors == [None, None, None]
+        by_path = {delivery["path"]: delivery for delivery in receiver.deliveries}
+        assert sorted(by_path) == ["/a", "/b"]
+        body = by_path["/a"]["body"]
+        assert [event["id"] for event in json.loads(body)["events"]] == ["1", "3"]
+        assert by_path["/a"]["headers"][SIGNATURE_HEADER] == sign(SECRET, body)
+
+    async def test_failed_deliveries_are_reported_and_measured(self):
+        sender = WebhookSender(allow_local_urls=True)
+        with WebhookReceiver() as receiver:
+            errors = await sender.deliver(
+                [_payload("a", f"{receiver.url}/fail", 1), _payload("b", f"{receiver.url}/b", 2)]
+            )
+            await sender.close()
+        errors += await sender.deliver([_payload("c", "http://127.0.0.1:9/closed", 3)])
+        await sender.close()
+
+        assert errors[0] == "HTTP 500"
+        assert errors[1] is None
+        assert errors[2].startswith("ConnectError")
+        endpoint = receiver.url.removeprefix("http://")
+        summary = sender.metrics.summary()
+        assert summary[endpoint]["deliveries"] == 2
+        assert summary[endpoint]["failures"] == 1
+        assert summary[endpoint]["maxMs"] >= summary[endpoint]["p50Ms"] > 0
+
+    async def test_deliveries_per_endpoint_are_limited(self):
+        sender = WebhookSender(endpoint_concurrency=1, allow_local_urls=True)
+        with WebhookReceiver(delay=0.05) as receiver:
+            errors = await sender.deliver(
+                [_payload(name, f"{receiver.url}/{name}", n) for n, name in enumerate("abc")]
+            )
+            await sender.close()
+
+        assert errors == [None, None, None]
+        assert len(receiver.deliveries) == 3
+        assert receiver.peak_in_flight == 1
+
+    async def test_local_endpoints_are_refused(self):
+        sender = WebhookSender()
+        with WebhookReceiver() as receiver:
+            errors = await sender.deliver([_payload("a", f"{receiver.url}/a", 1)])
+            await sender.close()
+
+        assert errors[0].startswith("Refused")
+        assert receiver.deliveries == []
+
+
+@pytest.mark.asyncio
+class TestCheckWebhookURL:
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "http://93.184.216.34/hooks",
+            "https://127.0.0.1/hooks",
+            "https://localhost:8000/hooks",
+            "https://10.0.0.5/hooks",
+            "https://169.254.169.254/latest/meta-data",
+            "https://[::1]/hooks",
+            "https://[::ffff:192.168.0.1]/hooks",
+        ],
+    )
+    async def test_rejected(self, url):
+        with pytest.raises(WebhookURLError):
+            await check_webhook_url(url)
+
+    async def test_public_https_address_is_accepted(self):
+        await check_webhook_url("https://93.184.216.34/hooks")
+
+    async def test_local_urls_can_be_allowed(self):
+        await check_webhook_url("http://postgraphile:5000/graphql", allow_local_urls=True)
+
+
+@pytest.mark.asyncio
+class TestWebhookSubscriptions:
+
+    @pytest.fixture
+    async def client(self, test_app):
+        memory_backend.reset()
+        with patch("src.infrastructure.graphql_client.GRAPHQL_TRANSPORT", "memory"):
+            transport = ASGITransport(app=test_app)
+            async with AsyncClient(transport=transport, base_url="http://test") as ac:
+                yield ac
+
+    async def test_task_changes_are_delivered_to_subscribers(self, client):
+        response = await client.post("/task-lists", json={"name": "Sprint"}, headers=HEADERS)
+        task_list_id = response.json()["id"]
+
+        with (
+            WebhookReceiver() as receiver,
+            patch("src.controllers.webhooks_controller.WEBHOOK_ALLOW_LOCAL_URLS", True),
+        ):
+            response = await client.post(
+                f"/task-lists/{task_list_id}/webhooks",
+                json={"url": f"{receiver.url}/hooks", "secret": SECRET},
+                headers=HEADERS,
+            )
+            assert response.status_code == status.HTTP_200_OK
+            webhook = response.json()
+            assert webhook["secret"] == SECRET
+
+            response = await client.post(
+                "/tasks",
+                json={"title": "Film intro", "task_list_id": task_list_id},
+                headers=HEADERS,
+            )
+            task_id = response.json()["id"]
+            await client.put(
+                f"/tasks/{task_id}/status", json={"status": "completed"}, headers=HEADERS
+            )
+
+            sender = WebhookSender(allow_local_urls=True)
+            with patch("src.controllers.jobs_controller.webhook_sender", sender):
+                worker = run_jobs.build_worker(run_jobs.parse_args(["--once"]))
+                assert await run_jobs.drain(worker) == 2
+            await sender.close()
+
+        assert len(receiver.deliveries) == 1
+        delivery = receiver.deliveries[0]
+        assert delivery["path"] == "/hooks"
+        assert delivery["headers"][SIGNATURE_HEADER] == sign(SECRET, delivery["body"])
+        events = json.loads(delivery["body"])["events"]
+        assert [event["action"] for event in events] == ["task.created", "task.updated"]
+        assert events[1]["taskId"] == task_id
+        assert events[1]["task"]["status"] == "completed"
+        assert memory_backend.store.jobs == {}
+
+        response = await client.get(f"/task-lists/{task_list_id}/webhooks", headers=HEADERS)
+        assert [hook["id"] for hook in response.json()] == [webhook["id"]]
+        assert "secret" not in response.json()[0]
+
+        response = await client.delete(
+            f"/task-lists/{task_list_id}/webhooks/{webhook['id']}", headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = await client.delete(
+            f"/task-lists/{task_list_id}/webhooks/{webhook['id']}", headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"url": "not a url"},
+            {"url": "https://example.com", "secret": "short"},
+            {},
+            {"url": "http://93.184.216.34/hooks"},
+            {"url": "https://127.0.0.1/hooks"},
+            {"url": "https://169.254.169.254/latest/meta-data"},
+        ],
+    )
+    async def test_invalid_subscription(self, client, payload):
+        response = await client.post("/task-lists", json={"name": "Sprint"}, headers=HEADERS)
+        response = await client.post(
+            f"/task-lists/{response.json()['id']}/webhooks", json=payload, headers=HEADERS
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_unknown_task_list(self, client):
+        response = await client.post(
+            "/task-lists/5f0c6f0e-8d7c-4b8e-9a55-2a3f7c1f0b11/webhooks",
+            json={"url": "https://example.com/hooks"},
+            headers=HEADERS,
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.write_behind import WriteBehindBuffer
+
+
+class RecordingWriter:
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(batch)
+
+
+@pytest.mark.asyncio
+class TestWriteBehindBuffer:
+
+    async def test_updates_within_the_window_are_written_in_one_batch(self):
+        writer = RecordingWriter()
+        buffer = WriteBehindBuffer(writer, window_seconds=0.01)
+
+        for percentage in range(0, 101, 10):
+            buffer.submit("task-1", {"completed_percentage": percentage})
+        buffer.submit("task-1", {"status": "completed"})
+        buffer.submit("task-2", {"completed_percentage": 5})
+        await asyncio.sleep(0.05)
+
+        assert writer.batches == [
+            {
+                "task-1": {"completed_percentage": 100, "status": "completed"},
+                "task-2": {"completed_percentage": 5},
+            }
+        ]
+        assert buffer.submitted == 13
+        assert buffer.batches == 1
+        assert buffer.pending("task-1") == {}
+
+    async def test_max_batch_flushes_without_waiting_for_the_window(self):
+        writer = RecordingWriter()
+        buffer = WriteBehindBuffer(writer, window_seconds=60, max_batch=2)
+
+        buffer.submit("task-1", {"completed_percentage": 10})
+        buffer.submit("task-2", {"completed_percentage": 20})
+        await asyncio.sleep(0)
+
+        assert writer.batches == [
+            {"task-1": {"completed_percentage": 10}, "task-2": {"completed_percentage": 20}}
+        ]
+        await buffer.close()
+
+    async def test_close_waits_for_the_flushes_in_progress(self):
+        written = asyncio.Event()
+
+        async def slow_writer(batch):
+            await asyncio.sleep(0.01)
+            written.set()
+
+        buffer = WriteBehindBuffer(slow_writer, window_seconds=60, max_batch=1)
+        buffer.submit("task-1", {"completed_percentage": 10})
+        assert len(buffer._flushes) == 1
+
+        await buffer.close()
+
+        assert written.is_set()
+        assert buffer.batches == 1
+        await asyncio.sleep(0)
+        assert not buffer._flushes
+
+    async def test_pending_and_discard(self):
+        writer = RecordingWriter()
+        buffer = WriteBehindBuffer(writer, window_seconds=60)
+
+        assert buffer.submit("task-1", {"status": "in_process"}) == {"status": "in_process"}
+        assert buffer.submit("task-1", {"completed_percentage": 40}) == {
+            "status": "in_process",
+            "completed_percentage": 40,
+        }
+
+        buffer.discard("task-1")
+        await buffer.close()
+
+        assert buffer.pending("task-1") == {}
+        assert writer.batches == []
+
+    async def test_discard_only_the_given_fields(self):
+        writer = RecordingWriter()
+        buffer = WriteBehindBuffer(writer, window_seconds=60)
+
+        buffer.submit("task-1", {"status": "in_process", "completed_percentage": 40})
+        buffer.submit("task-2", {"status": "completed"})
+        buffer.discard("task-1", ("status",))
+        buffer.discard("task-2", ("status",))
+        await buffer.close()
+
+        assert writer.batches == [{"task-1": {"completed_percentage": 40}}]
+
+    async def test_failed_batch_is_retried_under_newer_updates(self):
+        writer = RecordingWriter(failures=1)
+        buffer = WriteBehindBuffer(writer, window_seconds=60)
+
+        buffer.submit("task-1", {"status": "in_process", "completed_percentage": 10})
+        await buffer.flush()
+        buffer.submit("task-1", {"completed_percentage": 20})
+        await buffer.close()
+
+        assert writer.batches == [{"task-1": {"status": "in_process", "completed_percentage": 20}}]